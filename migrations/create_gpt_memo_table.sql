@@ -0,0 +1,14 @@
+-- Shared tier of the GPT memo used by src/utils/gpt_memo.py
+-- (used by default when Supabase credentials are set; GPT_MEMO_SUPABASE=false turns it off)
+-- One row per (prompt version, OpenAI model, make, model, normalized content hash)
+CREATE TABLE IF NOT EXISTS gpt_memo (
+    prompt_version TEXT NOT NULL,
+    model_name TEXT NOT NULL,
+    make TEXT NOT NULL,
+    model TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    result JSONB NOT NULL,
+    tokens INTEGER DEFAULT 0,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (prompt_version, model_name, make, model, content_hash)
+);
@@ -0,0 +1,16 @@
+-- OpenAI Batch API submissions of the sentiment_analysis job (src/analysis/sentiment_batch.py)
+-- One row per local batch ID; kept in Supabase so pending batches survive worker redeploys
+CREATE TABLE IF NOT EXISTS openai_batches (
+    local_id TEXT PRIMARY KEY,         -- sentiment_<timestamp>_<suffix>, not the OpenAI batch ID
+    job TEXT NOT NULL,                 -- sentiment_analysis
+    clip_ids TEXT[] NOT NULL DEFAULT '{}',  -- clips whose results the batch will save
+    submitted BOOLEAN NOT NULL DEFAULT FALSE,
+    finished BOOLEAN NOT NULL DEFAULT FALSE,
+    manifest JSONB NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- The worker polls unfinished batches, and sentiment jobs skip their clips
+CREATE INDEX IF NOT EXISTS idx_openai_batches_unfinished
+ON openai_batches(job) WHERE NOT finished;
@@ -0,0 +1,21 @@
+-- Shared transcript store used by src/utils/transcript_store.py
+-- (used by default when Supabase credentials are set; TRANSCRIPT_STORE_BACKENDS overrides)
+-- One row per (video, source); segments are zlib-compressed JSON, base64-encoded
+CREATE TABLE IF NOT EXISTS transcripts (
+    video_id TEXT NOT NULL,
+    source TEXT NOT NULL,              -- captions | apify | whisper
+    success BOOLEAN NOT NULL,
+    segments TEXT,
+    lang TEXT,
+    error TEXT,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    expires_at TIMESTAMPTZ NOT NULL,
+    PRIMARY KEY (video_id, source)
+);
+
+-- Lookups are by video, newest live entry first
+CREATE INDEX IF NOT EXISTS idx_transcripts_video_live
+ON transcripts(video_id, success, expires_at);
+
+-- Purge of expired rows
+CREATE INDEX IF NOT EXISTS idx_transcripts_expires_at ON transcripts(expires_at);
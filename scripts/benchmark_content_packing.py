@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Benchmark tokens sent per clip: the old flat `content[:12000]` cut vs the
+token-budgeted content packer used by the sentiment analyzers.
+
+Before, analyze_clip, analyze_clip_enhanced and the v1 analyzer sent the first
+12000 characters of every clip, so long articles spent the budget on menus and
+share bars and long transcripts lost their verdicts. After, content_packer
+strips boilerplate, keeps the passages with the most make/model mentions plus
+the opening and closing passages, and (with --summarize) map-reduce summarizes
+very long transcripts.
+
+For every clip the benchmark reports the tokens sent, how many of the clip's
+make/model mentions survived, and whether its closing passage (usually the
+verdict) was kept. Clips are synthetic articles and transcripts padded with
+boilerplate, plus any .txt files from --input-dir (files ending in
+.transcript.txt are treated as video transcripts). The synthetic reviews with
+pros/cons lists also check that no list line is lost - those short,
+unpunctuated lines look like menus but carry most of a review's sentiment.
+
+Usage:
+    python scripts/benchmark_content_packing.py
+    python scripts/benchmark_content_packing.py --input-dir data/clip_samples --vehicle "Mazda:CX-70"
+    python scripts/benchmark_content_packing.py --budget 3000 --summarize   # needs OPENAI_API_KEY
+"""
+
+import sys
+import os
+import glob
+import random
+import argparse
+import statistics
+from typing import List, NamedTuple, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.analysis.content_packer import pack_content, count_tokens, strip_boilerplate, CONTENT_TOKEN_BUDGET
+from src.utils.vehicle_matcher import get_vehicle_matcher
+
+OLD_MAX_CONTENT_LENGTH = 12000
+
+NAV = ['Home', 'Reviews', 'News', 'Buyer\'s Guide', 'Car Shopping', 'EVs', 'Trucks', 'Videos', 'Deals']
+BOILERPLATE = [
+    'Subscribe to our newsletter for the latest reviews',
+    'We use cookies to improve your experience. Accept all cookies',
+    'Share this article on Facebook',
+    'Follow us on Instagram',
+    'Related Articles',
+    'Advertisement',
+    'Read more: the best midsize SUVs of the year',
+    '© 2025 Example Media. All rights reserved. Privacy Policy | Terms of Use',
+]
+FILLER = [
+    'The drive route took us through winding canyon roads and a stretch of highway.',
+    'Pricing for the segment has climbed steadily over the last few model years.',
+    'Our test week included a weekend trip with luggage for four.',
+    'Competitors have been busy updating their lineups as well.',
+    'Weather during the loan was mostly dry with a few rainy mornings.',
+    'The photographer spent most of the afternoon chasing the light.',
+]
+OPINIONS = [
+    'The {make} {model} rides with real composure and the steering is precise.',
+    'Inside the {model} the materials feel a class above, although the screen is small.',
+    'Fuel economy in the {make} {model} averaged well above the EPA estimate on our loop.',
+    'The {model} third row is tight for adults, which buyers should keep in mind.',
+    'Acceleration from the {make} {model} turbo engine is strong and smooth.',
+    'Cargo space behind the {model} second row is competitive for the class.',
+]
+PROS_CONS = ['Pros', 'Smooth inline-six engine', 'Upscale cabin materials', 'Sharp handling',
+             'Cons', 'Firm ride', 'Pricey options', 'Cramped rear seat']
+CHATTER = [
+    'so yeah', 'anyway let me know in the comments', 'this video is sponsored by our friends at',
+    'make sure you hit that subscribe button', 'okay so', 'you know what I mean', 'right',
+]
+
+class Clip(NamedTuple):
+    name: str
+    make: str
+    model: str
+    content: str
+    transcript: bool
+    must_keep: Tuple[str, ...] = ()
+
+def _sentences(rng: random.Random, make: str, model: str, count: int, opinion_rate: float) -> List[str]:
+    return [rng.choice(OPINIONS).format(make=make, model=model) if rng.random() < opinion_rate
+            else rng.choice(FILLER) for _ in range(count)]
+
+def synthetic_article(rng: random.Random, make: str, model: str, paragraphs: int) -> str:
+    lines = NAV + ['', f"2025 {make} {model} Review: First Drive", '']
+    lines += rng.sample(BOILERPLATE, 3)
+    for index in range(paragraphs):
+        lines += ['', ' '.join(_sentences(rng, make, model, 5, 0.15 if index % 4 else 0.6))]
+        if index % 5 == 4:
+            lines += ['', rng.choice(BOILERPLATE), 'Related Articles'] + rng.sample(NAV, 4)
+    lines += ['', f"Verdict: the {make} {model} is the one to buy in its class, with few real flaws."]
+    lines += [''] + BOILERPLATE + NAV
+    return '\n'.join(lines)
+
+def pros_cons_review(rng: random.Random, make: str, model: str, paragraphs: int) -> str:
+    """Review with a pros/cons list between prose paragraphs, framed by navigation"""
+    body = [' '.join(_sentences(rng, make, model, 5, 0.3)) for _ in range(paragraphs)]
+    middle = paragraphs // 2
+    lines = NAV[:4] + ['', f"{make} {model} Review"] + body[:middle] + PROS_CONS + body[middle:]
+    lines += [f"Verdict: the {make} {model} is easy to recommend.", ''] + BOILERPLATE[:2] + NAV[4:]
+    return '\n'.join(lines)
+
+def synthetic_transcript(rng: random.Random, make: str, model: str, sentences: int) -> str:
+    words = []
+    for sentence in _sentences(rng, make, model, sentences, 0.12):
+        words.append(f"{rng.choice(CHATTER)} {sentence[0].lower()}{sentence[1:]}")
+    words.append(f"So my final verdict on the {make} {model}: I would buy one, it is the best in the segment.")
+    return ' '.join(words)
+
+def synthetic_clips(seed: int, vehicles: List[tuple]) -> List[Clip]:
+    rng = random.Random(seed)
+    clips = []
+    for make, model in vehicles:
+        clips.append(Clip(f"{make} {model} short article", make, model, synthetic_article(rng, make, model, 6), False))
+        clips.append(Clip(f"{make} {model} long article", make, model, synthetic_article(rng, make, model, 60), False))
+        clips.append(Clip(f"{make} {model} 20-min transcript", make, model, synthetic_transcript(rng, make, model, 450), True))
+        clips.append(Clip(f"{make} {model} 60-min transcript", make, model, synthetic_transcript(rng, make, model, 1400), True))
+        clips.append(Clip(f"{make} {model} short pros/cons", make, model, pros_cons_review(rng, make, model, 2),
+                          False, tuple(PROS_CONS)))
+        clips.append(Clip(f"{make} {model} long pros/cons", make, model, pros_cons_review(rng, make, model, 40),
+                          False, tuple(PROS_CONS)))
+    return clips
+
+def file_clips(input_dir: str, make: str, model: str) -> List[Clip]:
+    clips = []
+    for path in sorted(glob.glob(os.path.join(input_dir, '*.txt'))):
+        with open(path, encoding='utf-8', errors='replace') as f:
+            clips.append(Clip(os.path.basename(path), make, model, f.read(), path.endswith('.transcript.txt')))
+    return clips
+
+def ending_kept(original: str, packed: str) -> bool:
+    """Was the last sentence of the clip (usually the verdict) sent? Trailing boilerplate doesn't count."""
+    tail = strip_boilerplate(original).rsplit('\n', 1)[-1].strip()
+    tail = tail.rsplit('. ', 1)[-1][-120:]
+    return tail in packed
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare tokens sent per clip before/after the content packer',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('--budget', type=int, default=CONTENT_TOKEN_BUDGET,
+                        help=f'Content token budget (default: CONTENT_TOKEN_BUDGET={CONTENT_TOKEN_BUDGET})')
+    parser.add_argument('--input-dir', type=str, help='Directory of .txt clips to add to the synthetic ones')
+    parser.add_argument('--vehicle', action='append', help='Make:Model (repeatable; the first is used for --input-dir)')
+    parser.add_argument('--summarize', action='store_true', help='Allow GPT chunk summaries of long transcripts')
+    parser.add_argument('--seed', type=int, default=7, help='Seed for the synthetic clips')
+    args = parser.parse_args()
+
+    vehicles = [tuple(v.split(':', 1)) for v in (args.vehicle or ['Mazda:CX-70', 'Toyota:Crown Signia'])]
+    clips = synthetic_clips(args.seed, vehicles)
+    if args.input_dir:
+        clips += file_clips(args.input_dir, *vehicles[0])
+
+    print(f"📊 {len(clips)} clips, budget {args.budget} tokens, summaries {'on' if args.summarize else 'off'}")
+    print(f"{'clip':<36} {'tokens in':>9} {'before':>7} {'after':>7} {'mentions':>15} {'ending':>13}  strategy")
+
+    before_tokens, after_tokens = [], []
+    before_endings = after_endings = 0
+    lost_lists = 0
+    for clip in clips:
+        matcher = get_vehicle_matcher(clip.make, clip.model)
+        old = clip.content[:OLD_MAX_CONTENT_LENGTH] + ("..." if len(clip.content) > OLD_MAX_CONTENT_LENGTH else "")
+        packed = pack_content(clip.content, clip.make, clip.model, budget_tokens=args.budget,
+                              transcript=clip.transcript, summarize=args.summarize)
+        total = matcher.mentions(clip.content.lower()) or 1
+        old_kept, new_kept = ending_kept(clip.content, old), ending_kept(clip.content, packed.text)
+        before_endings += old_kept
+        after_endings += new_kept
+        before_tokens.append(count_tokens(old))
+        after_tokens.append(packed.tokens_out)
+        mentions = (f"{matcher.mentions(old.lower()) / total:>6.0%} → "
+                    f"{matcher.mentions(packed.text.lower()) / total:>5.0%}")
+        endings = f"{'yes' if old_kept else 'no':>4} → {'yes' if new_kept else 'no':>4}"
+        print(f"{clip.name[:36]:<36} {packed.tokens_in:>9} {before_tokens[-1]:>7} {packed.tokens_out:>7} "
+              f"{mentions:>15} {endings:>13}  {packed.strategy}")
+        lost = [line for line in clip.must_keep if line not in packed.text.split('\n')]
+        if lost:
+            lost_lists += 1
+            print(f"❌ {clip.name}: dropped {', '.join(lost)}")
+
+    mean_before, mean_after = statistics.mean(before_tokens), statistics.mean(after_tokens)
+    print(f"{'mean tokens per clip':<36} {'':>9} {mean_before:>7.0f} {mean_after:>7.0f} "
+          f"({(1 - mean_after / mean_before):.0%} fewer)")
+    print(f"Closing passage kept: {before_endings}/{len(clips)} before, {after_endings}/{len(clips)} after")
+    over = sum(1 for tokens in after_tokens if tokens > args.budget)
+    if over:
+        print(f"❌ {over} clips exceed the budget")
+    if lost_lists:
+        print(f"❌ {lost_lists} clips lost pros/cons lines")
+    if over or lost_lists:
+        return 1
+    print("✅ Every clip within budget, every pros/cons list kept")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
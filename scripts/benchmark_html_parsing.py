@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Benchmark HTML parse time per article: the old per-extractor parsing vs the
+shared ParsedDocument.
+
+Before, one fetched article was parsed once per extractor:
+    extract_article_content      html.parser
+    try_alternative_extraction   html.parser  (only when basic extraction is poor)
+    extract_date_from_html       lxml
+    crawler byline extraction    html.parser
+    Google Search byline check   html.parser
+After, the read-only extractors (date + both bylines) share one lxml tree and
+content extraction parses its own lxml tree (plus one more for alternatives).
+
+Pages are read from saved dumps: .html/.htm files are used as-is and JSON dumps
+are scanned for embedded HTML strings. Cached pages from the crawl cache can be
+added with --cache-db.
+
+Usage:
+    python scripts/benchmark_html_parsing.py
+    python scripts/benchmark_html_parsing.py data/network_dumps_debug --repeat 5
+    python scripts/benchmark_html_parsing.py --cache-db data/scraping_cache.db --limit 200
+"""
+
+import sys
+import os
+import re
+import json
+import time
+import sqlite3
+import argparse
+import statistics
+from typing import List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from src.utils.parsed_document import ParsedDocument, HTML_PARSER
+from src.utils.content_extractor import extract_article_content
+from src.utils.date_extractor import extract_date_from_html
+
+DEFAULT_DUMP_DIR = os.path.join('data', 'network_dumps_debug')
+MIN_HTML_LENGTH = 200
+HTML_PATTERN = re.compile(r'<(html|body|div|p|article|span|a)\b', re.IGNORECASE)
+
+# (parser, runs only when basic extraction fails the quality check)
+OLD_PARSES = [
+    ('html.parser', False),  # extract_article_content
+    ('html.parser', True),   # try_alternative_extraction
+    ('lxml', False),         # extract_date_from_html
+    ('html.parser', False),  # EnhancedCrawlerManager._extract_byline_from_content
+    ('html.parser', False),  # GoogleSearch._extract_actual_byline_sync
+]
+
+def _html_strings(value):
+    """Yield HTML-looking strings nested anywhere in a JSON dump"""
+    if isinstance(value, dict):
+        for item in value.values():
+            yield from _html_strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _html_strings(item)
+    elif isinstance(value, str) and len(value) >= MIN_HTML_LENGTH and HTML_PATTERN.search(value):
+        yield value
+
+def load_pages(paths: List[str], cache_db: str = None, limit: int = None) -> List[Tuple[str, str]]:
+    """Return (label, html) pairs from dump files/directories and optionally the crawl cache."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, name) for name in sorted(os.listdir(path)))
+        elif os.path.exists(path):
+            files.append(path)
+
+    pages = []
+    for file_path in files:
+        name = os.path.basename(file_path)
+        try:
+            if file_path.endswith(('.html', '.htm')):
+                with open(file_path, encoding='utf-8', errors='ignore') as f:
+                    pages.append((name, f.read()))
+            elif file_path.endswith('.json'):
+                with open(file_path, encoding='utf-8', errors='ignore') as f:
+                    dump = json.load(f)
+                for i, html in enumerate(_html_strings(dump)):
+                    pages.append((f"{name}#{i}", html))
+        except Exception as e:
+            print(f"⚠️ Skipping {file_path}: {e}")
+
+    if cache_db:
+        conn = sqlite3.connect(cache_db)
+        rows = conn.execute(
+            "SELECT url, content FROM scraping_cache WHERE content != '' AND content LIKE '%<%'"
+        ).fetchall()
+        conn.close()
+        pages.extend((url, content) for url, content in rows if HTML_PATTERN.search(content))
+
+    return pages[:limit] if limit else pages
+
+def _time(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+def time_old(html: str, with_alternative: bool) -> float:
+    return sum(_time(lambda: BeautifulSoup(html, parser))
+               for parser, alternative_only in OLD_PARSES
+               if with_alternative or not alternative_only)
+
+def time_new(html: str, with_alternative: bool) -> float:
+    document = ParsedDocument(html)
+    elapsed = _time(lambda: document.soup)  # shared by date + both byline extractors
+    # extract_article_content and try_alternative_extraction share one stripped tree
+    def _stripped():
+        with document.stripped_tree():
+            pass
+    elapsed += _time(_stripped)
+    return elapsed
+
+def time_pipeline(html: str, label: str) -> float:
+    """Content + date extraction end to end through the shared document (new code path)"""
+    document = ParsedDocument(html, label)
+    start = time.perf_counter()
+    extract_article_content(document, label, "")
+    extract_date_from_html(document, label)
+    _ = document.soup.select('[class*="author"], meta[name="author"]')
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare per-article HTML parse time before/after the shared ParsedDocument',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('paths', nargs='*', default=[DEFAULT_DUMP_DIR],
+                        help=f'Dump files or directories (default: {DEFAULT_DUMP_DIR})')
+    parser.add_argument('--cache-db', type=str, help='Also benchmark pages stored in the crawl cache')
+    parser.add_argument('--limit', type=int, help='Maximum pages to benchmark')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per page (median is reported)')
+    parser.add_argument('--pipeline', action='store_true',
+                        help='Also time content + date + byline extraction end to end on the new path')
+    args = parser.parse_args()
+
+    pages = load_pages(args.paths, args.cache_db, args.limit)
+    if not pages:
+        print("❌ No HTML pages found in the given dumps")
+        return 1
+
+    total_kb = sum(len(html) for _, html in pages) / 1024
+    print(f"📊 {len(pages)} pages ({total_kb:.0f} KB), {args.repeat} runs each, new parser: {HTML_PARSER}")
+    print(f"{'':<34} {'before':>10} {'after':>10} {'speedup':>8}")
+
+    for with_alternative in (False, True):
+        before = [statistics.median(time_old(html, with_alternative) for _ in range(args.repeat)) for _, html in pages]
+        after = [statistics.median(time_new(html, with_alternative) for _ in range(args.repeat)) for _, html in pages]
+        label = 'parse ms/article' + (' (+alternative)' if with_alternative else '')
+        mean_before = statistics.mean(before) * 1000
+        mean_after = statistics.mean(after) * 1000
+        speedup = mean_before / mean_after if mean_after else 0.0
+        print(f"{label:<34} {mean_before:>10.2f} {mean_after:>10.2f} {speedup:>7.1f}x")
+
+    if args.pipeline:
+        pipeline = [statistics.median(time_pipeline(html, label) for _ in range(args.repeat)) for label, html in pages]
+        print(f"{'extraction ms/article (new)':<34} {'':>10} {statistics.mean(pipeline) * 1000:>10.2f}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Benchmark the native asyncio ingest engine against the old asyncio.to_thread wrapper.
+
+Crawl, GPT and Supabase calls are replayed from a fixture of recorded latencies
+(sleep-based), so both engines see exactly the same workload and no network,
+API credits or database writes are used during the comparison.
+
+Usage:
+    # Record real per-URL latencies for a sample of loans (hits the network + OpenAI)
+    python scripts/benchmark_ingest_engine.py --record --input data/loans.csv --limit 20 --fixture data/ingest_fixture.json
+
+    # Replay a recorded fixture through both engines
+    python scripts/benchmark_ingest_engine.py --fixture data/ingest_fixture.json
+
+    # Replay a synthetic workload (no recording needed), 10x faster than real time
+    python scripts/benchmark_ingest_engine.py --synthetic 200 --seed 7 --time-scale 0.1
+"""
+
+import sys
+import os
+import json
+import time
+import random
+import asyncio
+import argparse
+from typing import Dict, List, Any
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import src.ingest.ingest_database as ingest_db
+import src.analysis.gpt_analysis as gpt_analysis
+import src.utils.database as database_module
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+BASELINE_MAX_CONCURRENT = 5  # MAX_CONCURRENT used by the old to_thread wrapper
+
+# ---------------------------------------------------------------------------
+# Recording
+# ---------------------------------------------------------------------------
+
+def record_fixture(args) -> Dict[str, Any]:
+    """Run loans sequentially through the real pipeline and record per-URL latencies."""
+    import src.ingest.ingest as ingest
+
+    if args.url:
+        loans = ingest.load_loans_data_from_url(args.url)
+    else:
+        loans = ingest.load_loans_data(args.input)
+    loans = loans[:args.limit]
+
+    current: Dict[str, Any] = {}
+    original_crawl = ingest_db._crawl_loan_url
+    original_gpt = ingest_db.analyze_clip_relevance_only
+    original_fetch = ingest.crawler_manager._fetch_basic_http
+
+    def timed_fetch(url):
+        start = time.perf_counter()
+        try:
+            return original_fetch(url)
+        finally:
+            current['tier1'] += time.perf_counter() - start
+
+    def timed_crawl(url, loan, cancel_check=None, prefetched_html=None):
+        current['tier1'] = 0.0
+        start = time.perf_counter()
+        result = original_crawl(url, loan, cancel_check, prefetched_html)
+        current['urls'][url] = {
+            'crawl': round(time.perf_counter() - start, 3),
+            'tier1': round(current['tier1'], 3),
+            'found': bool(result and (result.get('clip_url') or result.get('url'))),
+        }
+        return result
+
+    def timed_gpt(content, make, model, video_title=None):
+        start = time.perf_counter()
+        result = original_gpt(content, make, model, video_title=video_title)
+        current['gpt'].append(round(time.perf_counter() - start, 3))
+        return result
+
+    ingest_db._crawl_loan_url = timed_crawl
+    ingest_db.analyze_clip_relevance_only = timed_gpt
+    ingest.crawler_manager._fetch_basic_http = timed_fetch
+
+    fixture_loans = []
+    try:
+        for loan in loans:
+            current.clear()
+            current.update({'urls': {}, 'gpt': [], 'tier1': 0.0})
+            ingest_db.process_loan_for_database(dict(loan), run_id=None)
+            # GPT runs once per found URL, in URL order
+            gpt_times = iter(current['gpt'])
+            urls = []
+            for url, timing in current['urls'].items():
+                timing['gpt'] = next(gpt_times, 0.0) if timing['found'] else 0.0
+                urls.append({'url': url, **timing})
+            fixture_loans.append({
+                'work_order': str(loan.get('work_order', '')),
+                'make': loan.get('make', ''),
+                'model': loan.get('model', ''),
+                'urls': urls,
+            })
+            logger.info(f"📊 Recorded {loan.get('work_order')}: {len(urls)} URLs")
+    finally:
+        ingest_db._crawl_loan_url = original_crawl
+        ingest_db.analyze_clip_relevance_only = original_gpt
+        ingest.crawler_manager._fetch_basic_http = original_fetch
+
+    db_latency = args.db_latency
+    try:
+        db = database_module.get_database()
+        start = time.perf_counter()
+        db.should_retry_wo(fixture_loans[0]['work_order'] if fixture_loans else '0')
+        db_latency = round((time.perf_counter() - start) / 2, 3)  # should_retry_wo is two round trips
+    except Exception as e:
+        logger.warning(f"⚠️ Could not measure DB latency, using {db_latency}s: {e}")
+
+    return {'db_latency': db_latency, 'loans': fixture_loans}
+
+def synthetic_fixture(count: int, seed: int, db_latency: float) -> Dict[str, Any]:
+    """Generate a workload with latency shapes similar to production runs."""
+    rng = random.Random(seed)
+    loans = []
+    for i in range(count):
+        urls = []
+        for j in range(rng.randint(1, 6)):
+            tier1 = rng.uniform(0.2, 1.5)
+            # Most URLs finish after Tier 1, a few escalate to ScrapFly/index crawls
+            escalation = rng.lognormvariate(0, 1) * 3 if rng.random() < 0.3 else 0.0
+            found = rng.random() < 0.5
+            urls.append({
+                'url': f"https://outlet{j}.example.com/reviews/{i}",
+                'tier1': round(tier1, 3),
+                'crawl': round(tier1 + escalation + rng.uniform(0.05, 0.3), 3),
+                'gpt': round(rng.uniform(1.0, 4.0), 3) if found else 0.0,
+                'found': found,
+            })
+        loans.append({'work_order': str(100000 + i), 'make': 'Toyota', 'model': 'Camry', 'urls': urls})
+    return {'db_latency': db_latency, 'loans': loans}
+
+# ---------------------------------------------------------------------------
+# Replay
+# ---------------------------------------------------------------------------
+
+class _ReplayResponse:
+    def __init__(self, data):
+        self.data = data
+
+class _ReplayQuery:
+    """Minimal stand-in for a supabase query chain; every execute() costs one round trip."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.single_row = False
+
+    def __getattr__(self, name):
+        def chain(*args, **kwargs):
+            if name == 'single':
+                self.single_row = True
+            return self
+        return chain
+
+    def execute(self):
+        time.sleep(self.latency)
+        # Cancellation polls use .single(); bulk selects/upserts get an empty row list
+        return _ReplayResponse({'job_status': 'running'} if self.single_row else [])
+
+class _ReplayTable:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def table(self, name):
+        return _ReplayQuery(self.latency)
+
+class ReplayDatabase:
+    """DatabaseManager double that replays round-trip latency for the calls the ingest path makes."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.supabase = _ReplayTable(latency)
+        self.stored = 0
+
+    def _round_trips(self, n: int):
+        time.sleep(self.latency * n)
+
+    def should_retry_wo(self, wo_number):
+        self._round_trips(2)
+        return True
+
+    def store_clip(self, clip_data):
+        self._round_trips(2)
+        self.stored += 1
+        return True
+
+    def mark_wo_success(self, wo_number, clip_url):
+        self._round_trips(2)
+
+    def mark_wo_attempt(self, wo_number, status, reason=None):
+        self._round_trips(2)
+
+    def store_failed_attempt(self, data, status):
+        self._round_trips(3)
+        return True
+
+    def record_skip_event(self, wo_number, run_id, reason):
+        self._round_trips(1)
+
+    def plan_wo_retries(self, wo_numbers):
+        self._round_trips(2 * (len(wo_numbers) // 200 + 1))
+        return {str(wo): None for wo in wo_numbers}
+
+    def record_skip_events(self, skip_reasons, run_id):
+        self._round_trips(1)
+        return len(skip_reasons)
+
+    def get_pending_clips(self, run_id):
+        self._round_trips(1)
+        return [None] * self.stored
+
+class _ReplayHTTPClient:
+    """Stands in for the shared httpx.AsyncClient (fetches are replayed by replay_fetch)"""
+
+    async def aclose(self):
+        pass
+
+def install_replay(fixture: Dict[str, Any], scale: float):
+    """Patch crawl/GPT/HTTP entry points with sleeps taken from the fixture."""
+    timings = {u['url']: u for loan in fixture['loans'] for u in loan['urls']}
+
+    def replay_crawl(url, loan, cancel_check=None, prefetched_html=None):
+        timing = timings[url]
+        elapsed = timing['crawl']
+        if prefetched_html is not None:
+            elapsed -= timing['tier1']  # Tier 1 was already awaited asynchronously
+        time.sleep(max(elapsed, 0) * scale)
+        if not timing['found']:
+            return None
+        # The URL leads the content so the GPT replay can find its recorded latency
+        content = url + '\n' + f"{loan.get('make')} {loan.get('model')} review " * 50
+        return {'url': url, 'content': content, 'title': 'Replay'}
+
+    async def replay_fetch(client, url):
+        await asyncio.sleep(timings[url]['tier1'] * scale)
+        return '<html></html>'
+
+    def _gpt_time(content):
+        return timings[content.split('\n', 1)[0]]['gpt']
+
+    def replay_gpt(content, make, model, video_title=None):
+        time.sleep(_gpt_time(content) * scale)
+        return {'relevance_score': 8}
+
+    async def replay_gpt_async(content, make, model, video_title=None):
+        await asyncio.sleep(_gpt_time(content) * scale)
+        return {'relevance_score': 8}
+
+    ingest_db._crawl_loan_url = replay_crawl
+    # Both engines must do the full work - no reuse of scores across the two passes
+    ingest_db._cached_content_analysis = lambda result, make, model: None
+    ingest_db._remember_content_analysis = lambda *args: None
+    ingest_db._fetch_basic_http_async = replay_fetch
+    ingest_db._create_http_client = lambda: _ReplayHTTPClient()
+    ingest_db.analyze_clip_relevance_only = replay_gpt
+    gpt_analysis.analyze_clip_relevance_only_async = replay_gpt_async
+
+def _replay_loans(fixture: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{
+        'work_order': loan['work_order'],
+        'make': loan['make'],
+        'model': loan['model'],
+        'urls': [u['url'] for u in loan['urls']],
+    } for loan in fixture['loans']]
+
+async def run_baseline(loans, db, run_id) -> int:
+    """The previous engine: whole loans pushed through asyncio.to_thread behind MAX_CONCURRENT."""
+    semaphore = asyncio.Semaphore(BASELINE_MAX_CONCURRENT)
+
+    async def one(loan):
+        async with semaphore:
+            # The old wrapper made its retry/store DB calls directly on the event loop
+            if not ingest_db._check_retry_or_record_skip(db, loan['work_order'], run_id):
+                return False
+            result = await asyncio.to_thread(ingest_db.process_loan_for_database, loan, run_id)
+            return ingest_db._store_loan_outcome(db, loan, result, run_id)
+
+    results = await asyncio.gather(*(one(loan) for loan in loans))
+    return sum(1 for r in results if r is True)
+
+async def run_engine(loans, db, run_id) -> int:
+    stats = await ingest_db.process_loans_database_concurrent(loans, db, run_id)
+    return stats['processed']
+
+def time_engine(name, runner, fixture, scale) -> float:
+    db = ReplayDatabase(fixture['db_latency'] * scale)
+    database_module.get_database = lambda: db
+    loans = _replay_loans(fixture)
+    start = time.perf_counter()
+    processed = asyncio.run(runner(loans, db, 'benchmark-run'))
+    elapsed = (time.perf_counter() - start) / scale
+    loans_per_minute = len(loans) / elapsed * 60 if elapsed else 0.0
+    print(f"{name:<28} {processed:>5} loans  {elapsed:>9.1f}s  {loans_per_minute:>9.1f} loans/min")
+    return loans_per_minute
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare loans/minute of the async ingest engine vs the old to_thread wrapper',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('--record', action='store_true', help='Record a fixture from real crawls')
+    parser.add_argument('--input', type=str, help='Loans CSV/Excel file to record from')
+    parser.add_argument('--url', type=str, help='Loans CSV URL to record from')
+    parser.add_argument('--limit', type=int, default=20, help='Loans to record')
+    parser.add_argument('--fixture', type=str, help='Fixture JSON path (written by --record, read otherwise)')
+    parser.add_argument('--synthetic', type=int, help='Replay N synthetic loans instead of a fixture')
+    parser.add_argument('--seed', type=int, default=42, help='Seed for --synthetic')
+    parser.add_argument('--db-latency', type=float, default=0.08, help='Supabase round trip in seconds')
+    parser.add_argument('--time-scale', type=float, default=1.0,
+                        help='Multiply all replayed latencies (e.g. 0.1 runs 10x faster)')
+    args = parser.parse_args()
+
+    if args.record:
+        if not (args.fixture and (args.input or args.url)):
+            parser.error('--record requires --fixture and --input or --url')
+        fixture = record_fixture(args)
+        with open(args.fixture, 'w') as f:
+            json.dump(fixture, f, indent=2)
+        print(f"✅ Recorded {len(fixture['loans'])} loans to {args.fixture}")
+        return 0
+
+    if args.synthetic:
+        fixture = synthetic_fixture(args.synthetic, args.seed, args.db_latency)
+    elif args.fixture:
+        with open(args.fixture) as f:
+            fixture = json.load(f)
+    else:
+        parser.error('pass --fixture or --synthetic')
+
+    install_replay(fixture, args.time_scale)
+    url_count = sum(len(loan['urls']) for loan in fixture['loans'])
+    print(f"📊 Replaying {len(fixture['loans'])} loans / {url_count} URLs "
+          f"(time scale {args.time_scale}, MAX_INFLIGHT_LOANS={ingest_db.MAX_INFLIGHT_LOANS}, "
+          f"INGEST_CRAWL_THREADS={ingest_db.INGEST_CRAWL_THREADS})")
+    baseline = time_engine(f"to_thread (max {BASELINE_MAX_CONCURRENT})", run_baseline, fixture, args.time_scale)
+    engine = time_engine("native async engine", run_engine, fixture, args.time_scale)
+    if baseline:
+        print(f"Speedup: {engine / baseline:.1f}x")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
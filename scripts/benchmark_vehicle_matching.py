@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Benchmark article-link relevance scans: the old per-link substring loops vs
+the compiled VehicleMatcher used by Index Page Discovery.
+
+Before, every call to _find_relevant_articles regenerated the variations and
+then, per link, ran `any(variation in text)` over the whole list for the URL
+and the title plus a `next(...)` scan for the matched variation. After, the
+variations are compiled once per make/model into trie-shaped regexes and each
+text is scanned in one pass.
+
+Links come from the article link index (data/article_link_index.db, filled by
+Index Page Discovery) when it exists, padded with synthetic review-style URLs
+up to --links so large index pages can be simulated. Both paths must agree on
+every link's score; any mismatch is reported.
+
+Usage:
+    python scripts/benchmark_vehicle_matching.py
+    python scripts/benchmark_vehicle_matching.py --links 20000 --repeat 5
+    python scripts/benchmark_vehicle_matching.py --vehicle "Mazda:CX-70" --vehicle "Toyota:GR Corolla Premium"
+"""
+
+import sys
+import os
+import random
+import sqlite3
+import argparse
+import statistics
+import time
+from typing import List, Tuple
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.model_variations import generate_model_variations
+from src.utils.vehicle_matcher import get_vehicle_matcher, split_base_and_variant
+
+DEFAULT_INDEX_DB = os.path.join('data', 'article_link_index.db')
+DEFAULT_VEHICLES = [
+    'Mazda:CX-70', 'Toyota:Crown Signia Limited', 'Lexus:ES 350', 'Hyundai:Kona Limited AWD',
+    'Toyota:GR Corolla Premium', 'BMW:3 Series', 'Honda:Accord Hybrid Touring', 'Ford:F-150 Raptor',
+]
+SYNTHETIC_MAKES = ['mazda', 'toyota', 'lexus', 'hyundai', 'honda', 'ford', 'bmw', 'kia', 'subaru', 'nissan']
+SYNTHETIC_MODELS = ['cx-50', 'cx-90', 'camry', 'rav4', 'es-350', 'tucson', 'civic', 'bronco', 'x5', 'telluride',
+                    'outback', 'rogue', 'crown', 'kona', 'accord', 'f-150', 'corolla', 'mx-5-miata']
+SYNTHETIC_WORDS = ['review', 'first-drive', 'road-test', 'long-term', 'comparison', 'news', 'price', 'specs',
+                   'interior', 'towing', 'recall', 'best-suvs', 'deals', 'ev', 'hybrid', 'limited', 'touring']
+
+def title_from_url(url: str) -> str:
+    """Same title slug as EnhancedCrawlerManager._extract_title_from_url"""
+    parts = [p for p in urlparse(url).path.split('/') if p]
+    return parts[-1].replace('-', ' ').replace('_', ' ').title() if parts else "Unknown Article"
+
+def load_links(index_db: str, count: int, seed: int) -> List[str]:
+    links = []
+    if index_db and os.path.exists(index_db):
+        conn = sqlite3.connect(index_db)
+        links = [row[0] for row in conn.execute('SELECT url FROM article_links LIMIT ?', (count,))]
+        conn.close()
+    rng = random.Random(seed)
+    while len(links) < count:
+        year = rng.choice(['2023', '2024', '2025', '2026'])
+        slug = '-'.join([year, rng.choice(SYNTHETIC_MAKES), rng.choice(SYNTHETIC_MODELS)]
+                        + rng.sample(SYNTHETIC_WORDS, 2))
+        section = rng.choice(['reviews', 'news', f"blog/post/{rng.randint(10**6, 10**7)}"])
+        links.append(f"https://www.example-outlet.com/{section}/{slug}")
+    return links
+
+def link_texts(links: List[str]) -> List[Tuple[str, str]]:
+    """(url_lower, title_lower) per link - computed the same way on both paths, so kept out of the timing"""
+    return [(url.lower(), title_from_url(url).lower()) for url in links]
+
+def legacy_scores(texts: List[Tuple[str, str]], make: str, model: str) -> List[int]:
+    """The pre-matcher _find_relevant_articles scoring loop (debug logging stripped)"""
+    make_lower = make.lower()
+    base_model, variant = split_base_and_variant(model.lower())
+    model_variations = generate_model_variations(make, model)
+    year_variations = []
+    for year in [2025, 2024, 2023]:
+        for variation in model_variations[:5]:
+            year_variations.extend([f"{year} {variation}", f"{variation} {year}"])
+    model_variations.extend(year_variations)
+    model_variations = list(set([v.lower() for v in model_variations if v.strip()]))
+
+    scores = []
+    for url_lower, title_lower in texts:
+        has_make = make_lower in url_lower or make_lower in title_lower
+        has_full_model = (any(v in url_lower for v in model_variations)
+                          or any(v in title_lower for v in model_variations))
+        _ = next((v for v in model_variations if v in url_lower or v in title_lower), None)
+        has_base_model = base_model in url_lower or base_model in title_lower
+        has_variant = bool(variant) and (variant in url_lower or variant in title_lower)
+        if has_make and has_full_model:
+            score = 1000
+        elif has_full_model:
+            score = 800
+        elif has_make and has_base_model and has_variant:
+            score = 700
+        elif has_base_model and has_variant:
+            score = 600
+        elif has_make and has_base_model:
+            score = 500
+        elif has_base_model:
+            score = 300
+        else:
+            score = 0
+        scores.append(score)
+    return scores
+
+def compiled_scores(texts: List[Tuple[str, str]], make: str, model: str) -> List[int]:
+    matcher = get_vehicle_matcher(make, model)
+    scores = []
+    for url_lower, title_lower in texts:
+        url_scan = matcher.scan(url_lower)
+        title_scan = matcher.scan(title_lower)
+        scores.append(matcher.tier(url_scan, title_scan)[0])
+    return scores
+
+def _time(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare article-link scan time before/after the compiled vehicle matcher',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('--links', type=int, default=5000, help='Links per scan (default: 5000)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per vehicle (median is reported)')
+    parser.add_argument('--vehicle', action='append', help='Make:Model to scan for (repeatable)')
+    parser.add_argument('--index-db', type=str, default=DEFAULT_INDEX_DB,
+                        help=f'Article link index to read real links from (default: {DEFAULT_INDEX_DB})')
+    parser.add_argument('--seed', type=int, default=7, help='Seed for the synthetic links')
+    args = parser.parse_args()
+
+    vehicles: List[Tuple[str, str]] = [tuple(v.split(':', 1)) for v in (args.vehicle or DEFAULT_VEHICLES)]
+    links = load_links(args.index_db, args.links, args.seed)
+    texts = link_texts(links)
+    print(f"📊 {len(links)} links, {len(vehicles)} vehicles, {args.repeat} runs each")
+    print(f"{'vehicle':<34} {'before':>10} {'after':>10} {'speedup':>8}   (ms per 1,000 links)")
+
+    mismatches = 0
+    before_all, after_all = [], []
+    for make, model in vehicles:
+        get_vehicle_matcher.cache_clear()
+        # Only the first compiled run pays for building the matcher, like the first loan on an outlet
+        before = statistics.median(_time(lambda: legacy_scores(texts, make, model)) for _ in range(args.repeat))
+        after = statistics.median(_time(lambda: compiled_scores(texts, make, model)) for _ in range(args.repeat))
+        if legacy_scores(texts, make, model) != compiled_scores(texts, make, model):
+            mismatches += 1
+            print(f"❌ Score mismatch for {make} {model}")
+        per_k_before = before * 1000 / len(links) * 1000
+        per_k_after = after * 1000 / len(links) * 1000
+        before_all.append(per_k_before)
+        after_all.append(per_k_after)
+        label = f"{make} {model}"[:34]
+        print(f"{label:<34} {per_k_before:>10.2f} {per_k_after:>10.2f} {per_k_before / per_k_after:>7.1f}x")
+
+    mean_before, mean_after = statistics.mean(before_all), statistics.mean(after_all)
+    print(f"{'mean':<34} {mean_before:>10.2f} {mean_after:>10.2f} {mean_before / mean_after:>7.1f}x")
+    if mismatches:
+        print(f"❌ {mismatches} vehicles scored differently")
+        return 1
+    print("✅ Identical scores on every link")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the OpenAI Batch API, for exercising the sentiment batch path
+(src/analysis/sentiment_batch.py) without an API key or a 24h completion window.
+
+Implements the endpoints OpenAIBatchClient uses - POST /v1/files, POST /v1/batches,
+GET /v1/batches/{id}, POST /v1/batches/{id}/cancel, GET /v1/files/{id}/content -
+in memory. A batch reports in_progress for --delay seconds (request_counts climb
+linearly) and then completes with one canned enhanced-sentiment response per
+request; --fail-every N turns every Nth request into an error line.
+
+Usage:
+    python scripts/openai_batch_stub_server.py --port 8765 --delay 30 --fail-every 10
+
+    # Then point the worker (sentiment_analysis jobs with batch_mode) at it
+    export OPENAI_BATCH_BASE_URL=http://127.0.0.1:8765/v1 SENTIMENT_BATCH_CHECK_SECONDS=10
+
+    # Submit a JSONL file against the stub and print the parsed output
+    python scripts/openai_batch_stub_server.py --self-test
+"""
+
+import sys
+import os
+import json
+import time
+import uuid
+import argparse
+import threading
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CANNED_ANALYSIS = {
+    'sentiment_classification': {
+        'overall': 'positive',
+        'confidence': 0.8,
+        'rationale': 'Stub review: the reviewer is broadly positive about the vehicle.',
+    },
+    'key_features_mentioned': [
+        {'feature': 'Fuel economy', 'sentiment': 'positive', 'quote': 'returned impressive mileage'},
+        {'feature': 'Infotainment', 'sentiment': 'neutral', 'quote': 'works, but the screen is small'},
+    ],
+    'brand_attributes_captured': [
+        {'attribute': 'Reliability', 'sentiment': 'reinforced', 'evidence': 'praised build quality'},
+    ],
+    'purchase_drivers': [
+        {'reason': 'Value', 'sentiment': 'positive', 'strength': 'primary', 'quote': 'a lot of car for the money'},
+    ],
+    'competitive_context': {'direct_comparisons': ['Rival: roomier but slower'], 'market_positioning': 'Value leader'},
+    'trim_level_mentioned': False,
+    'trim_impact_score': 0.0,
+    'trim_highlights': None,
+}
+
+class StubState:
+    def __init__(self, delay: float, fail_every: int):
+        self.delay = delay
+        self.fail_every = fail_every
+        self.lock = threading.RLock()  # view() builds the output files while holding it
+        self.files: Dict[str, bytes] = {}
+        self.batches: Dict[str, Dict[str, Any]] = {}
+
+    def add_file(self, content: bytes) -> str:
+        file_id = f"file-{uuid.uuid4().hex[:24]}"
+        with self.lock:
+            self.files[file_id] = content
+        return file_id
+
+    def _output(self, batch: Dict[str, Any]):
+        """Build the output/error files once the batch is due"""
+        lines, errors = [], []
+        requests = [json.loads(line) for line in self.files[batch['input_file_id']].decode().splitlines() if line.strip()]
+        for index, request in enumerate(requests, start=1):
+            if self.fail_every and index % self.fail_every == 0:
+                errors.append(json.dumps({
+                    'id': f"batch_req_{index}", 'custom_id': request['custom_id'], 'response': None,
+                    'error': {'code': 'stub_error', 'message': 'Injected failure'},
+                }))
+                continue
+            prompt = request['body']['messages'][0]['content']
+            lines.append(json.dumps({
+                'id': f"batch_req_{index}",
+                'custom_id': request['custom_id'],
+                'response': {'status_code': 200, 'body': {
+                    'id': f"chatcmpl-{uuid.uuid4().hex[:12]}",
+                    'object': 'chat.completion',
+                    'model': request['body']['model'],
+                    'choices': [{'index': 0, 'finish_reason': 'stop',
+                                 'message': {'role': 'assistant', 'content': json.dumps(CANNED_ANALYSIS)}}],
+                    'usage': {'prompt_tokens': len(prompt) // 4, 'completion_tokens': 400,
+                              'total_tokens': len(prompt) // 4 + 400},
+                }},
+                'error': None,
+            }))
+        batch['output_file_id'] = self.add_file(('\n'.join(lines) + '\n').encode()) if lines else None
+        batch['error_file_id'] = self.add_file(('\n'.join(errors) + '\n').encode()) if errors else None
+        batch['request_counts'] = {'total': len(requests), 'completed': len(lines), 'failed': len(errors)}
+
+    def view(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            batch = self.batches.get(batch_id)
+            if batch is None:
+                return None
+            if batch['status'] == 'in_progress':
+                elapsed = time.time() - batch['created_at']
+                total = batch['request_counts']['total']
+                if elapsed >= self.delay:
+                    batch['status'] = 'completed'
+                    batch['completed_at'] = int(time.time())
+                    self._output(batch)
+                else:
+                    batch['request_counts']['completed'] = int(total * elapsed / self.delay) if self.delay else total
+            return dict(batch)
+
+class StubHandler(BaseHTTPRequestHandler):
+    state: StubState = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, payload, content_type: str = 'application/json'):
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+    def do_POST(self):
+        parts = self.path.strip('/').split('/')
+        if parts == ['v1', 'files']:
+            message = BytesParser(policy=HTTP).parsebytes(
+                f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode() + self._body())
+            uploads = [part for part in message.iter_parts() if part.get_param('name', header='content-disposition') == 'file']
+            if not uploads:
+                return self._send(400, {'error': {'message': 'missing file'}})
+            content = uploads[0].get_payload(decode=True)
+            file_id = self.state.add_file(content)
+            return self._send(200, {'id': file_id, 'object': 'file', 'bytes': len(content), 'purpose': 'batch'})
+        if parts == ['v1', 'batches']:
+            request = json.loads(self._body())
+            if request.get('input_file_id') not in self.state.files:
+                return self._send(404, {'error': {'message': 'unknown input file'}})
+            total = sum(1 for line in self.state.files[request['input_file_id']].splitlines() if line.strip())
+            batch = {
+                'id': f"batch_{uuid.uuid4().hex[:24]}",
+                'object': 'batch',
+                'endpoint': request.get('endpoint'),
+                'input_file_id': request['input_file_id'],
+                'completion_window': request.get('completion_window'),
+                'status': 'in_progress',
+                'created_at': time.time(),
+                'output_file_id': None,
+                'error_file_id': None,
+                'errors': None,
+                'metadata': request.get('metadata') or {},
+                'request_counts': {'total': total, 'completed': 0, 'failed': 0},
+            }
+            with self.state.lock:
+                self.state.batches[batch['id']] = batch
+            return self._send(200, dict(batch))
+        if len(parts) == 4 and parts[:2] == ['v1', 'batches'] and parts[3] == 'cancel':
+            with self.state.lock:
+                batch = self.state.batches.get(parts[2])
+                if batch is not None and batch['status'] == 'in_progress':
+                    batch['status'] = 'cancelled'
+            if batch is None:
+                return self._send(404, {'error': {'message': 'unknown batch'}})
+            return self._send(200, dict(batch))
+        self._send(404, {'error': {'message': f"unknown endpoint {self.path}"}})
+
+    def do_GET(self):
+        parts = self.path.strip('/').split('/')
+        if len(parts) == 3 and parts[:2] == ['v1', 'batches']:
+            batch = self.state.view(parts[2])
+            return self._send(200, batch) if batch else self._send(404, {'error': {'message': 'unknown batch'}})
+        if len(parts) == 4 and parts[:2] == ['v1', 'files'] and parts[3] == 'content':
+            content = self.state.files.get(parts[2])
+            if content is None:
+                return self._send(404, {'error': {'message': 'unknown file'}})
+            return self._send(200, content, 'application/jsonl')
+        self._send(404, {'error': {'message': f"unknown endpoint {self.path}"}})
+
+def start_server(port: int, delay: float, fail_every: int) -> ThreadingHTTPServer:
+    StubHandler.state = StubState(delay, fail_every)
+    server = ThreadingHTTPServer(('127.0.0.1', port), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def self_test(port: int, requests: int) -> int:
+    """Round-trip a JSONL file through the stub with OpenAIBatchClient"""
+    import asyncio
+    import tempfile
+    from src.utils.openai_batch import (
+        OpenAIBatchClient, chat_request_line, parse_output_lines, completion_text, TERMINAL_STATUSES
+    )
+
+    async def run():
+        with tempfile.NamedTemporaryFile('w', suffix='.jsonl', delete=False) as f:
+            for index in range(requests):
+                f.write(chat_request_line(f"clip-{index}", 'gpt-4-turbo', f"Analyze review {index}") + '\n')
+        async with OpenAIBatchClient(api_key='stub', base_url=f"http://127.0.0.1:{port}/v1") as client:
+            file_id = await client.upload_file(f.name)
+            batch = await client.create_batch(file_id)
+            while batch.get('status') not in TERMINAL_STATUSES:
+                await asyncio.sleep(0.5)
+                batch = await client.get_batch(batch['id'])
+            ok = failed = 0
+            for file_key in ('output_file_id', 'error_file_id'):
+                if batch.get(file_key):
+                    for custom_id, body, error in parse_output_lines(await client.file_content(batch[file_key])):
+                        if error:
+                            failed += 1
+                        else:
+                            json.loads(completion_text(body))
+                            ok += 1
+        os.unlink(f.name)
+        print(f"📊 {ok} responses, {failed} errors for {requests} requests")
+        return 0 if ok + failed == requests else 1
+
+    return asyncio.run(run())
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Local stand-in for the OpenAI Batch API',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('--port', type=int, default=8765, help='Port to listen on (default: 8765)')
+    parser.add_argument('--delay', type=float, default=5.0, help='Seconds until a batch completes (default: 5)')
+    parser.add_argument('--fail-every', type=int, default=0, help='Make every Nth request fail (default: never)')
+    parser.add_argument('--self-test', action='store_true', help='Round-trip a generated JSONL file and exit')
+    parser.add_argument('--requests', type=int, default=20, help='Requests in the --self-test file (default: 20)')
+    args = parser.parse_args()
+
+    server = start_server(args.port, 1.0 if args.self_test else args.delay, args.fail_every)
+    if args.self_test:
+        try:
+            return self_test(args.port, args.requests)
+        finally:
+            server.shutdown()
+
+    print(f"✅ Batch API stub listening on http://127.0.0.1:{args.port}/v1 "
+          f"(batches complete after {args.delay:.0f}s)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
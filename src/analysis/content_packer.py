@@ -0,0 +1,362 @@
+"""
+Token-budgeted content packing for the sentiment prompts.
+
+analyze_clip, analyze_clip_enhanced and the v1 analyzer used to send
+`content[:12000]`: long transcripts lost their conclusions (the verdict is at the
+end), and long articles spent the budget on navigation, share bars and
+newsletter boxes. pack_content instead:
+
+1. sends content that fits CONTENT_TOKEN_BUDGET unchanged;
+2. strips boilerplate lines (menus, cookie/subscribe/share prompts, repeated
+   lines) and sends the result if it now fits;
+3. for very long transcripts (over CONTENT_MAP_REDUCE_TOKENS), summarizes
+   chunks in parallel with a cheap model (map) and joins the summaries (reduce);
+4. otherwise keeps the passages with the highest make/model mention density
+   (compiled VehicleMatcher) - plus the opening and closing passages and any
+   pros/cons lists - in their original order until the budget is spent.
+
+Tokens are counted with tiktoken when it is installed, else estimated at ~4
+characters per token like the rest of the GPT bookkeeping.
+"""
+
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, NamedTuple, Optional
+
+import openai
+
+from src.utils.logger import setup_logger
+from src.utils.gpt_memo import get_gpt_memo, prompt_version, estimate_tokens, response_tokens
+from src.utils.openai_dispatcher import get_openai_dispatcher, estimate_request_tokens
+from src.utils.vehicle_matcher import get_vehicle_matcher
+
+logger = setup_logger(__name__)
+
+# ~12000 characters - the size of the flat cut the analyzers used to send, so
+# packing changes what is sent rather than how much
+CONTENT_TOKEN_BUDGET = int(os.environ.get('CONTENT_TOKEN_BUDGET', '3000'))
+# Transcripts above this many tokens (after stripping) are chunk-summarized; 0 disables
+CONTENT_MAP_REDUCE_TOKENS = int(os.environ.get('CONTENT_MAP_REDUCE_TOKENS', '9000'))
+CONTENT_SUMMARY_CHUNK_TOKENS = int(os.environ.get('CONTENT_SUMMARY_CHUNK_TOKENS', '3000'))
+CONTENT_SUMMARY_WORKERS = int(os.environ.get('CONTENT_SUMMARY_WORKERS', '4'))
+CONTENT_SUMMARY_MODEL = os.environ.get('CONTENT_SUMMARY_MODEL', 'gpt-3.5-turbo')
+
+# Passages are paragraphs, or windows of this many tokens for unbroken transcripts
+PASSAGE_TOKENS = 150
+GAP_MARKER = "\n[...]\n"
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding('cl100k_base')
+except ImportError:
+    _ENCODING = None
+
+def count_tokens(text: Optional[str]) -> int:
+    if not text:
+        return 0
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text, disallowed_special=()))
+    return estimate_tokens(text)
+
+class PackedContent(NamedTuple):
+    text: str
+    tokens_in: int
+    tokens_out: int
+    strategy: str  # full, stripped, selected or summarized
+
+# ---------------------------------------------------------------------------
+# Boilerplate stripping
+# ---------------------------------------------------------------------------
+
+_BOILERPLATE = re.compile(
+    r'\b(?:subscribe|newsletter|sign up|sign in|log in|cookie|privacy policy|terms of (?:use|service)|'
+    r'all rights reserved|advertisement|sponsored|share (?:this|on)|follow us|related (?:articles|stories|posts)|'
+    r'read more|click here|skip to (?:main )?content|back to top|comments? \(\d+\)|leave a (?:reply|comment))\b',
+    re.IGNORECASE,
+)
+_SENTENCE_END = re.compile(r'[.!?]["\')\]]?\s*$')
+# Headings of the lists that carry a review's verdict - never treated as menus
+_KEY_HEADING = re.compile(
+    r'^(?:pros|cons|highs|lows|likes|dislikes|the good|the bad|what we like|what we don.t like|'
+    r'verdict|the verdict|bottom line|conclusion|final thoughts)\b',
+    re.IGNORECASE | re.MULTILINE,
+)
+_BULLET = re.compile(r'^(?:[-*\u2022\u2013>]|\d+[.)])\s')
+
+def _is_short_line(line: str) -> bool:
+    """Menu-item shaped: a few words, no sentence punctuation, no digits, no bullet marker"""
+    return (len(line.split()) <= 4 and not _SENTENCE_END.search(line) and not re.search(r'\d', line)
+            and not _BULLET.match(line))
+
+def strip_boilerplate(text: str) -> str:
+    """
+    Drop navigation/boilerplate lines: repeated lines, short lines matching a
+    boilerplate phrase, and menu-like runs of 3+ short lines. A run only counts
+    as a menu when it sits before the first or after the last prose line, or
+    next to boilerplate; runs between prose paragraphs (feature lists) and runs
+    headed "Pros"/"Cons"/"Verdict" are kept.
+    """
+    lines = []  # (kind, text) with kind blank/boilerplate/short/prose
+    drop = set()  # repeated lines - still counted as part of a menu run
+    seen = set()
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            lines.append(('blank', ''))
+            continue
+        key = stripped.lower()
+        if key in seen and len(stripped) < 200:
+            drop.add(len(lines))
+        seen.add(key)
+        if len(stripped.split()) <= 25 and _BOILERPLATE.search(stripped):
+            lines.append(('boilerplate', stripped))
+        elif _is_short_line(stripped):
+            lines.append(('short', stripped))
+        else:
+            lines.append(('prose', stripped))
+
+    prose = [index for index, (kind, _) in enumerate(lines) if kind == 'prose' and index not in drop]
+    first_prose, last_prose = (prose[0], prose[-1]) if prose else (len(lines), -1)
+
+    def neighbour(index: int, step: int) -> Optional[str]:
+        index += step
+        while 0 <= index < len(lines) and lines[index][0] == 'blank':
+            index += step
+        return lines[index][0] if 0 <= index < len(lines) else None
+
+    index = 0
+    while index < len(lines):
+        if lines[index][0] != 'short':
+            index += 1
+            continue
+        end = index
+        while end + 1 < len(lines) and lines[end + 1][0] == 'short':
+            end += 1
+        run = lines[index:end + 1]
+        at_edge = end < first_prose or index > last_prose
+        near_boilerplate = 'boilerplate' in (neighbour(index, -1), neighbour(end, 1))
+        # A couple of short lines are headings; longer runs at the edges or beside boilerplate are menus
+        if (len(run) > 2 and (at_edge or near_boilerplate)
+                and not any(_KEY_HEADING.match(line) for _, line in run)):
+            drop.update(range(index, end + 1))
+        index = end + 1
+
+    kept = [line for index, (kind, line) in enumerate(lines) if kind != 'boilerplate' and index not in drop]
+    return re.sub(r'\n{3,}', '\n\n', '\n'.join(kept)).strip()
+
+# ---------------------------------------------------------------------------
+# Passage selection
+# ---------------------------------------------------------------------------
+
+def _paragraphs(text: str) -> List[str]:
+    """Lines, with runs of short/bulleted lines (feature and pros/cons lists) kept together"""
+    paragraphs, run = [], []
+    for line in text.split('\n'):
+        line = line.strip()
+        if line and (_is_short_line(line) or _BULLET.match(line) or len(line.split()) <= 8):
+            run.append(line)
+            continue
+        if run:
+            paragraphs.append('\n'.join(run))
+            run = []
+        if line:
+            paragraphs.append(line)
+    if run:
+        paragraphs.append('\n'.join(run))
+    return paragraphs
+
+def split_passages(text: str, passage_tokens: int = PASSAGE_TOKENS) -> List[str]:
+    """Paragraphs, with long paragraphs (and unbroken transcripts) cut into ~passage_tokens sentence windows"""
+    passages = []
+    for paragraph in _paragraphs(text):
+        if count_tokens(paragraph) <= passage_tokens * 2:
+            passages.append(paragraph)
+            continue
+        window, window_tokens = [], 0
+        for sentence in re.split(r'(?<=[.!?])\s+', paragraph):
+            window.append(sentence)
+            window_tokens += count_tokens(sentence)
+            if window_tokens >= passage_tokens:
+                passages.append(' '.join(window))
+                window, window_tokens = [], 0
+        if window:
+            passages.append(' '.join(window))
+    return passages
+
+def select_passages(text: str, make: str, model: str, budget_tokens: int) -> str:
+    """
+    Keep the opening and closing passages plus the passages with the highest
+    make/model mention density, in original order, within budget_tokens.
+    """
+    passages = split_passages(text)
+    if not passages:
+        return text
+    matcher = get_vehicle_matcher(make, model)
+    tokens = [count_tokens(passage) for passage in passages]
+    density = [matcher.mentions(passage.lower()) / max(count, 1) for passage, count in zip(passages, tokens)]
+
+    # Introduction, verdict and pros/cons lists first, then by density (earlier passages win ties)
+    order = [0, len(passages) - 1] if len(passages) > 1 else [0]
+    middle = range(1, len(passages) - 1)
+    order += [index for index in middle if _KEY_HEADING.search(passages[index])]
+    order += sorted((index for index in middle if index not in order), key=lambda index: -density[index])
+
+    gap_tokens = count_tokens(GAP_MARKER)
+    chosen, used = [], 0
+    for index in order:
+        cost = tokens[index] + gap_tokens
+        if used + cost > budget_tokens:
+            continue
+        chosen.append(index)
+        used += cost
+
+    if not chosen:
+        # Even the opening passage is over budget - fall back to a hard cut
+        return _cut_to_tokens(passages[0], budget_tokens)
+
+    # Per-passage counts can undershoot the joined text slightly; drop the
+    # lowest-priority passages until it really fits
+    packed = _join_passages(passages, chosen)
+    while len(chosen) > 1 and count_tokens(packed) > budget_tokens:
+        chosen.pop()
+        packed = _join_passages(passages, chosen)
+    return packed
+
+def _join_passages(passages: List[str], chosen: List[int]) -> str:
+    """Chosen passages in original order, with a gap marker where passages were skipped"""
+    parts, previous = [], -1
+    for index in sorted(chosen):
+        if parts and index != previous + 1:
+            parts.append(GAP_MARKER.strip())
+        parts.append(passages[index])
+        previous = index
+    return '\n\n'.join(parts)
+
+def _cut_to_tokens(text: str, budget_tokens: int) -> str:
+    if _ENCODING is not None:
+        return _ENCODING.decode(_ENCODING.encode(text, disallowed_special=())[:budget_tokens]) + "..."
+    return text[:budget_tokens * 4] + "..."
+
+# ---------------------------------------------------------------------------
+# Map-reduce summarization of long transcripts
+# ---------------------------------------------------------------------------
+
+CHUNK_SUMMARY_PROMPT = """Below is one part of a longer {content_type} about the {make} {model}.
+
+Condense it to at most {max_words} words for a later sentiment analysis of the {make} {model}. Keep:
+- every opinion, verdict and recommendation about the vehicle, with short direct quotes
+- features, specs, prices and trims that are discussed, and whether they are praised or criticized
+- comparisons with competitors
+Drop greetings, sponsor reads, channel promotion and anything unrelated to the vehicle.
+Write plain prose in the reviewer's voice, no preamble.
+
+Part {part} of {parts}:
+{chunk}"""
+
+CHUNK_SUMMARY_VERSION = prompt_version('chunk-summary', CHUNK_SUMMARY_PROMPT)
+
+def _chunks(text: str, chunk_tokens: int) -> List[str]:
+    chunks, current, current_tokens = [], [], 0
+    for passage in split_passages(text):
+        passage_tokens = count_tokens(passage)
+        if current and current_tokens + passage_tokens > chunk_tokens:
+            chunks.append('\n'.join(current))
+            current, current_tokens = [], 0
+        current.append(passage)
+        current_tokens += passage_tokens
+    if current:
+        chunks.append('\n'.join(current))
+    return chunks
+
+def summarize_chunk(chunk: str, make: str, model: str, part: int, parts: int, max_words: int,
+                    content_type: str = "video transcript") -> Optional[str]:
+    """One map step (memoized); None if the call fails"""
+    memo = get_gpt_memo()
+    memo_model = f"{model} part {part}/{parts} {max_words}w"
+    memoized = memo.get(CHUNK_SUMMARY_VERSION, CONTENT_SUMMARY_MODEL, make, memo_model, chunk)
+    if memoized is not None:
+        return memoized.get('summary')
+
+    prompt = CHUNK_SUMMARY_PROMPT.format(content_type=content_type, make=make, model=model,
+                                         max_words=max_words, part=part, parts=parts, chunk=chunk)
+    max_tokens = max_words * 2
+    try:
+        openai.api_key = os.environ.get('OPENAI_API_KEY')
+        with get_openai_dispatcher().acquire(estimate_request_tokens(prompt, max_tokens),
+                                              model=CONTENT_SUMMARY_MODEL) as lease:
+            response = openai.ChatCompletion.create(
+                model=CONTENT_SUMMARY_MODEL,
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=max_tokens,
+                temperature=0.2,
+                request_timeout=60
+            )
+            lease.record(response, prompt)
+        summary = response.choices[0].message.content.strip()
+    except Exception as e:
+        logger.warning(f"⚠️ Chunk summary {part}/{parts} failed: {e}")
+        return None
+    memo.put(CHUNK_SUMMARY_VERSION, CONTENT_SUMMARY_MODEL, make, memo_model, chunk,
+             {'summary': summary}, response_tokens(response, prompt))
+    return summary
+
+def map_reduce_summary(text: str, make: str, model: str, budget_tokens: int) -> Optional[str]:
+    """
+    Summarize chunks of text in parallel and join the summaries in order so they
+    fit budget_tokens. None if any chunk fails (callers fall back to selection).
+    """
+    chunks = _chunks(text, CONTENT_SUMMARY_CHUNK_TOKENS)
+    # Leave room for the part markers; ~0.75 words per token
+    max_words = max(60, int((budget_tokens - 20 * len(chunks)) / len(chunks) * 0.75))
+    logger.info(f"📝 Summarizing {len(chunks)} chunks of a {count_tokens(text)}-token transcript for "
+                f"{make} {model} (≤{max_words} words each)")
+    with ThreadPoolExecutor(max_workers=min(CONTENT_SUMMARY_WORKERS, len(chunks))) as pool:
+        summaries = list(pool.map(
+            lambda args: summarize_chunk(args[1], make, model, args[0], len(chunks), max_words),
+            enumerate(chunks, start=1)))
+    if any(summary is None for summary in summaries):
+        return None
+    reduced = '\n\n'.join(f"[Part {part} of {len(chunks)}] {summary}"
+                          for part, summary in enumerate(summaries, start=1))
+    if count_tokens(reduced) > budget_tokens:
+        reduced = select_passages(reduced, make, model, budget_tokens)
+    return reduced
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def pack_content(content: str, make: str, model: str, budget_tokens: int = CONTENT_TOKEN_BUDGET,
+                 transcript: bool = False, summarize: bool = True) -> PackedContent:
+    """
+    Fit content into budget_tokens for a sentiment prompt.
+
+    Args:
+        content: Extracted article text or transcript
+        make: Vehicle make
+        model: Vehicle model
+        budget_tokens: Token budget for the content part of the prompt
+        transcript: Content is a video transcript (eligible for map-reduce summaries)
+        summarize: Allow GPT chunk summaries (False keeps packing local)
+    """
+    tokens_in = count_tokens(content)
+    if tokens_in <= budget_tokens:
+        return PackedContent(content, tokens_in, tokens_in, 'full')
+
+    text = strip_boilerplate(content)
+    tokens = count_tokens(text)
+    strategy = 'stripped'
+    if tokens > budget_tokens:
+        packed = None
+        if summarize and transcript and CONTENT_MAP_REDUCE_TOKENS and tokens > CONTENT_MAP_REDUCE_TOKENS:
+            packed = map_reduce_summary(text, make, model, budget_tokens)
+            strategy = 'summarized'
+        if packed is None:
+            packed = select_passages(text, make, model, budget_tokens)
+            strategy = 'selected'
+        text = packed
+        tokens = count_tokens(text)
+
+    logger.info(f"Packed content from {tokens_in} to {tokens} tokens ({strategy}, budget {budget_tokens})")
+    return PackedContent(text, tokens_in, tokens, strategy)
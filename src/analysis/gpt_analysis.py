@@ -1,6 +1,7 @@
 import os
 import json
 import time
+import asyncio
 from typing import Dict, Any, Optional, Tuple, List
 import re
 
@@ -9,12 +10,38 @@ from dotenv import load_dotenv
 
 # Import local modules
 from src.utils.logger import setup_logger
-from src.utils.rate_limiter import rate_limiter
 from src.utils.content_extractor import extract_article_content
-from src.utils.openai_semaphore import openai_semaphore
+from src.utils.openai_dispatcher import get_openai_dispatcher, estimate_request_tokens
+from src.utils.gpt_memo import get_gpt_memo, prompt_version, response_tokens
+from src.analysis.content_packer import pack_content
 
 logger = setup_logger(__name__)
 
+# Relevance-only prompt built in _prepare_relevance_request
+RELEVANCE_PROMPT = """
+    Analyze this automotive content for relevance to the {make} {model}.
+    
+    Content: {content_excerpt}
+    
+    IMPORTANT CONTEXT:
+    - Reviewers sometimes misspeak or make errors when referring to vehicle names
+    - If the content mentions "{model}" or variations like "{model_lower}", it's likely about that vehicle
+    - Look for context clues - if they're discussing features/aspects of a "{model}", score it as relevant
+    - Example: If someone says "CX-5" but then refers to it as "CX-90", they likely mean CX-90
+    
+    Rate relevance on a scale of 0-10 where:
+    - 0: No mention of the vehicle at all
+    - 1-3: Brief mention only
+    - 4-6: Some discussion of the vehicle
+    - 7-8: Substantial coverage of the vehicle (THIS IS THE MINIMUM if the content is a review of the {make} {model})
+    - 9-10: Comprehensive review or detailed analysis
+    
+    CRITICAL: If this appears to be a review or detailed discussion of the {make} {model} (even if the reviewer misspoke initially), the score MUST be at least 7.
+    
+    Respond with ONLY a JSON object: {{"relevance_score": <number>}}
+    """
+RELEVANCE_PROMPT_VERSION = prompt_version('relevance', RELEVANCE_PROMPT)
+
 def get_openai_key() -> Optional[str]:
     """
     Get the OpenAI API key from environment variables.
@@ -323,11 +350,8 @@ def analyze_clip(content: str, make: str, model: str, max_retries: int = 3, url:
             else:
                 logger.warning("Failed to extract article text from HTML. Using raw content.")
     
-    # Truncate content if it's too long
-    max_content_length = 12000  # Increased for more comprehensive analysis
-    if len(content) > max_content_length:
-        logger.info(f"Truncating content from {len(content)} to {max_content_length} characters")
-        content = content[:max_content_length] + "..."
+    # Fit content to the token budget (boilerplate stripped, most on-topic passages kept)
+    content = pack_content(content, make, model, transcript=bool(is_youtube)).text
     
     # Log content excerpt for debugging
     content_excerpt = content[:500] + "..." if len(content) > 500 else content
@@ -426,19 +450,22 @@ def analyze_clip(content: str, make: str, model: str, max_retries: int = 3, url:
         content_length=len(content)
     )
     
+    memo = get_gpt_memo()
+    memo_version = prompt_version('clip-youtube' if is_youtube else 'clip-article', prompt_template)
+    memoized = memo.get(memo_version, "gpt-4-turbo", make, model, content)
+    if memoized is not None:
+        return memoized
+    
     logger.info(f"Making enhanced GPT analysis call to OpenAI API (attempt 1/{max_retries})")
     
     # Set API key for older OpenAI client version
     openai.api_key = api_key
     
-    # Apply rate limiting before API calls
-    rate_limiter.wait_if_needed('openai.com')
-    
     for attempt in range(max_retries):
         try:
             # Use the older OpenAI client format (compatible with openai==0.27.0)
-            # Acquire semaphore to limit concurrent API calls
-            with openai_semaphore.acquire():
+            # The dispatcher budgets RPM/TPM and limits concurrent API calls
+            with get_openai_dispatcher().acquire(estimate_request_tokens(prompt, 2000), model="gpt-4-turbo") as lease:
                 response = openai.ChatCompletion.create(
                     model="gpt-4-turbo",
                     messages=[
@@ -451,6 +478,7 @@ def analyze_clip(content: str, make: str, model: str, max_retries: int = 3, url:
                     temperature=0.3,
                     request_timeout=120
                 )
+                lease.record(response, prompt)
             
             # Extract response content
             response_content = response.choices[0].message.content.strip()
@@ -471,6 +499,8 @@ def analyze_clip(content: str, make: str, model: str, max_retries: int = 3, url:
                         logger.warning(f"Content excerpt sent to GPT: {content[:500]}...")
                         logger.warning(f"GPT reasoning: {analysis_result.get('summary', 'No summary provided')}")
                     
+                    memo.put(memo_version, "gpt-4-turbo", make, model, content,
+                             analysis_result, response_tokens(response, prompt))
                     return analysis_result
                 else:
                     logger.error("Parsed result doesn't have expected structure")
@@ -504,30 +534,21 @@ def analyze_clip(content: str, make: str, model: str, max_retries: int = 3, url:
 #     """
 #     pass
 
-def analyze_clip_relevance_only(content: str, make: str, model: str, video_title: str = None) -> Dict[str, Any]:
+def _prepare_relevance_request(content: str, make: str, model: str, video_title: str = None) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
     """
-    Analyze content for relevance only (no sentiment analysis) to save costs.
-    This function mirrors the OLD system's GPT analysis but skips sentiment scoring.
+    Build the relevance-only prompt, or short-circuit without calling GPT.
+    
+    Shared by the sync and async relevance entry points so both send the
+    exact same prompt.
     
-    Args:
-        content: Article or video transcript content
-        make: Vehicle make
-        model: Vehicle model
-        video_title: Optional video title for additional context
-        
     Returns:
-        Dictionary with relevance_score only, or None if analysis fails
+        Tuple of (shortcut_result, prompt). When shortcut_result is not None
+        the caller should return it directly and skip the API call.
     """
-    api_key = get_openai_key()
-    
-    if not api_key:
-        logger.error("No OpenAI API key found. Cannot analyze content.")
-        return None
-
     # Basic content validation
     if not content or len(content.strip()) < 100:
         logger.warning("Content too short for relevance analysis")
-        return {'relevance_score': 0}
+        return {'relevance_score': 0}, None
     
     # SHORTCUT: If title (video or article) clearly indicates it's about the target vehicle, bypass GPT
     if video_title:
@@ -550,7 +571,7 @@ def analyze_clip_relevance_only(content: str, make: str, model: str, video_title
                 # Still check content to make sure it's substantial
                 if len(content) >= 1000:  # Substantial content
                     logger.info(f"✅ Returning high relevance (8) based on title match and substantial content")
-                    return {'relevance_score': 8}
+                    return {'relevance_score': 8}, None
                 break
     
     # Extract a more representative sample of the content
@@ -587,40 +608,98 @@ def analyze_clip_relevance_only(content: str, make: str, model: str, video_title
         logger.warning(f"⚠️ Excerpt may not contain {make} {model} - might be too early in content")
     
     # Simple relevance-only prompt
-    prompt = f"""
-    Analyze this automotive content for relevance to the {make} {model}.
+    prompt = RELEVANCE_PROMPT.format(make=make, model=model, model_lower=model_lower,
+                                     content_excerpt=content_excerpt)
     
-    Content: {content_excerpt}
+    return None, prompt
+
+def _parse_relevance_response(response_content: str, label: str = "") -> Dict[str, Any]:
+    """
+    Parse a relevance-only GPT response into {'relevance_score': n}.
     
-    IMPORTANT CONTEXT:
-    - Reviewers sometimes misspeak or make errors when referring to vehicle names
-    - If the content mentions "{model}" or variations like "{model_lower}", it's likely about that vehicle
-    - Look for context clues - if they're discussing features/aspects of a "{model}", score it as relevant
-    - Example: If someone says "CX-5" but then refers to it as "CX-90", they likely mean CX-90
+    Args:
+        response_content: Raw text returned by the model
+        label: Optional suffix for log lines (e.g. " (fallback)")
+    """
+    try:
+        # Try to extract JSON from response
+        if '{' in response_content and '}' in response_content:
+            json_start = response_content.find('{')
+            json_end = response_content.rfind('}') + 1
+            json_str = response_content[json_start:json_end]
+            result = json.loads(json_str)
+            
+            relevance_score = result.get('relevance_score', 0)
+            logger.info(f"✅ Relevance analysis successful{label}: {relevance_score}/10")
+            return {'relevance_score': relevance_score}
+        else:
+            # Try to extract number from response
+            relevance_match = re.search(r'(\d+)', response_content)
+            if relevance_match:
+                relevance_score = int(relevance_match.group(1))
+                logger.info(f"✅ Extracted relevance score from text{label}: {relevance_score}/10")
+                return {'relevance_score': relevance_score}
+            else:
+                logger.warning(f"Could not extract relevance score from response{label}")
+                return {'relevance_score': 0}
+                
+    except Exception as e:
+        logger.error(f"Error parsing relevance response{label}: {e}")
+        return {'relevance_score': 0}
+
+def _is_quota_error(error_msg: str) -> bool:
+    """Check if an OpenAI error looks like a quota/billing/rate limit problem"""
+    return any(x in error_msg.lower() for x in ['quota', 'billing', 'rate', 'limit', 'tpm', 'rpm'])
+
+def _memoize_relevance(memo, make: str, model: str, content: str, result: Dict[str, Any], response, prompt: str):
+    """
+    Memoize a gpt-4-turbo relevance result. A score of 0 is also what parse
+    failures return, so it is never memoized; gpt-3.5 fallback results are
+    not either, so the clip gets a proper gpt-4 score next time.
+    """
+    if result and result.get('relevance_score'):
+        memo.put(RELEVANCE_PROMPT_VERSION, "gpt-4-turbo", make, model, content,
+                 result, response_tokens(response, prompt))
+
+def analyze_clip_relevance_only(content: str, make: str, model: str, video_title: str = None) -> Dict[str, Any]:
+    """
+    Analyze content for relevance only (no sentiment analysis) to save costs.
+    This function mirrors the OLD system's GPT analysis but skips sentiment scoring.
     
-    Rate relevance on a scale of 0-10 where:
-    - 0: No mention of the vehicle at all
-    - 1-3: Brief mention only
-    - 4-6: Some discussion of the vehicle
-    - 7-8: Substantial coverage of the vehicle (THIS IS THE MINIMUM if the content is a review of the {make} {model})
-    - 9-10: Comprehensive review or detailed analysis
+    Args:
+        content: Article or video transcript content
+        make: Vehicle make
+        model: Vehicle model
+        video_title: Optional video title for additional context
+        
+    Returns:
+        Dictionary with relevance_score only, or None if analysis fails
+    """
+    api_key = get_openai_key()
     
-    CRITICAL: If this appears to be a review or detailed discussion of the {make} {model} (even if the reviewer misspoke initially), the score MUST be at least 7.
+    if not api_key:
+        logger.error("No OpenAI API key found. Cannot analyze content.")
+        return None
+
+    shortcut_result, prompt = _prepare_relevance_request(content, make, model, video_title)
+    if shortcut_result is not None:
+        return shortcut_result
     
-    Respond with ONLY a JSON object: {{"relevance_score": <number>}}
-    """
+    memo = get_gpt_memo()
+    memoized = memo.get(RELEVANCE_PROMPT_VERSION, "gpt-4-turbo", make, model, content)
+    if memoized is not None:
+        return memoized
     
     # Set API key for older OpenAI client version
     openai.api_key = api_key
     
-    # Apply rate limiting before API calls
-    rate_limiter.wait_if_needed('openai.com')
+    dispatcher = get_openai_dispatcher()
     
     try:
         logger.info(f"Making relevance-only GPT call for {make} {model}")
         
-        # Acquire semaphore to limit concurrent API calls
-        with openai_semaphore.acquire():
+        # The dispatcher budgets RPM/TPM and limits concurrent API calls
+        with dispatcher.acquire(estimate_request_tokens(prompt, 100), model="gpt-4-turbo") as lease:
             response = openai.ChatCompletion.create(
                 model="gpt-4-turbo",
                 messages=[{"role": "user", "content": prompt}],
@@ -628,51 +707,25 @@ def analyze_clip_relevance_only(content: str, make: str, model: str, video_title
                 temperature=0.1,
                 request_timeout=30
             )
+            lease.record(response, prompt)
         
         response_content = response.choices[0].message.content.strip()
         logger.info(f"GPT relevance response: {response_content}")
         
-        # Parse the response
-        try:
-            import json
-            # Try to extract JSON from response
-            if '{' in response_content and '}' in response_content:
-                json_start = response_content.find('{')
-                json_end = response_content.rfind('}') + 1
-                json_str = response_content[json_start:json_end]
-                result = json.loads(json_str)
-                
-                relevance_score = result.get('relevance_score', 0)
-                logger.info(f"✅ Relevance analysis successful: {relevance_score}/10")
-                return {'relevance_score': relevance_score}
-            else:
-                # Try to extract number from response
-                relevance_match = re.search(r'(\d+)', response_content)
-                if relevance_match:
-                    relevance_score = int(relevance_match.group(1))
-                    logger.info(f"✅ Extracted relevance score from text: {relevance_score}/10")
-                    return {'relevance_score': relevance_score}
-                else:
-                    logger.warning("Could not extract relevance score from response")
-                    return {'relevance_score': 0}
-                    
-        except Exception as e:
-            logger.error(f"Error parsing relevance response: {e}")
-            return {'relevance_score': 0}
+        result = _parse_relevance_response(response_content)
+        _memoize_relevance(memo, make, model, content, result, response, prompt)
+        return result
             
     except Exception as e:
         error_msg = str(e)
         logger.error(f"Error in relevance analysis: {e}")
         
         # Check if it's a quota/billing/rate limit error
-        if any(x in error_msg.lower() for x in ['quota', 'billing', 'rate', 'limit', 'tpm', 'rpm']):
+        if _is_quota_error(error_msg):
             logger.warning("Quota/billing issue detected - falling back to gpt-3.5-turbo")
             try:
-                # Apply rate limiting for fallback attempt
-                rate_limiter.wait_if_needed('openai.com')
-                
-                # Retry with cheaper model with semaphore
-                with openai_semaphore.acquire():
+                # Retry with cheaper model through the dispatcher
+                with dispatcher.acquire(estimate_request_tokens(prompt, 100), model="gpt-3.5-turbo") as lease:
                     response = openai.ChatCompletion.create(
                         model="gpt-3.5-turbo",
                         messages=[{"role": "user", "content": prompt}],
@@ -680,35 +733,12 @@ def analyze_clip_relevance_only(content: str, make: str, model: str, video_title
                         temperature=0.1,
                         request_timeout=30
                     )
+                    lease.record(response, prompt)
                 
                 response_content = response.choices[0].message.content.strip()
                 logger.info(f"GPT relevance response (fallback model): {response_content}")
                 
-                # Parse the response (same logic as above)
-                try:
-                    import json
-                    if '{' in response_content and '}' in response_content:
-                        json_start = response_content.find('{')
-                        json_end = response_content.rfind('}') + 1
-                        json_str = response_content[json_start:json_end]
-                        result = json.loads(json_str)
-                        
-                        relevance_score = result.get('relevance_score', 0)
-                        logger.info(f"✅ Relevance analysis successful (fallback): {relevance_score}/10")
-                        return {'relevance_score': relevance_score}
-                    else:
-                        # Try to extract number from response
-                        relevance_match = re.search(r'(\d+)', response_content)
-                        if relevance_match:
-                            relevance_score = int(relevance_match.group(1))
-                            logger.info(f"✅ Extracted relevance score from text (fallback): {relevance_score}/10")
-                            return {'relevance_score': relevance_score}
-                        else:
-                            logger.warning("Could not extract relevance score from fallback response")
-                            return {'relevance_score': 0}
-                except Exception as parse_error:
-                    logger.error(f"Error parsing fallback relevance response: {parse_error}")
-                    return {'relevance_score': 0}
+                return _parse_relevance_response(response_content, label=" (fallback)")
                     
             except Exception as fallback_error:
                 logger.error(f"Fallback model also failed: {fallback_error}")
@@ -716,6 +746,65 @@ def analyze_clip_relevance_only(content: str, make: str, model: str, video_title
         
         return {'relevance_score': 0}
 
+async def analyze_clip_relevance_only_async(content: str, make: str, model: str, video_title: str = None) -> Dict[str, Any]:
+    """
+    Async twin of analyze_clip_relevance_only for the native async ingest engine.
+    
+    Uses openai.ChatCompletion.acreate so the event loop is never blocked while
+    waiting on the API. Prompt, shortcut and parsing logic are shared with the
+    sync version.
+    
+    Returns:
+        Dictionary with relevance_score only, or None if analysis fails
+    """
+    api_key = get_openai_key()
+    
+    if not api_key:
+        logger.error("No OpenAI API key found. Cannot analyze content.")
+        return None
+
+    shortcut_result, prompt = _prepare_relevance_request(content, make, model, video_title)
+    if shortcut_result is not None:
+        return shortcut_result
+    
+    memo = get_gpt_memo()
+    memoized = await asyncio.to_thread(memo.get, RELEVANCE_PROMPT_VERSION, "gpt-4-turbo", make, model, content)
+    if memoized is not None:
+        return memoized
+    
+    openai.api_key = api_key
+    
+    dispatcher = get_openai_dispatcher()
+    
+    for model_name, label in (("gpt-4-turbo", ""), ("gpt-3.5-turbo", " (fallback)")):
+        try:
+            logger.info(f"Making async relevance-only GPT call for {make} {model} ({model_name})")
+            async with dispatcher.async_acquire(estimate_request_tokens(prompt, 100), model=model_name) as lease:
+                response = await openai.ChatCompletion.acreate(
+                    model=model_name,
+                    messages=[{"role": "user", "content": prompt}],
+                    max_tokens=100,
+                    temperature=0.1,
+                    request_timeout=30
+                )
+                lease.record(response, prompt)
+            
+            response_content = response.choices[0].message.content.strip()
+            logger.info(f"GPT relevance response{label}: {response_content}")
+            result = _parse_relevance_response(response_content, label=label)
+            if not label:
+                await asyncio.to_thread(_memoize_relevance, memo, make, model, content, result, response, prompt)
+            return result
+            
+        except Exception as e:
+            logger.error(f"Error in async relevance analysis{label}: {e}")
+            # Only quota/rate problems on the primary model fall through to gpt-3.5
+            if label or not _is_quota_error(str(e)):
+                return {'relevance_score': 0}
+            logger.warning("Quota/billing issue detected - falling back to gpt-3.5-turbo")
+    
+    return {'relevance_score': 0}
+
 def _create_fallback_analysis(content: str, make: str, model: str) -> Dict[str, Any]:
     """
     Create a fallback analysis when GPT response parsing fails.
@@ -837,18 +926,17 @@ class GPTAnalyzer:
             logger.info(f"Truncating content from {len(content)} to {max_content_chars} characters")
             content = content[:max_content_chars] + "..."
         
-        # Apply rate limiting
-        rate_limiter.wait_if_needed('openai.com')
-        
         # Prepare the system message
         system_message = self._create_system_prompt(vehicle_make, vehicle_model)
+        dispatcher = get_openai_dispatcher()
+        request_tokens = estimate_request_tokens(system_message + content)
         
         # Try the API call with retries
         attempt = 0
         while attempt < max_retries:
             try:
-                # Acquire semaphore to limit concurrent API calls
-                with openai_semaphore.acquire():
+                # The dispatcher budgets RPM/TPM and limits concurrent API calls
+                with dispatcher.acquire(request_tokens, model=self.model) as lease:
                     response = openai.ChatCompletion.create(
                         model=self.model,
                         messages=[
@@ -858,6 +946,7 @@ class GPTAnalyzer:
                         timeout=timeout,
                         temperature=0.1,  # Low temperature for more deterministic responses
                     )
+                    lease.record(response, system_message + content)
                 
                 # Extract and parse the response
                 result = self._parse_gpt_response(response)
@@ -872,7 +961,7 @@ class GPTAnalyzer:
                 if 'gpt-4' in self.model.lower():
                     logger.info("Falling back to gpt-3.5-turbo due to rate limit")
                     try:
-                        with openai_semaphore.acquire():
+                        with dispatcher.acquire(request_tokens, model="gpt-3.5-turbo-16k") as lease:
                             response = openai.ChatCompletion.create(
                                 model="gpt-3.5-turbo-16k",
                                 messages=[
@@ -882,6 +971,7 @@ class GPTAnalyzer:
                                 timeout=timeout,
                                 temperature=0.1,
                             )
+                            lease.record(response, system_message + content)
                         result = self._parse_gpt_response(response)
                         logger.info(f"Successfully analyzed with fallback model for {vehicle_make} {vehicle_model}")
                         return result
@@ -909,7 +999,7 @@ class GPTAnalyzer:
                 if any(x in error_msg.lower() for x in ['quota', 'billing', 'exceeded']):
                     logger.warning("Quota/billing issue detected - trying fallback to gpt-3.5-turbo")
                     try:
-                        with openai_semaphore.acquire():
+                        with dispatcher.acquire(request_tokens, model="gpt-3.5-turbo-16k") as lease:
                             response = openai.ChatCompletion.create(
                                 model="gpt-3.5-turbo-16k",
                                 messages=[
@@ -919,6 +1009,7 @@ class GPTAnalyzer:
                                 timeout=timeout,
                                 temperature=0.1,
                             )
+                            lease.record(response, system_message + content)
                         result = self._parse_gpt_response(response)
                         logger.info(f"Successfully analyzed with fallback model after quota error")
                         return result
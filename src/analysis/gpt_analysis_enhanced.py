@@ -1,7 +1,7 @@
 import os
 import json
 import time
-from typing import Dict, Any, Optional, Tuple, List
+from typing import Dict, Any, Optional, Tuple, List, NamedTuple
 import re
 
 import openai
@@ -17,9 +17,11 @@ else:
 
 # Import local modules
 from src.utils.logger import setup_logger
-from src.utils.rate_limiter import rate_limiter
 from src.utils.content_extractor import extract_article_content
-from src.utils.openai_semaphore import openai_semaphore
+from src.utils.openai_dispatcher import get_openai_dispatcher, estimate_request_tokens
+from src.utils.gpt_memo import get_gpt_memo, prompt_version, response_tokens
+from src.analysis.content_packer import pack_content
+from src.analysis.gpt_analysis import _is_quota_error
 
 logger = setup_logger(__name__)
 
@@ -177,7 +179,6 @@ def parse_json_with_fallbacks(response_text: str) -> dict:
     logger.error("All JSON parsing strategies failed. Returning None.")
     return None
 
-
 def analyze_clip_enhanced_with_special_char_stripping(content: str, make: str, model: str, year: str = None, trim: str = None, max_retries: int = 3, url: str = None) -> Dict[str, Any]:
     """
     Strategy 5: Try analysis with special characters stripped from content.
@@ -228,28 +229,87 @@ def analyze_clip_enhanced_with_special_char_stripping(content: str, make: str, m
     # Try the analysis with cleaned content
     return analyze_clip_enhanced(cleaned_content, make, model, year, trim, max_retries, url)
 
-def analyze_clip_enhanced(content: str, make: str, model: str, year: str = None, trim: str = None, max_retries: int = 3, url: str = None) -> Dict[str, Any]:
+def _truncate_content(content: str, make: str, model: str, is_youtube: bool = False, summarize: bool = True) -> str:
+    """Fit content to what the enhanced prompt sends (CONTENT_TOKEN_BUDGET, see content_packer)"""
+    return pack_content(content, make, model, transcript=bool(is_youtube), summarize=summarize).text
+
+def _finalize_enhanced_result(analysis_result: Dict[str, Any], vehicle_identifier: str, content_type: str) -> Dict[str, Any]:
     """
-    Analyze a clip using the enhanced Message Pull-Through Analysis prompt.
+    Add the backward compatibility fields to a parsed enhanced analysis (in place).
+    Shared by the primary/fallback model paths and the combined ingest call.
+    """
+    # Add backward compatibility fields for existing system
+    analysis_result['vehicle_identifier'] = vehicle_identifier
+    analysis_result['content_type'] = content_type
+    
+    # Map new sentiment to old format for compatibility
+    sentiment_map = {
+        'very_positive': 'positive',
+        'positive': 'positive',
+        'neutral': 'neutral',
+        'negative': 'negative',
+        'very_negative': 'negative'
+    }
+    
+    overall_sentiment = analysis_result.get('sentiment_classification', {}).get('overall', 'neutral')
+    analysis_result['overall_sentiment'] = sentiment_map.get(overall_sentiment, 'neutral')
+    
+    # Calculate relevance score based on content depth
+    features_count = len(analysis_result.get('key_features_mentioned', []))
+    attributes_count = len(analysis_result.get('brand_attributes_captured', []))
+    drivers_count = len(analysis_result.get('purchase_drivers', []))
+    trim_mentioned = analysis_result.get('trim_level_mentioned', False)
+    trim_impact = analysis_result.get('trim_impact_score', 0.0)
+    
+    # Relevance scoring: more extracted elements = higher relevance
+    relevance_score = min(10, max(1, 
+        3 + # Base score for mentioning the vehicle
+        min(4, features_count) + # Up to 4 points for features
+        min(2, attributes_count) + # Up to 2 points for brand attributes
+        min(1, drivers_count) + # Up to 1 point for purchase drivers
+        (1 if trim_mentioned and trim_impact > 0.5 else 0) # Bonus point for significant trim discussion
+    ))
+    
+    analysis_result['relevance_score'] = relevance_score
+    
+    # Add summary for backward compatibility
+    sentiment_summary = analysis_result.get('sentiment_classification', {}).get('rationale', '')
+    analysis_result['summary'] = sentiment_summary
+    
+    # Brand alignment based on sentiment of brand attributes
+    brand_sentiments = [attr.get('sentiment', 'neutral') for attr in analysis_result.get('brand_attributes_captured', [])]
+    positive_brand = sum(1 for s in brand_sentiments if s == 'reinforced')
+    negative_brand = sum(1 for s in brand_sentiments if s == 'challenged')
+    analysis_result['brand_alignment'] = positive_brand > negative_brand
+    
+    # Ensure trim fields are present even if not in response
+    if 'trim_level_mentioned' not in analysis_result:
+        analysis_result['trim_level_mentioned'] = False
+    if 'trim_impact_score' not in analysis_result:
+        analysis_result['trim_impact_score'] = 0.0
+    if 'trim_highlights' not in analysis_result:
+        analysis_result['trim_highlights'] = None
+    
+    return analysis_result
+
+class EnhancedRequest(NamedTuple):
+    """A formatted enhanced-analysis prompt and what is needed to finalize/memoize its response"""
+    prompt: str
+    content: str  # extracted, truncated content the prompt was built from
+    vehicle_identifier: str
+    content_type: str
+    memo_model: str
+
+def prepare_enhanced_request(content: str, make: str, model: str, year: str = None, trim: str = None,
+                             url: str = None, summarize: bool = True) -> Optional[EnhancedRequest]:
+    """
+    Extract, truncate and quality-check content and format the enhanced prompt.
+    Shared by analyze_clip_enhanced and the sentiment Batch API path (which passes
+    summarize=False: interactive chunk summaries would undo the batch discount).
     
-    Args:
-        content: Article or video transcript content (HTML or text)
-        make: Vehicle make
-        model: Vehicle model
-        year: Vehicle year (optional)
-        trim: Vehicle trim level (optional)
-        max_retries: Maximum number of retry attempts
-        url: URL of the content (for HTML extraction and content type detection)
-        
     Returns:
-        Dictionary with enhanced analysis results for Message Pull-Through
+        EnhancedRequest, or None if the content is unusable (raw HTML with no text)
     """
-    api_key = get_openai_key()
-    
-    if not api_key:
-        logger.error("No OpenAI API key found. Cannot analyze content - skipping analysis.")
-        return None
-
     # Detect content type based on URL or content characteristics
     is_youtube = url and ('youtube.com' in url or 'youtu.be' in url)
     content_type = "YouTube Video Transcript" if is_youtube else "Web Article"
@@ -272,10 +332,7 @@ def analyze_clip_enhanced(content: str, make: str, model: str, year: str = None,
                 logger.warning("Failed to extract article text from HTML. Using raw content.")
     
     # Truncate content if it's too long
-    max_content_length = 12000  # Increased for more comprehensive analysis
-    if len(content) > max_content_length:
-        logger.info(f"Truncating content from {len(content)} to {max_content_length} characters")
-        content = content[:max_content_length] + "..."
+    content = _truncate_content(content, make, model, is_youtube, summarize)
     
     # Pre-filters to save OpenAI costs (but skip for approved clips)
     # Filter 1: Content Length Check (skip for approved clips - they're already vetted)
@@ -338,18 +395,67 @@ def analyze_clip_enhanced(content: str, make: str, model: str, year: str = None,
         content=content
     )
     
+    # Year and trim are part of the prompt, so they are part of the memo key too
+    memo_model = " ".join(filter(None, [str(year) if year else None, model, trim]))
+    return EnhancedRequest(prompt, content, vehicle_identifier, content_type, memo_model)
+    
+
+def enhanced_memo_version() -> str:
+    return prompt_version('enhanced', ENHANCED_SENTIMENT_PROMPT)
+
+def parse_enhanced_response(response_content: str, request: EnhancedRequest) -> Optional[Dict[str, Any]]:
+    """Parse an enhanced-analysis response and add the backward compatibility fields; None if unparseable"""
+    analysis_result = parse_json_with_fallbacks(response_content.strip())
+    if not analysis_result:
+        return None
+    return _finalize_enhanced_result(analysis_result, request.vehicle_identifier, request.content_type)
+
+def analyze_clip_enhanced(content: str, make: str, model: str, year: str = None, trim: str = None, max_retries: int = 3, url: str = None) -> Dict[str, Any]:
+    """
+    Analyze a clip using the enhanced Message Pull-Through Analysis prompt.
+    
+    Args:
+        content: Article or video transcript content (HTML or text)
+        make: Vehicle make
+        model: Vehicle model
+        year: Vehicle year (optional)
+        trim: Vehicle trim level (optional)
+        max_retries: Maximum number of retry attempts
+        url: URL of the content (for HTML extraction and content type detection)
+        
+    Returns:
+        Dictionary with enhanced analysis results for Message Pull-Through
+    """
+    api_key = get_openai_key()
+    
+    if not api_key:
+        logger.error("No OpenAI API key found. Cannot analyze content - skipping analysis.")
+        return None
+    
+    request = prepare_enhanced_request(content, make, model, year, trim, url)
+    if request is None:
+        return None
+    prompt, content, vehicle_identifier, content_type, memo_model = request
+    
+    memo = get_gpt_memo()
+    memo_version = enhanced_memo_version()
+    memoized = memo.get(memo_version, "gpt-4-turbo", make, memo_model, content)
+    if memoized is not None:
+        memoized['content_type'] = content_type
+        return memoized
+    
     logger.info(f"Making enhanced Message Pull-Through analysis call to OpenAI API (attempt 1/{max_retries})")
     
     # Set API key for older OpenAI client version
     openai.api_key = api_key
     
-    # Apply rate limiting before API calls
-    rate_limiter.wait_if_needed('openai.com')
+    dispatcher = get_openai_dispatcher()
+    request_tokens = estimate_request_tokens(prompt, 2000)
     
     for attempt in range(max_retries):
         try:
-            # Acquire semaphore to limit concurrent API calls
-            with openai_semaphore.acquire():
+            # The dispatcher budgets RPM/TPM and limits concurrent API calls
+            with dispatcher.acquire(request_tokens, model="gpt-4-turbo") as lease:
                 # Use the older OpenAI client format (compatible with openai==0.27.0)
                 response = openai.ChatCompletion.create(
                     model="gpt-4-turbo",
@@ -363,6 +469,7 @@ def analyze_clip_enhanced(content: str, make: str, model: str, year: str = None,
                     temperature=0.3,
                     request_timeout=120
                 )
+                lease.record(response, prompt)
             
             # Extract response content
             response_content = response.choices[0].message.content.strip()
@@ -374,58 +481,10 @@ def analyze_clip_enhanced(content: str, make: str, model: str, year: str = None,
             if analysis_result:
                 logger.info(f"Successfully analyzed content with enhanced prompt: sentiment={analysis_result.get('sentiment_classification', {}).get('overall', 'N/A')}")
                 
-                # Add backward compatibility fields for existing system
-                analysis_result['vehicle_identifier'] = vehicle_identifier
-                analysis_result['content_type'] = content_type
-                
-                # Map new sentiment to old format for compatibility
-                sentiment_map = {
-                    'very_positive': 'positive',
-                    'positive': 'positive',
-                    'neutral': 'neutral',
-                    'negative': 'negative',
-                    'very_negative': 'negative'
-                }
-                
-                overall_sentiment = analysis_result.get('sentiment_classification', {}).get('overall', 'neutral')
-                analysis_result['overall_sentiment'] = sentiment_map.get(overall_sentiment, 'neutral')
-                
-                # Calculate relevance score based on content depth
-                features_count = len(analysis_result.get('key_features_mentioned', []))
-                attributes_count = len(analysis_result.get('brand_attributes_captured', []))
-                drivers_count = len(analysis_result.get('purchase_drivers', []))
-                trim_mentioned = analysis_result.get('trim_level_mentioned', False)
-                trim_impact = analysis_result.get('trim_impact_score', 0.0)
-                
-                # Relevance scoring: more extracted elements = higher relevance
-                relevance_score = min(10, max(1, 
-                    3 + # Base score for mentioning the vehicle
-                    min(4, features_count) + # Up to 4 points for features
-                    min(2, attributes_count) + # Up to 2 points for brand attributes
-                    min(1, drivers_count) + # Up to 1 point for purchase drivers
-                    (1 if trim_mentioned and trim_impact > 0.5 else 0) # Bonus point for significant trim discussion
-                ))
-                
-                analysis_result['relevance_score'] = relevance_score
-                
-                # Add summary for backward compatibility
-                sentiment_summary = analysis_result.get('sentiment_classification', {}).get('rationale', '')
-                analysis_result['summary'] = sentiment_summary
-                
-                # Brand alignment based on sentiment of brand attributes
-                brand_sentiments = [attr.get('sentiment', 'neutral') for attr in analysis_result.get('brand_attributes_captured', [])]
-                positive_brand = sum(1 for s in brand_sentiments if s == 'reinforced')
-                negative_brand = sum(1 for s in brand_sentiments if s == 'challenged')
-                analysis_result['brand_alignment'] = positive_brand > negative_brand
-                
-                # Ensure trim fields are present even if not in response
-                if 'trim_level_mentioned' not in analysis_result:
-                    analysis_result['trim_level_mentioned'] = False
-                if 'trim_impact_score' not in analysis_result:
-                    analysis_result['trim_impact_score'] = 0.0
-                if 'trim_highlights' not in analysis_result:
-                    analysis_result['trim_highlights'] = None
+                _finalize_enhanced_result(analysis_result, vehicle_identifier, content_type)
                 
+                memo.put(memo_version, "gpt-4-turbo", make, memo_model, content,
+                         analysis_result, response_tokens(response, prompt))
                 return analysis_result
             else:
                 logger.error("Failed to parse enhanced analysis response")
@@ -439,11 +498,8 @@ def analyze_clip_enhanced(content: str, make: str, model: str, year: str = None,
             if any(x in error_msg.lower() for x in ['quota', 'billing', 'rate', 'limit', 'tpm', 'rpm']):
                 logger.warning("Quota/billing issue detected - falling back to gpt-3.5-turbo")
                 try:
-                    # Apply rate limiting for fallback attempt
-                    rate_limiter.wait_if_needed('openai.com')
-                    
-                    # Retry with cheaper model with semaphore
-                    with openai_semaphore.acquire():
+                    # Retry with cheaper model through the dispatcher
+                    with dispatcher.acquire(request_tokens, model="gpt-3.5-turbo-16k") as lease:
                         response = openai.ChatCompletion.create(
                             model="gpt-3.5-turbo-16k",  # Use 16k for longer content
                             messages=[
@@ -456,6 +512,7 @@ def analyze_clip_enhanced(content: str, make: str, model: str, year: str = None,
                             temperature=0.3,
                             request_timeout=120
                         )
+                        lease.record(response, prompt)
                     
                     # Process response same as above
                     response_content = response.choices[0].message.content.strip()
@@ -471,47 +528,7 @@ def analyze_clip_enhanced(content: str, make: str, model: str, year: str = None,
                     
                     if analysis_result:
                         # Add same processing as successful response above
-                        features_count = len(analysis_result.get('key_features_mentioned', []))
-                        attributes_count = len(analysis_result.get('brand_attributes_captured', []))
-                        drivers_count = len(analysis_result.get('purchase_drivers', []))
-                        trim_mentioned = analysis_result.get('trim_level_mentioned', False)
-                        trim_impact = analysis_result.get('trim_impact_score', 0.0)
-                        
-                        relevance_score = min(10, max(1, 
-                            3 + min(4, features_count) + min(2, attributes_count) + min(1, drivers_count) +
-                            (1 if trim_mentioned and trim_impact > 0.5 else 0)
-                        ))
-                        
-                        analysis_result['relevance_score'] = relevance_score
-                        analysis_result['summary'] = analysis_result.get('sentiment_classification', {}).get('rationale', '')
-                        analysis_result['vehicle_identifier'] = vehicle_identifier
-                        analysis_result['content_type'] = content_type
-                        
-                        # Map new sentiment to old format for compatibility
-                        sentiment_map = {
-                            'very_positive': 'positive',
-                            'positive': 'positive',
-                            'neutral': 'neutral',
-                            'negative': 'negative',
-                            'very_negative': 'negative'
-                        }
-                        overall_sentiment = analysis_result.get('sentiment_classification', {}).get('overall', 'neutral')
-                        analysis_result['overall_sentiment'] = sentiment_map.get(overall_sentiment, 'neutral')
-                        
-                        brand_sentiments = [attr.get('sentiment', 'neutral') for attr in analysis_result.get('brand_attributes_captured', [])]
-                        positive_brand = sum(1 for s in brand_sentiments if s == 'reinforced')
-                        negative_brand = sum(1 for s in brand_sentiments if s == 'challenged')
-                        analysis_result['brand_alignment'] = positive_brand > negative_brand
-                        
-                        # Ensure trim fields are present even if not in response
-                        if 'trim_level_mentioned' not in analysis_result:
-                            analysis_result['trim_level_mentioned'] = False
-                        if 'trim_impact_score' not in analysis_result:
-                            analysis_result['trim_impact_score'] = 0.0
-                        if 'trim_highlights' not in analysis_result:
-                            analysis_result['trim_highlights'] = None
-                        
-                        return analysis_result
+                        return _finalize_enhanced_result(analysis_result, vehicle_identifier, content_type)
                 except Exception as fallback_error:
                     logger.error(f"Fallback model also failed: {fallback_error}")
             
@@ -520,8 +537,6 @@ def analyze_clip_enhanced(content: str, make: str, model: str, year: str = None,
                 wait_time = 2 ** attempt
                 logger.info(f"Retrying in {wait_time} seconds...")
                 time.sleep(wait_time)
-                # Apply rate limiting before retry
-                rate_limiter.wait_if_needed('openai.com')
             else:
                 logger.error(f"Failed after {max_retries} attempts, cannot analyze content")
                 return None
@@ -658,4 +673,126 @@ Remember: The goal is to understand if reviewers are highlighting trim-specific
 Return ONLY valid JSON matching the specified format."""
 
 # Keep the original analyze_clip function for backward compatibility
-analyze_clip = analyze_clip_enhanced  # Alias for easy migration
\ No newline at end of file
+# Relevance gate prepended to the enhanced prompt for the combined ingest call
+COMBINED_RELEVANCE_PREAMBLE = """# Relevance Check
+
+Before the sentiment analysis below, rate how relevant the content is to the {make} {model} on a scale of 0-10:
+- 0: No mention of the vehicle at all
+- 1-3: Brief mention only
+- 4-6: Some discussion of the vehicle
+- 7-8: Substantial coverage of the vehicle (THIS IS THE MINIMUM if the content is a review of the {make} {model})
+- 9-10: Comprehensive review or detailed analysis
+
+Reviewers sometimes misspeak vehicle names - if they discuss features/aspects of a "{model}", score it as relevant.
+
+Add the rating to the JSON output below as a top-level "vehicle_relevance_score" field.
+If the rating is 0, return ONLY {{"vehicle_relevance_score": 0}} and skip the analysis.
+
+"""
+
+def analyze_clip_combined(content: str, make: str, model: str, year: str = None, trim: str = None,
+                          url: str = None) -> Optional[Dict[str, Any]]:
+    """
+    Relevance gate and enhanced Message Pull-Through analysis in one GPT call,
+    for ingest's combined analysis mode. Content must already be extracted text.
+    
+    Returns:
+        {'relevance_score': 0-10, 'sentiment': enhanced analysis or None}, or
+        None if the call or parsing failed (callers fall back to local scoring)
+    """
+    api_key = get_openai_key()
+    
+    if not api_key:
+        logger.error("No OpenAI API key found. Cannot analyze content - skipping analysis.")
+        return None
+    
+    is_youtube = url and ('youtube.com' in url or 'youtu.be' in url)
+    content_type = "YouTube Video Transcript" if is_youtube else "Web Article"
+    content = _truncate_content(content, make, model, is_youtube, summarize=False)  # keep combined mode to one call
+    vehicle_identifier = " ".join(filter(None, [str(year) if year else None, make, model, trim]))
+    
+    prompt = COMBINED_RELEVANCE_PREAMBLE.format(make=make, model=model) + ENHANCED_SENTIMENT_PROMPT.format(
+        make=make,
+        model=model,
+        year=year or "",
+        trim=trim or "",
+        content=content
+    )
+    
+    memo = get_gpt_memo()
+    memo_version = prompt_version('combined', COMBINED_RELEVANCE_PREAMBLE + ENHANCED_SENTIMENT_PROMPT)
+    memo_model = " ".join(filter(None, [str(year) if year else None, model, trim]))
+    memoized = memo.get(memo_version, "gpt-4-turbo", make, memo_model, content)
+    if memoized is not None:
+        return memoized
+    
+    openai.api_key = api_key
+    dispatcher = get_openai_dispatcher()
+    request_tokens = estimate_request_tokens(prompt, 2000)
+    
+    for model_name, label in (("gpt-4-turbo", ""), ("gpt-3.5-turbo-16k", " (fallback)")):
+        try:
+            logger.info(f"Making combined relevance + sentiment GPT call for {make} {model} ({model_name})")
+            with dispatcher.acquire(request_tokens, model=model_name) as lease:
+                response = openai.ChatCompletion.create(
+                    model=model_name,
+                    messages=[{"role": "user", "content": prompt}],
+                    max_tokens=2000,
+                    temperature=0.3,
+                    request_timeout=120
+                )
+                lease.record(response, prompt)
+            
+            analysis_result = parse_json_with_fallbacks(response.choices[0].message.content.strip())
+            if not isinstance(analysis_result, dict) or 'vehicle_relevance_score' not in analysis_result:
+                logger.error(f"Combined analysis response{label} has no vehicle_relevance_score")
+                return None
+            
+            try:
+                relevance_score = float(analysis_result.pop('vehicle_relevance_score') or 0)
+            except (TypeError, ValueError):
+                relevance_score = 0
+            if relevance_score <= 0 or 'sentiment_classification' not in analysis_result:
+                logger.info(f"✅ Combined analysis{label}: relevance {relevance_score}/10, no sentiment payload")
+                return {'relevance_score': relevance_score, 'sentiment': None}
+            
+            sentiment = _finalize_enhanced_result(analysis_result, vehicle_identifier, content_type)
+            # Lets the sentiment job recognise (and reuse) an ingest-time analysis
+            sentiment['analysis_source'] = 'ingest_combined'
+            combined = {'relevance_score': relevance_score, 'sentiment': sentiment}
+            logger.info(f"✅ Combined analysis{label}: relevance {relevance_score}/10, "
+                        f"sentiment={sentiment.get('overall_sentiment')}")
+            if not label:
+                memo.put(memo_version, "gpt-4-turbo", make, memo_model, content,
+                         combined, response_tokens(response, prompt))
+            return combined
+            
+        except Exception as e:
+            error_msg = str(e)
+            logger.error(f"Error in combined analysis{label}: {e}")
+            # Only quota/rate problems on the primary model fall through to gpt-3.5
+            if label or not _is_quota_error(error_msg):
+                return None
+            logger.warning("Quota/billing issue detected - falling back to gpt-3.5-turbo")
+    
+    return None
+
+def ingest_combined_analysis(clip_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    The enhanced analysis ingest's combined mode already stored for a clip
+    (sentiment_data_enhanced tagged analysis_source='ingest_combined'), or None.
+    Lets the sentiment job skip a second GPT call on the same content.
+    """
+    if clip_data.get('sentiment_completed'):
+        return None
+    stored = clip_data.get('sentiment_data_enhanced')
+    try:
+        analysis_result = json.loads(stored) if isinstance(stored, str) else stored
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(analysis_result, dict) or analysis_result.get('analysis_source') != 'ingest_combined':
+        return None
+    logger.info(f"♻️ Reusing ingest-time combined analysis for WO# {clip_data.get('wo_number')} (no GPT call)")
+    return dict(analysis_result)
+
+analyze_clip = analyze_clip_enhanced  # Alias for easy migration
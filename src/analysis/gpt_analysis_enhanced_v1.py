@@ -9,8 +9,9 @@ from dotenv import load_dotenv
 
 # Import local modules
 from src.utils.logger import setup_logger
-from src.utils.rate_limiter import rate_limiter
+from src.utils.openai_dispatcher import get_openai_dispatcher, estimate_request_tokens
 from src.utils.content_extractor import extract_article_content
+from src.analysis.content_packer import pack_content
 
 logger = setup_logger(__name__)
 
@@ -158,11 +159,8 @@ def analyze_clip_enhanced(content: str, make: str, model: str, year: str = None,
             else:
                 logger.warning("Failed to extract article text from HTML. Using raw content.")
     
-    # Truncate content if it's too long
-    max_content_length = 12000  # Increased for more comprehensive analysis
-    if len(content) > max_content_length:
-        logger.info(f"Truncating content from {len(content)} to {max_content_length} characters")
-        content = content[:max_content_length] + "..."
+    # Fit content to the token budget (boilerplate stripped, most on-topic passages kept)
+    content = pack_content(content, make, model, transcript=bool(is_youtube)).text
     
     # Pre-filters to save OpenAI costs (same as original)
     # Filter 1: Content Length Check
@@ -226,21 +224,28 @@ def analyze_clip_enhanced(content: str, make: str, model: str, year: str = None,
     
     logger.info(f"Making enhanced Message Pull-Through analysis call to OpenAI API (attempt 1/{max_retries})")
     
+    dispatcher = get_openai_dispatcher()
+    request_tokens = estimate_request_tokens(prompt, 2000)
+    
     for attempt in range(max_retries):
         try:
-            # Use the new OpenAI v1.x client format
-            response = client.chat.completions.create(
-                model="gpt-4-turbo",
-                messages=[
-                    {
-                        "role": "user", 
-                        "content": prompt
-                    }
-                ],
-                max_tokens=2000,
-                temperature=0.3,
-                timeout=120
-            )
+            # Use the new OpenAI v1.x client format; the raw response carries the
+            # x-ratelimit-* headers the dispatcher adapts to
+            with dispatcher.acquire(request_tokens, model="gpt-4-turbo") as lease:
+                raw_response = client.chat.completions.with_raw_response.create(
+                    model="gpt-4-turbo",
+                    messages=[
+                        {
+                            "role": "user", 
+                            "content": prompt
+                        }
+                    ],
+                    max_tokens=2000,
+                    temperature=0.3,
+                    timeout=120
+                )
+                response = raw_response.parse()
+                lease.record(response, prompt, headers=raw_response.headers)
             
             # Extract response content
             response_content = response.choices[0].message.content.strip()
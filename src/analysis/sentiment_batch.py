@@ -0,0 +1,363 @@
+"""
+OpenAI Batch API path for the sentiment_analysis background job.
+
+The interactive paths analyze clips five at a time with a one-second pause
+(SentimentAnalyzer.analyze_clips_batch) or one per second
+(SentimentManager.process_batch). For overnight backfills of hundreds of clips
+this module instead:
+
+1. formats the enhanced Message Pull-Through prompt of every clip
+   (prepare_enhanced_request) into a JSONL request file - clips that the GPT memo
+   or ingest's combined mode already analyzed need no request at all;
+2. uploads the file and creates a batch (half the price of synchronous calls, and
+   it doesn't draw on the per-minute limits the dispatcher budgets for ingest);
+3. records the submission in a manifest and returns - the job doesn't wait out
+   the (up to 24h) completion window;
+4. later, collect_sentiment_batches checks every pending manifest once, and for
+   batches that have finished parses the output and bulk-writes results through
+   SentimentManager.save_analysis_results. The worker calls it from its run loop.
+
+Manifests are stored in the Supabase openai_batches table (see
+migrations/create_openai_batches_table.sql) so pending batches survive a redeploy
+and are visible to every worker; they are identified by their local ID
+(sentiment_...), not the OpenAI batch ID. Until a batch is saved its clips still
+have no sentiment_analysis_date, so sentiment jobs skip queued_clip_ids() instead
+of paying for them twice. The JSONL request files are only kept until they are
+uploaded. Set OPENAI_BATCH_BASE_URL to scripts/openai_batch_stub_server.py to run
+the whole path locally.
+"""
+
+import os
+import uuid
+import shutil
+import asyncio
+import tempfile
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, List, Optional, Callable, Set
+
+import httpx
+
+from src.utils.logger import setup_logger
+from src.utils.database import get_database
+from src.utils.gpt_memo import get_gpt_memo, estimate_tokens
+from src.utils.cache_manager import content_hash
+from src.utils.openai_batch import (
+    OpenAIBatchClient, chat_request_line, parse_output_lines, completion_text, is_transient_error,
+    TERMINAL_STATUSES
+)
+from src.analysis.gpt_analysis_enhanced import (
+    EnhancedRequest, prepare_enhanced_request, parse_enhanced_response, enhanced_memo_version,
+    ingest_combined_analysis
+)
+from src.analysis.sentiment_manager import SentimentManager
+
+logger = setup_logger(__name__)
+
+OPENAI_BATCH_MODEL = os.environ.get('OPENAI_BATCH_MODEL', 'gpt-4-turbo')
+# The Batch API accepts up to 50,000 requests per input file
+OPENAI_BATCH_MAX_REQUESTS = int(os.environ.get('OPENAI_BATCH_MAX_REQUESTS', '50000'))
+# A manifest still unsubmitted after this long belongs to a worker that died mid-submission;
+# collect what its created batches return instead of holding its clips forever
+OPENAI_BATCH_SUBMIT_GRACE_SECONDS = int(os.environ.get('OPENAI_BATCH_SUBMIT_GRACE_SECONDS', '3600'))
+
+def _batches_table():
+    return get_database().supabase.table('openai_batches')
+
+def _save_manifest(manifest: Dict[str, Any]):
+    _batches_table().upsert({
+        'local_id': manifest['local_id'],
+        'job': 'sentiment_analysis',
+        'clip_ids': sorted(set(manifest['requests']) | set(manifest['ready'])),
+        'submitted': manifest['submitted'],
+        'finished': manifest['finished'],
+        'manifest': manifest,
+        'updated_at': datetime.now(timezone.utc).isoformat(),
+    }, on_conflict='local_id').execute()
+
+def load_manifest(local_id: str) -> Dict[str, Any]:
+    result = _batches_table().select('manifest').eq('local_id', local_id).limit(1).execute()
+    if not result.data:
+        raise KeyError(f"Unknown sentiment batch {local_id}")
+    return result.data[0]['manifest']
+
+def _unfinished_rows(columns: str) -> List[Dict[str, Any]]:
+    return _batches_table().select(columns).eq('job', 'sentiment_analysis').eq('finished', False).execute().data or []
+
+def pending_batches() -> List[str]:
+    """Local IDs of submitted batches whose results haven't been saved yet"""
+    abandoned_before = datetime.now(timezone.utc) - timedelta(seconds=OPENAI_BATCH_SUBMIT_GRACE_SECONDS)
+    return [row['local_id'] for row in _unfinished_rows('local_id, submitted, updated_at')
+            if row['submitted'] or datetime.fromisoformat(row['updated_at']) < abandoned_before]
+
+def queued_clip_ids() -> Set[str]:
+    """IDs of clips whose results a batch that hasn't been saved yet will write"""
+    return {str(clip_id) for row in _unfinished_rows('clip_ids') for clip_id in row.get('clip_ids') or []}
+
+def build_sentiment_batch(clips: List[Dict[str, Any]], model_name: str = OPENAI_BATCH_MODEL) -> Dict[str, Any]:
+    """
+    Write the enhanced-analysis requests for clips to JSONL file(s) and return the manifest.
+    The manifest is only stored once its first batch is created (submit_sentiment_batch).
+
+    Returns:
+        Manifest with 'files' (one JSONL per OPENAI_BATCH_MAX_REQUESTS requests, in a
+        temporary directory), 'requests' (what is needed to finalize each clip's
+        response - its content only as a hash), 'ready' (results that need no request) and 'failed' (clips that
+        can't be analyzed)
+    """
+    local_id = f"sentiment_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+    manifest = {
+        'local_id': local_id,
+        'model_name': model_name,
+        'created': datetime.now().isoformat(),
+        'clip_count': len(clips),
+        'files': [],
+        'batches': [],
+        'requests': {},
+        'ready': {},
+        'failed': {},
+        'submitted': False,
+        'finished': False,
+    }
+    memo = get_gpt_memo()
+    memo_version = enhanced_memo_version()
+
+    lines = []
+    for clip in clips:
+        clip_id = str(clip['id'])
+        content = clip.get('extracted_content') or ''
+        if not content:
+            manifest['failed'][clip_id] = 'no content'
+            continue
+
+        # Ingest's combined analysis mode may already have analyzed this clip
+        analysis_result = ingest_combined_analysis(clip)
+        if analysis_result is not None:
+            manifest['ready'][clip_id] = analysis_result
+            continue
+
+        make, model, year, trim = SentimentManager.parse_vehicle(clip)
+        request = prepare_enhanced_request(content, make, model, year, trim, clip.get('clip_url', ''),
+                                           summarize=False)
+        if request is None:
+            manifest['failed'][clip_id] = 'unusable content'
+            continue
+
+        memoized = memo.get(memo_version, model_name, make, request.memo_model, request.content)
+        if memoized is not None:
+            memoized['content_type'] = request.content_type
+            manifest['ready'][clip_id] = memoized
+            continue
+
+        # The prompt and content live in the JSONL; the manifest (a Supabase row that is
+        # re-sent after every batch part) keeps only what finalizing/memoizing needs
+        manifest['requests'][clip_id] = {
+            'vehicle_identifier': request.vehicle_identifier,
+            'content_type': request.content_type,
+            'memo_model': request.memo_model,
+            'make': make,
+            'content_hash': content_hash(request.content),
+            'content_tokens': estimate_tokens(request.content),
+        }
+        lines.append(chat_request_line(clip_id, model_name, request.prompt))
+
+    work_dir = tempfile.mkdtemp(prefix=f"{local_id}_") if lines else None
+    for part, start in enumerate(range(0, len(lines), OPENAI_BATCH_MAX_REQUESTS)):
+        path = os.path.join(work_dir, f"{local_id}_{part}.jsonl")
+        with open(path, 'w') as f:
+            f.write('\n'.join(lines[start:start + OPENAI_BATCH_MAX_REQUESTS]) + '\n')
+        manifest['files'].append(path)
+
+    logger.info(f"📊 Sentiment batch {local_id}: {len(lines)} requests in {len(manifest['files'])} file(s), "
+                f"{len(manifest['ready'])} already analyzed, {len(manifest['failed'])} skipped")
+    return manifest
+
+def _finish_request(manifest: Dict[str, Any], clip_id: str, body: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Finalize one batch response like analyze_clip_enhanced does (and memoize it)"""
+    stored = manifest['requests'].get(clip_id)
+    if stored is None:
+        logger.warning(f"⚠️ Batch output for unknown clip {clip_id}")
+        return None
+    request = EnhancedRequest(prompt='', content='', vehicle_identifier=stored['vehicle_identifier'],
+                              content_type=stored['content_type'], memo_model=stored['memo_model'])
+    analysis_result = parse_enhanced_response(completion_text(body), request)
+    if analysis_result is None:
+        return None
+    # Manifests submitted before the content was dropped from them still carry it
+    digest = stored.get('content_hash') or content_hash(stored.get('content'))
+    tokens = ((body.get('usage') or {}).get('total_tokens')
+              or stored.get('content_tokens') or estimate_tokens(stored.get('content')))
+    get_gpt_memo().put_hashed(enhanced_memo_version(), manifest['model_name'], stored['make'], stored['memo_model'],
+                              digest, analysis_result, tokens)
+    return analysis_result
+
+async def _collect_results(client: OpenAIBatchClient, manifest: Dict[str, Any], batch: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Parse a finished batch's output (and error) file; failures are recorded in the manifest"""
+    results = {}
+    for file_key in ('output_file_id', 'error_file_id'):
+        if not batch.get(file_key):
+            continue
+        text = await client.file_content(batch[file_key])
+        for clip_id, body, error in parse_output_lines(text):
+            if error:
+                manifest['failed'][clip_id] = error
+                continue
+            try:
+                analysis_result = _finish_request(manifest, clip_id, body)
+            except Exception as e:
+                analysis_result = None
+                logger.error(f"❌ Error finalizing batch result for clip {clip_id}: {e}")
+            if analysis_result is None:
+                manifest['failed'][clip_id] = 'unparseable response'
+            else:
+                results[clip_id] = analysis_result
+    return results
+
+async def submit_sentiment_batch(client: OpenAIBatchClient, manifest: Dict[str, Any],
+                                 cancel_check: Optional[Callable] = None) -> Dict[str, Any]:
+    """
+    Upload the manifest's request files and create one batch per file. The manifest
+    is stored after every batch created, and the request files are removed at the end.
+    """
+    try:
+        for path in manifest['files']:
+            if cancel_check and cancel_check():
+                raise Exception("Job cancelled by user")
+            file_id = await client.upload_file(path)
+            batch = await client.create_batch(file_id, metadata={'job': 'sentiment_analysis',
+                                                                 'local_id': manifest['local_id']})
+            manifest['batches'].append(batch['id'])
+            _save_manifest(manifest)
+    except Exception:
+        # Don't leave part of a submission running with nobody to collect it
+        for batch_id in manifest['batches']:
+            try:
+                await client.cancel_batch(batch_id)
+            except Exception as cancel_error:
+                logger.warning(f"⚠️ Could not cancel batch {batch_id}: {cancel_error}")
+        if manifest['batches']:
+            manifest['finished'] = True
+            _save_manifest(manifest)
+        raise
+    finally:
+        for work_dir in {os.path.dirname(path) for path in manifest['files']}:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    manifest['submitted'] = True
+    _save_manifest(manifest)
+    return manifest
+
+async def _save_batch_results(client: OpenAIBatchClient, manifest: Dict[str, Any], finished: List[Dict[str, Any]],
+                              manager: Optional[SentimentManager] = None) -> Dict[str, Any]:
+    """
+    Save every result of finished batches (including the ones that needed no
+    request) through SentimentManager.save_analysis_results and close the manifest.
+    """
+    results = dict(manifest['ready'])
+    for batch in finished:
+        if batch.get('status') != 'completed':
+            # Expired batches still carry the responses that finished in time
+            logger.warning(f"⚠️ Batch {batch['id']} ended {batch.get('status')}: {batch.get('errors')}")
+        results.update(await _collect_results(client, manifest, batch))
+    for clip_id in manifest['requests']:
+        if clip_id not in results and clip_id not in manifest['failed']:
+            manifest['failed'][clip_id] = 'no response'
+
+    manager = manager or SentimentManager(use_enhanced=True)
+    # Supabase calls are blocking - keep them off the event loop
+    loop = asyncio.get_running_loop()
+    saved = await loop.run_in_executor(None, manager.save_analysis_results_bulk, results, True)
+
+    manifest['finished'] = True
+    _save_manifest(manifest)
+    stats = {
+        'local_id': manifest['local_id'],
+        'batches': manifest['batches'],
+        'total': manifest['clip_count'],
+        'requested': len(manifest['requests']),
+        'reused': len(manifest['ready']),
+        'successful': saved['saved'],
+        'failed': len(manifest['failed']) + saved['failed'],
+    }
+    logger.info(f"✅ Sentiment batch {manifest['local_id']} finished: {stats['successful']} saved, "
+                f"{stats['reused']} reused without a request, {stats['failed']} failed")
+    return stats
+
+async def check_sentiment_batch(client: OpenAIBatchClient, manifest: Dict[str, Any],
+                                manager: Optional[SentimentManager] = None) -> Optional[Dict[str, Any]]:
+    """
+    Poll the manifest's batches once. If all of them have reached a terminal status,
+    save the results and return the processing statistics; otherwise return None.
+    """
+    batches = [await client.get_batch(batch_id) for batch_id in manifest['batches']]
+    running = [batch for batch in batches if batch.get('status') not in TERMINAL_STATUSES]
+    if running:
+        done = sum((batch.get('request_counts') or {}).get('completed', 0)
+                   + (batch.get('request_counts') or {}).get('failed', 0) for batch in batches)
+        logger.info(f"Sentiment batch {manifest['local_id']} still running: "
+                    f"{done}/{len(manifest['requests'])} requests done")
+        return None
+    return await _save_batch_results(client, manifest, batches, manager)
+
+async def _submit(clips: List[Dict[str, Any]], cancel_check: Optional[Callable]) -> Dict[str, Any]:
+    manifest = build_sentiment_batch(clips)
+    async with OpenAIBatchClient() as client:
+        if manifest['files']:
+            await submit_sentiment_batch(client, manifest, cancel_check)
+        else:
+            manifest['submitted'] = True
+            _save_manifest(manifest)
+        # Saves right away when every clip was reused and nothing needed a request
+        finished = await check_sentiment_batch(client, manifest)
+    return finished or {
+        'local_id': manifest['local_id'],
+        'batches': manifest['batches'],
+        'total': manifest['clip_count'],
+        'requested': len(manifest['requests']),
+        'reused': len(manifest['ready']),
+        'failed': len(manifest['failed']),
+        'pending': True,
+    }
+
+def submit_sentiment_batch_job(clips: List[Dict[str, Any]], cancel_check: Optional[Callable] = None) -> Dict[str, Any]:
+    """
+    Synchronous entry point for the background worker: build and submit a batch for
+    clips without waiting for it. Returns the submission statistics ('pending': True
+    until collect_sentiment_batches saves the results).
+    """
+    return asyncio.run(_submit(clips, cancel_check))
+
+async def _collect(local_ids: List[str]) -> List[Dict[str, Any]]:
+    collected = []
+    async with OpenAIBatchClient() as client:
+        for local_id in local_ids:
+            try:
+                manifest = load_manifest(local_id)
+            except KeyError as e:
+                logger.error(f"❌ {e}")
+                continue
+            if manifest.get('finished'):
+                continue
+            try:
+                stats = await check_sentiment_batch(client, manifest)
+            except httpx.HTTPError as e:
+                if is_transient_error(e):
+                    logger.warning(f"⚠️ Could not check sentiment batch {local_id}, will retry: {e}")
+                    continue
+                # Unknown batch or rejected key - checking again won't help
+                logger.error(f"❌ Giving up on sentiment batch {local_id}: {e}")
+                manifest['finished'] = True
+                manifest['error'] = str(e)
+                _save_manifest(manifest)
+                continue
+            if stats is not None:
+                collected.append(stats)
+    return collected
+
+def collect_sentiment_batches(local_ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Check submitted batches once (all pending manifests by default) and save the
+    results of the ones that finished. Returns the statistics of every batch saved.
+    """
+    local_ids = pending_batches() if local_ids is None else local_ids
+    if not local_ids:
+        return []
+    return asyncio.run(_collect(local_ids))
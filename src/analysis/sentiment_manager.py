@@ -4,14 +4,15 @@ Handles both current automated flow and new enhanced analysis capabilities
 """
 
 import json
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime, timedelta
 import asyncio
 
 from src.utils.logger import setup_logger
-from src.database.connection import get_supabase_client
-from src.analysis.gpt_analysis_enhanced import analyze_clip_enhanced
+from src.utils.database import get_database
+from src.analysis.gpt_analysis_enhanced import analyze_clip_enhanced, ingest_combined_analysis
 from src.analysis.gpt_analysis import analyze_clip as analyze_clip_original
+from src.utils.gpt_memo import get_gpt_memo
 
 logger = setup_logger(__name__)
 
@@ -31,9 +32,42 @@ class SentimentManager:
         Args:
             use_enhanced: Whether to use enhanced Message Pull-Through prompt
         """
-        self.supabase = get_supabase_client()
+        self.supabase = get_database().supabase
         self.use_enhanced = use_enhanced
         
+    @staticmethod
+    def parse_vehicle(clip_data: Dict[str, Any]) -> Tuple[str, str, Optional[str], Optional[str]]:
+        """
+        (make, model, year, trim) of a clip; year/trim are parsed from the model
+        field (e.g. "2024 Camry XLE") when not provided separately
+        """
+        make = clip_data.get('make', '')
+        model = clip_data.get('model', '')
+        
+        # Extract year and trim if available
+        year = clip_data.get('year')  # Check if year is provided separately
+        trim = clip_data.get('trim')  # Check if trim is provided separately
+        
+        # If trim not provided separately, try to parse from model field
+        if not trim:
+            # Try to parse year from model (e.g., "2024 Camry XLE")
+            model_parts = model.split()
+            if model_parts and model_parts[0].isdigit() and len(model_parts[0]) == 4:
+                if not year:
+                    year = model_parts[0]
+                # Reconstruct model without year
+                model = ' '.join(model_parts[1:])
+                
+                # Check if last part might be trim
+                if len(model_parts) > 2:
+                    potential_trim = model_parts[-1]
+                    # Common trim indicators
+                    if any(indicator in potential_trim.upper() for indicator in ['XLE', 'XSE', 'SR', 'LIMITED', 'SPORT', 'BASE', 'LX', 'EX', 'SI']):
+                        trim = potential_trim
+                        model = ' '.join(model_parts[1:-1])
+        
+        return make, model, year, trim
+    
     def analyze_clip(self, clip_data: Dict[str, Any], force_enhanced: bool = None) -> Optional[Dict[str, Any]]:
         """
         Analyze a single clip with sentiment analysis
@@ -51,44 +85,24 @@ class SentimentManager:
             
             # Extract required fields
             content = clip_data.get('extracted_content', '')
-            make = clip_data.get('make', '')
-            model = clip_data.get('model', '')
             url = clip_data.get('clip_url', '')
-            
-            # Extract year and trim if available
-            year = clip_data.get('year')  # Check if year is provided separately
-            trim = clip_data.get('trim')  # Check if trim is provided separately
-            
-            # If trim not provided separately, try to parse from model field
-            if not trim:
-                # Try to parse year from model (e.g., "2024 Camry XLE")
-                model_parts = model.split()
-                if model_parts and model_parts[0].isdigit() and len(model_parts[0]) == 4:
-                    if not year:
-                        year = model_parts[0]
-                    # Reconstruct model without year
-                    model = ' '.join(model_parts[1:])
-                    
-                    # Check if last part might be trim
-                    if len(model_parts) > 2:
-                        potential_trim = model_parts[-1]
-                        # Common trim indicators
-                        if any(indicator in potential_trim.upper() for indicator in ['XLE', 'XSE', 'SR', 'LIMITED', 'SPORT', 'BASE', 'LX', 'EX', 'SI']):
-                            trim = potential_trim
-                            model = ' '.join(model_parts[1:-1])
+            make, model, year, trim = self.parse_vehicle(clip_data)
             
             logger.info(f"Analyzing clip: {make} {model} {year} {trim} - Using {'enhanced' if use_enhanced_analysis else 'original'} analyzer")
             
             if use_enhanced_analysis:
-                # Use enhanced Message Pull-Through analysis
-                analysis_result = analyze_clip_enhanced(
-                    content=content,
-                    make=make,
-                    model=model,
-                    year=year,
-                    trim=trim,
-                    url=url
-                )
+                # Ingest's combined analysis mode may already have analyzed this clip
+                analysis_result = ingest_combined_analysis(clip_data)
+                if analysis_result is None:
+                    # Use enhanced Message Pull-Through analysis
+                    analysis_result = analyze_clip_enhanced(
+                        content=content,
+                        make=make,
+                        model=model,
+                        year=year,
+                        trim=trim,
+                        url=url
+                    )
             else:
                 # Use original analysis for backward compatibility
                 analysis_result = analyze_clip_original(
@@ -123,6 +137,7 @@ class SentimentManager:
             # Prepare update data
             update_data = {
                 'sentiment_analysis_date': datetime.utcnow().isoformat(),
+                'sentiment_completed': True,
                 'workflow_stage': 'sentiment_analyzed'
             }
             
@@ -159,6 +174,30 @@ class SentimentManager:
             logger.error(f"Error saving analysis results: {e}")
             return False
     
+    def save_analysis_results_bulk(self, results: Dict[str, Dict[str, Any]], is_enhanced: bool = None,
+                                   progress_callback=None) -> Dict[str, int]:
+        """
+        Save many analysis results (e.g. a finished Batch API run) through save_analysis_results
+        
+        Args:
+            results: Analysis results keyed by clip ID
+            is_enhanced: Whether these are enhanced analyses
+            progress_callback: Optional callback(saved_so_far, total)
+            
+        Returns:
+            {'saved': n, 'failed': n}
+        """
+        counts = {'saved': 0, 'failed': 0}
+        for index, (clip_id, analysis_result) in enumerate(results.items(), start=1):
+            if self.save_analysis_results(clip_id, analysis_result, is_enhanced=is_enhanced):
+                counts['saved'] += 1
+            else:
+                counts['failed'] += 1
+            if progress_callback:
+                progress_callback(index, len(results))
+        logger.info(f"Bulk save complete: {counts['saved']}/{len(results)} clips saved")
+        return counts
+    
     def get_clips_for_analysis(self, 
                                status: str = 'approved',
                                limit: int = 100,
@@ -220,6 +259,8 @@ class SentimentManager:
             'skipped': 0
         }
         
+        memo = get_gpt_memo()
+        
         for clip in clips:
             try:
                 # Check if content exists
@@ -229,7 +270,9 @@ class SentimentManager:
                     continue
                 
                 # Analyze the clip
-                analysis_result = self.analyze_clip(clip, force_enhanced=use_enhanced)
+                with memo.track_lookups() as lookups:
+                    analysis_result = self.analyze_clip(clip, force_enhanced=use_enhanced)
+                memo_hit = lookups['hits'] > 0 and lookups['misses'] == 0
                 
                 if analysis_result:
                     # Save results
@@ -243,14 +286,16 @@ class SentimentManager:
                     results['failed'] += 1
                     logger.error(f"Failed to analyze clip {clip['id']}")
                     
-                # Add small delay to avoid rate limits
-                await asyncio.sleep(1)
+                # Add small delay to avoid rate limits (memoized results made no API call)
+                if not memo_hit:
+                    await asyncio.sleep(1)
                 
             except Exception as e:
                 logger.error(f"Error processing clip {clip.get('id', 'unknown')}: {e}")
                 results['failed'] += 1
         
         logger.info(f"Batch processing complete: {results}")
+        memo.log_stats()
         return results
     
     def reprocess_with_enhanced_prompt(self, make: str = None, model: str = None, limit: int = 50) -> Dict[str, Any]:
@@ -17,11 +17,11 @@ from src.dashboard.oem_messaging_ui import display_oem_messaging_tab
 from src.dashboard.historical_reprocessing import display_historical_reprocessing_tab
 from src.dashboard.active_jobs_tab import display_active_jobs_tab, submit_job_to_queue
 from src.dashboard.cooldown_management import display_cooldown_management_tab
+from src.ingest.loan_report import get_loan_report_path
 import io
 from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils.dataframe import dataframe_to_rows
-import requests
 from streamlit_extras.stylable_container import stylable_container
 
 # Initialize environment (handles .env loading gracefully)
@@ -169,16 +169,15 @@ def load_loans_data_for_filtering(url: str):
     Returns (success: bool, df: pd.DataFrame, data_info: dict)
     """
     try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
+        # Shared ETag/Last-Modified cache with the background worker's loader
+        report_path = get_loan_report_path(url)
         
         headers = [
             "ActivityID", "Person_ID", "Make", "Model", "WO #", "Office", "To", 
             "Affiliation", "Start Date", "Stop Date", "Model Short Name", "Links"
         ]
         
-        csv_content = response.content.decode('utf-8')
-        df = pd.read_csv(io.StringIO(csv_content), header=None, names=headers, on_bad_lines='warn')
+        df = pd.read_csv(report_path, header=None, names=headers, on_bad_lines='warn', encoding='utf-8')
         
         df.columns = [col.strip() for col in df.columns]
 
@@ -1094,10 +1093,10 @@ def create_client_excel_report(df, approved_df=None):
     # FIX: Fetch Activity_ID values from external source if they're blank in the data
     activity_id_mapping = {}
     try:
-        import requests
-        response = requests.get("https://reports.driveshop.com/?report=file:/home/deployer/reports/clips/media_loans_without_clips.rpt&init=csv", timeout=30)
-        if response.status_code == 200:
-            source_lines = response.text.strip().split('\n')
+        with open(get_loan_report_path("https://reports.driveshop.com/?report=file:/home/deployer/reports/clips/media_loans_without_clips.rpt&init=csv"), encoding='utf-8') as report:
+            report_text = report.read()
+        if report_text:
+            source_lines = report_text.strip().split('\n')
             for line in source_lines:
                 if line.strip() and not line.startswith('"Activity_ID"'):  # Skip header
                     # Parse CSV line properly (handle quoted fields)
@@ -1308,10 +1307,10 @@ def create_client_excel_report(df, approved_df=None):
             source_mapping = {}
             activity_id_mapping = {}
             try:
-                import requests
-                response = requests.get("https://reports.driveshop.com/?report=file:/home/deployer/reports/clips/media_loans_without_clips.rpt&init=csv", timeout=30)
-                if response.status_code == 200:
-                    source_lines = response.text.strip().split('\n')
+                with open(get_loan_report_path("https://reports.driveshop.com/?report=file:/home/deployer/reports/clips/media_loans_without_clips.rpt&init=csv"), encoding='utf-8') as report:
+                    report_text = report.read()
+                if report_text:
+                    source_lines = report_text.strip().split('\n')
                     for line in source_lines:
                         if line.strip() and not line.startswith('"Activity_ID"'):  # Skip header
                             # Parse CSV line properly (handle quoted fields)
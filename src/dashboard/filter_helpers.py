@@ -3,21 +3,20 @@ Helper functions for the filtering functionality in the dashboard.
 """
 
 import os
-import requests
 import pandas as pd
-import io
 import streamlit as st
 from pathlib import Path
 
+from src.ingest.loan_report import get_loan_report_path
+
 def load_loans_data_for_filtering(url: str):
     """
     Load loans data from URL for preview and filtering without processing.
     Returns (success: bool, data_info: dict)
     """
     try:
-        # Download CSV
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
+        # Download CSV (shared ETag/Last-Modified cache with the background worker)
+        report_path = get_loan_report_path(url)
         
         # Define headers manually for this specific report
         headers = [
@@ -26,8 +25,7 @@ def load_loans_data_for_filtering(url: str):
         ]
         
         # Parse CSV
-        csv_content = response.content.decode('utf-8')
-        df = pd.read_csv(io.StringIO(csv_content), header=None, names=headers, on_bad_lines='warn')
+        df = pd.read_csv(report_path, header=None, names=headers, on_bad_lines='warn', encoding='utf-8')
         
         # Clean up column names
         df.columns = [col.strip() for col in df.columns]
@@ -16,6 +16,7 @@ from src.utils.logger import setup_logger
 from src.utils.database import get_database
 from src.utils.sentiment_analysis import run_sentiment_analysis
 from src.utils.trim_extractor import extract_trim_from_model
+from src.utils.gpt_memo import get_gpt_memo
 
 logger = setup_logger(__name__)
 
@@ -448,6 +449,8 @@ def process_clips_queue(db, all_clips: List[Dict[str, Any]], queue_ids: List[str
         # Final results
         progress_bar.progress(1.0)
         add_log(f"🎉 Processing complete: {success_count}/{len(clips_to_process)} successful")
+        memo_stats = get_gpt_memo().get_stats()
+        add_log(f"♻️ GPT memo: {memo_stats['hits']} reused results, ~{memo_stats['tokens_saved']} tokens saved this session")
         
         if success_count > 0:
             status_text.success(f"✅ Successfully processed {success_count}/{len(clips_to_process)} clips!")
@@ -31,18 +31,16 @@ from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 from datetime import datetime, timedelta
 import time
-import requests
 import asyncio
 import logging
 import re
 import argparse
-import dateutil.parser
-import io
 
 # Import local modules
 from src.utils.logger import setup_logger
+from src.ingest.loan_report import iter_loan_report, parse_start_date
 # from src.utils.notifications import send_slack_message  # Commented out to prevent hanging
-from src.utils.youtube_handler import get_channel_id, get_latest_videos, get_transcript, extract_video_id, get_video_metadata_fallback, scrape_channel_videos_with_scrapfly
+from src.utils.youtube_handler import get_channel_id, get_latest_videos, get_relevant_transcript, extract_video_id, get_video_metadata_fallback, scrape_channel_videos_with_scrapfly
 from src.utils.escalation import crawling_strategy
 from src.utils.enhanced_crawler_manager import EnhancedCrawlerManager
 from src.analysis.gpt_analysis import analyze_clip
@@ -216,36 +214,6 @@ def add_rejected_record(loan: Dict[str, Any], rejection_reason: str, url_details
     REJECTED_RECORDS.append(rejected_record)
     logger.info(f"📝 Added rejected record: {loan.get('work_order')} - {rejection_reason}")
 
-def parse_start_date(date_str: str) -> Optional[datetime]:
-    """
-    Parse a date string from the Start Date column.
-    Handles various date formats commonly found in spreadsheets.
-    
-    Args:
-        date_str: Date string from the spreadsheet
-        
-    Returns:
-        datetime object or None if parsing fails
-    """
-    if not date_str or pd.isna(date_str):
-        return None
-    
-    try:
-        # Convert to string if it's not already
-        date_str = str(date_str).strip()
-        
-        # Handle empty strings
-        if not date_str:
-            return None
-        
-        # Use dateutil parser which handles many formats automatically
-        parsed_date = dateutil.parser.parse(date_str)
-        return parsed_date
-    
-    except (ValueError, TypeError) as e:
-        logger.warning(f"Could not parse date '{date_str}': {e}")
-        return None
-
 # Legacy function - kept for backward compatibility but now uses enhanced filter
 def is_content_within_date_range(content_date: Optional[datetime], 
                                 start_date: Optional[datetime], 
@@ -277,89 +245,8 @@ def load_loans_data_from_url(url: str, limit: Optional[int] = None) -> List[Dict
     Returns:
         List of dictionaries containing loan information, mapped to the application's expected keys.
     """
-    logger.info(f"Fetching loans data from URL: {url}")
-    response = requests.get(url, timeout=30)
-    response.raise_for_status()
-    
-    # Define headers manually for this specific report, as it has no header row
-    headers = [
-        "ActivityID", "Person_ID", "Make", "Model", "WO #", "Office", "To", 
-        "Affiliation", "Start Date", "Stop Date", "Model Short Name", "Links"
-    ]
-    
-    # Use StringIO to treat the string content as a file
-    csv_content = response.content.decode('utf-8')
-    df = pd.read_csv(io.StringIO(csv_content), header=None, names=headers, on_bad_lines='warn')
-    
-    # Clean up column names (just in case)
-    df.columns = [col.strip() for col in df.columns]
-    logger.info(f"Columns assigned: {df.columns.tolist()}")
-    
-    # Apply limit if provided
-    if limit is not None and limit > 0:
-        logger.info(f"Limiting records to the first {limit}")
-        df = df.head(limit)
-        
-    # Convert to a list of dictionaries to process each record
-    records = df.to_dict('records')
-    logger.info(f"Loaded {len(records)} loans from URL.")
-    
-    # Map the columns to the internal variable names the rest of the script expects
-    processed_loans = []
-    for record in records:
-        # Convert to dictionary and handle potential NaN values
-        loan_dict = {k: v if pd.notna(v) else '' for k, v in record.items()}
-        
-        # Parse URLs from the Links field - handle comma-separated URLs properly
-        urls = []
-        links_text = loan_dict.get('Links', '')
-        if links_text:
-            # Split by comma and clean up each URL
-            url_parts = [url.strip() for url in str(links_text).split(',')]
-            for url in url_parts:
-                # Remove quotes if present
-                url = url.strip('"\'')
-                # Skip empty URLs and internal system URLs
-                if url and not url.startswith('https://fms.driveshop.com/'):
-                    urls.append(url)
-        
-        # Log URL parsing for debugging
-        logger.info(f"Loan {loan_dict.get('WO #')}: Parsed {len(urls)} URLs from '{links_text[:100]}...'")
-        
-        # Get make and model - but DON'T extract trim yet for efficiency
-        make = loan_dict.get('Make', '')
-        full_model = loan_dict.get('Model', '')
-        
-        # For efficiency, we'll extract trim later only for filtered loans
-        # This avoids extracting trim for all 2090 loans when we only need 1
-        
-        processed_loan = {
-            'work_order': loan_dict.get('WO #'),
-            'model': full_model,  # Keep full model for now - will extract trim later if needed
-            'model_full': full_model,  # Keep the full model string
-            'trim': None,  # Will be extracted later for filtered loans only
-            'to': loan_dict.get('To'),
-            'affiliation': loan_dict.get('Affiliation'),
-            'urls': urls,  # Use the properly parsed URLs
-            'start_date': None,  # Initialize as None, then parse below
-            'make': make,
-            # Add the new fields
-            'activity_id': loan_dict.get('ActivityID'),
-            'person_id': loan_dict.get('Person_ID'),
-            'office': loan_dict.get('Office')
-        }
-        
-        # Parse start date properly (same logic as file upload function)
-        start_date_str = loan_dict.get('Start Date')
-        if start_date_str and pd.notna(start_date_str):
-            parsed_date = parse_start_date(start_date_str)
-            if parsed_date:
-                processed_loan['start_date'] = parsed_date
-                logger.debug(f"Parsed start date for {processed_loan['work_order']}: {parsed_date.strftime('%Y-%m-%d')}")
-            else:
-                logger.warning(f"Could not parse start date for {processed_loan['work_order']}: {start_date_str}")
-        
-        processed_loans.append(processed_loan)
+    # Streams + caches the report; use iter_loan_report directly to start work before it finishes
+    processed_loans = list(iter_loan_report(url, limit=limit))
 
     logger.info(f"Total loans processed: {len(processed_loans)}")
     total_urls = sum(len(loan['urls']) for loan in processed_loans)
@@ -699,7 +586,8 @@ def process_youtube_url(url: str, loan: Dict[str, Any], cancel_check: Optional[c
             else:
                 # Only if metadata fails completely (rare), try transcript as last resort
                 logger.warning(f"⚠️ No metadata available, attempting transcript extraction as fallback")
-                transcript = get_transcript(video_id, video_url=url)
+                # No title to pre-check - let the transcript gate decide from the first minutes
+                transcript = get_relevant_transcript(video_id, make, model, video_url=url)
                 
                 if transcript:
                     title = metadata.get('title', f"YouTube Video {video_id}") if metadata else f"YouTube Video {video_id}"
@@ -981,7 +869,7 @@ def process_youtube_url(url: str, loan: Dict[str, Any], cancel_check: Optional[c
                             else:
                                 # Only try transcript if metadata completely fails (rare)
                                 logger.warning(f"⚠️ No metadata for {video_id}, attempting transcript as fallback")
-                                transcript = get_transcript(video_id, video_url=video['url'])
+                                transcript = get_relevant_transcript(video_id, loan.get('make', ''), loan.get('model', ''), video_url=video['url'])
                                 
                                 if transcript:
                                     return {
@@ -1007,7 +895,40 @@ def process_youtube_url(url: str, loan: Dict[str, Any], cancel_check: Optional[c
         logger.error(f"Error processing YouTube URL {url}: {e}")
         return None
 
-def process_web_url(url: str, loan: Dict[str, Any], cancel_check: Optional[callable] = None) -> Optional[Dict[str, Any]]:
+def apply_url_redirects(url: str) -> str:
+    """Rewrite known outlet URLs to the section where their articles actually live."""
+    # Redirect MotorTrend automobilemag URLs to car-reviews
+    if 'motortrend.com/automobilemag' in url:
+        original_url = url
+        url = url.replace('/automobilemag', '/car-reviews')
+        logger.info(f"🔄 Redirecting MotorTrend URL: {original_url} -> {url}")
+        
+    # Redirect Tightwad Garage to blog section where articles are located
+    if 'tightwadgarage.com' in url and '/blog' not in url:
+        original_url = url
+        # Ensure URL ends with /blog
+        if url.endswith('/'):
+            url = url + 'blog'
+        else:
+            url = url + '/blog'
+        logger.info(f"🔄 Redirecting Tightwad Garage URL: {original_url} -> {url}")
+    
+    return url
+
+def web_crawl_target(url: str, loan: Dict[str, Any]) -> Tuple[str, str, str]:
+    """
+    What process_web_url hands to crawl_url for a loan's web URL: the URL after
+    outlet-specific redirects, the hierarchical search model and the person name
+    the crawl cache is keyed on. Returns (url, search_model, person_name).
+    """
+    url = apply_url_redirects(url)
+    search_model = loan.get('search_model', loan.get('model', ''))  # Use hierarchical search model
+    # Get person name for caching if available
+    person_name = loan.get('to', loan.get('affiliation', ''))
+    return url, search_model, person_name
+
+def process_web_url(url: str, loan: Dict[str, Any], cancel_check: Optional[callable] = None,
+                    prefetched_html: Optional[str] = None) -> Optional[Dict[str, Any]]:
     """
     Process a web URL to extract article content with date filtering.
     Implements graceful degradation: 90 days -> 180 days if nothing found.
@@ -1015,6 +936,7 @@ def process_web_url(url: str, loan: Dict[str, Any], cancel_check: Optional[calla
     Args:
         url: Web article URL
         loan: Loan data dictionary
+        prefetched_html: Tier 1 HTML already fetched by the async ingest engine (optional)
         
     Returns:
         Dictionary with article content or None if not found
@@ -1022,32 +944,14 @@ def process_web_url(url: str, loan: Dict[str, Any], cancel_check: Optional[calla
     try:
         if cancel_check and cancel_check():
             raise Exception("Job cancelled by user")
-        # Redirect MotorTrend automobilemag URLs to car-reviews
-        if 'motortrend.com/automobilemag' in url:
-            original_url = url
-            url = url.replace('/automobilemag', '/car-reviews')
-            logger.info(f"🔄 Redirecting MotorTrend URL: {original_url} -> {url}")
-            
-        # Redirect Tightwad Garage to blog section where articles are located
-        if 'tightwadgarage.com' in url and '/blog' not in url:
-            original_url = url
-            # Ensure URL ends with /blog
-            if url.endswith('/'):
-                url = url + 'blog'
-            else:
-                url = url + '/blog'
-            logger.info(f"🔄 Redirecting Tightwad Garage URL: {original_url} -> {url}")
+        url, search_model, person_name = web_crawl_target(url, loan)
         
         # Get make and model for finding relevant content
         make = loan.get('make', '')
         model = loan.get('model', '')
-        search_model = loan.get('search_model', model)  # Use hierarchical search model
         
         logger.info(f"Using hierarchical search model: '{search_model}' (base: '{model}', make: '{make}')")
         
-        # Get person name for caching if available
-        person_name = loan.get('to', loan.get('affiliation', ''))
-        
         # ENABLED DATE FILTERING: Check if article was published after loan start date
         # Articles published BEFORE loan start date should be rejected
         logger.info(f"🔒 Date filtering ENABLED - checking article publish date vs loan start date")
@@ -1063,7 +967,8 @@ def process_web_url(url: str, loan: Dict[str, Any], cancel_check: Optional[calla
             make=make,
             model=search_model,  # Use the hierarchical search model
             person_name=person_name,
-            loan_start_date=start_date
+            loan_start_date=start_date,
+            prefetched_html=prefetched_html
         )
         
         if not result['success']:
@@ -1079,12 +984,13 @@ def process_web_url(url: str, loan: Dict[str, Any], cancel_check: Optional[calla
         if cancel_check and cancel_check():
             raise Exception("Job cancelled by user")
         html_content = result.get('content', '')
+        document = result.get('document')
         final_url = result.get('url', url)
         published_date = None
         
-        # Try to extract the publication date from the content
+        # Try to extract the publication date from the content (parsed once by crawl_url)
         if html_content:
-            published_date = extract_date_from_html(html_content, final_url)
+            published_date = extract_date_from_html(document or html_content, final_url)
             
         # CRITICAL: Check if article was published BEFORE loan start date
         if published_date and start_date:
@@ -1103,6 +1009,9 @@ def process_web_url(url: str, loan: Dict[str, Any], cancel_check: Optional[calla
                     days_before = (start_date - published_date).days
                     logger.warning(f"📅 ❌ REJECTED: Article from {published_date.strftime('%Y-%m-%d')} is {days_before} days BEFORE loan start {start_date.strftime('%Y-%m-%d')}")
                     logger.warning(f"❌ ABSOLUTE RULE: No article before loan start date can be valid")
+                    # Never replay a rejected article from the crawl cache
+                    crawler_manager.cache_manager.invalidate_url(
+                        person_name, crawler_manager.repair_url(url), make, search_model)
                     return None
                 else:
                     days_after = (published_date - start_date).days
@@ -1137,6 +1046,7 @@ def process_web_url(url: str, loan: Dict[str, Any], cancel_check: Optional[calla
             'url': final_url,  # Use the final URL (may be specific article found by Google Search)
             'original_url': url,  # Keep the original URL for reference
             'content': result['content'],
+            'document': document,  # Parsed 'content', for the article extractor downstream
             'content_type': 'article',
             'title': result.get('title', url),
             'tier_used': tier_used,
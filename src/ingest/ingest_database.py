@@ -6,8 +6,14 @@ GPT analysis is skipped during ingestion to save costs - it will be run later in
 
 import os
 import asyncio
+import itertools
+import contextlib
+import contextvars
+import threading
 import time
-from typing import List, Dict, Any, Optional, Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import List, Dict, Any, Optional, Callable, Iterable, Iterator, NamedTuple
 from pathlib import Path
 from datetime import datetime
 from urllib.parse import urlparse
@@ -15,16 +21,30 @@ import re
 
 # Import existing modules
 from src.utils.logger import setup_logger
-from src.utils.database import get_database
+from src.utils.database import get_database, BufferedClipWriter
+from src.utils.cancellation import CancellationToken, JobCancellationPoller
+from src.utils.cache_manager import get_cache_manager, content_hash
 from src.ingest.ingest import (
     load_loans_data, 
     load_loans_data_from_url, 
     process_youtube_url, 
     process_web_url,
-    parse_start_date,
-    MAX_CONCURRENT
+    web_crawl_target,
+    apply_url_redirects,
+    crawler_manager,
+    parse_start_date
 )
 from src.analysis.gpt_analysis import analyze_clip_relevance_only
+from src.utils.openai_dispatcher import (
+    get_openai_dispatcher, openai_priority, install_response_header_hook, PRIORITY_BATCH
+)
+from src.utils.domain_limiter import DomainConcurrencyLimiter
+from src.utils.single_flight import begin_run, end_run
+from src.utils.article_url_cache import get_article_cache
+from src.utils.http_pool import record_request, log_http_metrics, ACCEPT_ENCODING
+from src.utils.whisper_pool import get_whisper_pool
+from src.utils.youtube_handler import get_transcript_hedge, TRANSCRIPT_HEDGED
+from src.utils.vehicle_matcher import get_vehicle_matcher
 import json
 
 logger = setup_logger(__name__)
@@ -238,20 +258,430 @@ def calculate_relevance_score(content: str, make: str, model: str, url: str) ->
     
     return min(score, 10.0)
 
-def process_loan_for_database(loan: Dict[str, Any], run_id: str, outlets_mapping: dict = None) -> Dict[str, Any]:
+# ---------------------------------------------------------------------------
+# Per-URL helpers shared by the sync and async loan pipelines
+# ---------------------------------------------------------------------------
+
+# Opt-in: give a loan's ranked candidates one combined relevance + enhanced sentiment
+# GPT call each, best first, stopping like the relevance-only path does (instead of
+# relevance-only calls here and a separate sentiment call later)
+INGEST_COMBINED_ANALYSIS = os.environ.get('INGEST_COMBINED_ANALYSIS', 'false').lower() == 'true'
+
+# Candidates are sent to GPT best-first (see _rank_candidates) and a loan stops at the
+# first one scoring at least this much - the relevance prompt's floor for an actual
+# review of the vehicle (combined mode uses the same floor, so a brief mention doesn't
+# end the search before a full review). Set it above 10 to score every candidate and
+# keep the max.
+INGEST_GPT_ACCEPT_SCORE = float(os.environ.get('INGEST_GPT_ACCEPT_SCORE', '7'))
+
+class RelevanceTriageStats:
+    """Thread-safe per-run counters of GPT relevance calls made vs avoided by local ranking"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def record(self, candidates: int, gpt_calls: int, cached: int):
+        with self._lock:
+            self._stats['loans'] += 1
+            self._stats['candidates'] += candidates
+            self._stats['gpt_calls'] += gpt_calls
+            self._stats['cached'] += cached
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats['gpt_avoided'] = stats['candidates'] - stats['gpt_calls'] - stats['cached']
+        stats['avoided_rate'] = round(stats['gpt_avoided'] / stats['candidates'], 3) if stats['candidates'] else 0.0
+        return stats
+    
+    def reset(self):
+        with self._lock:
+            self._stats = {'loans': 0, 'candidates': 0, 'gpt_calls': 0, 'cached': 0}
+    
+    def log_stats(self):
+        stats = self.get_stats()
+        if not stats['candidates']:
+            return
+        logger.info(f"📊 GPT relevance triage: {stats['candidates']} candidates over {stats['loans']} loans, "
+                    f"{stats['gpt_calls']} GPT calls, {stats['gpt_avoided']} avoided ({stats['avoided_rate']:.0%}), "
+                    f"{stats['cached']} reused cached scores")
+
+_triage_stats = RelevanceTriageStats()
+
+def get_relevance_triage_stats() -> RelevanceTriageStats:
+    return _triage_stats
+
+class ClipCandidate(NamedTuple):
+    """A crawled result ready for relevance scoring"""
+    url: str
+    result: Dict[str, Any]
+    result_url: str
+    content: str
+    content_title: Optional[str]
+    cached_score: Optional[float]  # accepted score of byte-identical content crawled earlier
+
+def _is_youtube_url(url: str) -> bool:
+    return 'youtube.com' in url or 'youtu.be' in url
+
+def _is_run_cancelled(db, run_id: str) -> bool:
+    """Check processing_runs.job_status; never raises."""
+    try:
+        if db and run_id:
+            st = db.supabase.table('processing_runs').select('job_status').eq('id', run_id).single().execute()
+            return bool(st.data and st.data.get('job_status') == 'cancelled')
+    except Exception:
+        return False
+    return False
+
+def _crawl_loan_url(url: str, loan: Dict[str, Any], cancel_check: Optional[Callable] = None,
+                    prefetched_html: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Dispatch a single (already redirected and authorized) URL to its platform handler."""
+    if _is_youtube_url(url):
+        return process_youtube_url(url, loan, cancel_check=cancel_check)
+    elif 'tiktok.com' in url or 'vm.tiktok.com' in url:
+        # Import the TikTok processing function
+        from src.ingest.ingest import process_tiktok_url
+        return process_tiktok_url(url, loan)
+    elif 'instagram.com' in url:
+        # Import the Instagram processing function
+        from src.ingest.ingest import process_instagram_url
+        return process_instagram_url(url, loan)
+    else:
+        return process_web_url(url, loan, cancel_check=cancel_check, prefetched_html=prefetched_html)
+
+def _prepare_clip_candidate(url: str, result: Dict[str, Any], make: str, model: str) -> Optional[tuple]:
     """
-    Process a single loan and store results to database instead of CSV.
-    Includes URL validation and relevance scoring to prevent storing bad clips.
+    Turn a crawl result into (result_url, content, content_title) ready for relevance scoring.
+    Returns None if the result should be rejected outright.
+    """
+    # Additional validation: Check if result URL is also a homepage
+    result_url = result.get('clip_url') or result.get('url', '')
+    if is_homepage_or_index_url(result_url):
+        logger.warning(f"⚠️ REJECTING result - homepage URL returned: {result_url}")
+        return None
+    
+    # Use GPT relevance-only analysis (like OLD system but without sentiment)
+    content = result.get('extracted_content') or result.get('content', '')
+    # Parsed page from crawl_url; dropped from the result so the tree isn't kept alive
+    document = result.pop('document', None)
+    
+    # CRITICAL FIX: Extract clean article text from HTML before GPT analysis
+    # This ensures GPT analyzes article content, not HTML tags and navigation
+    if content and not _is_youtube_url(url):
+        # Check if content is HTML and extract article text
+        is_html = bool(re.search(r'<html|<body|<div|<p>', content))
+        if is_html:
+            logger.info("Content appears to be HTML. Extracting clean article text...")
+            
+            # Import the content extractor
+            from src.utils.content_extractor import extract_article_content
+            
+            # Create expected topic from vehicle make and model for quality checking
+            expected_topic = f"{make} {model}"
+            if document is None or document.html != content:
+                document = content
+            extracted_content = extract_article_content(document, result_url, expected_topic)
+            
+            # Check if extraction was successful
+            if extracted_content and len(extracted_content.strip()) > 100:
+                logger.info(f"✅ Successfully extracted clean article text: {len(extracted_content)} characters")
+                content = extracted_content  # Use the clean extracted content for GPT analysis
+            else:
+                logger.warning("⚠️ Article extraction failed or returned minimal content. Using raw HTML.")
+                # Don't reject entirely - let GPT try with raw HTML as fallback
+    
+    # Extract title for both YouTube and web content
+    content_title = None
+    if _is_youtube_url(url):
+        # Extract title from the formatted YouTube content
+        title_match = re.search(r'Video Title:\s*(.+?)(?:\n|$)', content)
+        if title_match:
+            content_title = title_match.group(1).strip()
+            logger.info(f"📹 Extracted video title: '{content_title}'")
+    else:
+        # For web articles, use the title from the result
+        content_title = result.get('title', '')
+        if content_title and content_title != result_url:  # Don't use URL as title
+            logger.info(f"📰 Using article title: '{content_title}'")
+    
+    return result_url, content, content_title
+
+def _score_from_gpt_result(gpt_result: Optional[Dict[str, Any]], result_url: str, content: str) -> Optional[float]:
+    """Return the GPT relevance score, or None if the clip should be rejected."""
+    relevance_score = gpt_result.get('relevance_score', 0) if gpt_result else 0
+    
+    # Only store if relevance score is reasonable (same threshold as OLD system)
+    if relevance_score <= 0:
+        logger.warning(f"⚠️ REJECTING clip - GPT relevance score {relevance_score} <= 0")
+        logger.info(f"   URL: {result_url}")
+        logger.info(f"   Content preview: {content[:200]}...")
+        return None
+    return relevance_score
+
+def _fallback_relevance_score(content: str, make: str, model: str, result_url: str) -> Optional[float]:
+    """Simple keyword scoring used when GPT is unavailable; None if the clip should be rejected."""
+    relevance_score = calculate_relevance_score(content, make, model, result_url)
+    if relevance_score < 2.0:
+        logger.warning(f"⚠️ REJECTING clip - fallback relevance score {relevance_score:.1f} < 2.0")
+        return None
+    return relevance_score
+
+def _cached_content_analysis(result: Dict[str, Any], make: str, model: str) -> Optional[tuple]:
     """
+    Reuse extraction + relevance scoring from an earlier crawl of byte-identical content.
+    Returns (result_url, content, relevance_score), or None if this content hasn't been scored.
+    """
+    raw_content = result.get('extracted_content') or result.get('content', '')
+    result['content_hash'] = result.get('content_hash') or content_hash(raw_content)
+    analysis = get_cache_manager().get_content_analysis(result['content_hash'], make, model)
+    if analysis is None:
+        return None
+    
+    result_url = result.get('clip_url') or result.get('url', '')
+    if is_homepage_or_index_url(result_url):
+        return None  # Let the normal path log and reject it
+    
+    logger.info(f"♻️ Unchanged content at {result_url} - reusing relevance score {analysis['relevance_score']} (no extraction/GPT)")
+    return result_url, analysis['content'], analysis['relevance_score']
+
+def _remember_content_analysis(result: Dict[str, Any], make: str, model: str, content: str,
+                               relevance_score: Optional[float]):
+    """Store accepted GPT scores by content hash (zero scores may be API errors, so they aren't kept)."""
+    if relevance_score and relevance_score > 0:
+        get_cache_manager().store_content_analysis(result.get('content_hash'), make, model,
+                                                   {'content': content, 'relevance_score': relevance_score})
+
+def _collect_candidate(url: str, result: Dict[str, Any], make: str, model: str) -> Optional[ClipCandidate]:
+    """Reuse an earlier analysis of unchanged content, else extract the candidate; None if rejected."""
+    cached = _cached_content_analysis(result, make, model)
+    if cached is not None:
+        result_url, content, relevance_score = cached
+        return ClipCandidate(url, result, result_url, content, None, relevance_score)
+    candidate = _prepare_clip_candidate(url, result, make, model)
+    if candidate is None:
+        return None
+    result_url, content, content_title = candidate
+    return ClipCandidate(url, result, result_url, content, content_title, None)
+
+class LocalScore(NamedTuple):
+    """Pre-GPT signals for one candidate, computed for all of a loan's candidates in one pass"""
+    keyword_score: float  # calculate_relevance_score
+    title_tier: int       # best vehicle_matcher tier of the title/URL (0 if neither names the vehicle)
+    date_rank: int        # 0 published on/after the loan start, 1 undated, 2 published before it
+
+def _candidate_published(result: Dict[str, Any]) -> Optional[datetime]:
+    """The crawl result's publish/upload date as a naive datetime, or None"""
+    value = result.get('published_date') or result.get('published')
+    if not value:
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            from src.utils.date_extractor import parse_date_string
+            value = parse_date_string(value)
+    elif not isinstance(value, datetime) and hasattr(value, 'isoformat'):
+        value = datetime(value.year, value.month, value.day)
+    if not isinstance(value, datetime):
+        return None
+    return value.replace(tzinfo=None)
+
+def _local_scores(candidates: List[ClipCandidate], loan: Dict[str, Any]) -> List[LocalScore]:
+    """
+    Keyword score, title/URL match tier and date check for every candidate of a loan.
+    The make/model variations are compiled once and reused across the candidates.
+    """
+    make = loan.get('make', '')
+    model = loan.get('model', '')
+    matcher = get_vehicle_matcher(make, model)
+    start_date = loan.get('start_date')
+    if isinstance(start_date, datetime):
+        start_date = start_date.replace(tzinfo=None)
+    else:
+        start_date = None
+    
+    scores = []
+    for candidate in candidates:
+        scans = [matcher.scan(candidate.result_url.lower())]
+        if candidate.content_title:
+            scans.append(matcher.scan(candidate.content_title.lower()))
+        published = _candidate_published(candidate.result)
+        if published is None or start_date is None:
+            date_rank = 1
+        else:
+            date_rank = 0 if published >= start_date else 2
+        scores.append(LocalScore(
+            keyword_score=calculate_relevance_score(candidate.content, make, model, candidate.result_url),
+            title_tier=matcher.tier(*scans)[0],
+            date_rank=date_rank,
+        ))
+    return scores
+
+def _rank_candidates(wo_number: str, candidates: List[ClipCandidate], loan: Dict[str, Any]) -> List[ClipCandidate]:
+    """
+    Order candidates best-first without GPT: previously accepted content first, then
+    by date check, title/URL match tier and calculate_relevance_score. The sort is
+    stable, so ties keep URL order.
+    """
+    local_scores = dict(zip(map(id, candidates), _local_scores(candidates, loan)))
+    ranked = sorted(candidates, key=lambda c: (
+        c.cached_score is None,
+        local_scores[id(c)].date_rank,
+        -local_scores[id(c)].title_tier,
+        -local_scores[id(c)].keyword_score,
+    ))
+    if len(ranked) > 1:
+        logger.info(f"📊 Ranked {len(ranked)} candidates for {wo_number}: " +
+                    ", ".join(f"{c.result_url} ({local_scores[id(c)].keyword_score:.1f}, "
+                              f"tier {local_scores[id(c)].title_tier})" for c in ranked))
+    return ranked
+
+def _relevance_candidate_clip(candidate: ClipCandidate, loan: Dict[str, Any], wo_number: str) -> Optional[Dict[str, Any]]:
+    """One relevance-only GPT call for a candidate; the finalized clip, or None if rejected."""
+    make = loan.get('make', '')
+    model = loan.get('model', '')
+    result, result_url, content = candidate.result, candidate.result_url, candidate.content
+    if candidate.cached_score is not None:
+        return _finalize_clip(result, candidate.cached_score, loan, wo_number, result_url, content)
+    
+    try:
+        gpt_result = analyze_clip_relevance_only(content, make, model, video_title=candidate.content_title)
+        relevance_score = _score_from_gpt_result(gpt_result, result_url, content)
+        _remember_content_analysis(result, make, model, content, relevance_score)
+    except Exception as e:
+        logger.error(f"❌ GPT relevance analysis failed: {e}")
+        # Fallback to simple scoring on GPT failure
+        relevance_score = _fallback_relevance_score(content, make, model, result_url)
+    if relevance_score is None:
+        return None
+    return _finalize_clip(result, relevance_score, loan, wo_number, result_url, content)
+
+def _accepts(clip: Dict[str, Any], accept_score: float) -> bool:
+    return clip.get('relevance_score', 0) >= accept_score
+
+def _score_best_first(wo_number: str, candidates: List[ClipCandidate], loan: Dict[str, Any],
+                      score_candidate: Callable, accept_score: float) -> List[Dict[str, Any]]:
+    """
+    Score ranked candidates one at a time with score_candidate(candidate, loan, wo_number)
+    until a clip reaches accept_score. Returns the clips accepted so far.
+    """
+    clip_results = []
+    gpt_calls = cached = 0
+    for candidate in _rank_candidates(wo_number, candidates, loan):
+        if candidate.cached_score is None:
+            gpt_calls += 1
+        else:
+            cached += 1
+        clip = score_candidate(candidate, loan, wo_number)
+        if clip is not None:
+            clip_results.append(clip)
+            if _accepts(clip, accept_score):
+                break
+    _record_triage(wo_number, len(candidates), gpt_calls, cached)
+    return clip_results
+
+def _record_triage(wo_number: str, candidates: int, gpt_calls: int, cached: int):
+    _triage_stats.record(candidates, gpt_calls, cached)
+    if gpt_calls + cached < candidates:
+        logger.info(f"♻️ {wo_number}: accepted after {gpt_calls + cached}/{candidates} candidates, "
+                    f"skipped {candidates - gpt_calls - cached} GPT calls")
+
+def _combined_candidate_clip(candidate: ClipCandidate, loan: Dict[str, Any], wo_number: str) -> Optional[Dict[str, Any]]:
+    """One combined relevance + sentiment GPT call for a candidate; the finalized clip, or None if rejected."""
+    from src.analysis.gpt_analysis_enhanced import analyze_clip_combined
+    
+    make = loan.get('make', '')
+    model = loan.get('model', '')
+    result, result_url, content = candidate.result, candidate.result_url, candidate.content
+    if candidate.cached_score is not None:
+        return _finalize_clip(result, candidate.cached_score, loan, wo_number, result_url, content)
+    
+    sentiment = None
+    try:
+        combined = analyze_clip_combined(content, make, model, year=loan.get('year'), trim=loan.get('trim'),
+                                         url=result_url)
+    except Exception as e:
+        logger.error(f"❌ Combined GPT analysis failed: {e}")
+        combined = None
+    if combined is None:
+        # Fallback to simple scoring on GPT failure
+        relevance_score = _fallback_relevance_score(content, make, model, result_url)
+    else:
+        relevance_score = _score_from_gpt_result(combined, result_url, content)
+        _remember_content_analysis(result, make, model, content, relevance_score)
+        sentiment = combined.get('sentiment')
+    if relevance_score is None:
+        return None
+    
+    clip = _finalize_clip(result, relevance_score, loan, wo_number, result_url, content)
+    if sentiment:
+        clip['combined_sentiment'] = sentiment
+    return clip
+
+def _finalize_clip(result: Dict[str, Any], relevance_score: float, loan: Dict[str, Any],
+                   wo_number: str, result_url: str, content: str) -> Dict[str, Any]:
+    """Attach relevance/loan fields and normalize field names between OLD and NEW systems."""
+    logger.info(f"✅ Found clip for {wo_number} at {result_url} - content extracted ({len(content)} chars)")
+    logger.info(f"📊 Relevance score: {relevance_score:.1f}/10.0")
+    
+    # Add relevance score to result and normalize field names
+    result['relevance_score'] = relevance_score
+    result['office'] = loan.get('office', '')
+    result['person_id'] = loan.get('person_id', '')
+    result['activity_id'] = loan.get('activity_id', '')
+    
+    # CRITICAL FIX: Normalize field names between OLD and NEW systems
+    # OLD system expects 'clip_url', NEW system gets 'url' from process_web_url
+    if not result.get('clip_url') and result.get('url'):
+        result['clip_url'] = result['url']
+    if not result.get('extracted_content') and result.get('content'):
+        result['extracted_content'] = result['content']
+    # YouTube ScrapFly returns 'published', but database expects 'published_date'
+    if not result.get('published_date') and result.get('published'):
+        result['published_date'] = result['published']
+    
+    # Debug logging for date tracking
+    if result.get('published_date'):
+        logger.info(f"📅 Result has published_date: {result.get('published_date')}")
+    else:
+        logger.warning(f"⚠️ Result missing published_date for {result_url}")
+        logger.info(f"Result keys: {list(result.keys())}")
+    
+    return result
+
+def _select_best_clip(wo_number: str, clip_results: List[Dict[str, Any]], url_count: int) -> Dict[str, Any]:
+    """Select only the BEST clip per WO# (highest relevance score)."""
+    if clip_results:
+        # Sort by relevance score (highest first), then by processed date (most recent first)
+        best_clip = max(clip_results, key=lambda clip: (
+            clip.get('relevance_score', 0),
+            clip.get('processed_date', '1970-01-01')
+        ))
+        
+        logger.info(f"📊 Selected BEST clip for {wo_number}: relevance {best_clip.get('relevance_score', 0):.1f}/10")
+        logger.info(f"📊 URL Summary for {wo_number}: {len(clip_results)}/{url_count} URLs found, keeping best clip")
+        
+        return {
+            'wo_number': wo_number,
+            'successful': True,
+            'clips': [best_clip]  # Only return the best clip
+        }
+    else:
+        logger.info(f"📊 URL Summary for {wo_number}: 0/{url_count} URLs successful")
+        
+        return {
+            'wo_number': wo_number,
+            'successful': False,
+            'clips': []
+        }
+
+def _prepare_loan(loan: Dict[str, Any]) -> str:
+    """Set search_model on the loan and return its WO#."""
     wo_number = str(loan.get('work_order', ''))
     make = loan.get('make', '')
     model = loan.get('model', '')
     model_short = loan.get('model_short', '')  # Get short model from dashboard
-    contact = loan.get('to', '')
-    person_id = loan.get('person_id', '')
-    
-    # Activity ID should already be in the loan data from load_loans_data_from_url
-    activity_id = loan.get('activity_id', '')
     
     # CRITICAL FIX: Set search_model for hierarchical search (broad to specific)
     # Use short model if available (e.g., "Tacoma" instead of "Tacoma TRD Pro Double Cab")
@@ -263,50 +693,13 @@ def process_loan_for_database(loan: Dict[str, Any], run_id: str, outlets_mapping
         logger.info(f"No short model available, using full model: '{model}'")
     
     logger.info(f"Processing loan {wo_number}: {make} {model} (database mode - no GPT)")
-    
-    urls = loan.get('urls', [])  # URLs are already parsed as a list
-    
-    successful_urls = 0
-    clip_results = []
-    
-    # Collect results from all URLs to pick the best one
-    all_results = []
-    
-    # Lazy import to avoid circulars; used for cancellation checks
-    from src.utils.database import get_database as _get_db
-    db_for_cancel = None
-    try:
-        db_for_cancel = _get_db()
-    except Exception:
-        db_for_cancel = None
+    return wo_number
 
-    for url in urls:
-        # Cooperative cancellation: check DB before each heavy URL processing
-        try:
-            if db_for_cancel and run_id:
-                status_result = db_for_cancel.supabase.table('processing_runs').select('job_status').eq('id', run_id).single().execute()
-                if status_result.data and status_result.data.get('job_status') == 'cancelled':
-                    logger.info(f"Cancellation detected for run {run_id} before processing URL; aborting loan {wo_number}")
-                    raise Exception("Job cancelled by user")
-        except Exception:
-            # If status check fails, continue; do not crash
-            pass
-        # Redirect MotorTrend automobilemag URLs to car-reviews
-        if 'motortrend.com/automobilemag' in url:
-            original_url = url
-            url = url.replace('/automobilemag', '/car-reviews')
-            logger.info(f"🔄 Redirecting MotorTrend URL: {original_url} -> {url}")
-            
-        # Redirect Tightwad Garage to blog section where articles are located
-        if 'tightwadgarage.com' in url and '/blog' not in url:
-            original_url = url
-            # Ensure URL ends with /blog
-            if url.endswith('/'):
-                url = url + 'blog'
-            else:
-                url = url + '/blog'
-            logger.info(f"🔄 Redirecting Tightwad Garage URL: {original_url} -> {url}")
-        
+def _authorized_loan_urls(loan: Dict[str, Any], outlets_mapping: dict = None):
+    """Yield redirected URLs for the loan, skipping outlets the contact is not authorized for."""
+    person_id = loan.get('person_id', '')
+    for url in loan.get('urls', []):  # URLs are already parsed as a list
+        url = apply_url_redirects(url)
         logger.info(f"Processing URL: {url}")
         
         # MEDIA OUTLET VALIDATION - Check if URL is from authorized outlet
@@ -323,31 +716,46 @@ def process_loan_for_database(loan: Dict[str, Any], run_id: str, outlets_mapping
         # if is_homepage_or_index_url(url):
         #     logger.warning(f"⚠️ SKIPPING homepage/index URL: {url}")
         #     continue
+        yield url
+
+def process_loan_for_database(loan: Dict[str, Any], run_id: str, outlets_mapping: dict = None,
+                              cancel_token: Optional[CancellationToken] = None) -> Dict[str, Any]:
+    """
+    Process a single loan and store results to database instead of CSV.
+    Includes URL validation and relevance scoring to prevent storing bad clips.
+    Pass the job's cancel_token to avoid polling processing_runs for every URL.
+    """
+    wo_number = _prepare_loan(loan)
+    make = loan.get('make', '')
+    model = loan.get('model', '')
+    urls = loan.get('urls', [])
+    
+    # Collect results from all URLs to pick the best one
+    all_results = []
+    
+    if cancel_token is not None:
+        _cancelled = cancel_token.is_cancelled
+    else:
+        # Lazy import to avoid circulars; used for cancellation checks
+        from src.utils.database import get_database as _get_db
+        db_for_cancel = None
+        try:
+            db_for_cancel = _get_db()
+        except Exception:
+            db_for_cancel = None
+
+        def _cancelled():
+            return _is_run_cancelled(db_for_cancel, run_id)
+
+    for url in _authorized_loan_urls(loan, outlets_mapping):
+        # Cooperative cancellation: check DB before each heavy URL processing
+        if _cancelled():
+            logger.info(f"Cancellation detected for run {run_id} before processing URL; aborting loan {wo_number}")
+            raise Exception("Job cancelled by user")
             
         # Process the URL based on platform
         try:
-            # Helper to reuse in nested calls
-            def _cancelled():
-                try:
-                    if db_for_cancel and run_id:
-                        st = db_for_cancel.supabase.table('processing_runs').select('job_status').eq('id', run_id).single().execute()
-                        return bool(st.data and st.data.get('job_status') == 'cancelled')
-                except Exception:
-                    return False
-                return False
-
-            if 'youtube.com' in url or 'youtu.be' in url:
-                result = process_youtube_url(url, loan, cancel_check=_cancelled)
-            elif 'tiktok.com' in url or 'vm.tiktok.com' in url:
-                # Import the TikTok processing function
-                from src.ingest.ingest import process_tiktok_url
-                result = process_tiktok_url(url, loan)
-            elif 'instagram.com' in url:
-                # Import the Instagram processing function
-                from src.ingest.ingest import process_instagram_url
-                result = process_instagram_url(url, loan)
-            else:
-                result = process_web_url(url, loan, cancel_check=_cancelled)
+            result = _crawl_loan_url(url, loan, cancel_check=_cancelled)
             
             if result and (result.get('clip_url') or result.get('url')):
                 all_results.append((url, result))
@@ -358,142 +766,378 @@ def process_loan_for_database(loan: Dict[str, Any], run_id: str, outlets_mapping
             logger.error(f"❌ Error processing URL {url}: {e}")
             # Continue processing other URLs even if this one fails
     
-    # Process all collected results through GPT and pick the best one
-    best_result = None
-    best_score = -1
+    candidates = [c for c in (_collect_candidate(url, result, make, model) for url, result in all_results) if c]
+    if INGEST_COMBINED_ANALYSIS:
+        # Combined calls also carry sentiment; the best clip scored so far is kept
+        clip_results = _score_best_first(wo_number, candidates, loan, _combined_candidate_clip,
+                                         INGEST_GPT_ACCEPT_SCORE)
+    else:
+        # Relevance-only GPT calls best-first, until one is clearly a review of the vehicle
+        clip_results = _score_best_first(wo_number, candidates, loan, _relevance_candidate_clip,
+                                         INGEST_GPT_ACCEPT_SCORE)
     
-    for url, result in all_results:
-            # Additional validation: Check if result URL is also a homepage
-            result_url = result.get('clip_url') or result.get('url', '')
-            if is_homepage_or_index_url(result_url):
-                logger.warning(f"⚠️ REJECTING result - homepage URL returned: {result_url}")
-                continue
-            
-            # Use GPT relevance-only analysis (like OLD system but without sentiment)
-            content = result.get('extracted_content') or result.get('content', '')
-            
-            # CRITICAL FIX: Extract clean article text from HTML before GPT analysis
-            # This ensures GPT analyzes article content, not HTML tags and navigation
-            if content and not ('youtube.com' in url or 'youtu.be' in url):
-                # Check if content is HTML and extract article text
-                import re
-                is_html = bool(re.search(r'<html|<body|<div|<p>', content))
-                if is_html:
-                    logger.info("Content appears to be HTML. Extracting clean article text...")
-                    
-                    # Import the content extractor
-                    from src.utils.content_extractor import extract_article_content
-                    
-                    # Create expected topic from vehicle make and model for quality checking
-                    expected_topic = f"{make} {model}"
-                    extracted_content = extract_article_content(content, result_url, expected_topic)
-                    
-                    # Check if extraction was successful
-                    if extracted_content and len(extracted_content.strip()) > 100:
-                        logger.info(f"✅ Successfully extracted clean article text: {len(extracted_content)} characters")
-                        content = extracted_content  # Use the clean extracted content for GPT analysis
-                    else:
-                        logger.warning("⚠️ Article extraction failed or returned minimal content. Using raw HTML.")
-                        # Don't reject entirely - let GPT try with raw HTML as fallback
+    return _select_best_clip(wo_number, clip_results, len(urls))
+
+# ---------------------------------------------------------------------------
+# Native asyncio ingest engine
+#
+# Only the loan bookkeeping lives on the event loop; everything that blocks is
+# pushed to bounded executors so one worker can keep many loans/URLs in flight:
+#   * Tier 1 HTTP fetches use a shared httpx.AsyncClient
+#   * GPT relevance calls use openai's async client
+#   * remaining crawl tiers (ScrapFly SDK, Playwright, YouTube) run on
+#     _CRAWL_EXECUTOR, Supabase calls run on _DB_EXECUTOR
+# ---------------------------------------------------------------------------
+
+MAX_INFLIGHT_LOANS = int(os.environ.get('MAX_INFLIGHT_LOANS', '25'))
+LOAN_STREAM_BATCH = int(os.environ.get('LOAN_STREAM_BATCH', '25'))
+INGEST_CRAWL_THREADS = int(os.environ.get('INGEST_CRAWL_THREADS', '32'))
+INGEST_DB_THREADS = int(os.environ.get('INGEST_DB_THREADS', '8'))
+INGEST_HTTP_CONNECTIONS = int(os.environ.get('INGEST_HTTP_CONNECTIONS', '100'))
+
+_BASIC_HTTP_HEADERS = {
+    'User-Agent': 'DriveShopMediaMonitorBot/1.0',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Encoding': ACCEPT_ENCODING,
+}
+
+_CRAWL_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_DB_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+def _get_executors() -> tuple:
+    """Lazily create the crawl/DB thread pools (shared across asyncio.run calls)."""
+    global _CRAWL_EXECUTOR, _DB_EXECUTOR
+    with _executor_lock:
+        if _CRAWL_EXECUTOR is None:
+            _CRAWL_EXECUTOR = ThreadPoolExecutor(max_workers=INGEST_CRAWL_THREADS, thread_name_prefix='ingest-crawl')
+        if _DB_EXECUTOR is None:
+            _DB_EXECUTOR = ThreadPoolExecutor(max_workers=INGEST_DB_THREADS, thread_name_prefix='ingest-db')
+        return _CRAWL_EXECUTOR, _DB_EXECUTOR
+
+async def _run_in_crawl_executor(func, *args, **kwargs):
+    crawl_executor, _ = _get_executors()
+    # Carry context variables (the run's OpenAI priority) into the crawl thread, like asyncio.to_thread
+    context = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(crawl_executor, partial(context.run, func, *args, **kwargs))
+
+async def _run_in_db_executor(func, *args, **kwargs):
+    _, db_executor = _get_executors()
+    return await asyncio.get_running_loop().run_in_executor(db_executor, partial(func, *args, **kwargs))
+
+def _create_http_client():
+    """Shared async HTTP client for Tier 1 fetches (None if httpx is unavailable)."""
+    try:
+        import httpx
+    except ImportError:
+        logger.warning("⚠️ httpx not installed - Tier 1 fetches will run in crawl threads")
+        return None
+    try:
+        import h2  # noqa: F401 - httpx only negotiates HTTP/2 when h2 is installed
+        http2 = True
+    except ImportError:
+        http2 = False
+    return httpx.AsyncClient(
+        headers=_BASIC_HTTP_HEADERS,
+        timeout=10,
+        follow_redirects=True,
+        http2=http2,
+        limits=httpx.Limits(max_connections=INGEST_HTTP_CONNECTIONS,
+                            max_keepalive_connections=INGEST_HTTP_CONNECTIONS // 2)
+    )
+
+async def _fetch_basic_http_async(client, url: str) -> Optional[str]:
+    """
+    Async equivalent of EnhancedCrawlerManager._fetch_basic_http.
+    Returns the HTML, '' if the fetch failed (Tier 1 is then skipped), or None
+    if the URL cannot be pre-fetched and the crawler should handle it itself.
+    """
+    if client is None or not urlparse(url).netloc:
+        return None
+    start = time.perf_counter()
+    try:
+        logger.info(f"Making async basic HTTP request to {url}")
+        response = await client.get(url)
+        record_request(url, time.perf_counter() - start, response.status_code, error=response.status_code >= 500)
+        if response.status_code == 200:
+            logger.info(f"Async basic HTTP success for {url} ({len(response.text)} chars)")
+            return response.text
+        logger.warning(f"Async basic HTTP failed for {url}: HTTP {response.status_code}")
+        return ''
+    except Exception as e:
+        record_request(url, time.perf_counter() - start, error=True)
+        logger.error(f"Async basic HTTP error for {url}: {e}")
+        return ''
+
+def _tier1_prefetch_url(url: str, loan: Dict[str, Any]) -> Optional[str]:
+    """
+    URL the async engine should prefetch Tier 1 for, or None when crawl_url will
+    answer without fetching (blocked domains, crawl-cache hits including cached
+    no_content outcomes). Uses the same URL and cache key as process_web_url.
+    """
+    target_url, search_model, person_name = web_crawl_target(url, loan)
+    target_url, _, early_result = crawler_manager.precheck(target_url, loan.get('make', ''), search_model, person_name)
+    return None if early_result is not None else target_url
+
+async def _crawl_candidate_async(url: str, loan: Dict[str, Any], wo_number: str, run_id: str,
+                                 cancel_token: CancellationToken, http_client=None,
+                                 domain_limiter=None, single_flight=None) -> Optional[ClipCandidate]:
+    """
+    Crawl one URL of a loan and extract its candidate (no GPT). Returns None if nothing usable.
+    Only the crawl holds a per-domain slot. The Tier 1 prefetch is skipped for URLs
+    crawl_url answers without fetching, and otherwise goes through the run's
+    single_flight group, so loans sharing an outlet URL reuse one fetch.
+    """
+    make = loan.get('make', '')
+    model = loan.get('model', '')
+    
+    try:
+        async with (domain_limiter.acquire(url) if domain_limiter else contextlib.nullcontext()):
+            # Cooperative cancellation: in-memory flag kept fresh by the job's poller
+            if cancel_token.is_cancelled():
+                logger.info(f"Cancellation detected for run {run_id} before processing URL; aborting loan {wo_number}")
+                raise Exception("Job cancelled by user")
             
-            # Extract title for both YouTube and web content
-            content_title = None
-            if 'youtube.com' in url or 'youtu.be' in url:
-                # Extract title from the formatted YouTube content
-                import re
-                title_match = re.search(r'Video Title:\s*(.+?)(?:\n|$)', content)
-                if title_match:
-                    content_title = title_match.group(1).strip()
-                    logger.info(f"📹 Extracted video title: '{content_title}'")
-            else:
-                # For web articles, use the title from the result
-                content_title = result.get('title', '')
-                if content_title and content_title != result_url:  # Don't use URL as title
-                    logger.info(f"📰 Using article title: '{content_title}'")
+            prefetched_html = None
+            if not (_is_youtube_url(url) or 'tiktok.com' in url or 'instagram.com' in url):
+                # Cache lookups are SQLite - keep them off the loop
+                prefetch_url = await _run_in_crawl_executor(_tier1_prefetch_url, url, loan)
+                if prefetch_url is not None and single_flight is not None and http_client is not None:
+                    prefetched_html = await single_flight.do_async(
+                        'tier1', prefetch_url, partial(_fetch_basic_http_async, http_client, prefetch_url))
+                elif prefetch_url is not None:
+                    prefetched_html = await _fetch_basic_http_async(http_client, prefetch_url)
+            result = await _run_in_crawl_executor(_crawl_loan_url, url, loan, cancel_token.is_cancelled, prefetched_html)
+    except Exception as e:
+        # Bubble up cancellation quickly
+        if 'cancelled by user' in str(e).lower():
+            raise
+        logger.error(f"❌ Error processing URL {url}: {e}")
+        return None
+    
+    if not (result and (result.get('clip_url') or result.get('url'))):
+        return None
+    
+    # Unchanged pages reuse their earlier extraction + score, otherwise extract the
+    # article text - hashing/SQLite/HTML parsing are CPU-bound, keep them off the loop
+    return await _run_in_crawl_executor(_collect_candidate, url, result, make, model)
+
+async def _relevance_candidate_clip_async(candidate: ClipCandidate, loan: Dict[str, Any],
+                                         wo_number: str) -> Optional[Dict[str, Any]]:
+    """Async _relevance_candidate_clip: the GPT call goes through openai's async client."""
+    from src.analysis.gpt_analysis import analyze_clip_relevance_only_async
+    
+    make = loan.get('make', '')
+    model = loan.get('model', '')
+    result, result_url, content = candidate.result, candidate.result_url, candidate.content
+    if candidate.cached_score is not None:
+        return _finalize_clip(result, candidate.cached_score, loan, wo_number, result_url, content)
+    
+    try:
+        gpt_result = await analyze_clip_relevance_only_async(content, make, model, video_title=candidate.content_title)
+        relevance_score = _score_from_gpt_result(gpt_result, result_url, content)
+        await _run_in_crawl_executor(_remember_content_analysis, result, make, model, content, relevance_score)
+    except Exception as e:
+        logger.error(f"❌ GPT relevance analysis failed: {e}")
+        # Content scan + regex - CPU-bound like the rest of this path
+        relevance_score = await _run_in_crawl_executor(_fallback_relevance_score, content, make, model, result_url)
+    if relevance_score is None:
+        return None
+    
+    return _finalize_clip(result, relevance_score, loan, wo_number, result_url, content)
+
+async def _combined_candidate_clip_async(candidate: ClipCandidate, loan: Dict[str, Any],
+                                         wo_number: str) -> Optional[Dict[str, Any]]:
+    return await _run_in_crawl_executor(_combined_candidate_clip, candidate, loan, wo_number)
+
+async def _score_best_first_async(wo_number: str, candidates: List[ClipCandidate], loan: Dict[str, Any],
+                                  score_candidate: Callable, accept_score: float) -> List[Dict[str, Any]]:
+    """Async _score_best_first; score_candidate is a coroutine function"""
+    clip_results = []
+    gpt_calls = cached = 0
+    for candidate in _rank_candidates(wo_number, candidates, loan):
+        if candidate.cached_score is None:
+            gpt_calls += 1
+        else:
+            cached += 1
+        clip = await score_candidate(candidate, loan, wo_number)
+        if clip is not None:
+            clip_results.append(clip)
+            if _accepts(clip, accept_score):
+                break
+    _record_triage(wo_number, len(candidates), gpt_calls, cached)
+    return clip_results
+
+async def process_loan_for_database_async(loan: Dict[str, Any], run_id: str, outlets_mapping: dict = None,
+                                          cancel_token: Optional[CancellationToken] = None, http_client=None,
+                                          domain_limiter=None, single_flight=None) -> Dict[str, Any]:
+    """
+    Async version of process_loan_for_database with identical selection logic.
+    The loan's URLs are crawled concurrently (bounded per domain by domain_limiter),
+    so a loan takes as long as its slowest URL rather than the sum of all of them.
+    The candidates are then ranked locally and sent to GPT best-first, after the
+    crawls released their per-domain slots.
+    """
+    wo_number = _prepare_loan(loan)
+    urls = loan.get('urls', [])
+    if cancel_token is None:
+        cancel_token = CancellationToken(run_id)  # Never signalled - caller isn't tracking cancellation
+    
+    crawl_tasks = [
+        _crawl_candidate_async(url, loan, wo_number, run_id, cancel_token,
+                               http_client=http_client, domain_limiter=domain_limiter,
+                               single_flight=single_flight)
+        for url in _authorized_loan_urls(loan, outlets_mapping)
+    ]
+    outcomes = await asyncio.gather(*crawl_tasks, return_exceptions=True)
+    
+    # gather() preserves URL order, so ranking ties resolve exactly like the serial path
+    candidates = []
+    for outcome in outcomes:
+        if isinstance(outcome, BaseException):
+            # Only cancellation escapes _crawl_candidate_async
+            raise outcome
+        if outcome is not None:
+            candidates.append(outcome)
+    
+    if INGEST_COMBINED_ANALYSIS:
+        clip_results = await _score_best_first_async(wo_number, candidates, loan, _combined_candidate_clip_async,
+                                                     INGEST_GPT_ACCEPT_SCORE)
+    else:
+        clip_results = await _score_best_first_async(wo_number, candidates, loan, _relevance_candidate_clip_async,
+                                                     INGEST_GPT_ACCEPT_SCORE)
+    return _select_best_clip(wo_number, clip_results, len(urls))
+
+def _check_retry_or_record_skip(db, wo_number: str, run_id: str) -> bool:
+    """SMART RETRY LOGIC: return True if the WO# should be processed, otherwise record the skip."""
+    should_process = db.should_retry_wo(wo_number)
+    if should_process:
+        return True
+    
+    # Determine skip reason based on database state
+    clips_result = db.supabase.table('clips').select('status').eq('wo_number', wo_number).execute()
+    clip_status = clips_result.data[0].get('status', '') if clips_result.data else None
+    skip_reason = db.skip_reason_for_clip_status(clip_status)
+    
+    # Record the skip event
+    db.record_skip_event(wo_number, run_id, skip_reason)
+    logger.info(f"⏭️ Skipping {wo_number} - {skip_reason}")
+    return False
+
+def _store_loan_outcome(db, loan: Dict[str, Any], result: Optional[Dict[str, Any]], run_id: str,
+                        writer=None) -> bool:
+    """
+    STORES ALL LOAN ATTEMPTS (successful and failed) to database.
+    With a BufferedClipWriter the rows (including wo_tracking) are queued for a batched flush.
+    Returns True if processed (clip stored, or failure recorded).
+    """
+    store = writer or db
+    if result and result.get('successful') and result.get('clips'):
+        # SUCCESS: Store clips to database
+        stored_clips = 0
+        for clip_result in result['clips']:
+            clip_data = {
+                'wo_number': result['wo_number'],
+                'processing_run_id': run_id,
+                'office': clip_result.get('office'),
+                'make': loan.get('make'),
+                'model': loan.get('model'),  # This is already the base model from ingest.py
+                'trim': loan.get('trim'),  # This already has the extracted trim from ingest.py
+                'contact': loan.get('to'),  # FIX: Get contact name from loan data, not clip_result
+                'person_id': clip_result.get('person_id'),
+                'activity_id': loan.get('activity_id'),  # FIX: Get Activity_ID from loan data, not clip_result
+                'clip_url': clip_result.get('clip_url'),
+                'extracted_content': clip_result.get('extracted_content'),
+                'published_date': _normalize_date_for_storage(clip_result.get('published_date')),
+                'attribution_strength': clip_result.get('attribution_strength'),
+                'byline_author': clip_result.get('byline_author'),
+                'tier_used': clip_result.get('processing_method', 'Unknown'),
+                'relevance_score': clip_result.get('relevance_score', 0.0),
+                'status': 'pending_review',  # No GPT analysis yet
+                'workflow_stage': 'found'
+            }
+            if clip_result.get('combined_sentiment'):
+                # Combined analysis mode: the sentiment job reuses this instead of calling GPT again
+                clip_data['sentiment_data_enhanced'] = json.dumps(clip_result['combined_sentiment'])
             
             try:
-                gpt_result = analyze_clip_relevance_only(content, make, model, video_title=content_title)
-                relevance_score = gpt_result.get('relevance_score', 0) if gpt_result else 0
-                
-                # Only store if relevance score is reasonable (same threshold as OLD system)
-                if relevance_score <= 0:
-                    logger.warning(f"⚠️ REJECTING clip - GPT relevance score {relevance_score} <= 0")
-                    logger.info(f"   URL: {result_url}")
-                    logger.info(f"   Content preview: {content[:200]}...")
-                    continue
+                success = store.store_clip(clip_data)
+                if success:
+                    if writer is None:
+                        db.mark_wo_success(result['wo_number'], clip_result.get('clip_url'))
+                    logger.info(f"✅ Stored clip for {result['wo_number']} in database")
+                    stored_clips += 1
+                else:
+                    logger.error(f"❌ Failed to store clip for {result['wo_number']}")
+                    db.mark_wo_attempt(result['wo_number'], 'store_failed', 'Database storage failed')
             except Exception as e:
-                logger.error(f"❌ GPT relevance analysis failed: {e}")
-                # Fallback to simple scoring on GPT failure
-                relevance_score = calculate_relevance_score(content, make, model, result_url)
-                if relevance_score < 2.0:
-                    logger.warning(f"⚠️ REJECTING clip - fallback relevance score {relevance_score:.1f} < 2.0")
-                    continue
-            
-            logger.info(f"✅ Found clip for {wo_number} at {result_url} - content extracted ({len(content)} chars)")
-            logger.info(f"📊 Relevance score: {relevance_score:.1f}/10.0")
-            
-            # Add relevance score to result and normalize field names
-            result['relevance_score'] = relevance_score
-            result['office'] = loan.get('office', '')
-            result['person_id'] = person_id
-            result['activity_id'] = activity_id
-            
-            # CRITICAL FIX: Normalize field names between OLD and NEW systems
-            # OLD system expects 'clip_url', NEW system gets 'url' from process_web_url
-            if not result.get('clip_url') and result.get('url'):
-                result['clip_url'] = result['url']
-            if not result.get('extracted_content') and result.get('content'):
-                result['extracted_content'] = result['content']
-            # YouTube ScrapFly returns 'published', but database expects 'published_date'
-            if not result.get('published_date') and result.get('published'):
-                result['published_date'] = result['published']
-            
-            # Debug logging for date tracking
-            if result.get('published_date'):
-                logger.info(f"📅 Result has published_date: {result.get('published_date')}")
-            else:
-                logger.warning(f"⚠️ Result missing published_date for {result_url}")
-                logger.info(f"Result keys: {list(result.keys())}")
-            
-            clip_results.append(result)
-            successful_urls += 1
-            # Continue processing all URLs to find the BEST clip
-    
-    # NEW: Select only the BEST clip per WO# (highest relevance score)
-    if clip_results:
-        # Sort by relevance score (highest first), then by processed date (most recent first)
-        best_clip = max(clip_results, key=lambda clip: (
-            clip.get('relevance_score', 0),
-            clip.get('processed_date', '1970-01-01')
-        ))
-        
-        logger.info(f"📊 Selected BEST clip for {wo_number}: relevance {best_clip.get('relevance_score', 0):.1f}/10")
-        logger.info(f"📊 URL Summary for {wo_number}: {successful_urls}/{len(urls)} URLs found, keeping best clip")
+                logger.error(f"❌ Failed to store clip: {e}")
+                db.mark_wo_attempt(result['wo_number'], 'store_failed', str(e))
         
-        return {
-            'wo_number': wo_number,
-            'successful': True,
-            'clips': [best_clip]  # Only return the best clip
-        }
+        return stored_clips > 0
     else:
-        logger.info(f"📊 URL Summary for {wo_number}: {successful_urls}/{len(urls)} URLs successful")
+        # FAILURE: No clips found - STORE to database with failed status
+        wo_number = result.get('wo_number') if result else loan.get('work_order', 'unknown')
         
-        return {
+        # ENHANCEMENT: Store original source URLs for transparency in View link
+        original_urls = loan.get('urls', [])
+        original_urls_text = '; '.join(original_urls) if original_urls else 'No URLs provided'
+        
+        # Store the failed attempt as a record with no_content_found status
+        failed_loan_data = {
             'wo_number': wo_number,
-            'successful': False,
-            'clips': []
+            'processing_run_id': run_id,
+            'office': loan.get('office'),
+            'make': loan.get('make'),
+            'model': loan.get('model'),
+            'contact': loan.get('to'),
+            'person_id': loan.get('person_id'),
+            'activity_id': loan.get('activity_id'),  # Activity_ID is correctly sourced from loan data
+            'tier_used': result.get('tier_used', 'Unknown') if result else 'Unknown',
+            'workflow_stage': 'found',
+            # NEW: Store original source URLs for View link
+            'original_urls': original_urls_text,
+            'urls_attempted': len(original_urls),
+            'failure_reason': f"No content found from {len(original_urls)} URLs: {original_urls_text[:100]}..."
         }
+        
+        try:
+            # Store as no_content_found status
+            success = store.store_failed_attempt(failed_loan_data, 'no_content_found')
+            if success:
+                logger.info(f"✅ Stored failed attempt for {wo_number} in database")
+            else:
+                logger.error(f"❌ Failed to store failed attempt for {wo_number}")
+        except Exception as e:
+            logger.error(f"❌ Exception storing failed attempt: {e}")
+            # Store as processing_failed if we can't even store the no_content_found
+            try:
+                store.store_failed_attempt(failed_loan_data, 'processing_failed')
+            except:
+                pass  # Last resort - don't let this break the pipeline
+        
+        return True  # Return True because we DID process it (even if no clips found)
 
-async def process_loan_database_async(semaphore: asyncio.Semaphore, loan: Dict[str, Any], db, run_id: str, outlets_mapping: dict = None) -> bool:
+async def process_loan_database_async(semaphore: asyncio.Semaphore, loan: Dict[str, Any], db, run_id: str,
+                                      outlets_mapping: dict = None, http_client=None, domain_limiter=None,
+                                      retry_planned: bool = False, writer=None,
+                                      cancel_token: Optional[CancellationToken] = None,
+                                      single_flight=None) -> bool:
     """
-    Async wrapper for database-integrated loan processing with smart retry logic.
+    Database-integrated loan processing with smart retry logic on the native async engine.
     STORES ALL LOAN ATTEMPTS (successful and failed) to database.
     
     Args:
-        semaphore: Async semaphore to control concurrency
+        semaphore: Async semaphore bounding loans in flight
         loan: Loan data dictionary
         db: Database manager instance
         run_id: Processing run ID for tracking
+        http_client: Shared httpx.AsyncClient for Tier 1 fetches (optional)
+        domain_limiter: Per-domain URL concurrency caps shared by the run (optional)
+        retry_planned: True if plan_wo_retries already cleared this WO# for processing
+        writer: BufferedClipWriter for batched clip/wo_tracking writes (optional)
+        cancel_token: The job's CancellationToken (optional)
+        single_flight: The run's SingleFlightGroup coalescing duplicate URL fetches (optional)
         
     Returns:
         True if processed (success or failure), False if skipped
@@ -501,185 +1145,199 @@ async def process_loan_database_async(semaphore: asyncio.Semaphore, loan: Dict[s
     async with semaphore:
         wo_number = loan.get('work_order', '')
         
-        # SMART RETRY LOGIC: Check if we should process this WO#
-        should_process = db.should_retry_wo(wo_number)
-        if not should_process:
-            # Determine skip reason based on database state
-            clips_result = db.supabase.table('clips').select('status').eq('wo_number', wo_number).execute()
-            if clips_result.data:
-                clip_status = clips_result.data[0].get('status', '')
-                if clip_status in ['approved', 'pending_review', 'rejected']:
-                    skip_reason = f'already_{clip_status}'
-                elif clip_status in ['no_content_found', 'processing_failed']:
-                    skip_reason = 'retry_cooldown'
-                else:
-                    skip_reason = 'unknown'
-            else:
-                skip_reason = 'unknown'
-            
-            # Record the skip event
-            db.record_skip_event(wo_number, run_id, skip_reason)
-            logger.info(f"⏭️ Skipping {wo_number} - {skip_reason}")
+        if not retry_planned and not await _run_in_db_executor(_check_retry_or_record_skip, db, wo_number, run_id):
             return False
         
-        # Process the loan (crawling + content extraction, no GPT)
-        result = await asyncio.to_thread(process_loan_for_database, loan, run_id, outlets_mapping)
-        
-        if result and result.get('successful') and result.get('clips'):
-            # SUCCESS: Store clips to database
-            stored_clips = 0
-            for clip_result in result['clips']:
-                clip_data = {
-                    'wo_number': result['wo_number'],
-                    'processing_run_id': run_id,
-                    'office': clip_result.get('office'),
-                    'make': loan.get('make'),
-                    'model': loan.get('model'),  # This is already the base model from ingest.py
-                    'trim': loan.get('trim'),  # This already has the extracted trim from ingest.py
-                    'contact': loan.get('to'),  # FIX: Get contact name from loan data, not clip_result
-                    'person_id': clip_result.get('person_id'),
-                    'activity_id': loan.get('activity_id'),  # FIX: Get Activity_ID from loan data, not clip_result
-                    'clip_url': clip_result.get('clip_url'),
-                    'extracted_content': clip_result.get('extracted_content'),
-                    'published_date': _normalize_date_for_storage(clip_result.get('published_date')),
-                    'attribution_strength': clip_result.get('attribution_strength'),
-                    'byline_author': clip_result.get('byline_author'),
-                    'tier_used': clip_result.get('processing_method', 'Unknown'),
-                    'relevance_score': clip_result.get('relevance_score', 0.0),
-                    'status': 'pending_review',  # No GPT analysis yet
-                    'workflow_stage': 'found'
-                }
-                
-                try:
-                    success = db.store_clip(clip_data)
-                    if success:
-                        db.mark_wo_success(result['wo_number'], clip_result.get('clip_url'))
-                        logger.info(f"✅ Stored clip for {result['wo_number']} in database")
-                        stored_clips += 1
-                    else:
-                        logger.error(f"❌ Failed to store clip for {result['wo_number']}")
-                        db.mark_wo_attempt(result['wo_number'], 'store_failed', 'Database storage failed')
-                except Exception as e:
-                    logger.error(f"❌ Failed to store clip: {e}")
-                    db.mark_wo_attempt(result['wo_number'], 'store_failed', str(e))
-            
-            return stored_clips > 0
-        else:
-            # FAILURE: No clips found - STORE to database with failed status
-            wo_number = result.get('wo_number') if result else loan.get('work_order', 'unknown')
-            
-            # ENHANCEMENT: Store original source URLs for transparency in View link
-            original_urls = loan.get('urls', [])
-            original_urls_text = '; '.join(original_urls) if original_urls else 'No URLs provided'
-            
-            # Store the failed attempt as a record with no_content_found status
-            failed_loan_data = {
-                'wo_number': wo_number,
-                'processing_run_id': run_id,
-                'office': loan.get('office'),
-                'make': loan.get('make'),
-                'model': loan.get('model'),
-                'contact': loan.get('to'),
-                'person_id': loan.get('person_id'),
-                'activity_id': loan.get('activity_id'),  # Activity_ID is correctly sourced from loan data
-                'tier_used': result.get('tier_used', 'Unknown') if result else 'Unknown',
-                'workflow_stage': 'found',
-                # NEW: Store original source URLs for View link
-                'original_urls': original_urls_text,
-                'urls_attempted': len(original_urls),
-                'failure_reason': f"No content found from {len(original_urls)} URLs: {original_urls_text[:100]}..."
-            }
-            
-            try:
-                # Store as no_content_found status
-                success = db.store_failed_attempt(failed_loan_data, 'no_content_found')
-                if success:
-                    logger.info(f"✅ Stored failed attempt for {wo_number} in database")
-                else:
-                    logger.error(f"❌ Failed to store failed attempt for {wo_number}")
-            except Exception as e:
-                logger.error(f"❌ Exception storing failed attempt: {e}")
-                # Store as processing_failed if we can't even store the no_content_found
-                try:
-                    db.store_failed_attempt(failed_loan_data, 'processing_failed')
-                except:
-                    pass  # Last resort - don't let this break the pipeline
-            
-            return True  # Return True because we DID process it (even if no clips found)
+        # Process the loan (crawling + content extraction + relevance scoring)
+        result = await process_loan_for_database_async(loan, run_id, outlets_mapping, cancel_token=cancel_token,
+                                                       http_client=http_client, domain_limiter=domain_limiter,
+                                                       single_flight=single_flight)
+        
+        return await _run_in_db_executor(_store_loan_outcome, db, loan, result, run_id, writer)
+
+def _next_loan_batch(loans: Iterator[Dict[str, Any]], size: int, lock: threading.Lock) -> List[Dict[str, Any]]:
+    """Pull up to `size` loans from a (possibly still downloading) loan stream"""
+    with lock:
+        return list(itertools.islice(loans, size))
+
+def _close_loan_stream(loans: Iterator[Dict[str, Any]], lock: threading.Lock):
+    """
+    Close a loan generator (and the report download behind it). Waits for a batch
+    read still running in the DB executor - a cancelled await doesn't stop it.
+    """
+    close = getattr(loans, 'close', None)
+    if close is None:
+        return
+    with lock:
+        close()
 
 async def process_loans_database_concurrent(
-    loans: List[Dict[str, Any]], 
+    loans: Iterable[Dict[str, Any]], 
     db, 
     run_id: str, 
     outlets_mapping: dict = None,
-    progress_callback: Optional[Callable] = None
+    progress_callback: Optional[Callable] = None,
+    cancel_token: Optional[CancellationToken] = None
 ) -> Dict[str, int]:
     """
     Process multiple loans concurrently with database storage and smart retry logic.
     
     Args:
-        loans: List of loan dictionaries
+        loans: List of loan dictionaries, or an iterator of loans (e.g. iter_loan_report)
+            that is consumed in LOAN_STREAM_BATCH batches while earlier loans are processed
         db: Database manager instance
         run_id: Processing run ID for tracking
+        progress_callback: Called with (completed, total); total grows while a stream is read
+        cancel_token: The job's CancellationToken; if omitted, one is polled here for run_id
         
     Returns:
         Dictionary with processing statistics
     """
-    if not loans:
-        return {'processed': 0, 'skipped': 0, 'successful': 0, 'failed': 0}
+    streaming = not isinstance(loans, (list, tuple))
+    if not streaming and not loans:
+        return {'processed': 0, 'skipped': 0, 'successful': 0, 'failed': 0, 'total': 0}
     
-    # Create semaphore to control concurrency
-    semaphore = asyncio.Semaphore(MAX_CONCURRENT)
+    # Feed rate-limit headers of successful calls to the dispatcher (openai 0.27 only)
+    install_response_header_hook()
     
-    logger.info(f"Starting database-integrated concurrent processing of {len(loans)} loans (max {MAX_CONCURRENT} concurrent)")
+    # Bound loans in flight; blocking work is further bounded by the executors
+    semaphore = asyncio.Semaphore(MAX_INFLIGHT_LOANS)
+    http_client = _create_http_client()
+    domain_limiter = DomainConcurrencyLimiter()
+    writer = BufferedClipWriter(db)
     
-    # Create tasks for all loans
-    tasks = [
-        process_loan_database_async(semaphore, loan, db, run_id, outlets_mapping) 
-        for loan in loans
-    ]
+    # One status poller per job; everything below reads the in-memory flag
+    cancel_poller = None
+    if cancel_token is None:
+        cancel_poller = JobCancellationPoller(db, run_id) if run_id else None
+        cancel_token = cancel_poller.start() if cancel_poller else CancellationToken(run_id)
     
-    # Process tasks and track progress
+    logger.info(f"Starting database-integrated concurrent processing of "
+                f"{'streamed' if streaming else len(loans)} loans "
+                f"(max {MAX_INFLIGHT_LOANS} in flight, {INGEST_CRAWL_THREADS} crawl threads)")
+    
+    tasks = []
+    pending = set()
     processed_count = 0
     skipped_count = 0
     error_count = 0
-    total_loans = len(loans)
+    total_loans = 0
     
-    # Process tasks as they complete for progress tracking
-    results = []
-    for i, task in enumerate(asyncio.as_completed(tasks)):
-        try:
-            # Cooperative cancellation: check job status before awaiting each task
-            try:
-                current_run = db.supabase.table('processing_runs').select('job_status').eq('id', run_id).single().execute()
-                if current_run.data and current_run.data.get('job_status') == 'cancelled':
-                    logger.info(f"Run {run_id} cancelled - stopping further processing")
-                    break
-            except Exception:
-                # If we can't read status, continue but don't crash
-                pass
-
-            result = await task
-            results.append(result)
+    def report_progress(force: bool = False):
+        # Update progress callback every 2 records or at milestones for smoother updates
+        completed = skipped_count + processed_count + error_count
+        if progress_callback and (force or completed % 2 == 0 or completed == total_loans or completed == 1):
+            progress_callback(completed, total_loans)
+    
+    async def schedule(batch: List[Dict[str, Any]]):
+        nonlocal skipped_count, total_loans
+        total_loans += len(batch)
+        
+        # SMART RETRY LOGIC: decide skip/process for every WO# of the batch in a few bulk queries
+        retry_plan = await _run_in_db_executor(db.plan_wo_retries, [loan.get('work_order', '') for loan in batch])
+        skip_reasons = {}
+        for loan in batch:
+            wo_number = str(loan.get('work_order', ''))
+            if retry_plan.get(wo_number):
+                skip_reasons[wo_number] = retry_plan[wo_number]
+                logger.info(f"⏭️ Skipping {wo_number} - {retry_plan[wo_number]}")
+                continue
+            # Unplanned WO#s fall back to the per-WO check
+            task = asyncio.ensure_future(process_loan_database_async(
+                semaphore, loan, db, run_id, outlets_mapping, http_client, domain_limiter,
+                retry_planned=wo_number in retry_plan, writer=writer, cancel_token=cancel_token,
+                single_flight=single_flight))
+            tasks.append(task)
+            pending.add(task)
+        if skip_reasons:
+            await _run_in_db_executor(db.record_skip_events, skip_reasons, run_id)
+            skipped_count += len(skip_reasons)
+            report_progress(force=True)
+    
+    # Loans are scheduled batch by batch while the rest of the report is still downloading
+    loan_stream = iter(loans) if streaming else None
+    loan_stream_lock = threading.Lock()
+    
+    async def produce():
+        while not cancel_token.is_cancelled():
+            batch = await _run_in_db_executor(_next_loan_batch, loan_stream, LOAN_STREAM_BATCH, loan_stream_lock)
+            if not batch:
+                return
+            await schedule(batch)
+    
+    # Loans sharing an outlet URL await one fetch instead of each starting their own
+    single_flight = begin_run(run_id or 'run')
+    producer = None
+    try:
+        if streaming:
+            producer = asyncio.ensure_future(produce())
+        else:
+            await schedule(list(loans))
+        
+        # Process tasks as they complete for progress tracking
+        while pending or (producer is not None and not producer.done()):
+            # Cooperative cancellation: check job status before waiting on more loans
+            if cancel_token.is_cancelled():
+                logger.info(f"Run {run_id} cancelled - stopping further processing")
+                break
             
-            if result is True:
-                processed_count += 1
-            elif result is False:
-                skipped_count += 1
-                
-            # Update progress callback every 2 records or at milestones for smoother updates
-            completed = i + 1
-            if progress_callback and (completed % 2 == 0 or completed == total_loans or completed == 1):
-                progress_callback(completed, total_loans)
-                
-        except Exception as e:
-            results.append(e)
-            error_count += 1
-            # Find which loan failed
-            logger.error(f"Error processing loan: {e}")
+            waiting = set(pending)
+            if producer is not None and not producer.done():
+                waiting.add(producer)
+            done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+            
+            for task in done:
+                if task is producer:
+                    task.result()  # Surface report download/parse errors
+                    continue
+                pending.discard(task)
+                try:
+                    result = task.result()
+                    
+                    if result is True:
+                        processed_count += 1
+                    elif result is False:
+                        skipped_count += 1
+                    
+                    report_progress()
+                    
+                except Exception as e:
+                    error_count += 1
+                    logger.error(f"Error processing loan: {e}")
+    finally:
+        # Don't leave loans (or the report reader) running after a cancel/break
+        if producer is not None and not producer.done():
+            producer.cancel()
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        await asyncio.gather(*tasks, *([producer] if producer is not None else []), return_exceptions=True)
+        if loan_stream is not None:
+            # Stop reading the report now rather than when the generator is collected
+            try:
+                await _run_in_db_executor(_close_loan_stream, loan_stream, loan_stream_lock)
+            except Exception as e:
+                logger.warning(f"Error closing loan report stream: {e}")
+        if http_client is not None:
+            await http_client.aclose()
+        # Flush buffered clip/wo_tracking rows (also on cancel) before counting stored clips
+        await _run_in_db_executor(writer.close)
+        if cancel_poller is not None:
+            cancel_poller.stop()
+        log_http_metrics()
+        get_whisper_pool().log_stats()
+        if TRANSCRIPT_HEDGED:
+            get_transcript_hedge().log_stats()
+        if single_flight is not None:
+            single_flight.log_stats()
+        get_article_cache().log_stats()
+        get_openai_dispatcher().log_stats()
+        _triage_stats.log_stats()
+        _triage_stats.reset()
+        end_run(single_flight)
     
     # Get success count from database (clips that were actually stored)
-    clips_stored = db.get_pending_clips(run_id)
+    clips_stored = await _run_in_db_executor(db.get_pending_clips, run_id)
     successful_count = len(clips_stored)
     failed_count = processed_count - successful_count
     
@@ -688,7 +1346,8 @@ async def process_loans_database_concurrent(
         'skipped': skipped_count, 
         'successful': successful_count,
         'failed': failed_count,
-        'errors': error_count
+        'errors': error_count,
+        'total': total_loans
     }
     
     logger.info(f"Database processing completed: {stats}")
@@ -746,8 +1405,9 @@ def run_ingest_database(
         # Load outlets mapping for media validation
         outlets_mapping = load_person_outlets_mapping()
         
-        # Process loans with database storage and smart retry logic
-        stats = asyncio.run(process_loans_database_concurrent(loans, db, run_id, outlets_mapping, None))
+        # Process loans with database storage and smart retry logic (batch priority for GPT calls)
+        with openai_priority(PRIORITY_BATCH):
+            stats = asyncio.run(process_loans_database_concurrent(loans, db, run_id, outlets_mapping, None))
         
         # Update processing run with final statistics
         db.finish_processing_run(
@@ -825,10 +1485,11 @@ def run_ingest_database_with_filters(
         # Load outlets mapping for media validation
         outlets_mapping = load_person_outlets_mapping()
         
-        # Process loans
-        stats = asyncio.run(process_loans_database_concurrent(
-            loans_to_process, db, run_id, outlets_mapping, progress_callback
-        ))
+        # Process loans (batch priority for GPT calls)
+        with openai_priority(PRIORITY_BATCH):
+            stats = asyncio.run(process_loans_database_concurrent(
+                loans_to_process, db, run_id, outlets_mapping, progress_callback
+            ))
         
         # Update processing run
         db.finish_processing_run(
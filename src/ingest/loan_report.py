@@ -0,0 +1,364 @@
+"""
+Streaming loader for the "media_loans_without_clips" loan report.
+
+Rows are parsed with the csv module while the download is still in progress,
+filtered (office/make/model/reporter/WO#/Activity ID/skip/date/limit) as they
+arrive and yielded one loan at a time, so the ingest scheduler can start
+crawling before the report has finished downloading.
+
+Every full download is also written to data/report_cache/ together with its
+ETag/Last-Modified validators. Within LOAN_REPORT_CACHE_SECONDS the cached copy
+is used as-is; after that a conditional GET revalidates it, so the dashboard
+and the background worker share one download of the same report.
+"""
+
+import os
+import io
+import csv
+import json
+import time
+import hashlib
+import tempfile
+from pathlib import Path
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Any, Iterator, List, Optional, TextIO
+
+import pandas as pd
+import dateutil.parser
+
+from src.utils.logger import setup_logger
+from src.utils.http_pool import get_http_session
+
+logger = setup_logger(__name__)
+
+LOAN_REPORT_CACHE_SECONDS = int(os.environ.get('LOAN_REPORT_CACHE_SECONDS', '300'))
+LOAN_REPORT_TIMEOUT = int(os.environ.get('LOAN_REPORT_TIMEOUT', '30'))
+
+# The report has no header row
+LOAN_REPORT_COLUMNS = [
+    "ActivityID", "Person_ID", "Make", "Model", "WO #", "Office", "To",
+    "Affiliation", "Start Date", "Stop Date", "Model Short Name", "Links"
+]
+# pandas inferred these as integers in the old DataFrame-based loader
+_INTEGER_COLUMNS = ("ActivityID", "Person_ID", "WO #")
+
+_ALL_VALUES = {
+    'office': ('All', 'All Offices'),
+    'make': ('All', 'All Makes'),
+    'model': ('All', 'All Models'),
+    'reporter': ('All', 'All Reporters'),
+}
+
+def parse_start_date(date_str: str) -> Optional[datetime]:
+    """
+    Parse a date string from the Start Date column.
+    Handles various date formats commonly found in spreadsheets.
+
+    Args:
+        date_str: Date string from the spreadsheet
+
+    Returns:
+        datetime object or None if parsing fails
+    """
+    if not date_str or pd.isna(date_str):
+        return None
+
+    try:
+        # Convert to string if it's not already
+        date_str = str(date_str).strip()
+
+        # Handle empty strings
+        if not date_str:
+            return None
+
+        # Use dateutil parser which handles many formats automatically
+        parsed_date = dateutil.parser.parse(date_str)
+        return parsed_date
+
+    except (ValueError, TypeError) as e:
+        logger.warning(f"Could not parse date '{date_str}': {e}")
+        return None
+
+# ---------------------------------------------------------------------------
+# Report cache
+# ---------------------------------------------------------------------------
+
+def _cache_paths(url: str):
+    project_root = Path(__file__).parent.parent.parent
+    cache_dir = os.path.join(project_root, 'data', 'report_cache')
+    os.makedirs(cache_dir, exist_ok=True)
+    key = hashlib.sha256(url.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{key}.csv"), os.path.join(cache_dir, f"{key}.json")
+
+def _read_meta(meta_path: str) -> Dict[str, Any]:
+    try:
+        with open(meta_path) as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+def _write_meta(meta_path: str, meta: Dict[str, Any]):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(meta_path), suffix='.json.tmp')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, meta_path)
+
+class _TeeReader(io.RawIOBase):
+    """Raw stream over the decoded response body that copies everything it reads to a file"""
+
+    def __init__(self, raw, sink):
+        self._raw = raw
+        self._sink = sink
+        self._buffer = b''
+        self.finished = False
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        if not self._buffer:
+            self._buffer = self._raw.read(len(b)) or b''
+            if not self._buffer:
+                self.finished = True
+                return 0
+            self._sink.write(self._buffer)
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
+
+def _text_stream(binary) -> TextIO:
+    return io.TextIOWrapper(binary, encoding='utf-8', errors='replace', newline='')
+
+@contextmanager
+def open_loan_report(url: str, max_age: Optional[int] = None) -> Iterator[TextIO]:
+    """
+    Open the report as a text stream, from the cache when it is fresh (or the
+    server answers 304), otherwise streamed from the network while being cached.
+    A download the caller stops reading early is not cached.
+    """
+    max_age = LOAN_REPORT_CACHE_SECONDS if max_age is None else max_age
+    csv_path, meta_path = _cache_paths(url)
+    meta = _read_meta(meta_path)
+    cached = os.path.exists(csv_path) and meta.get('url') == url
+
+    if cached and time.time() - meta.get('fetched_at', 0) < max_age:
+        logger.info(f"♻️ Using cached loan report ({int(time.time() - meta['fetched_at'])}s old)")
+        with open(csv_path, 'rb') as f:
+            yield _text_stream(f)
+        return
+
+    headers = {}
+    if cached and meta.get('etag'):
+        headers['If-None-Match'] = meta['etag']
+    if cached and meta.get('last_modified'):
+        headers['If-Modified-Since'] = meta['last_modified']
+
+    logger.info(f"Fetching loans data from URL: {url}")
+    response = get_http_session().get(url, headers=headers, timeout=LOAN_REPORT_TIMEOUT, stream=True)
+    try:
+        if response.status_code == 304 and cached:
+            logger.info("♻️ Loan report not modified - using cached copy")
+            meta['fetched_at'] = time.time()
+            _write_meta(meta_path, meta)
+            with open(csv_path, 'rb') as f:
+                yield _text_stream(f)
+            return
+
+        response.raise_for_status()
+        response.raw.decode_content = True
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(csv_path), suffix='.csv.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as sink:
+                tee = _TeeReader(response.raw, sink)
+                yield _text_stream(io.BufferedReader(tee))
+            if tee.finished:
+                os.replace(tmp_path, csv_path)
+                _write_meta(meta_path, {
+                    'url': url,
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                    'fetched_at': time.time(),
+                })
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    finally:
+        response.close()
+
+def get_loan_report_path(url: str, max_age: Optional[int] = None) -> str:
+    """Make sure a complete, fresh copy of the report is cached and return its path"""
+    with open_loan_report(url, max_age) as stream:
+        while stream.read(1024 * 1024):
+            pass
+    return _cache_paths(url)[0]
+
+# ---------------------------------------------------------------------------
+# Rows -> loans
+# ---------------------------------------------------------------------------
+
+def _coerce_integer(value: str):
+    value = value.strip()
+    if value.lstrip('-').isdigit():
+        return int(value)
+    return value
+
+def loan_from_report_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Map one report row (keyed by LOAN_REPORT_COLUMNS) to the internal loan dict"""
+    # Parse URLs from the Links field - handle comma-separated URLs properly
+    urls = []
+    links_text = row.get('Links', '')
+    if links_text:
+        # Split by comma and clean up each URL
+        url_parts = [url.strip() for url in str(links_text).split(',')]
+        for url in url_parts:
+            # Remove quotes if present
+            url = url.strip('"\'')
+            # Skip empty URLs and internal system URLs
+            if url and not url.startswith('https://fms.driveshop.com/'):
+                urls.append(url)
+
+    logger.debug(f"Loan {row.get('WO #')}: Parsed {len(urls)} URLs from '{str(links_text)[:100]}...'")
+
+    # Trim is extracted later, only for loans that survive filtering
+    full_model = row.get('Model', '')
+    loan = {
+        'work_order': row.get('WO #'),
+        'model': full_model,
+        'model_full': full_model,
+        'trim': None,
+        'to': row.get('To'),
+        'affiliation': row.get('Affiliation'),
+        'urls': urls,
+        'start_date': None,
+        'make': row.get('Make', ''),
+        'activity_id': row.get('ActivityID'),
+        'person_id': row.get('Person_ID'),
+        'office': row.get('Office')
+    }
+
+    start_date_str = row.get('Start Date')
+    if start_date_str:
+        parsed_date = parse_start_date(start_date_str)
+        if parsed_date:
+            loan['start_date'] = parsed_date
+        else:
+            logger.warning(f"Could not parse start date for {loan['work_order']}: {start_date_str}")
+
+    return loan
+
+def iter_report_rows(stream: TextIO) -> Iterator[Dict[str, Any]]:
+    """Yield report rows as dicts; malformed lines are skipped with a warning like pandas did"""
+    for line_number, values in enumerate(csv.reader(stream), start=1):
+        if not values or not any(v.strip() for v in values):
+            continue
+        if len(values) > len(LOAN_REPORT_COLUMNS):
+            logger.warning(f"Skipping line {line_number}: expected {len(LOAN_REPORT_COLUMNS)} fields, saw {len(values)}")
+            continue
+        values = values + [''] * (len(LOAN_REPORT_COLUMNS) - len(values))
+        row = dict(zip(LOAN_REPORT_COLUMNS, values))
+        for column in _INTEGER_COLUMNS:
+            row[column] = _coerce_integer(row[column])
+        yield row
+
+# ---------------------------------------------------------------------------
+# Filtering
+# ---------------------------------------------------------------------------
+
+def _csv_values(raw) -> List[str]:
+    if not raw:
+        return []
+    return [str(x).strip() for x in str(raw).split(',') if str(x).strip()]
+
+def _iso_date(value) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value))
+    except Exception:
+        return None
+
+class LoanReportFilter:
+    """
+    The dashboard/worker job filters, applied one loan at a time in the same
+    order as before: field filters, then skip_records, then the date range,
+    then the overall limit.
+    """
+
+    def __init__(self, filters: Optional[Dict[str, Any]] = None, limit: Optional[int] = None):
+        filters = filters or {}
+        self.values = {
+            key: filters.get(key) for key in _ALL_VALUES
+            if filters.get(key) and filters.get(key) not in _ALL_VALUES[key]
+        }
+        self.wo_numbers = set(_csv_values(filters.get('wo_numbers')))
+        self.activity_ids = set(_csv_values(filters.get('activity_ids')))
+        skip_records = filters.get('skip_records')
+        self.skip_remaining = skip_records if isinstance(skip_records, int) and skip_records > 0 else 0
+        self.date_from = _iso_date(filters.get('date_from'))
+        self.date_to = _iso_date(filters.get('date_to'))
+        self.limit = limit if isinstance(limit, int) and limit > 0 else None
+        self.accepted = 0
+
+    @property
+    def exhausted(self) -> bool:
+        return self.limit is not None and self.accepted >= self.limit
+
+    def _matches_fields(self, loan: Dict[str, Any]) -> bool:
+        if 'office' in self.values and loan.get('office') != self.values['office']:
+            return False
+        if 'make' in self.values and loan.get('make') != self.values['make']:
+            return False
+        if 'model' in self.values and loan.get('model') != self.values['model']:
+            return False
+        if 'reporter' in self.values and str(loan.get('to', '')).strip() != str(self.values['reporter']).strip():
+            return False
+        if self.wo_numbers and str(loan.get('work_order', '')).strip() not in self.wo_numbers:
+            return False
+        if self.activity_ids and str(loan.get('activity_id', '')).strip() not in self.activity_ids:
+            return False
+        return True
+
+    def _in_date_range(self, loan: Dict[str, Any]) -> bool:
+        start_date = loan.get('start_date')
+        if not start_date:
+            return True
+        try:
+            if self.date_from and start_date < self.date_from:
+                return False
+            if self.date_to and start_date > self.date_to:
+                return False
+        except TypeError:
+            pass  # naive vs aware dates - don't exclude
+        return True
+
+    def accept(self, loan: Dict[str, Any]) -> bool:
+        if self.exhausted or not self._matches_fields(loan):
+            return False
+        if self.skip_remaining:
+            self.skip_remaining -= 1
+            return False
+        if not self._in_date_range(loan):
+            return False
+        self.accepted += 1
+        return True
+
+def iter_loan_report(url: str, filters: Optional[Dict[str, Any]] = None,
+                     limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Stream loans from the report URL, filtered and limited while parsing.
+    Stops reading (and downloading) as soon as the limit is reached.
+    """
+    loan_filter = LoanReportFilter(filters, limit)
+    rows = 0
+    with open_loan_report(url) as stream:
+        for row in iter_report_rows(stream):
+            rows += 1
+            loan = loan_from_report_row(row)
+            if loan_filter.accept(loan):
+                yield loan
+            if loan_filter.exhausted:
+                logger.info(f"Reached limit of {loan_filter.limit} loans after {rows} report rows")
+                break
+    logger.info(f"Streamed {loan_filter.accepted} loans from {rows} report rows")
@@ -0,0 +1,192 @@
+"""
+Persistent per-outlet article-link index for Index Page Discovery.
+
+Index Page Discovery used to walk an outlet's paginated index (up to five
+pages, often through ScrapFly JS renders) for every loan and re-extract the
+links, while ArticleURLCache only remembered a final hit per
+domain/make/model. The index keeps every article link seen on an outlet's
+index pages - URL, title slug, first-seen time and the page it was found on -
+in SQLite so that:
+
+- an index refreshed within ARTICLE_INDEX_TTL_MINUTES is served from the index
+  with no request at all, and make/model lookups are an in-memory match
+  against its links;
+- a stale index is refreshed newest-page-first and the walk stops as soon as a
+  page is mostly links that are already indexed;
+- concurrent loans on the same outlet wait on one refresh (index_lock).
+"""
+
+import os
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional, List, Dict, Set
+from urllib.parse import urlparse
+
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+ARTICLE_INDEX_TTL_MINUTES = float(os.environ.get('ARTICLE_INDEX_TTL_MINUTES', '360'))
+ARTICLE_INDEX_MAX_LINKS = int(os.environ.get('ARTICLE_INDEX_MAX_LINKS', '1000'))
+# A refresh stops after a page where at least this share of the links is already indexed
+ARTICLE_INDEX_KNOWN_STOP = float(os.environ.get('ARTICLE_INDEX_KNOWN_STOP', '0.5'))
+
+def index_key(index_url: str) -> str:
+    """Normalize an index URL (with or without www/scheme/trailing slash/fragment) to one key"""
+    parsed = urlparse(index_url if '://' in index_url else f"https://{index_url}")
+    domain = parsed.netloc.lower()
+    if domain.startswith('www.'):
+        domain = domain[4:]
+    path = parsed.path.rstrip('/').lower()
+    return f"{domain}{path}?{parsed.query}" if parsed.query else f"{domain}{path}"
+
+def title_slug(url: str) -> str:
+    """Last meaningful path segment, e.g. '2025-mazda-cx-70-review'"""
+    parts = [part for part in urlparse(url).path.split('/') if part]
+    if not parts:
+        return ''
+    slug = parts[-1]
+    # /post/2335133/ style URLs carry the slug before or after a numeric ID
+    if slug.isdigit() and len(parts) > 1:
+        slug = parts[-2]
+    return slug.rsplit('.', 1)[0].lower()
+
+class ArticleLinkIndex:
+    """SQLite-backed (WAL mode, one connection per thread) article links per outlet index page"""
+
+    def __init__(self, db_path: Optional[str] = None):
+        if db_path is None:
+            project_root = Path(__file__).parent.parent.parent
+            data_dir = os.path.join(project_root, 'data')
+            os.makedirs(data_dir, exist_ok=True)
+            db_path = os.path.join(data_dir, 'article_link_index.db')
+
+        self.db_path = db_path
+        self.ttl_seconds = ARTICLE_INDEX_TTL_MINUTES * 60
+        self._local = threading.local()
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._init_database()
+        logger.info(f"Article link index initialized with database: {self.db_path} "
+                    f"(fresh for {ARTICLE_INDEX_TTL_MINUTES:.0f} min)")
+
+    def _get_connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _init_database(self):
+        conn = self._get_connection()
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS article_links (
+                index_key TEXT NOT NULL,
+                domain TEXT NOT NULL,
+                url TEXT NOT NULL,
+                slug TEXT,
+                first_seen REAL NOT NULL,
+                page INTEGER NOT NULL,
+                seq INTEGER NOT NULL,
+                PRIMARY KEY (index_key, url)
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_article_links_domain ON article_links(domain)')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS index_state (
+                index_key TEXT PRIMARY KEY,
+                refreshed_at REAL NOT NULL,
+                pages INTEGER NOT NULL
+            )
+        ''')
+        conn.commit()
+
+    def index_lock(self, key: str) -> threading.Lock:
+        """Per-index lock so one refresh serves every waiting loan"""
+        with self._locks_guard:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    def is_fresh(self, key: str) -> bool:
+        state = self._get_connection().execute(
+            'SELECT refreshed_at FROM index_state WHERE index_key = ?', (key,)
+        ).fetchone()
+        return bool(state) and time.time() - state[0] < self.ttl_seconds
+
+    def known_urls(self, key: str) -> Set[str]:
+        return {row[0] for row in self._get_connection().execute(
+            'SELECT url FROM article_links WHERE index_key = ?', (key,))}
+
+    def get_links(self, key: str, limit: Optional[int] = None) -> List[str]:
+        """Indexed article URLs, newest first (most recently discovered, then page order)"""
+        rows = self._get_connection().execute(
+            'SELECT url FROM article_links WHERE index_key = ? ORDER BY seq DESC LIMIT ?',
+            (key, limit or ARTICLE_INDEX_MAX_LINKS)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def merge(self, key: str, pages: List[List[str]]) -> int:
+        """
+        Merge one refresh walk (links per page, page 1 first) into the index and
+        mark it fresh. Unknown links are placed above everything already indexed,
+        keeping their page order. Returns the number of new links.
+        """
+        conn = self._get_connection()
+        known = self.known_urls(key)
+        top_seq = conn.execute(
+            'SELECT COALESCE(MAX(seq), 0) FROM article_links WHERE index_key = ?', (key,)
+        ).fetchone()[0]
+
+        fresh = []
+        for page_number, links in enumerate(pages, start=1):
+            for url in links:
+                if url not in known:
+                    known.add(url)
+                    fresh.append((url, page_number))
+
+        now = time.time()
+        domain = key.split('/', 1)[0].split('?', 1)[0]
+        for offset, (url, page_number) in enumerate(fresh):
+            conn.execute('''
+                INSERT OR REPLACE INTO article_links (index_key, domain, url, slug, first_seen, page, seq)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (key, domain, url, title_slug(url), now, page_number, top_seq + len(fresh) - offset))
+
+        # Trim the oldest entries beyond the cap
+        conn.execute('''
+            DELETE FROM article_links WHERE index_key = ? AND seq <= (
+                SELECT seq FROM article_links WHERE index_key = ?
+                ORDER BY seq DESC LIMIT 1 OFFSET ?
+            )
+        ''', (key, key, ARTICLE_INDEX_MAX_LINKS))
+
+        conn.execute('INSERT OR REPLACE INTO index_state (index_key, refreshed_at, pages) VALUES (?, ?, ?)',
+                     (key, now, len(pages)))
+        conn.commit()
+        return len(fresh)
+
+    def should_stop(self, known: Set[str], page_links: List[str]) -> bool:
+        """True when a refresh has reached links the index already has"""
+        if not known or not page_links:
+            return False
+        seen = sum(1 for url in page_links if url in known)
+        return seen >= len(page_links) * ARTICLE_INDEX_KNOWN_STOP
+
+# Global index instance
+_article_link_index = None
+_article_link_index_lock = threading.Lock()
+
+def get_article_link_index() -> ArticleLinkIndex:
+    """Get the global article link index instance"""
+    global _article_link_index
+    if _article_link_index is None:
+        with _article_link_index_lock:
+            if _article_link_index is None:
+                _article_link_index = ArticleLinkIndex()
+    return _article_link_index
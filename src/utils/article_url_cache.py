@@ -1,47 +1,125 @@
 """
 Article URL Cache - Stores discovered article URLs to avoid repeated Index Discovery.
 This significantly improves performance for slow sites like Tightwad Garage.
+
+Entries live in SQLite (WAL mode, one connection per thread) instead of one
+JSON file that was rewritten in full on every hit and store:
+
+- writes are single-row transactions, so concurrent ingest threads can't
+  interleave a half-written cache;
+- last-accessed times are buffered in memory and flushed in one batch every
+  ARTICLE_URL_CACHE_FLUSH_SECONDS (or ARTICLE_URL_CACHE_FLUSH_BATCH hits);
+- the table is capped at ARTICLE_URL_CACHE_MAX_ENTRIES, least recently used
+  entries are evicted first;
+- hit/miss/store/eviction counters are kept (get_stats()).
+
+The legacy data/article_url_cache.json is imported once when the table is empty.
 """
 
 import json
 import os
-from typing import Optional, Dict
+import time
+import atexit
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional, Dict, Any
 from datetime import datetime
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+ARTICLE_URL_CACHE_MAX_ENTRIES = int(os.environ.get('ARTICLE_URL_CACHE_MAX_ENTRIES', '20000'))
+ARTICLE_URL_CACHE_FLUSH_SECONDS = float(os.environ.get('ARTICLE_URL_CACHE_FLUSH_SECONDS', '30'))
+ARTICLE_URL_CACHE_FLUSH_BATCH = int(os.environ.get('ARTICLE_URL_CACHE_FLUSH_BATCH', '100'))
+
+def _timestamp(value: Optional[str]) -> float:
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return time.time()
+
 class ArticleURLCache:
     """Cache for storing discovered article URLs to avoid repeated searches."""
     
-    def __init__(self, cache_file: str = None):
+    def __init__(self, db_path: str = None, max_entries: int = ARTICLE_URL_CACHE_MAX_ENTRIES):
         """Initialize the article URL cache."""
-        if cache_file is None:
-            project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            cache_file = os.path.join(project_root, 'data', 'article_url_cache.json')
+        legacy_json = None
+        if db_path is None:
+            project_root = Path(__file__).parent.parent.parent
+            data_dir = os.path.join(project_root, 'data')
+            os.makedirs(data_dir, exist_ok=True)
+            db_path = os.path.join(data_dir, 'article_url_cache.db')
+            legacy_json = os.path.join(data_dir, 'article_url_cache.json')
+        
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._pending_access: Dict[str, float] = {}
+        self._pending_lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._stats_lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
         
-        self.cache_file = cache_file
-        self.cache = self._load_cache()
-        logger.info(f"Article URL cache initialized with {len(self.cache)} entries")
+        self._init_database()
+        if legacy_json:
+            self._import_legacy_json(legacy_json)
+        logger.info(f"Article URL cache initialized with {len(self)} entries ({self.db_path})")
     
-    def _load_cache(self) -> Dict:
-        """Load cache from disk."""
-        if os.path.exists(self.cache_file):
-            try:
-                with open(self.cache_file, 'r') as f:
-                    return json.load(f)
-            except Exception as e:
-                logger.error(f"Error loading article URL cache: {e}")
-        return {}
+    def _get_connection(self) -> sqlite3.Connection:
+        """One connection per thread, opened in WAL mode"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
     
-    def _save_cache(self):
-        """Save cache to disk."""
+    def _init_database(self):
+        conn = self._get_connection()
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS article_urls (
+                cache_key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                title TEXT,
+                domain TEXT,
+                make TEXT,
+                model TEXT,
+                discovered REAL NOT NULL,
+                last_accessed REAL NOT NULL
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_article_urls_accessed ON article_urls(last_accessed)')
+        conn.commit()
+    
+    def _import_legacy_json(self, json_file: str):
+        """One-time import of the old JSON cache file into an empty table."""
+        if not os.path.exists(json_file) or len(self):
+            return
         try:
-            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
-            with open(self.cache_file, 'w') as f:
-                json.dump(self.cache, f, indent=2)
+            with open(json_file, 'r') as f:
+                legacy = json.load(f)
+            conn = self._get_connection()
+            with conn:
+                conn.executemany('''
+                    INSERT OR IGNORE INTO article_urls
+                        (cache_key, url, title, domain, make, model, discovered, last_accessed)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', [(key, entry['url'], entry.get('title'), entry.get('domain'), entry.get('make'),
+                       entry.get('model'), _timestamp(entry.get('discovered')),
+                       _timestamp(entry.get('last_accessed') or entry.get('discovered')))
+                      for key, entry in legacy.items() if entry.get('url')])
+            logger.info(f"Imported {len(legacy)} entries from legacy article URL cache {json_file}")
         except Exception as e:
-            logger.error(f"Error saving article URL cache: {e}")
+            logger.error(f"Error importing legacy article URL cache: {e}")
+    
+    def __len__(self) -> int:
+        return self._get_connection().execute('SELECT COUNT(*) FROM article_urls').fetchone()[0]
+    
+    def _count(self, name: str, amount: int = 1):
+        with self._stats_lock:
+            self.stats[name] += amount
     
     def _get_cache_key(self, domain: str, make: str, model: str) -> str:
         """Generate a cache key for the article."""
@@ -60,18 +138,45 @@ class ArticleURLCache:
         """
         cache_key = self._get_cache_key(domain, make, model)
         
-        if cache_key in self.cache:
-            entry = self.cache[cache_key]
-            url = entry.get('url')
-            logger.info(f"✅ Found cached article URL for {make} {model} on {domain}: {url}")
-            
-            # Update last accessed time
-            entry['last_accessed'] = datetime.now().isoformat()
-            self._save_cache()
-            
-            return url
+        row = self._get_connection().execute(
+            'SELECT url FROM article_urls WHERE cache_key = ?', (cache_key,)
+        ).fetchone()
+        if row is None:
+            self._count('misses')
+            return None
+        
+        url = row[0]
+        self._count('hits')
+        logger.info(f"✅ Found cached article URL for {make} {model} on {domain}: {url}")
+        
+        # Update last accessed time (buffered, written with the next batch)
+        with self._pending_lock:
+            self._pending_access[cache_key] = time.time()
+        self._maybe_flush()
         
-        return None
+        return url
+    
+    def _maybe_flush(self):
+        with self._pending_lock:
+            due = (len(self._pending_access) >= ARTICLE_URL_CACHE_FLUSH_BATCH or
+                   time.monotonic() - self._last_flush >= ARTICLE_URL_CACHE_FLUSH_SECONDS)
+        if due:
+            self.flush()
+    
+    def flush(self):
+        """Write buffered last-accessed times in one transaction."""
+        with self._pending_lock:
+            pending, self._pending_access = self._pending_access, {}
+            self._last_flush = time.monotonic()
+        if not pending:
+            return
+        try:
+            conn = self._get_connection()
+            with conn:
+                conn.executemany('UPDATE article_urls SET last_accessed = MAX(last_accessed, ?) WHERE cache_key = ?',
+                                 [(accessed, key) for key, accessed in pending.items()])
+        except Exception as e:
+            logger.warning(f"Error flushing article URL cache access times: {e}")
     
     def store_article_url(self, domain: str, make: str, model: str, url: str, title: str = None):
         """
@@ -85,46 +190,76 @@ class ArticleURLCache:
             title: Article title (optional)
         """
         cache_key = self._get_cache_key(domain, make, model)
+        now = time.time()
+        # Eviction below goes by last_accessed, so land the buffered hits first
+        self.flush()
         
-        self.cache[cache_key] = {
-            'url': url,
-            'title': title or f"{make} {model} Review",
-            'discovered': datetime.now().isoformat(),
-            'last_accessed': datetime.now().isoformat(),
-            'domain': domain,
-            'make': make,
-            'model': model
-        }
+        try:
+            conn = self._get_connection()
+            with conn:
+                conn.execute('''
+                    INSERT OR REPLACE INTO article_urls
+                        (cache_key, url, title, domain, make, model, discovered, last_accessed)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (cache_key, url, title or f"{make} {model} Review", domain, make, model, now, now))
+                evicted = self._evict(conn)
+        except Exception as e:
+            logger.error(f"Error saving article URL cache entry: {e}")
+            return
         
-        self._save_cache()
+        self._count('stores')
+        if evicted:
+            self._count('evictions', evicted)
+            logger.info(f"Evicted {evicted} least recently used article URL cache entries")
         logger.info(f"✅ Cached article URL for {make} {model} on {domain}: {url}")
     
+    def _evict(self, conn: sqlite3.Connection) -> int:
+        """Drop least recently used entries beyond max_entries (inside the caller's transaction)."""
+        return conn.execute('''
+            DELETE FROM article_urls WHERE cache_key IN (
+                SELECT cache_key FROM article_urls ORDER BY last_accessed DESC LIMIT -1 OFFSET ?
+            )
+        ''', (self.max_entries,)).rowcount
+    
     def clear_old_entries(self, days: int = 30):
         """Remove cache entries older than specified days."""
         cutoff_date = datetime.now().timestamp() - (days * 24 * 60 * 60)
         
-        keys_to_remove = []
-        for key, entry in self.cache.items():
-            try:
-                discovered = datetime.fromisoformat(entry.get('discovered', ''))
-                if discovered.timestamp() < cutoff_date:
-                    keys_to_remove.append(key)
-            except:
-                pass
-        
-        for key in keys_to_remove:
-            del self.cache[key]
+        conn = self._get_connection()
+        with conn:
+            removed = conn.execute('DELETE FROM article_urls WHERE discovered < ?', (cutoff_date,)).rowcount
         
-        if keys_to_remove:
-            self._save_cache()
-            logger.info(f"Removed {len(keys_to_remove)} old cache entries")
+        if removed:
+            logger.info(f"Removed {removed} old cache entries")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss/store/eviction counters plus hit rate and current size."""
+        with self._stats_lock:
+            stats = dict(self.stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else 0.0
+        stats['entries'] = len(self)
+        return stats
+    
+    def log_stats(self):
+        stats = self.get_stats()
+        if not stats['hits'] and not stats['misses'] and not stats['stores']:
+            return
+        logger.info(f"📊 Article URL cache: {stats['hits']} hits, {stats['misses']} misses "
+                    f"({stats['hit_rate']:.0%}), {stats['stores']} stored, {stats['evictions']} evicted, "
+                    f"{stats['entries']} entries")
 
 # Global instance for easy access
 _article_cache = None
+_article_cache_lock = threading.Lock()
 
 def get_article_cache() -> ArticleURLCache:
     """Get the global article URL cache instance."""
     global _article_cache
     if _article_cache is None:
-        _article_cache = ArticleURLCache()
-    return _article_cache
\ No newline at end of file
+        with _article_cache_lock:
+            if _article_cache is None:
+                _article_cache = ArticleURLCache()
+                # Don't lose buffered access times on shutdown
+                atexit.register(_article_cache.flush)
+    return _article_cache
@@ -1,24 +1,52 @@
 import sqlite3
 import json
 import os
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List
 from pathlib import Path
+from urllib.parse import urlparse
 
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+CRAWL_CACHE_ENABLED = os.environ.get('CRAWL_CACHE_ENABLED', 'true').lower() == 'true'
+CRAWL_CACHE_TTL_HOURS = float(os.environ.get('CRAWL_CACHE_TTL_HOURS', '24'))
+CRAWL_CACHE_NO_CONTENT_TTL_HOURS = float(os.environ.get('CRAWL_CACHE_NO_CONTENT_TTL_HOURS', '6'))
+CRAWL_CACHE_LRU_SIZE = int(os.environ.get('CRAWL_CACHE_LRU_SIZE', '512'))
+
+def content_hash(content: Optional[str]) -> Optional[str]:
+    """Whitespace-normalized SHA-256 of page content, used to spot unchanged pages"""
+    if not content:
+        return None
+    normalized = ' '.join(content.split())
+    return hashlib.sha256(normalized.encode('utf-8', errors='ignore')).hexdigest()
+
 class CacheManager:
-    """SQLite-based cache manager for storing scraping results with 24-hour TTL"""
+    """
+    Two-tier crawl result cache: in-process LRU in front of SQLite (WAL mode, one
+    connection per thread). Found content and "no content" outcomes get separate TTLs,
+    and per-(content hash, make, model) analysis results let unchanged pages skip
+    extraction and GPT scoring.
+    """
     
-    def __init__(self, db_path: Optional[str] = None):
+    OUTCOME_HIT = 'hit'
+    OUTCOME_NO_CONTENT = 'no_content'
+    
+    def __init__(self, db_path: Optional[str] = None, ttl_hours: Optional[float] = None,
+                 no_content_ttl_hours: Optional[float] = None, lru_size: Optional[int] = None):
         """
         Initialize cache manager with SQLite database.
         
         Args:
             db_path: Path to SQLite database file. If None, uses default location.
+            ttl_hours: TTL for found content (CRAWL_CACHE_TTL_HOURS)
+            no_content_ttl_hours: TTL for "nothing found" outcomes (CRAWL_CACHE_NO_CONTENT_TTL_HOURS)
+            lru_size: Entries kept in the in-process LRU (CRAWL_CACHE_LRU_SIZE)
         """
         if db_path is None:
             # Default to data directory in project root
@@ -28,79 +56,192 @@ class CacheManager:
             db_path = os.path.join(data_dir, 'scraping_cache.db')
         
         self.db_path = db_path
-        self.ttl_hours = 24
+        self.enabled = CRAWL_CACHE_ENABLED
+        self.ttl_hours = ttl_hours if ttl_hours is not None else CRAWL_CACHE_TTL_HOURS
+        self.no_content_ttl_hours = no_content_ttl_hours if no_content_ttl_hours is not None else CRAWL_CACHE_NO_CONTENT_TTL_HOURS
+        self.lru_size = lru_size if lru_size is not None else CRAWL_CACHE_LRU_SIZE
+        
+        self._local = threading.local()
+        self._lru: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        self._lru_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.stats = {'lru_hits': 0, 'sqlite_hits': 0, 'misses': 0, 'analysis_hits': 0}
         
         # Initialize database
         self._init_database()
         
-        logger.info(f"Cache manager initialized with database: {self.db_path}")
+        logger.info(f"Cache manager initialized with database: {self.db_path} "
+                    f"({'enabled' if self.enabled else 'DISABLED'}, TTL {self.ttl_hours}h / no-content {self.no_content_ttl_hours}h)")
+    
+    def _get_connection(self) -> sqlite3.Connection:
+        """One pooled connection per thread, opened in WAL mode"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
     
     def _init_database(self):
-        """Create the cache table if it doesn't exist"""
+        """Create the cache tables if they don't exist"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Create cache table
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS scraping_cache (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        person_id TEXT NOT NULL,
-                        domain TEXT NOT NULL,
-                        make TEXT NOT NULL,
-                        model TEXT NOT NULL,
-                        url TEXT NOT NULL,
-                        content TEXT NOT NULL,
-                        metadata TEXT,  -- JSON string for GPT analysis results
-                        cached_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        expires_at TIMESTAMP NOT NULL,
-                        UNIQUE(person_id, domain, make, model) ON CONFLICT REPLACE
-                    )
-                ''')
-                
-                # Create index for faster lookups
-                cursor.execute('''
-                    CREATE INDEX IF NOT EXISTS idx_cache_lookup 
-                    ON scraping_cache(person_id, domain, make, model, expires_at)
-                ''')
-                
-                # Create index for cleanup
-                cursor.execute('''
-                    CREATE INDEX IF NOT EXISTS idx_cache_expiry 
-                    ON scraping_cache(expires_at)
-                ''')
-                
-                conn.commit()
-                logger.info("Cache database initialized successfully")
+            conn = self._get_connection()
+            cursor = conn.cursor()
+            
+            # Create cache table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS scraping_cache (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    person_id TEXT NOT NULL,
+                    domain TEXT NOT NULL,
+                    make TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    metadata TEXT,  -- JSON string for GPT analysis results
+                    cached_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    expires_at TIMESTAMP NOT NULL,
+                    UNIQUE(person_id, domain, make, model) ON CONFLICT REPLACE
+                )
+            ''')
+            
+            # Columns added when the cache was re-enabled (older cache files lack them)
+            existing_columns = {row[1] for row in cursor.execute('PRAGMA table_info(scraping_cache)')}
+            for column in ('source_url', 'content_hash', 'outcome', 'tier_used', 'title'):
+                if column not in existing_columns:
+                    cursor.execute(f'ALTER TABLE scraping_cache ADD COLUMN {column} TEXT')
+            
+            # Create index for faster lookups
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_cache_lookup 
+                ON scraping_cache(person_id, domain, make, model, expires_at)
+            ''')
+            
+            # Create index for cleanup
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_cache_expiry 
+                ON scraping_cache(expires_at)
+            ''')
+            
+            # Analysis results per unchanged page content
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS content_analysis (
+                    content_hash TEXT NOT NULL,
+                    make TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    metadata TEXT NOT NULL,
+                    expires_at TIMESTAMP NOT NULL,
+                    PRIMARY KEY (content_hash, make, model) ON CONFLICT REPLACE
+                )
+            ''')
+            
+            conn.commit()
+            logger.info("Cache database initialized successfully")
                 
         except Exception as e:
             logger.error(f"Error initializing cache database: {e}")
             raise
     
-    def get_cached_result(self, person_id: str, domain: str, make: str, model: str) -> Optional[Dict[str, Any]]:
+    def _count(self, name: str, amount: int = 1):
+        with self._stats_lock:
+            self.stats[name] += amount
+    
+    @staticmethod
+    def _key(person_id: str, domain: str, make: str, model: str) -> tuple:
+        return (person_id or 'unknown', (domain or '').lower(), make or '', model or '')
+    
+    def _lru_get(self, key: tuple) -> Optional[Dict[str, Any]]:
+        with self._lru_lock:
+            entry = self._lru.get(key)
+            if entry is None:
+                return None
+            if entry['expires_at'] <= datetime.now():
+                del self._lru[key]
+                return None
+            self._lru.move_to_end(key)
+            return entry
+    
+    def _lru_put(self, key: tuple, entry: Dict[str, Any]):
+        if self.lru_size <= 0:
+            return
+        with self._lru_lock:
+            self._lru[key] = entry
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.lru_size:
+                self._lru.popitem(last=False)
+    
+    def get_cached_result(self, person_id: str, domain: str, make: str, model: str,
+                          source_url: Optional[str] = None, record_stats: bool = True) -> Optional[Dict[str, Any]]:
         """
         Get cached scraping result if it exists and hasn't expired.
         
-        CACHE DISABLED: Always returns None to force fresh searches for reliable results.
-        
         Args:
             person_id: Unique identifier for the media contact
             domain: Domain name (e.g., "motortrend.com")
             make: Vehicle make (e.g., "Audi")
             model: Vehicle model (e.g., "Q6 e-tron")
+            source_url: URL the crawl started from; entries cached for a different
+                        start URL on the same domain are treated as a miss
+            record_stats: False for lookups that only peek ahead of the real one
+                          (e.g. the ingest Tier 1 prefetch), so each crawl counts once
             
         Returns:
-            Always None - cache disabled for reliability
+            Dict with url, content, content_hash, outcome ('hit' or 'no_content'),
+            tier_used, title and metadata - or None on a miss
         """
-        # CACHE DISABLED: Always return None to force fresh searches
-        # This ensures consistent, reliable results without cache-related bugs
-        logger.info(f"Cache DISABLED - forcing fresh search for {person_id}/{domain}/{make}/{model}")
-        return None
+        if not self.enabled:
+            return None
+        
+        key = self._key(person_id, domain, make, model)
+        entry = self._lru_get(key)
+        if entry is not None:
+            if record_stats:
+                self._count('lru_hits')
+        else:
+            try:
+                row = self._get_connection().execute('''
+                    SELECT url, content, metadata, content_hash, outcome, tier_used, title, source_url, expires_at
+                    FROM scraping_cache
+                    WHERE person_id = ? AND domain = ? AND make = ? AND model = ? AND expires_at > ?
+                ''', (*key, datetime.now())).fetchone()
+            except Exception as e:
+                logger.error(f"Error reading cache: {e}")
+                row = None
+            
+            if row is None:
+                if record_stats:
+                    self._count('misses')
+                return None
+            
+            if record_stats:
+                self._count('sqlite_hits')
+            entry = {
+                'url': row[0],
+                'content': row[1],
+                'metadata': json.loads(row[2]) if row[2] else None,
+                'content_hash': row[3] or content_hash(row[1]),
+                'outcome': row[4] or self.OUTCOME_HIT,
+                'tier_used': row[5],
+                'title': row[6],
+                'source_url': row[7],
+                'expires_at': datetime.fromisoformat(str(row[8])),
+            }
+            self._lru_put(key, entry)
+        
+        if source_url and entry.get('source_url') and entry['source_url'] != source_url:
+            logger.info(f"Cache entry for {person_id}/{domain} was crawled from {entry['source_url']} - ignoring for {source_url}")
+            return None
+        
+        logger.info(f"Cache {entry['outcome']} for {person_id}/{domain}/{make}/{model}")
+        return dict(entry)
     
     def store_result(self, person_id: str, domain: str, make: str, model: str, 
-                    url: str, content: str, metadata: Optional[Dict[str, Any]] = None):
+                    url: str, content: str, metadata: Optional[Dict[str, Any]] = None,
+                    outcome: str = OUTCOME_HIT, tier_used: Optional[str] = None,
+                    title: Optional[str] = None, source_url: Optional[str] = None):
         """
-        Store scraping result in cache with 24-hour expiry.
+        Store scraping result in cache (TTL depends on the outcome).
         
         Args:
             person_id: Unique identifier for the media contact
@@ -110,41 +251,146 @@ class CacheManager:
             url: The actual URL where content was found
             content: Scraped HTML content
             metadata: Optional GPT analysis results
+            outcome: 'hit' for found content, 'no_content' when every tier came up empty
+            tier_used: Tier that produced the content
+            title: Page title if known
+            source_url: URL the crawl started from
         """
+        if not self.enabled:
+            return
         try:
-            # Calculate expiry time (24 hours from now)
-            expires_at = datetime.now() + timedelta(hours=self.ttl_hours)
+            # Calculate expiry time
+            ttl = self.no_content_ttl_hours if outcome == self.OUTCOME_NO_CONTENT else self.ttl_hours
+            expires_at = datetime.now() + timedelta(hours=ttl)
+            key = self._key(person_id, domain, make, model)
+            entry = {
+                'url': url,
+                'content': content or '',
+                'metadata': metadata,
+                'content_hash': content_hash(content),
+                'outcome': outcome,
+                'tier_used': tier_used,
+                'title': title,
+                'source_url': source_url,
+                'expires_at': expires_at,
+            }
             
-            # Convert metadata to JSON
-            metadata_json = json.dumps(metadata) if metadata else None
+            conn = self._get_connection()
+            conn.execute('''
+                INSERT OR REPLACE INTO scraping_cache 
+                (person_id, domain, make, model, url, content, metadata, expires_at,
+                 content_hash, outcome, tier_used, title, source_url)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (*key, url, entry['content'], json.dumps(metadata) if metadata else None, expires_at,
+                  entry['content_hash'], outcome, tier_used, title, source_url))
+            conn.commit()
+            self._lru_put(key, entry)
             
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                    INSERT OR REPLACE INTO scraping_cache 
-                    (person_id, domain, make, model, url, content, metadata, expires_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (person_id, domain, make, model, url, content, metadata_json, expires_at))
-                
-                conn.commit()
-                
-                logger.info(f"Cached result for {person_id}/{domain}/{make}/{model} (expires: {expires_at})")
+            logger.info(f"Cached {outcome} for {person_id}/{domain}/{make}/{model} (expires: {expires_at})")
                 
         except Exception as e:
             logger.error(f"Error storing cache result: {e}")
     
+    def store_no_content(self, person_id: str, domain: str, make: str, model: str,
+                         url: str, source_url: Optional[str] = None):
+        """Remember that every tier came up empty (short TTL so new articles get picked up)"""
+        self.store_result(person_id, domain, make, model, url, '', outcome=self.OUTCOME_NO_CONTENT,
+                          tier_used='All Tiers Failed', source_url=source_url or url)
+    
+    # ========== INVALIDATION ==========
+    
+    def invalidate(self, person_id: Optional[str] = None, domain: Optional[str] = None,
+                   make: Optional[str] = None, model: Optional[str] = None) -> int:
+        """
+        Drop cached crawl results matching every given field (None matches anything).
+        Call this when downstream validation rejects a cached result (e.g. the article
+        predates the loan) so the next crawl searches again instead of replaying it.
+        """
+        filters = {'person_id': person_id, 'domain': domain.lower() if domain else None,
+                   'make': make, 'model': model}
+        filters = {k: v for k, v in filters.items() if v is not None}
+        
+        with self._lru_lock:
+            for key in list(self._lru.keys()):
+                entry_fields = dict(zip(('person_id', 'domain', 'make', 'model'), key))
+                if all(entry_fields[k] == v for k, v in filters.items()):
+                    del self._lru[key]
+        
+        try:
+            where = ' AND '.join(f'{k} = ?' for k in filters) or '1 = 1'
+            conn = self._get_connection()
+            deleted = conn.execute(f'DELETE FROM scraping_cache WHERE {where}', tuple(filters.values())).rowcount
+            conn.commit()
+            if deleted:
+                logger.info(f"Invalidated {deleted} cache entries for {filters}")
+            return deleted
+        except Exception as e:
+            logger.error(f"Error invalidating cache entries: {e}")
+            return 0
+    
+    def invalidate_url(self, person_id: str, url: str, make: str, model: str) -> int:
+        """
+        Invalidate the entry a crawl of `url` would have used. `url` must be the
+        URL the crawl was keyed on (after malformed-URL repair); without a domain
+        nothing is dropped rather than every outlet's entry for the vehicle.
+        """
+        domain = urlparse(url).netloc.lower()
+        if not domain:
+            logger.warning(f"Not invalidating cache for {url}: no domain")
+            return 0
+        return self.invalidate(person_id or 'unknown', domain, make, model)
+    
+    # ========== CONTENT ANALYSIS (unchanged pages) ==========
+    
+    def get_content_analysis(self, content_hash_value: Optional[str], make: str, model: str) -> Optional[Dict[str, Any]]:
+        """Analysis stored for exactly this page content and vehicle, if still fresh"""
+        if not self.enabled or not content_hash_value:
+            return None
+        try:
+            row = self._get_connection().execute('''
+                SELECT metadata FROM content_analysis
+                WHERE content_hash = ? AND make = ? AND model = ? AND expires_at > ?
+            ''', (content_hash_value, make or '', model or '', datetime.now())).fetchone()
+        except Exception as e:
+            logger.error(f"Error reading content analysis cache: {e}")
+            return None
+        if row is None:
+            return None
+        self._count('analysis_hits')
+        return json.loads(row[0])
+    
+    def store_content_analysis(self, content_hash_value: Optional[str], make: str, model: str,
+                               metadata: Dict[str, Any]):
+        """Remember extraction/scoring results for this page content and vehicle"""
+        if not self.enabled or not content_hash_value:
+            return
+        try:
+            expires_at = datetime.now() + timedelta(hours=self.ttl_hours)
+            conn = self._get_connection()
+            conn.execute('''
+                INSERT OR REPLACE INTO content_analysis (content_hash, make, model, metadata, expires_at)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (content_hash_value, make or '', model or '', json.dumps(metadata), expires_at))
+            conn.commit()
+        except Exception as e:
+            logger.error(f"Error storing content analysis cache: {e}")
+    
     def _cleanup_expired_entries(self, cursor):
         """Remove expired entries from cache"""
         try:
-            cursor.execute('DELETE FROM scraping_cache WHERE expires_at <= CURRENT_TIMESTAMP')
+            now = datetime.now()
+            cursor.execute('DELETE FROM scraping_cache WHERE expires_at <= ?', (now,))
             deleted_count = cursor.rowcount
+            cursor.execute('DELETE FROM content_analysis WHERE expires_at <= ?', (now,))
+            deleted_count += cursor.rowcount
             
             if deleted_count > 0:
                 logger.info(f"Cleaned up {deleted_count} expired cache entries")
+            return deleted_count
                 
         except Exception as e:
             logger.error(f"Error cleaning up expired entries: {e}")
+            return 0
     
     def cleanup_cache(self) -> int:
         """
@@ -154,15 +400,12 @@ class CacheManager:
             Number of entries removed
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute('DELETE FROM scraping_cache WHERE expires_at <= CURRENT_TIMESTAMP')
-                deleted_count = cursor.rowcount
-                conn.commit()
-                
-                logger.info(f"Manual cleanup removed {deleted_count} expired cache entries")
-                return deleted_count
+            conn = self._get_connection()
+            deleted_count = self._cleanup_expired_entries(conn.cursor())
+            conn.commit()
+            
+            logger.info(f"Manual cleanup removed {deleted_count} expired cache entries")
+            return deleted_count
                 
         except Exception as e:
             logger.error(f"Error during manual cache cleanup: {e}")
@@ -176,37 +419,42 @@ class CacheManager:
             Dict with cache statistics
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Total entries
-                cursor.execute('SELECT COUNT(*) FROM scraping_cache')
-                total_entries = cursor.fetchone()[0]
-                
-                # Valid (non-expired) entries
-                cursor.execute('SELECT COUNT(*) FROM scraping_cache WHERE expires_at > CURRENT_TIMESTAMP')
-                valid_entries = cursor.fetchone()[0]
-                
-                # Expired entries
-                expired_entries = total_entries - valid_entries
-                
-                # Entries by domain
-                cursor.execute('''
-                    SELECT domain, COUNT(*) 
-                    FROM scraping_cache 
-                    WHERE expires_at > CURRENT_TIMESTAMP
-                    GROUP BY domain 
-                    ORDER BY COUNT(*) DESC
-                ''')
-                domain_stats = dict(cursor.fetchall())
-                
-                return {
-                    'total_entries': total_entries,
-                    'valid_entries': valid_entries,
-                    'expired_entries': expired_entries,
-                    'domain_breakdown': domain_stats,
-                    'cache_file': self.db_path
-                }
+            cursor = self._get_connection().cursor()
+            now = datetime.now()
+            
+            # Total entries
+            cursor.execute('SELECT COUNT(*) FROM scraping_cache')
+            total_entries = cursor.fetchone()[0]
+            
+            # Valid (non-expired) entries
+            cursor.execute('SELECT COUNT(*) FROM scraping_cache WHERE expires_at > ?', (now,))
+            valid_entries = cursor.fetchone()[0]
+            
+            # Expired entries
+            expired_entries = total_entries - valid_entries
+            
+            with self._stats_lock:
+                lookups = dict(self.stats)
+            
+            # Entries by domain
+            cursor.execute('''
+                SELECT domain, COUNT(*) 
+                FROM scraping_cache 
+                WHERE expires_at > ?
+                GROUP BY domain 
+                ORDER BY COUNT(*) DESC
+            ''', (now,))
+            domain_stats = dict(cursor.fetchall())
+            
+            return {
+                'total_entries': total_entries,
+                'valid_entries': valid_entries,
+                'expired_entries': expired_entries,
+                'domain_breakdown': domain_stats,
+                'lru_entries': len(self._lru),
+                'lookups': lookups,
+                'cache_file': self.db_path
+            }
                 
         except Exception as e:
             logger.error(f"Error getting cache stats: {e}")
@@ -215,24 +463,29 @@ class CacheManager:
     def clear_cache(self):
         """Clear all cache entries (use with caution)"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('DELETE FROM scraping_cache')
-                conn.commit()
-                
-                logger.warning("All cache entries cleared")
+            conn = self._get_connection()
+            conn.execute('DELETE FROM scraping_cache')
+            conn.execute('DELETE FROM content_analysis')
+            conn.commit()
+            with self._lru_lock:
+                self._lru.clear()
+            
+            logger.warning("All cache entries cleared")
                 
         except Exception as e:
             logger.error(f"Error clearing cache: {e}")
 
 # Global cache instance
 _cache_manager = None
+_cache_manager_lock = threading.Lock()
 
 def get_cache_manager() -> CacheManager:
     """Get the global cache manager instance"""
     global _cache_manager
     if _cache_manager is None:
-        _cache_manager = CacheManager()
+        with _cache_manager_lock:
+            if _cache_manager is None:
+                _cache_manager = CacheManager()
     return _cache_manager
 
 # Convenience functions
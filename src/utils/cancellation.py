@@ -0,0 +1,78 @@
+"""
+Per-job cancellation signal shared by the worker, the ingest scheduler and the crawlers.
+
+One JobCancellationPoller per job reads processing_runs.job_status every
+CANCEL_POLL_SECONDS and sets a CancellationToken; everything downstream only
+reads the in-memory flag instead of querying the database itself.
+"""
+
+import os
+import threading
+from typing import Optional
+
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+CANCEL_POLL_SECONDS = float(os.environ.get('CANCEL_POLL_SECONDS', '3'))
+
+class CancellationToken:
+    """Thread-safe cancellation flag; callable so it can be passed as a cancel_check"""
+
+    def __init__(self, job_id: Optional[str] = None):
+        self.job_id = job_id
+        self._event = threading.Event()
+
+    def cancel(self):
+        if not self._event.is_set():
+            logger.info(f"Cancellation signalled for job {self.job_id}")
+        self._event.set()
+
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+
+    __call__ = is_cancelled
+
+class JobCancellationPoller:
+    """Background thread that polls processing_runs.job_status for one job and sets its token"""
+
+    def __init__(self, db, job_id: str, token: Optional[CancellationToken] = None,
+                 interval: float = CANCEL_POLL_SECONDS):
+        self.db = db
+        self.job_id = job_id
+        self.token = token or CancellationToken(job_id)
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def poll_once(self) -> bool:
+        """Query the job status once; never raises"""
+        try:
+            result = self.db.supabase.table('processing_runs').select('job_status').eq(
+                'id', self.job_id
+            ).single().execute()
+            if result.data and result.data.get('job_status') == 'cancelled':
+                self.token.cancel()
+        except Exception as e:
+            logger.error(f"Failed to check job status: {e}")
+        return self.token.is_cancelled()
+
+    def _run(self):
+        while not self.token.is_cancelled() and not self._stop.wait(self.interval):
+            self.poll_once()
+
+    def start(self) -> CancellationToken:
+        if self._thread is None:
+            self.poll_once()
+            self._thread = threading.Thread(target=self._run, name=f'cancel-poll-{self.job_id}', daemon=True)
+            self._thread.start()
+        return self.token
+
+    def stop(self):
+        self._stop.set()
+
+    def __enter__(self) -> CancellationToken:
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
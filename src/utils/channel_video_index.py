@@ -0,0 +1,213 @@
+"""
+Persistent per-channel YouTube video index.
+
+Every loan that pointed at a YouTube channel used to re-scrape the channel's
+/videos page (a JS-rendered, five-scroll ScrapFly ASP render) or re-page its
+uploads through the Data API. The index keeps (video_id, title, published
+date) per channel and listing source in SQLite so that:
+
+- a channel refreshed within CHANNEL_INDEX_TTL_MINUTES is served from the
+  index with no request at all (every loan in a run shares one listing);
+- a stale channel is refreshed incrementally - only videos newer than the
+  newest one already indexed are fetched and merged on top;
+- concurrent loans that hit the same channel wait on one refresh
+  (channel_lock) instead of each starting their own.
+
+Listings from different sources (ScrapFly page scrape vs Data API) are kept
+apart because they differ in depth and date precision.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional, List, Dict, Any
+from urllib.parse import urlparse
+
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+CHANNEL_INDEX_TTL_MINUTES = float(os.environ.get('CHANNEL_INDEX_TTL_MINUTES', '60'))
+CHANNEL_INDEX_MAX_VIDEOS = int(os.environ.get('CHANNEL_INDEX_MAX_VIDEOS', '500'))
+
+_CHANNEL_TABS = ('videos', 'featured', 'streams', 'shorts', 'playlists', 'about')
+
+def channel_key(channel_url: str) -> str:
+    """Normalize a channel URL (any tab, with or without www/query) to one key"""
+    parsed = urlparse(channel_url if '://' in channel_url else f"https://{channel_url}")
+    path = parsed.path.rstrip('/')
+    parts = [part for part in path.split('/') if part]
+    if parts and parts[-1].lower() in _CHANNEL_TABS:
+        parts = parts[:-1]
+    return '/'.join(parts).lower() or parsed.netloc.lower()
+
+class ChannelVideoIndex:
+    """SQLite-backed (WAL mode, one connection per thread) channel listings"""
+
+    def __init__(self, db_path: Optional[str] = None):
+        if db_path is None:
+            project_root = Path(__file__).parent.parent.parent
+            data_dir = os.path.join(project_root, 'data')
+            os.makedirs(data_dir, exist_ok=True)
+            db_path = os.path.join(data_dir, 'channel_index.db')
+
+        self.db_path = db_path
+        self.ttl_seconds = CHANNEL_INDEX_TTL_MINUTES * 60
+        self._local = threading.local()
+        self._locks: Dict[tuple, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._init_database()
+        logger.info(f"Channel video index initialized with database: {self.db_path} "
+                    f"(fresh for {CHANNEL_INDEX_TTL_MINUTES:.0f} min)")
+
+    def _get_connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _init_database(self):
+        conn = self._get_connection()
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS channel_videos (
+                channel_key TEXT NOT NULL,
+                source TEXT NOT NULL,
+                video_id TEXT NOT NULL,
+                title TEXT,
+                published TEXT,
+                data TEXT,
+                seq INTEGER NOT NULL,
+                PRIMARY KEY (channel_key, source, video_id)
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS channel_state (
+                channel_key TEXT NOT NULL,
+                source TEXT NOT NULL,
+                refreshed_at REAL NOT NULL,
+                newest_video_id TEXT,
+                PRIMARY KEY (channel_key, source)
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS channel_aliases (
+                alias TEXT PRIMARY KEY,
+                channel_id TEXT NOT NULL,
+                resolved_at REAL NOT NULL
+            )
+        ''')
+        conn.commit()
+
+    def channel_lock(self, key: str, source: str) -> threading.Lock:
+        """Per-(channel, source) lock so one refresh serves every waiting loan"""
+        with self._locks_guard:
+            lock = self._locks.get((key, source))
+            if lock is None:
+                lock = self._locks[(key, source)] = threading.Lock()
+            return lock
+
+    def _state(self, key: str, source: str) -> Optional[tuple]:
+        return self._get_connection().execute(
+            'SELECT refreshed_at, newest_video_id FROM channel_state WHERE channel_key = ? AND source = ?',
+            (key, source)
+        ).fetchone()
+
+    def is_fresh(self, key: str, source: str) -> bool:
+        state = self._state(key, source)
+        return bool(state) and time.time() - state[0] < self.ttl_seconds
+
+    def newest_video_id(self, key: str, source: str) -> Optional[str]:
+        state = self._state(key, source)
+        return state[1] if state else None
+
+    def get_videos(self, key: str, source: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Indexed videos for the channel, newest first"""
+        rows = self._get_connection().execute(
+            'SELECT data FROM channel_videos WHERE channel_key = ? AND source = ? ORDER BY seq DESC LIMIT ?',
+            (key, source, limit or CHANNEL_INDEX_MAX_VIDEOS)
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def merge(self, key: str, source: str, videos: List[Dict[str, Any]]) -> int:
+        """
+        Merge a newest-first listing into the index and mark the channel fresh.
+        Unknown videos are placed above everything already indexed; known ones
+        keep their position but pick up a published date if they lacked one.
+        Returns the number of new videos.
+        """
+        conn = self._get_connection()
+        known = {row[0]: row[1] for row in conn.execute(
+            'SELECT video_id, published FROM channel_videos WHERE channel_key = ? AND source = ?', (key, source))}
+        top_seq = conn.execute(
+            'SELECT COALESCE(MAX(seq), 0) FROM channel_videos WHERE channel_key = ? AND source = ?', (key, source)
+        ).fetchone()[0]
+
+        fresh = [video for video in videos if video.get('video_id') and video['video_id'] not in known]
+        # Deduplicate while keeping listing order
+        seen = set()
+        fresh = [video for video in fresh if not (video['video_id'] in seen or seen.add(video['video_id']))]
+        for offset, video in enumerate(fresh):
+            conn.execute('''
+                INSERT OR REPLACE INTO channel_videos (channel_key, source, video_id, title, published, data, seq)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (key, source, video['video_id'], video.get('title'), video.get('published'),
+                  json.dumps(video, default=str), top_seq + len(fresh) - offset))
+
+        for video in videos:
+            video_id = video.get('video_id')
+            if video_id in known and not known[video_id] and video.get('published'):
+                conn.execute('''
+                    UPDATE channel_videos SET published = ?, data = ?
+                    WHERE channel_key = ? AND source = ? AND video_id = ?
+                ''', (video['published'], json.dumps(video, default=str), key, source, video_id))
+
+        # Trim the oldest entries beyond the cap
+        conn.execute('''
+            DELETE FROM channel_videos WHERE channel_key = ? AND source = ? AND seq <= (
+                SELECT seq FROM channel_videos WHERE channel_key = ? AND source = ?
+                ORDER BY seq DESC LIMIT 1 OFFSET ?
+            )
+        ''', (key, source, key, source, CHANNEL_INDEX_MAX_VIDEOS))
+
+        newest = conn.execute(
+            'SELECT video_id FROM channel_videos WHERE channel_key = ? AND source = ? ORDER BY seq DESC LIMIT 1',
+            (key, source)
+        ).fetchone()
+        conn.execute('''
+            INSERT OR REPLACE INTO channel_state (channel_key, source, refreshed_at, newest_video_id)
+            VALUES (?, ?, ?, ?)
+        ''', (key, source, time.time(), newest[0] if newest else None))
+        conn.commit()
+        return len(fresh)
+
+    def get_alias(self, alias: str) -> Optional[str]:
+        """Cached channel ID for a handle/alias (handles don't move between channels)"""
+        row = self._get_connection().execute(
+            'SELECT channel_id FROM channel_aliases WHERE alias = ?', (alias.lower(),)
+        ).fetchone()
+        return row[0] if row else None
+
+    def set_alias(self, alias: str, channel_id: str):
+        conn = self._get_connection()
+        conn.execute('INSERT OR REPLACE INTO channel_aliases (alias, channel_id, resolved_at) VALUES (?, ?, ?)',
+                     (alias.lower(), channel_id, time.time()))
+        conn.commit()
+
+# Global index instance
+_channel_index = None
+_channel_index_lock = threading.Lock()
+
+def get_channel_index() -> ChannelVideoIndex:
+    """Get the global channel video index instance"""
+    global _channel_index
+    if _channel_index is None:
+        with _channel_index_lock:
+            if _channel_index is None:
+                _channel_index = ChannelVideoIndex()
+    return _channel_index
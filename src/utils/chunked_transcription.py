@@ -0,0 +1,236 @@
+"""
+Chunked, parallel local transcription for long videos.
+
+Long-form reviews used to be transcribed as one file on one thread, so they
+were either skipped by the duration cap or blocked a worker for their whole
+length. Here the audio is split on silence (ffmpeg silencedetect) into
+~WHISPER_CHUNK_SECONDS chunks, each chunk is cut and transcribed in a process
+pool (one resident faster-whisper model per process), and the chunk segments
+are shifted by the chunk start so the stitched result is in the usual
+{'start', 'duration', 'text'} format consumed by segments_to_text.
+
+iter_transcribe_chunked() yields each chunk's segments in order as soon as it
+and every earlier chunk are done, so callers can start looking at the first
+minutes while the rest is still decoding. At most WHISPER_CHUNKED_MAX_JOBS
+videos use the process pool at once (a slot of the shared Whisper pool), and
+chunked_timeout() scales the wall-clock budget with the audio length.
+"""
+
+import os
+import re
+import time
+import shutil
+import tempfile
+import threading
+import subprocess
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Optional, List, Tuple, Iterator, Callable
+
+from src.utils.logger import setup_logger
+from src.utils.whisper_pool import get_whisper_pool, WHISPER_MODEL_SIZE, WHISPER_COMPUTE_TYPE
+
+logger = setup_logger(__name__)
+
+WHISPER_CHUNKED_ENABLED = os.environ.get('WHISPER_CHUNKED_ENABLED', 'true').lower() == 'true'
+WHISPER_CHUNK_SECONDS = int(os.environ.get('WHISPER_CHUNK_SECONDS', '120'))
+WHISPER_CHUNK_PROCESSES = int(os.environ.get('WHISPER_CHUNK_PROCESSES', str(max(1, (os.cpu_count() or 2) - 1))))
+WHISPER_CHUNKED_MAX_DURATION = int(os.environ.get('WHISPER_CHUNKED_MAX_DURATION', '3600'))
+# Wall-clock budget: a fixed allowance (download, silence detection, model load)
+# plus decode seconds per audio second on one process, spread over the processes
+WHISPER_CHUNKED_TIMEOUT = int(os.environ.get('WHISPER_CHUNKED_TIMEOUT', '300'))
+WHISPER_CHUNK_REALTIME_FACTOR = float(os.environ.get('WHISPER_CHUNK_REALTIME_FACTOR', '0.5'))
+SILENCE_NOISE_DB = os.environ.get('WHISPER_SILENCE_NOISE_DB', '-30dB')
+SILENCE_MIN_SECONDS = 0.4
+# How far from the target boundary we look for a silence to cut on
+CHUNK_SLACK_FRACTION = 0.25
+
+_SILENCE_START = re.compile(r'silence_start:\s*(-?[\d.]+)')
+_SILENCE_END = re.compile(r'silence_end:\s*(-?[\d.]+)')
+
+def ffmpeg_available() -> bool:
+    return shutil.which('ffmpeg') is not None
+
+def chunked_timeout(duration: float) -> float:
+    """Seconds to allow for a chunked transcription of duration seconds of audio"""
+    return WHISPER_CHUNKED_TIMEOUT + duration * WHISPER_CHUNK_REALTIME_FACTOR / max(1, WHISPER_CHUNK_PROCESSES)
+
+def detect_silences(audio_path: str, noise: str = SILENCE_NOISE_DB,
+                    min_silence: float = SILENCE_MIN_SECONDS) -> List[Tuple[float, float]]:
+    """Return (start, end) of silent stretches found by ffmpeg silencedetect"""
+    result = subprocess.run(
+        ['ffmpeg', '-hide_banner', '-nostats', '-i', audio_path,
+         '-af', f'silencedetect=noise={noise}:d={min_silence}', '-f', 'null', '-'],
+        capture_output=True, text=True, timeout=300
+    )
+    silences = []
+    start = None
+    for line in result.stderr.splitlines():
+        match = _SILENCE_START.search(line)
+        if match:
+            start = max(0.0, float(match.group(1)))
+            continue
+        match = _SILENCE_END.search(line)
+        if match and start is not None:
+            silences.append((start, float(match.group(1))))
+            start = None
+    return silences
+
+def plan_chunks(duration: float, silences: List[Tuple[float, float]],
+                target: float = WHISPER_CHUNK_SECONDS) -> List[Tuple[float, float]]:
+    """
+    Split [0, duration] into ~target-second chunks, cutting at the middle of the
+    silence closest to each target boundary (hard cut when none is near).
+    """
+    if duration <= target * (1 + CHUNK_SLACK_FRACTION):
+        return [(0.0, duration)]
+
+    midpoints = sorted((start + end) / 2 for start, end in silences)
+    slack = target * CHUNK_SLACK_FRACTION
+    chunks = []
+    chunk_start = 0.0
+    while duration - chunk_start > target + slack:
+        boundary = chunk_start + target
+        nearby = [point for point in midpoints if abs(point - boundary) <= slack and point > chunk_start]
+        cut = min(nearby, key=lambda point: abs(point - boundary)) if nearby else boundary
+        chunks.append((chunk_start, cut))
+        chunk_start = cut
+    chunks.append((chunk_start, duration))
+    return chunks
+
+def probe_duration(audio_path: str) -> float:
+    result = subprocess.run(
+        ['ffprobe', '-v', 'error', '-show_entries', 'format=duration', '-of', 'csv=p=0', audio_path],
+        capture_output=True, text=True, timeout=60
+    )
+    return float(result.stdout.strip() or 0)
+
+# ---------------------------------------------------------------------------
+# Worker process side
+# ---------------------------------------------------------------------------
+
+_process_model = None
+
+def _init_worker(model_size: str, compute_type: str, cpu_threads: int):
+    """Load one model per worker process, once"""
+    global _process_model
+    from faster_whisper import WhisperModel
+    _process_model = WhisperModel(model_size, device="cpu", compute_type=compute_type, cpu_threads=cpu_threads)
+
+def _transcribe_chunk(audio_path: str, start: float, end: float, work_dir: str, index: int) -> List[dict]:
+    """
+    Cut one chunk to 16 kHz mono wav and transcribe it; segment times are absolute.
+    The caller removes work_dir when it gives up, which stops a running chunk at
+    its next segment (queued chunks are cancelled, running ones can't be).
+    """
+    if not os.path.isdir(work_dir):
+        return []
+    chunk_path = os.path.join(work_dir, f"chunk_{index:04d}.wav")
+    subprocess.run(
+        ['ffmpeg', '-hide_banner', '-loglevel', 'error', '-y', '-ss', f'{start:.3f}', '-t', f'{end - start:.3f}',
+         '-i', audio_path, '-ac', '1', '-ar', '16000', chunk_path],
+        check=True, timeout=300
+    )
+    try:
+        segments, _ = _process_model.transcribe(chunk_path, beam_size=1, vad_filter=True)
+        result = []
+        # Segments decode lazily - stop as soon as the caller has abandoned the job
+        for segment in segments:
+            if not os.path.isdir(work_dir):
+                break
+            result.append({
+                'start': start + segment.start,
+                'duration': segment.end - segment.start,
+                'text': segment.text,
+            })
+        return result
+    finally:
+        try:
+            os.remove(chunk_path)
+        except OSError:
+            pass
+
+# ---------------------------------------------------------------------------
+# Caller side
+# ---------------------------------------------------------------------------
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+def get_chunk_executor() -> ProcessPoolExecutor:
+    """Process pool shared by every chunked transcription (models stay loaded between videos)"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                processes = max(1, WHISPER_CHUNK_PROCESSES)
+                cpu_threads = max(1, (os.cpu_count() or processes) // processes)
+                # spawn: don't fork a process that already runs CTranslate2/HTTP threads
+                _executor = ProcessPoolExecutor(
+                    max_workers=processes,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker,
+                    initargs=(WHISPER_MODEL_SIZE, WHISPER_COMPUTE_TYPE, cpu_threads),
+                )
+                logger.info(f"Chunked transcription pool started: {processes} processes x {cpu_threads} threads")
+    return _executor
+
+def iter_transcribe_chunked(audio_path: str, duration: Optional[float] = None,
+                            timeout: Optional[float] = None) -> Iterator[List[dict]]:
+    """
+    Transcribe a long audio file in parallel chunks, yielding each chunk's
+    segments in order. Stops early (cancelling queued chunks) when the caller
+    closes the generator or the timeout expires; raises TimeoutError then.
+    Raises WhisperQueueFull when WHISPER_CHUNKED_MAX_JOBS videos are already
+    being transcribed.
+    """
+    with get_whisper_pool().chunked_slot():
+        yield from _iter_chunks(audio_path, duration, timeout)
+
+def _iter_chunks(audio_path: str, duration: Optional[float], timeout: Optional[float]) -> Iterator[List[dict]]:
+    started = time.time()
+    if duration is None:
+        duration = probe_duration(audio_path)
+    chunks = plan_chunks(duration, detect_silences(audio_path))
+    logger.info(f"🎙️ Transcribing {duration:.0f}s of audio in {len(chunks)} chunks")
+
+    executor = get_chunk_executor()
+    work_dir = tempfile.mkdtemp(prefix='whisper_chunks_')
+    futures = [executor.submit(_transcribe_chunk, audio_path, start, end, work_dir, i)
+               for i, (start, end) in enumerate(chunks)]
+    try:
+        for i, future in enumerate(futures):
+            remaining = None if timeout is None else timeout - (time.time() - started)
+            if remaining is not None and remaining <= 0:
+                raise TimeoutError(f"chunked transcription exceeded {timeout:.0f}s at chunk {i + 1}/{len(chunks)}")
+            try:
+                segments = future.result(timeout=remaining)
+            except FutureTimeoutError:
+                raise TimeoutError(f"chunked transcription exceeded {timeout:.0f}s at chunk {i + 1}/{len(chunks)}")
+            logger.debug(f"Chunk {i + 1}/{len(chunks)} done ({len(segments)} segments)")
+            yield segments
+        logger.info(f"✅ Chunked transcription finished: {len(chunks)} chunks in {time.time() - started:.1f}s")
+    finally:
+        for future in futures:
+            future.cancel()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+def transcribe_chunked(audio_path: str, duration: Optional[float] = None, timeout: Optional[float] = None,
+                       on_partial: Optional[Callable[[List[dict]], None]] = None) -> Optional[List[dict]]:
+    """
+    Stitched segments for the whole file, or None on failure/timeout.
+    on_partial(segments_so_far) is called after every chunk.
+    """
+    segments: List[dict] = []
+    try:
+        for chunk_segments in iter_transcribe_chunked(audio_path, duration, timeout):
+            segments.extend(chunk_segments)
+            if on_partial:
+                on_partial(segments)
+    except TimeoutError as e:
+        logger.warning(f"⚠️ {e}")
+        return None
+    except Exception as e:
+        logger.warning(f"❌ Chunked transcription failed: {e}")
+        return None
+    return segments
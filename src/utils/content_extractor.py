@@ -1,12 +1,13 @@
 import re
 import json
-import requests
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Union
 from bs4 import BeautifulSoup
 import logging
 from urllib.parse import urlparse, urljoin
 
 from src.utils.logger import setup_logger
+from src.utils.http_pool import get_http_session
+from src.utils.parsed_document import ParsedDocument, StrippedTree, as_document
 
 logger = setup_logger(__name__)
 
@@ -65,7 +66,7 @@ def extract_fliphtml5(html: str) -> Optional[str]:
             logger.info(f"Trying text version URL: {text_url}")
             
             try:
-                response = requests.get(text_url, timeout=20)
+                response = get_http_session().get(text_url, timeout=20)
                 if response.status_code == 200:
                     text_soup = BeautifulSoup(response.text, "lxml")
                     text_content = text_soup.get_text(" ", strip=True)
@@ -84,7 +85,7 @@ def extract_fliphtml5(html: str) -> Optional[str]:
             logger.info(f"Trying JSON endpoint: {json_url}")
             
             try:
-                response = requests.get(json_url, timeout=20)
+                response = get_http_session().get(json_url, timeout=20)
                 if response.status_code == 200:
                     data = response.json()
                     if "page_text" in data:
@@ -222,53 +223,60 @@ def extract_fliphtml5(html: str) -> Optional[str]:
     
     return None
 
-def extract_article_content(html: str, url: str, expected_topic: str = "") -> str:
+def extract_article_content(html: Union[str, ParsedDocument], url: str, expected_topic: str = "") -> str:
     """
     Extract just the main article content from HTML, filtering out scripts, styles, navigation, etc.
     Uses quality-based escalation to try alternative methods if basic extraction fails.
     
     Args:
-        html: Full HTML content
+        html: Full HTML content, or the ParsedDocument of the fetch
         url: URL of the page (used to determine site-specific extraction)
         expected_topic: Expected topic for quality checking (e.g., "VW Jetta")
         
     Returns:
         Extracted article text
     """
-    if not html:
+    document = as_document(html, url)
+    if document is None:
         logger.warning("No HTML content provided for extraction")
         return ""
     
-    # Initialize BeautifulSoup
-    soup = BeautifulSoup(html, 'html.parser')
-    
-    # Remove all script, style elements and comments
-    for element in soup(['script', 'style', 'noscript', 'iframe', 'svg']):
-        element.decompose()
+    # Same page, same topic - reuse the extraction done earlier for this fetch
+    extracted = document.get_extracted(url, expected_topic)
+    if extracted is None:
+        extracted = _extract_article_content(document, url, expected_topic)
+        document.set_extracted(url, expected_topic, extracted)
+    return extracted
+
+def _extract_article_content(document: ParsedDocument, url: str, expected_topic: str = "") -> str:
+    """Uncached body of extract_article_content"""
+    # Shared stripped tree (scripts/styles/iframes already gone); navigation and
+    # ads are only taken out until this block ends, so the alternative
+    # extraction below starts from the same tree it always did
+    with document.stripped_tree() as tree:
+        soup = tree.soup
+        
+        # Try to remove navigation, headers, footers
+        tree.detach(soup.find_all(['nav', 'header', 'footer']))
+        
+        # Try to remove ads and banners
+        tree.detach(soup.find_all(class_=lambda c: c and ('ad' in c.lower() or 'banner' in c.lower() or 'cookie' in c.lower())))
+        
+        # Step 1: Try site-specific extraction first
+        site_specific_content = try_site_specific_extraction(soup, url, expected_topic, tree)
+        if site_specific_content:
+            # For SpotlightEP, if we got any content from site-specific extraction, use it
+            # (site-specific already handles FlipHTML5 detection and quality checks)
+            if "spotlightepnews.com" in url and len(site_specific_content) > 200:
+                logger.info(f"Using SpotlightEP content ({len(site_specific_content)} chars) - site-specific extraction succeeded")
+                log_content_excerpt(site_specific_content, "SpotlightEP-Specific")
+                return site_specific_content
+            elif not is_content_quality_poor(site_specific_content, url, expected_topic):
+                log_content_excerpt(site_specific_content, "Site-Specific")
+                return site_specific_content
         
-    # Try to remove navigation, headers, footers
-    for nav in soup.find_all(['nav', 'header', 'footer']):
-        nav.decompose()
-    
-    # Try to remove ads and banners
-    for ad in soup.find_all(class_=lambda c: c and ('ad' in c.lower() or 'banner' in c.lower() or 'cookie' in c.lower())):
-        ad.decompose()
-    
-    # Step 1: Try site-specific extraction first
-    site_specific_content = try_site_specific_extraction(soup, url, expected_topic)
-    if site_specific_content:
-        # For SpotlightEP, if we got any content from site-specific extraction, use it
-        # (site-specific already handles FlipHTML5 detection and quality checks)
-        if "spotlightepnews.com" in url and len(site_specific_content) > 200:
-            logger.info(f"Using SpotlightEP content ({len(site_specific_content)} chars) - site-specific extraction succeeded")
-            log_content_excerpt(site_specific_content, "SpotlightEP-Specific")
-            return site_specific_content
-        elif not is_content_quality_poor(site_specific_content, url, expected_topic):
-            log_content_excerpt(site_specific_content, "Site-Specific")
-            return site_specific_content
-    
-    # Step 2: Try basic extraction (site-specific or generic)
-    basic_extracted = _extract_with_basic_methods(soup, url)
+        # Step 2: Try basic extraction (site-specific or generic)
+        basic_extracted = _extract_with_basic_methods(soup, url)
     
     # Step 3: Quality check
     if not is_content_quality_poor(basic_extracted, url, expected_topic):
@@ -279,7 +287,7 @@ def extract_article_content(html: str, url: str, expected_topic: str = "") -> st
     # Step 4: Basic extraction failed quality check - try alternatives
     logger.info(f"Basic extraction failed quality check ({len(basic_extracted)} chars), trying alternatives")
     
-    alternative_extracted = try_alternative_extraction(html, url, expected_topic)
+    alternative_extracted = try_alternative_extraction(document, url, expected_topic)
     
     if alternative_extracted and not is_content_quality_poor(alternative_extracted, url, expected_topic):
         # Alternative extraction succeeded
@@ -296,7 +304,12 @@ def extract_article_content(html: str, url: str, expected_topic: str = "") -> st
         log_content_excerpt(basic_extracted, "Fallback Basic")
         return basic_extracted
 
-def try_site_specific_extraction(soup: BeautifulSoup, url: str, expected_topic: str = "") -> str:
+def _decompose_all(elements):
+    for element in elements:
+        element.decompose()
+
+def try_site_specific_extraction(soup: BeautifulSoup, url: str, expected_topic: str = "",
+                                 tree: Optional[StrippedTree] = None) -> str:
     """
     Try site-specific extraction methods for known problematic sites.
     
@@ -304,6 +317,7 @@ def try_site_specific_extraction(soup: BeautifulSoup, url: str, expected_topic:
         soup: BeautifulSoup object with cleaned HTML
         url: URL of the page
         expected_topic: Expected topic (e.g., "VW Jetta")
+        tree: Shared stripped tree soup belongs to; nodes are detached from it rather than decomposed
         
     Returns:
         Extracted content using site-specific methods, or empty string if not applicable
@@ -312,7 +326,7 @@ def try_site_specific_extraction(soup: BeautifulSoup, url: str, expected_topic:
     
     # Handle thegentlemanracer.com specifically
     if 'thegentlemanracer.com' in domain:
-        return extract_thegentlemanracer_content(soup, url, expected_topic)
+        return extract_thegentlemanracer_content(soup, url, expected_topic, tree)
     
     # Handle spotlightepnews.com specifically (PDF viewer/flipbook format)
     if 'spotlightepnews.com' in domain:
@@ -324,12 +338,14 @@ def try_site_specific_extraction(soup: BeautifulSoup, url: str, expected_topic:
     
     return ""
 
-def extract_thegentlemanracer_content(soup: BeautifulSoup, url: str, expected_topic: str = "") -> str:
+def extract_thegentlemanracer_content(soup: BeautifulSoup, url: str, expected_topic: str = "",
+                                     tree: Optional[StrippedTree] = None) -> str:
     """
     Site-specific extraction for thegentlemanracer.com.
     This site has sidebar content with other vehicle reviews that can confuse the generic extractor.
     """
     logger.info("Using thegentlemanracer.com-specific content extraction")
+    remove = tree.detach if tree else _decompose_all
     
     article_text = ""
     
@@ -400,8 +416,7 @@ def extract_thegentlemanracer_content(soup: BeautifulSoup, url: str, expected_to
     ]
     
     for selector in sidebar_selectors:
-        for element in content_container.select(selector):
-            element.decompose()
+        remove(content_container.select(selector))
     
     # Extract the title
     title = soup.find('h1')
@@ -1034,12 +1049,12 @@ def is_content_quality_poor(extracted_content: str, url: str, expected_topic: st
     
     return False
 
-def try_alternative_extraction(html: str, url: str, expected_topic: str = "") -> str:
+def try_alternative_extraction(html: Union[str, ParsedDocument], url: str, expected_topic: str = "") -> str:
     """
     Try alternative extraction methods when basic extraction fails quality checks.
     
     Args:
-        html: Full HTML content
+        html: Full HTML content, or the ParsedDocument of the fetch
         url: URL of the page
         expected_topic: Expected topic (e.g., "VW Jetta")
         
@@ -1048,37 +1063,36 @@ def try_alternative_extraction(html: str, url: str, expected_topic: str = "") ->
     """
     logger.info("Trying alternative extraction methods due to poor quality content")
     
-    if not html:
+    document = as_document(html, url)
+    if document is None:
         return ""
     
-    soup = BeautifulSoup(html, 'html.parser')
-    
-    # Remove scripts, styles, etc.
-    for element in soup(['script', 'style', 'noscript', 'iframe', 'svg']):
-        element.decompose()
-    
-    # Try multiple alternative methods
-    extraction_methods = []
-    
-    # Method 1: Title-based content discovery
-    title_based = extract_content_near_title(soup, url, expected_topic)
-    if title_based:
-        extraction_methods.append(("title_based", title_based))
-    
-    # Method 2: Paragraph density analysis
-    density_based = extract_highest_paragraph_density(soup, url)
-    if density_based:
-        extraction_methods.append(("density_based", density_based))
-    
-    # Method 3: Full text with smart filtering
-    filtered_text = extract_full_text_with_filtering(soup, url, expected_topic)
-    if filtered_text:
-        extraction_methods.append(("filtered_text", filtered_text))
-    
-    # Method 4: Longest meaningful text block
-    longest_block = extract_longest_text_block(soup, url)
-    if longest_block:
-        extraction_methods.append(("longest_block", longest_block))
+    # Scripts, styles, etc. are already out of the shared stripped tree
+    with document.stripped_tree() as tree:
+        soup = tree.soup
+        
+        # Try multiple alternative methods
+        extraction_methods = []
+        
+        # Method 1: Title-based content discovery
+        title_based = extract_content_near_title(soup, url, expected_topic)
+        if title_based:
+            extraction_methods.append(("title_based", title_based))
+        
+        # Method 2: Paragraph density analysis
+        density_based = extract_highest_paragraph_density(soup, url)
+        if density_based:
+            extraction_methods.append(("density_based", density_based))
+        
+        # Method 3: Full text with smart filtering
+        filtered_text = extract_full_text_with_filtering(soup, url, expected_topic, tree)
+        if filtered_text:
+            extraction_methods.append(("filtered_text", filtered_text))
+        
+        # Method 4: Longest meaningful text block (sees method 3's removals, as before)
+        longest_block = extract_longest_text_block(soup, url)
+        if longest_block:
+            extraction_methods.append(("longest_block", longest_block))
     
     # Select the best quality result
     best_content = select_best_extraction(extraction_methods, expected_topic)
@@ -1202,19 +1216,23 @@ def extract_highest_paragraph_density(soup: BeautifulSoup, url: str) -> str:
     
     return ""
 
-def extract_full_text_with_filtering(soup: BeautifulSoup, url: str, expected_topic: str = "") -> str:
-    """Extract all text but filter out navigation/sidebar content"""
+def extract_full_text_with_filtering(soup: BeautifulSoup, url: str, expected_topic: str = "",
+                                    tree: Optional[StrippedTree] = None) -> str:
+    """
+    Extract all text but filter out navigation/sidebar content.
+    With a StrippedTree the removed nodes are detached from the shared tree
+    (restored when the caller's block ends) instead of decomposed.
+    """
     logger.debug("Trying full text extraction with filtering")
+    remove = tree.detach if tree else _decompose_all
     
     # Remove obvious navigation/sidebar elements
-    for element in soup.find_all(['nav', 'header', 'footer', 'aside']):
-        element.decompose()
+    remove(soup.find_all(['nav', 'header', 'footer', 'aside']))
     
     # Remove elements with navigation-like classes
     nav_classes = ['nav', 'menu', 'sidebar', 'related', 'recommended', 'recent']
     for class_name in nav_classes:
-        for element in soup.find_all(class_=lambda c: c and class_name in c.lower()):
-            element.decompose()
+        remove(soup.find_all(class_=lambda c: c and class_name in c.lower()))
     
     # Get title
     title = soup.find('h1')
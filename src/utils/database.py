@@ -5,6 +5,8 @@ Handles all database operations for the DriveShop clip tracking system.
 
 import os
 import json
+import atexit
+import threading
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 from supabase import create_client, Client
@@ -58,6 +60,24 @@ class ClipData:
     sentiment_analysis_date: Optional[datetime]
     sentiment_completed: Optional[bool]
 
+# Retry intervals (in days) per attempt result
+RETRY_INTERVALS = {
+    'no_content': 4,        # 4 days - content might be published within a few days
+    'no_content_found': 4,  # 4 days - same as no_content
+    'generic_content': 3,   # 3 days - they might publish specific content soon  
+    'crawl_failed': 1,      # 1 day - technical issues usually resolve quickly
+    'blocked_403': 2,       # 2 days - anti-bot measures might reset
+    'timeout': 1,           # 1 day - site performance issues
+    'store_failed': 1,      # 1 day - database issues
+    'success': None         # Never retry - we found what we needed!
+}
+
+def _retry_after_date(result: str) -> Optional[str]:
+    """ISO retry_after_date for an attempt result, or None if it should not be scheduled"""
+    if result in RETRY_INTERVALS and RETRY_INTERVALS[result] is not None:
+        return (datetime.now() + timedelta(days=RETRY_INTERVALS[result])).isoformat()
+    return None
+
 class DatabaseManager:
     """Manages all database operations for the DriveShop clip tracking system"""
     
@@ -187,6 +207,65 @@ class DatabaseManager:
     
     # ========== CLIP MANAGEMENT ==========
     
+    @staticmethod
+    def _build_clip_row(clip_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Map clip_data to a clips row for a found clip"""
+        row = {
+            "wo_number": str(clip_data['wo_number']),
+            "processing_run_id": clip_data['processing_run_id'],
+            "office": clip_data.get('office'),
+            "make": clip_data.get('make'),
+            "model": clip_data.get('model'),
+            "trim": clip_data.get('trim'),  # ADD TRIM FIELD
+            "contact": clip_data.get('contact'),
+            "person_id": clip_data.get('person_id'),
+            "activity_id": clip_data.get('activity_id'),
+            "clip_url": clip_data.get('clip_url'),
+            "extracted_content": clip_data.get('extracted_content'),
+            "published_date": clip_data.get('published_date'),
+            "attribution_strength": clip_data.get('attribution_strength'),
+            "byline_author": clip_data.get('byline_author'),
+            "tier_used": clip_data.get('tier_used'),
+            "status": clip_data.get('status', 'pending_review'),
+            "workflow_stage": clip_data.get('workflow_stage', 'found'),
+            "last_attempt_result": 'success',
+            "relevance_score": clip_data.get('relevance_score'),
+            "overall_sentiment": clip_data.get('overall_sentiment'),
+            "brand_alignment": clip_data.get('brand_alignment'),
+            "summary": clip_data.get('summary'),
+            "sentiment_completed": clip_data.get('sentiment_completed', False)
+        }
+        # Only combined-analysis ingest provides it; don't clear an existing analysis otherwise
+        if clip_data.get('sentiment_data_enhanced'):
+            row["sentiment_data_enhanced"] = clip_data['sentiment_data_enhanced']
+        return row
+    
+    @staticmethod
+    def _build_failed_attempt_row(loan_data: Dict[str, Any], reason: str) -> Dict[str, Any]:
+        """Map loan_data to a clips row for a failed attempt"""
+        return {
+            "wo_number": str(loan_data['wo_number']),
+            "processing_run_id": loan_data['processing_run_id'],
+            "office": loan_data.get('office'),
+            "make": loan_data.get('make'),
+            "model": loan_data.get('model'),
+            "contact": loan_data.get('contact'),
+            "person_id": loan_data.get('person_id'),
+            "activity_id": loan_data.get('activity_id'),
+            "clip_url": None,  # No clip found
+            "extracted_content": None,  # No content found
+            "published_date": None,
+            "attribution_strength": None,
+            "byline_author": None,
+            "tier_used": loan_data.get('tier_used', 'Unknown'),
+            "status": reason,  # 'no_content_found' or 'processing_failed'
+            "workflow_stage": 'found',  # Default workflow stage
+            # NEW: Store original source URLs for View link transparency
+            "original_urls": loan_data.get('original_urls', ''),
+            "urls_attempted": loan_data.get('urls_attempted', 0),
+            "failure_reason": loan_data.get('failure_reason', reason)
+        }
+    
     def store_clip(self, clip_data: Dict[str, Any]) -> bool:
         """
         Store a found clip to the database
@@ -205,31 +284,7 @@ class DatabaseManager:
                     raise ValueError(f"Required field '{field}' missing from clip_data")
             
             # Prepare data for insertion
-            db_data = {
-                "wo_number": str(clip_data['wo_number']),
-                "processing_run_id": clip_data['processing_run_id'],
-                "office": clip_data.get('office'),
-                "make": clip_data.get('make'),
-                "model": clip_data.get('model'),
-                "trim": clip_data.get('trim'),  # ADD TRIM FIELD
-                "contact": clip_data.get('contact'),
-                "person_id": clip_data.get('person_id'),
-                "activity_id": clip_data.get('activity_id'),
-                "clip_url": clip_data.get('clip_url'),
-                "extracted_content": clip_data.get('extracted_content'),
-                "published_date": clip_data.get('published_date'),
-                "attribution_strength": clip_data.get('attribution_strength'),
-                "byline_author": clip_data.get('byline_author'),
-                "tier_used": clip_data.get('tier_used'),
-                "status": clip_data.get('status', 'pending_review'),
-                "workflow_stage": clip_data.get('workflow_stage', 'found'),
-                "last_attempt_result": 'success',
-                "relevance_score": clip_data.get('relevance_score'),
-                "overall_sentiment": clip_data.get('overall_sentiment'),
-                "brand_alignment": clip_data.get('brand_alignment'),
-                "summary": clip_data.get('summary'),
-                "sentiment_completed": clip_data.get('sentiment_completed', False)
-            }
+            db_data = self._build_clip_row(clip_data)
             
             # Check if clip already exists for this WO#
             existing = self.supabase.table('clips').select('id').eq('wo_number', clip_data['wo_number']).execute()
@@ -280,28 +335,7 @@ class DatabaseManager:
                     raise ValueError(f"Required field '{field}' missing from loan_data")
             
             # Prepare data for insertion
-            db_data = {
-                "wo_number": str(loan_data['wo_number']),
-                "processing_run_id": loan_data['processing_run_id'],
-                "office": loan_data.get('office'),
-                "make": loan_data.get('make'),
-                "model": loan_data.get('model'),
-                "contact": loan_data.get('contact'),
-                "person_id": loan_data.get('person_id'),
-                "activity_id": loan_data.get('activity_id'),
-                "clip_url": None,  # No clip found
-                "extracted_content": None,  # No content found
-                "published_date": None,
-                "attribution_strength": None,
-                "byline_author": None,
-                "tier_used": loan_data.get('tier_used', 'Unknown'),
-                "status": reason,  # 'no_content_found' or 'processing_failed'
-                "workflow_stage": 'found',  # Default workflow stage
-                # NEW: Store original source URLs for View link transparency
-                "original_urls": loan_data.get('original_urls', ''),
-                "urls_attempted": loan_data.get('urls_attempted', 0),
-                "failure_reason": loan_data.get('failure_reason', reason)
-            }
+            db_data = self._build_failed_attempt_row(loan_data, reason)
             
             # Check if clip already exists for this WO#
             existing = self.supabase.table('clips').select('id, attempt_count').eq('wo_number', loan_data['wo_number']).execute()
@@ -745,6 +779,96 @@ class DatabaseManager:
             # On error, allow retry to be safe
             return True
     
+    @staticmethod
+    def skip_reason_for_clip_status(clip_status: Optional[str]) -> str:
+        """Map an existing clip status to the skip reason recorded for a skipped WO#"""
+        if clip_status in ['approved', 'pending_review', 'rejected']:
+            return f'already_{clip_status}'
+        elif clip_status in ['no_content_found', 'processing_failed']:
+            return 'retry_cooldown'
+        return 'unknown'
+    
+    def plan_wo_retries(self, wo_numbers: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Bulk version of should_retry_wo for a whole run (chunked .in_() queries).
+        
+        Args:
+            wo_numbers: Work order numbers about to be processed
+            
+        Returns:
+            Dict of wo_number -> skip reason (None means process). WO#s whose chunk
+            could not be loaded are left out so callers can fall back to should_retry_wo.
+        """
+        wo_numbers = list(dict.fromkeys(str(wo) for wo in wo_numbers if wo))
+        plan = {}
+        
+        current_time = datetime.now()
+        current_time_utc = None  # Lazy init if needed
+        
+        # Supabase .in_() has a limit, batch in chunks of 200
+        for i in range(0, len(wo_numbers), 200):
+            batch = wo_numbers[i:i + 200]
+            try:
+                clip_status = {}
+                clips_result = self.supabase.table('clips').select('wo_number, status').in_('wo_number', batch).execute()
+                for row in clips_result.data or []:
+                    clip_status.setdefault(str(row['wo_number']), row.get('status', ''))
+                
+                tracking = {}
+                tracking_result = self.supabase.table('wo_tracking').select('wo_number, status, retry_after_date').in_('wo_number', batch).execute()
+                for row in tracking_result.data or []:
+                    tracking.setdefault(str(row['wo_number']), row)
+            except Exception as e:
+                logger.error(f"❌ Error loading retry state for {len(batch)} WO#s: {e}")
+                continue
+            
+            for wo_number in batch:
+                status = clip_status.get(wo_number)
+                # Finalized clip (approved, pending_review, or rejected by user)
+                if status in ['approved', 'pending_review', 'rejected']:
+                    plan[wo_number] = self.skip_reason_for_clip_status(status)
+                    continue
+                
+                wo_record = tracking.get(wo_number)
+                if not wo_record:
+                    # Never tried before, should process
+                    plan[wo_number] = None
+                    continue
+                
+                # If we already found a clip (successful), don't retry
+                if wo_record.get('status') == 'found':
+                    plan[wo_number] = self.skip_reason_for_clip_status(status)
+                    continue
+                
+                # Check retry timing
+                if wo_record.get('retry_after_date'):
+                    try:
+                        retry_after = datetime.fromisoformat(wo_record['retry_after_date'])
+                        # Handle timezone awareness
+                        if retry_after.tzinfo is not None:
+                            if current_time_utc is None:
+                                from datetime import timezone
+                                current_time_utc = datetime.now(timezone.utc)
+                            compare_time = current_time_utc
+                        else:
+                            compare_time = current_time
+                        in_cooldown = compare_time < retry_after
+                    except (ValueError, TypeError) as e:
+                        # Like should_retry_wo: a bad date only affects this WO#, which is processed
+                        logger.error(f"❌ Error checking retry status for WO# {wo_number}: {e}")
+                        in_cooldown = False
+                    
+                    if in_cooldown:
+                        plan[wo_number] = self.skip_reason_for_clip_status(status)
+                        continue
+                
+                plan[wo_number] = None
+        
+        skipped = sum(1 for reason in plan.values() if reason)
+        logger.info(f"📊 Retry plan: {len(plan) - skipped} to process, {skipped} to skip "
+                    f"({len(wo_numbers) - len(plan)} unplanned)")
+        return plan
+    
     def mark_wo_attempt(self, wo_number: str, result: str, details: str = None) -> bool:
         """
         Record an attempt for a WO# with smart retry logic
@@ -758,22 +882,8 @@ class DatabaseManager:
             True if successful, False otherwise
         """
         try:
-            # Define retry intervals (in days)
-            RETRY_INTERVALS = {
-                'no_content': 4,        # 4 days - content might be published within a few days
-                'no_content_found': 4,  # 4 days - same as no_content
-                'generic_content': 3,   # 3 days - they might publish specific content soon  
-                'crawl_failed': 1,      # 1 day - technical issues usually resolve quickly
-                'blocked_403': 2,       # 2 days - anti-bot measures might reset
-                'timeout': 1,           # 1 day - site performance issues
-                'store_failed': 1,      # 1 day - database issues
-                'success': None         # Never retry - we found what we needed!
-            }
-            
             # Calculate retry date
-            retry_after_date = None
-            if result in RETRY_INTERVALS and RETRY_INTERVALS[result] is not None:
-                retry_after_date = (datetime.now() + timedelta(days=RETRY_INTERVALS[result])).isoformat()
+            retry_after_date = _retry_after_date(result)
             
             # Get current attempt count to increment it
             existing = self.supabase.table('wo_tracking').select('attempt_count').eq('wo_number', str(wo_number)).execute()
@@ -832,6 +942,37 @@ class DatabaseManager:
             logger.error(f"❌ Failed to record skip event for WO# {wo_number}: {e}")
             return False
     
+    def record_skip_events(self, skip_reasons: Dict[str, str], run_id: str) -> int:
+        """
+        Bulk version of record_skip_event: one update per skip reason per 200 WO#s
+        
+        Args:
+            skip_reasons: Dict of wo_number -> skip reason
+            run_id: The current processing run ID
+            
+        Returns:
+            Number of clip records updated
+        """
+        by_reason: Dict[str, List[str]] = {}
+        for wo_number, skip_reason in skip_reasons.items():
+            by_reason.setdefault(skip_reason, []).append(str(wo_number))
+        
+        updated = 0
+        for skip_reason, wo_numbers in by_reason.items():
+            for i in range(0, len(wo_numbers), 200):
+                batch = wo_numbers[i:i + 200]
+                try:
+                    result = self.supabase.table('clips').update({
+                        'last_skip_run_id': run_id,
+                        'skip_reason': skip_reason
+                    }).in_('wo_number', batch).execute()
+                    updated += len(result.data or [])
+                except Exception as e:
+                    logger.error(f"❌ Failed to record {len(batch)} skip events ({skip_reason}): {e}")
+        
+        logger.info(f"📝 Recorded skip events for {updated} clips across {len(skip_reasons)} skipped WO#s")
+        return updated
+    
     def mark_wo_success(self, wo_number: str, clip_url: str) -> bool:
         """Mark a WO# as successfully found"""
         try:
@@ -1330,6 +1471,147 @@ class DatabaseManager:
             logger.error(f"❌ Failed to update clip URL for WO# {wo_number}: {e}")
             return False
 
+class BufferedClipWriter:
+    """
+    Write-behind buffer for the ingest hot path.
+    
+    Collects clip rows and wo_tracking rows during a run and flushes them as batched
+    upserts on wo_number (unique constraint from add_unique_wo_constraint.sql) every
+    `batch_rows` WO#s or `flush_seconds` seconds, replacing the per-clip
+    select/update/insert + select/upsert round trips of store_clip/store_failed_attempt.
+    Call close() when the run ends (also on cancel); it is registered with atexit too.
+    """
+    
+    def __init__(self, db: DatabaseManager, batch_rows: int = None, flush_seconds: float = None):
+        self.db = db
+        self.batch_rows = batch_rows or int(os.environ.get('DB_WRITE_BATCH_ROWS', '50'))
+        self.flush_seconds = flush_seconds or float(os.environ.get('DB_WRITE_FLUSH_SECONDS', '5'))
+        # wo_number -> (kind, source data, reason); last write per WO# wins like the update path
+        self._pending: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_periodically, name='clip-writer-flush', daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+    
+    def store_clip(self, clip_data: Dict[str, Any]) -> bool:
+        """Buffer a found clip (and its wo_tracking success row)"""
+        return self._add(clip_data, 'clip', 'success')
+    
+    def store_failed_attempt(self, loan_data: Dict[str, Any], reason: str = "no_content_found") -> bool:
+        """Buffer a failed attempt (and its wo_tracking retry row)"""
+        return self._add(loan_data, 'failed', reason)
+    
+    def _add(self, data: Dict[str, Any], kind: str, reason: str) -> bool:
+        if 'wo_number' not in data or 'processing_run_id' not in data:
+            logger.error(f"❌ Cannot buffer {kind} row without wo_number/processing_run_id")
+            return False
+        with self._lock:
+            self._pending[str(data['wo_number'])] = (kind, data, reason)
+            should_flush = len(self._pending) >= self.batch_rows
+        if should_flush:
+            self.flush()
+        return True
+    
+    def _flush_periodically(self):
+        while not self._closed.wait(self.flush_seconds):
+            self.flush()
+    
+    def flush(self) -> int:
+        """Write all buffered rows; returns the number of WO#s flushed"""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+            
+            try:
+                upserts = self._build_batch(pending)
+            except Exception as e:
+                # Nothing was written yet, so the regular per-row path is safe
+                logger.error(f"❌ Bulk clip flush failed ({e}) - falling back to per-row writes")
+                for kind, data, reason in pending.values():
+                    if kind == 'clip':
+                        self.db.store_clip(data)
+                    else:
+                        self.db.store_failed_attempt(data, reason)
+                return len(pending)
+            
+            # Upserts that succeeded are dropped from the list, so a failure part way
+            # through only retries the rows that were not written. The fallback writes
+            # the rows built above rather than going through store_clip/store_failed_attempt,
+            # which would read attempt_count again and increment it a second time.
+            try:
+                while upserts:
+                    table, rows = upserts[0]
+                    self.db.supabase.table(table).upsert(rows, on_conflict='wo_number').execute()
+                    upserts.pop(0)
+                logger.info(f"✅ Flushed {len(pending)} buffered clip rows")
+            except Exception as e:
+                logger.error(f"❌ Bulk clip flush failed ({e}) - writing the remaining rows one by one")
+                for table, rows in upserts:
+                    for row in rows:
+                        try:
+                            self.db.supabase.table(table).upsert([row], on_conflict='wo_number').execute()
+                        except Exception as row_error:
+                            logger.error(f"❌ Failed to write {table} row for WO# {row.get('wo_number')}: {row_error}")
+            return len(pending)
+    
+    def _build_batch(self, pending: Dict[str, tuple]) -> List[tuple]:
+        """The (table, rows) upserts that write `pending`, with attempt counts already incremented"""
+        wo_numbers = list(pending.keys())
+        clip_attempts = {}
+        tracking_attempts = {}
+        # Supabase .in_() has a limit, batch in chunks of 200
+        for i in range(0, len(wo_numbers), 200):
+            batch = wo_numbers[i:i + 200]
+            result = self.db.supabase.table('clips').select('wo_number, attempt_count').in_('wo_number', batch).execute()
+            for row in result.data or []:
+                clip_attempts[str(row['wo_number'])] = row.get('attempt_count') or 0
+            result = self.db.supabase.table('wo_tracking').select('wo_number, attempt_count').in_('wo_number', batch).execute()
+            for row in result.data or []:
+                tracking_attempts[str(row['wo_number'])] = row.get('attempt_count') or 0
+        
+        now = datetime.now().isoformat()
+        clip_rows, failed_rows, found_rows, searching_rows = [], [], [], []
+        for wo_number, (kind, data, reason) in pending.items():
+            tracking_row = {
+                "wo_number": wo_number,
+                "last_attempt_date": now,
+                "attempt_count": tracking_attempts.get(wo_number, 0) + 1,
+            }
+            if kind == 'clip':
+                clip_rows.append(DatabaseManager._build_clip_row(data))
+                tracking_row.update({"status": "found", "found_clip_url": data.get('clip_url'), "retry_after_date": None})
+                found_rows.append(tracking_row)
+            else:
+                row = DatabaseManager._build_failed_attempt_row(data, reason)
+                row['attempt_count'] = clip_attempts.get(wo_number, 0) + 1
+                failed_rows.append(row)
+                tracking_row.update({"status": "searching", "retry_after_date": _retry_after_date(reason)})
+                searching_rows.append(tracking_row)
+        
+        # Rows in one upsert must share the same columns, so each shape goes separately
+        # (clip rows with an ingest-time sentiment analysis have one more column)
+        clip_shapes = {}
+        for row in clip_rows:
+            clip_shapes.setdefault(tuple(row), []).append(row)
+        return [(table, rows) for table, rows in
+                ([('clips', rows) for rows in clip_shapes.values()] +
+                 [('clips', failed_rows), ('wo_tracking', found_rows), ('wo_tracking', searching_rows)])
+                if rows]
+    
+    def close(self):
+        """Stop the periodic flusher and flush anything still buffered"""
+        if not self._closed.is_set():
+            self._closed.set()
+            try:
+                atexit.unregister(self.close)
+            except Exception:
+                pass
+        self.flush()
+
 # Global database instance
 _db_instance = None
 
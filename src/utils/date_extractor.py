@@ -5,13 +5,14 @@ Handles extracting publication dates from various sources and formats.
 
 import re
 import json
-from typing import Optional
+from typing import Optional, Union
 from datetime import datetime, timedelta
 from bs4 import BeautifulSoup
 import dateutil.parser
 import logging
 
 from src.utils.logger import setup_logger
+from src.utils.parsed_document import ParsedDocument, as_document
 
 logger = setup_logger(__name__)
 
@@ -61,19 +62,23 @@ def extract_date_from_url(url: str) -> Optional[datetime]:
     
     return None
 
-def extract_date_from_html(html: str, url: str = "") -> Optional[datetime]:
+def extract_date_from_html(html: Union[str, ParsedDocument], url: str = "") -> Optional[datetime]:
     """
     Extract publication date from HTML content.
     Tries multiple methods in order of reliability.
     
     Args:
-        html: HTML content to extract date from
+        html: HTML content to extract date from, or the ParsedDocument of the fetch
         url: URL of the content (for context/debugging)
         
     Returns:
         datetime object or None if no date found
     """
-    soup = BeautifulSoup(html, 'lxml')
+    document = as_document(html, url)
+    if document is None:
+        return None
+    # Read-only from here on - the tree is shared with the other extractors
+    soup = document.soup
     
     # DISABLED: URL date extraction is too aggressive and returns Jan 1st defaults
     # Method 0: Check URL for year patterns first (fast and reliable)
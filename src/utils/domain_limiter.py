@@ -0,0 +1,104 @@
+"""
+Per-domain concurrency limits for the async ingest scheduler.
+
+Caps come from data/media_sources.csv: an explicit `max_concurrency` column wins,
+otherwise force_js (Playwright) outlets get 1 slot, js_mode outlets get 2 and
+everything else gets DOMAIN_MAX_CONCURRENT.
+"""
+
+import os
+import csv
+import asyncio
+from pathlib import Path
+from typing import Dict, Optional
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+DOMAIN_MAX_CONCURRENT = int(os.environ.get('DOMAIN_MAX_CONCURRENT', '4'))
+JS_DOMAIN_MAX_CONCURRENT = int(os.environ.get('JS_DOMAIN_MAX_CONCURRENT', '2'))
+FORCE_JS_DOMAIN_MAX_CONCURRENT = int(os.environ.get('FORCE_JS_DOMAIN_MAX_CONCURRENT', '1'))
+
+_domain_limits: Optional[Dict[str, int]] = None
+
+def _normalize_domain(domain: str) -> str:
+    domain = domain.strip().lower()
+    if domain.startswith('www.'):
+        domain = domain[4:]
+    return domain
+
+def load_domain_limits() -> Dict[str, int]:
+    """Load per-domain caps from media_sources.csv (cached for the process)."""
+    global _domain_limits
+    if _domain_limits is not None:
+        return _domain_limits
+
+    limits = {}
+    try:
+        project_root = Path(__file__).parent.parent.parent
+        config_file = os.path.join(project_root, 'data', 'media_sources.csv')
+
+        if os.path.exists(config_file):
+            with open(config_file, 'r') as f:
+                reader = csv.DictReader(f)
+                for row in reader:
+                    domain = _normalize_domain(row.get('domain') or '')
+                    if not domain or (row.get('active') or 'true').strip().lower() != 'true':
+                        continue
+
+                    explicit = (row.get('max_concurrency') or '').strip()
+                    if explicit.isdigit() and int(explicit) > 0:
+                        limit = int(explicit)
+                    elif (row.get('force_js') or '').strip().lower() == 'true':
+                        limit = FORCE_JS_DOMAIN_MAX_CONCURRENT
+                    elif (row.get('js_mode') or '').strip().lower() == 'true':
+                        limit = JS_DOMAIN_MAX_CONCURRENT
+                    else:
+                        limit = DOMAIN_MAX_CONCURRENT
+                    # www./bare rows can disagree - keep the stricter cap
+                    limits[domain] = min(limit, limits.get(domain, limit))
+            logger.info(f"Loaded concurrency limits for {len(limits)} media domains")
+    except Exception as e:
+        logger.warning(f"Error loading media source concurrency limits: {e}")
+
+    _domain_limits = limits
+    return limits
+
+def domain_for_url(url: str) -> str:
+    """Registrable-ish domain key used for limiting (www. stripped)."""
+    try:
+        return _normalize_domain(urlparse(url).netloc)
+    except Exception:
+        return ''
+
+class DomainConcurrencyLimiter:
+    """
+    Lazily creates one asyncio.Semaphore per domain.
+    Create one per event loop (i.e. per ingest run) - asyncio semaphores are loop-bound.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, int]] = None, default_limit: int = DOMAIN_MAX_CONCURRENT):
+        self.limits = load_domain_limits() if limits is None else limits
+        self.default_limit = default_limit
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def limit_for(self, domain: str) -> int:
+        """Cap for a domain, matching subdomains against configured parent domains."""
+        if domain in self.limits:
+            return self.limits[domain]
+        for media_domain, limit in self.limits.items():
+            if domain.endswith('.' + media_domain):
+                return limit
+        return self.default_limit
+
+    @asynccontextmanager
+    async def acquire(self, url: str):
+        domain = domain_for_url(url)
+        semaphore = self._semaphores.get(domain)
+        if semaphore is None:
+            semaphore = self._semaphores[domain] = asyncio.Semaphore(self.limit_for(domain))
+        async with semaphore:
+            yield
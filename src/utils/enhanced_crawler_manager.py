@@ -12,7 +12,7 @@ Plus: Index Page Discovery and Google Search for finding specific articles
 """
 
 import logging
-from typing import Dict, Any, Optional, Tuple, List
+from typing import Dict, Any, Optional, Tuple, List, Union
 import re
 from urllib.parse import urlparse
 
@@ -20,8 +20,9 @@ from .config import API_SCRAPER_DOMAINS, GENERIC_INDEX_PATTERNS
 from .google_search import GoogleSearchClient
 from .enhanced_http import EnhancedHTTPClient
 from .scraping_bee import ScrapingBeeClient
-from .cache_manager import CacheManager
+from .cache_manager import get_cache_manager
 from .crawler_manager import CrawlerManager  # Original crawler for tiers 4-5
+from .parsed_document import ParsedDocument
 
 logger = logging.getLogger(__name__)
 
@@ -32,7 +33,7 @@ class EnhancedCrawlerManager:
         self.google_search = GoogleSearchClient()
         self.enhanced_http = EnhancedHTTPClient()
         self.scraping_bee = ScrapingBeeClient()
-        self.cache_manager = CacheManager()
+        self.cache_manager = get_cache_manager()  # Shared so the LRU is process-wide
         self.original_crawler = CrawlerManager()  # For tiers 4-5
         
     def _is_likely_index_page(self, original_content: str, extracted_content: str, url: str) -> bool:
@@ -219,30 +220,45 @@ class EnhancedCrawlerManager:
         logger.info(f"SPECIFIC CONTENT confirmed: {make} {model} found with sufficient confidence")
         return False
 
-    def crawl_url(self, url: str, make: str, model: str, person_name: str = "", loan_start_date=None) -> Dict[str, Any]:
+    @staticmethod
+    def repair_url(url: str) -> str:
         """
-        6-tier escalation system with CONTENT QUALITY DETECTION
-        
-        Tier 1: Basic HTTP (free & fast)
-        Tier 2: Enhanced HTTP (browser-like headers)
-        Tier 3: RSS Feed (if available - structured data)
-        Tier 4: ScrapFly (premium with residential proxies)
-        Tier 5: ScrapingBee (backup service) - Currently disabled
-        
-        Returns: {
-            'success': bool,
-            'content': str,
-            'title': str,
-            'url': str,  # may be different if Google Search found specific article
-            'tier_used': str,
-            'cached': bool,
-            'error': str (if success=False)
-        }
+        Fix malformed URLs like "https:townvibe.com" (missing //). This is the URL
+        crawl_url crawls and keys the crawl cache on.
         """
+        if urlparse(url).netloc or not url.startswith(('http:', 'https:')):
+            return url
+        logger.warning(f"⚠️ Malformed URL detected: {url}")
+        # Try to fix by adding missing //
+        if url.startswith('http:') and not url.startswith('http://'):
+            if '://' not in url:
+                fixed_url = url.replace('http:', 'http://', 1)
+            else:
+                fixed_url = url
+        elif url.startswith('https:') and not url.startswith('https://'):
+            if '://' not in url:
+                fixed_url = url.replace('https:', 'https://', 1)
+            else:
+                fixed_url = url
+        else:
+            fixed_url = url
         
-        # Store loan start date for date filtering
-        self.loan_start_date = loan_start_date
-        
+        logger.info(f"🔧 Fixed malformed URL: {url} → {fixed_url}")
+        return fixed_url
+
+    def precheck(self, url: str, make: str, model: str, person_name: str = "",
+                 record_stats: bool = False) -> Tuple[str, str, Optional[Dict[str, Any]]]:
+        """
+        The checks crawl_url makes before any network I/O: blocked social/profile
+        URLs, malformed URLs and the crawl cache. Callers that fetch Tier 1 ahead
+        of crawl_url (the async ingest engine) use it to skip that fetch; it only
+        decides whether a fetch is needed - cache hits are returned without the
+        byline step crawl_url adds, and lookups only count towards the cache
+        stats with record_stats (crawl_url's own check).
+        
+        Returns (url, domain, result): url with a malformed scheme fixed, and the
+        result crawl_url returns without crawling, or None if the URL needs a crawl.
+        """
         # BLOCK SOCIAL MEDIA AND NON-CONTENT DOMAINS
         blocked_domains = [
             'instagram.com', 'facebook.com', 'twitter.com', 'x.com', 'tiktok.com',
@@ -253,7 +269,7 @@ class EnhancedCrawlerManager:
         for blocked_domain in blocked_domains:
             if blocked_domain in url.lower():
                 logger.warning(f"🚫 BLOCKED: Skipping social media/profile URL: {url}")
-                return {
+                return url, '', {
                     'success': False,
                     'content': '',
                     'title': '',
@@ -265,34 +281,12 @@ class EnhancedCrawlerManager:
         
         # Check cache first - FIX MALFORMED URL PARSING
         try:
-            parsed_url = urlparse(url)
-            domain = parsed_url.netloc.lower()
-            
-            # Handle malformed URLs like "https:townvibe.com" (missing //)
-            if not domain and url.startswith(('http:', 'https:')):
-                logger.warning(f"⚠️ Malformed URL detected: {url}")
-                # Try to fix by adding missing //
-                if url.startswith('http:') and not url.startswith('http://'):
-                    if '://' not in url:
-                        fixed_url = url.replace('http:', 'http://', 1)
-                    else:
-                        fixed_url = url
-                elif url.startswith('https:') and not url.startswith('https://'):
-                    if '://' not in url:
-                        fixed_url = url.replace('https:', 'https://', 1)
-                    else:
-                        fixed_url = url
-                else:
-                    fixed_url = url
-                
-                logger.info(f"🔧 Fixed malformed URL: {url} → {fixed_url}")
-                url = fixed_url  # Use fixed URL for all subsequent processing
-                parsed_url = urlparse(url)  # Re-parse the fixed URL
-                domain = parsed_url.netloc.lower()
+            url = self.repair_url(url)  # Use fixed URL for all subsequent processing
+            domain = urlparse(url).netloc.lower()
                 
             if not domain:
                 logger.error(f"❌ Unable to extract domain from URL: {url}")
-                return {
+                return url, '', {
                     'success': False,
                     'content': '',
                     'title': '',
@@ -303,7 +297,7 @@ class EnhancedCrawlerManager:
                 }
         except Exception as e:
             logger.error(f"❌ URL parsing error for {url}: {e}")
-            return {
+            return url, '', {
                 'success': False,
                 'content': '',
                 'title': '',
@@ -317,29 +311,86 @@ class EnhancedCrawlerManager:
             person_id=person_name or "unknown",
             domain=domain,
             make=make,
-            model=model
+            model=model,
+            source_url=url,
+            record_stats=record_stats
         )
         
+        if cached_result and cached_result['outcome'] == self.cache_manager.OUTCOME_NO_CONTENT:
+            logger.info(f"Cache hit (no content) for {person_name}/{domain}/{make}/{model} - skipping crawl")
+            return url, domain, {
+                'success': False,
+                'content': '',
+                'title': '',
+                'url': url,
+                'tier_used': 'Cache Hit (no content)',
+                'cached': True,
+                'error': 'All escalation tiers failed (cached)'
+            }
+        
         if cached_result:
             logger.info(f"Cache hit for {person_name}/{domain}/{make}/{model}")
-            return {
+            result = {
                 'success': True,
                 'content': cached_result['content'],
-                'title': 'Cached Result',
+                'title': cached_result.get('title') or 'Cached Result',
                 'url': cached_result['url'],
                 'tier_used': 'Cache Hit',
-                'cached': True
+                'cached': True,
+                'content_hash': cached_result['content_hash']
             }
-            
+            return url, domain, result
+        
+        return url, domain, None
+
+    def crawl_url(self, url: str, make: str, model: str, person_name: str = "", loan_start_date=None,
+                  prefetched_html: Optional[str] = None) -> Dict[str, Any]:
+        """
+        6-tier escalation system with CONTENT QUALITY DETECTION
+        
+        Tier 1: Basic HTTP (free & fast)
+        Tier 2: Enhanced HTTP (browser-like headers)
+        Tier 3: RSS Feed (if available - structured data)
+        Tier 4: ScrapFly (premium with residential proxies)
+        Tier 5: ScrapingBee (backup service) - Currently disabled
+        
+        Returns: {
+            'success': bool,
+            'content': str,
+            'title': str,
+            'url': str,  # may be different if Google Search found specific article
+            'tier_used': str,
+            'cached': bool,
+            'document': ParsedDocument,  # parsed 'content' (if success=True) - pass it to the extractors
+            'error': str (if success=False)
+        }
+        
+        prefetched_html: Tier 1 response already fetched by the async ingest
+        engine. An empty string means the async fetch failed, so Tier 1 is
+        not retried here.
+        """
+        
+        # NOTE: loan_start_date stays a local - this manager is shared by all
+        # ingest threads, so storing it on self would leak between loans
+        
+        url, domain, early_result = self.precheck(url, make, model, person_name, record_stats=True)
+        if early_result is not None:
+            return self._add_byline_to_result(early_result, person_name)
+        
         # Tier 1: Basic HTTP (FREE - simplest approach first)
         logger.info(f"Tier 1: Trying Basic HTTP (free) for {url}")
         
-        basic_content = self._fetch_basic_http(url)
+        if prefetched_html is not None:
+            logger.info(f"Tier 1: Using pre-fetched HTML ({len(prefetched_html)} chars)")
+            basic_content = prefetched_html or None
+        else:
+            basic_content = self._fetch_basic_http(url)
         if basic_content:
             # EXTRACT CONTENT FIRST to test quality
             from src.utils.content_extractor import extract_article_content
             expected_topic = f"{make} {model}"
-            extracted_content = extract_article_content(basic_content, url, expected_topic)
+            document = ParsedDocument(basic_content, url)
+            extracted_content = extract_article_content(document, url, expected_topic)
             
             # Check if extraction was successful (not just 30 chars from 469KB)
             min_content_length = 200  # Reasonable minimum for an article
@@ -355,11 +406,13 @@ class EnhancedCrawlerManager:
                         'title': 'Basic HTTP Result',
                         'url': url,
                         'tier_used': 'Tier 1: Basic HTTP',
-                        'cached': False
+                        'cached': False,
+                        'document': document
                     }
                     # Cache the result
                     self.cache_manager.store_result(
                         person_id=person_name or "unknown",
+                        source_url=url,
                         domain=domain,
                         make=make,
                         model=model,
@@ -381,7 +434,8 @@ class EnhancedCrawlerManager:
             # EXTRACT CONTENT FIRST to test quality
             from src.utils.content_extractor import extract_article_content
             expected_topic = f"{make} {model}"
-            extracted_content = extract_article_content(http_content, url, expected_topic)
+            document = ParsedDocument(http_content, url)
+            extracted_content = extract_article_content(document, url, expected_topic)
             
             # Check if extraction was successful (not just 30 chars from 469KB)
             min_content_length = 200  # Reasonable minimum for an article
@@ -397,11 +451,13 @@ class EnhancedCrawlerManager:
                         'title': 'Enhanced HTTP Result',
                         'url': url,
                         'tier_used': 'Tier 2: Enhanced HTTP',
-                        'cached': False
+                        'cached': False,
+                        'document': document
                     }
                     # Cache the result
                     self.cache_manager.store_result(
                         person_id=person_name or "unknown",
+                        source_url=url,
                         domain=domain,
                         make=make,
                         model=model,
@@ -428,7 +484,8 @@ class EnhancedCrawlerManager:
             if rss_content and not rss_error:
                 # Test content quality
                 from src.utils.content_extractor import extract_article_content
-                extracted_content = extract_article_content(rss_content, found_url or url)
+                document = ParsedDocument(rss_content, found_url or url)
+                extracted_content = extract_article_content(document, found_url or url)
                 
                 if extracted_content and not self.is_generic_content(extracted_content, found_url or url, make, model):
                     logger.info(f"✅ Tier 3: RSS feed returned QUALITY content for {make} {model}")
@@ -438,11 +495,13 @@ class EnhancedCrawlerManager:
                         'title': rss_title or 'RSS Result',
                         'url': found_url or url,
                         'tier_used': 'Tier 3: RSS Feed',
-                        'cached': False
+                        'cached': False,
+                        'document': document
                     }
                     # Cache the result
                     self.cache_manager.store_result(
                         person_id=person_name or "unknown",
+                        source_url=url,
                         domain=domain,
                         make=make,
                         model=model,
@@ -466,7 +525,8 @@ class EnhancedCrawlerManager:
                 # EXTRACT CONTENT FIRST to test quality
                 from src.utils.content_extractor import extract_article_content
                 expected_topic = f"{make} {model}"
-                extracted_content = extract_article_content(scrapfly_content, url, expected_topic)
+                document = ParsedDocument(scrapfly_content, url)
+                extracted_content = extract_article_content(document, url, expected_topic)
                 
                 # Check if extraction was successful
                 min_content_length = 200
@@ -495,11 +555,13 @@ class EnhancedCrawlerManager:
                         'title': scrapfly_title or 'ScrapFly Result',
                         'url': url,
                         'tier_used': 'Tier 4: ScrapFly',
-                        'cached': False
+                        'cached': False,
+                        'document': document
                     }
                     # Cache the result
                     self.cache_manager.store_result(
                         person_id=person_name or "unknown",
+                        source_url=url,
                         domain=domain,
                         make=make,
                         model=model,
@@ -523,7 +585,8 @@ class EnhancedCrawlerManager:
             # EXTRACT CONTENT FIRST to test quality (same as Enhanced HTTP)
             from src.utils.content_extractor import extract_article_content
             expected_topic = f"{make} {model}"
-            extracted_content = extract_article_content(bee_content, url, expected_topic)
+            document = ParsedDocument(bee_content, url)
+            extracted_content = extract_article_content(document, url, expected_topic)
             
             # Check if extraction was successful (not just 30 chars from 638KB)
             min_content_length = 200  # Reasonable minimum for an article
@@ -539,11 +602,13 @@ class EnhancedCrawlerManager:
                         'title': 'ScrapingBee Backup Result',
                         'url': url,
                         'tier_used': 'Tier 5: ScrapingBee Backup',
-                        'cached': False
+                        'cached': False,
+                        'document': document
                     }
                     # Cache the result
                     self.cache_manager.store_result(
                         person_id=person_name or "unknown",
+                        source_url=url,
                         domain=domain,
                         make=make,
                         model=model,
@@ -570,6 +635,7 @@ class EnhancedCrawlerManager:
             # Cache the result
             self.cache_manager.store_result(
                 person_id=person_name or "unknown",
+                source_url=url,
                 domain=domain,
                 make=make,
                 model=model,
@@ -626,7 +692,7 @@ class EnhancedCrawlerManager:
                 # Extract publication date from the article content
                 article_date = None
                 try:
-                    article_date = extract_date_from_html(article_result['content'], specific_url)
+                    article_date = extract_date_from_html(article_result.get('document') or article_result['content'], specific_url)
                     if article_date:
                         logger.info(f"📅 Extracted publication date: {article_date.strftime('%Y-%m-%d')} for {specific_url}")
                     else:
@@ -635,9 +701,9 @@ class EnhancedCrawlerManager:
                     logger.warning(f"📅 Error extracting date from {specific_url}: {e}")
                 
                 # Check date filtering if we have a loan start date
-                if self.loan_start_date:
-                    if not is_content_acceptable(article_date, self.loan_start_date, "web", specific_url):
-                        logger.warning(f"📅 REJECTING Google Search result - article from {article_date.strftime('%Y-%m-%d') if article_date else 'unknown date'} is outside acceptable range for loan starting {self.loan_start_date.strftime('%Y-%m-%d')}")
+                if loan_start_date:
+                    if not is_content_acceptable(article_date, loan_start_date, "web", specific_url):
+                        logger.warning(f"📅 REJECTING Google Search result - article from {article_date.strftime('%Y-%m-%d') if article_date else 'unknown date'} is outside acceptable range for loan starting {loan_start_date.strftime('%Y-%m-%d')}")
                         # Don't return this result, fall through to next tier
                         pass
                     else:
@@ -654,6 +720,7 @@ class EnhancedCrawlerManager:
                         # Cache the result
                         self.cache_manager.store_result(
                             person_id=person_name or "unknown",
+                            source_url=url,
                             domain=domain,
                             make=make,
                             model=model,
@@ -675,6 +742,7 @@ class EnhancedCrawlerManager:
                     # Cache the result
                     self.cache_manager.store_result(
                         person_id=person_name or "unknown",
+                        source_url=url,
                         domain=domain,
                         make=make,
                         model=model,
@@ -707,6 +775,7 @@ class EnhancedCrawlerManager:
             # Cache the result
             self.cache_manager.store_result(
                 person_id=person_name or "unknown",
+                source_url=url,
                 domain=domain,
                 make=make,
                 model=model,
@@ -715,7 +784,14 @@ class EnhancedCrawlerManager:
             )
             return self._add_byline_to_result(result, person_name)
             
-        # All tiers failed
+        # All tiers failed - remember briefly so reruns don't repeat the full escalation
+        self.cache_manager.store_no_content(
+            person_id=person_name or "unknown",
+            domain=domain,
+            make=make,
+            model=model,
+            url=url
+        )
         return {
             'success': False,
             'content': '',
@@ -736,7 +812,8 @@ class EnhancedCrawlerManager:
             # EXTRACT CONTENT FIRST to test quality
             from src.utils.content_extractor import extract_article_content
             expected_topic = f"{make} {model}"
-            extracted_content = extract_article_content(http_content, url, expected_topic)
+            document = ParsedDocument(http_content, url)
+            extracted_content = extract_article_content(document, url, expected_topic)
             
             # Check if extraction was successful (not just 30 chars from 469KB)
             min_content_length = 200  # Reasonable minimum for an article
@@ -751,7 +828,8 @@ class EnhancedCrawlerManager:
                         'content': http_content,
                         'title': 'Enhanced HTTP Result',
                         'url': url,
-                        'tier_used': 'Enhanced HTTP'
+                        'tier_used': 'Enhanced HTTP',
+                        'document': document
                     }
                 else:
                     logger.info(f"Enhanced HTTP: content extraction succeeded but content is GENERIC for {url}, escalating to ScrapingBee")
@@ -845,7 +923,7 @@ class EnhancedCrawlerManager:
     def _fetch_basic_http(self, url: str) -> Optional[str]:
         """Basic HTTP request with minimal headers (Level 1)"""
         try:
-            import requests
+            from src.utils.http_pool import get_http_session
             
             headers = {
                 'User-Agent': 'DriveShopMediaMonitorBot/1.0',
@@ -853,7 +931,7 @@ class EnhancedCrawlerManager:
             }
             
             logger.info(f"Making basic HTTP request to {url}")
-            response = requests.get(url, headers=headers, timeout=10, allow_redirects=True)
+            response = get_http_session().get(url, headers=headers, timeout=10, allow_redirects=True)
             
             if response.status_code == 200:
                 logger.info(f"Basic HTTP success for {url} ({len(response.text)} chars)")
@@ -892,14 +970,6 @@ class EnhancedCrawlerManager:
         """
         logger.info(f"🔍 Starting Index Page Discovery for {index_url}")
         
-        # Step 1: Use pre-fetched HTML if available, otherwise scrape the ENTIRE index page
-        if pre_fetched_html:
-            logger.info(f"Step 1: Using pre-fetched HTML content ({len(pre_fetched_html)} chars)")
-            index_content = pre_fetched_html
-        else:
-            logger.info(f"Step 1: Scraping index page: {index_url}")
-            index_content = self._scrape_index_page(index_url)
-        
         # OPTIMIZATION: Check article URL cache first
         from src.utils.article_url_cache import get_article_cache
         article_cache = get_article_cache()
@@ -919,6 +989,7 @@ class EnhancedCrawlerManager:
                 return self._add_byline_to_result({
                     'success': True,
                     'content': article_result['content'],
+                    'document': article_result.get('document'),
                     'title': article_result.get('title', f'{make} {model} Review'),
                     'url': cached_url,
                     'tier_used': f"Index Discovery (Cached) -> {article_result.get('tier_used', 'Unknown')}",
@@ -944,33 +1015,16 @@ class EnhancedCrawlerManager:
             
         for try_url in urls_to_try:
             logger.info(f"🔍 Trying URL: {try_url}")
-            index_content = self._scrape_index_page(try_url)
-                
-            if index_content:
-                # Step 2: Extract ALL article links from index page (like YouTube video links)
-                logger.info(f"Step 2: Extracting article links from: {try_url}")
-                
-                # DEBUG: Show what content we're working with
-                logger.info(f"📊 Index content length: {len(index_content)} characters")
-                if "tightwadgarage.com" in try_url:
-                    # Log a snippet of the content to see what we got
-                    content_preview = index_content[:1000].replace('\n', ' ')
-                    logger.info(f"📊 Tightwad content preview: {content_preview}")
-                    
-                    # Check if the content looks like HTML or extracted text
-                    if '<html' in index_content.lower() or '<body' in index_content.lower():
-                        logger.info(f"✅ Content appears to be HTML (good for link extraction)")
-                    else:
-                        logger.warning(f"⚠️ Content doesn't look like HTML - might be extracted text only")
-                
-                article_links = self._extract_article_links_from_index(index_content, try_url)
-                
-                if article_links:
-                    logger.info(f"✅ Found {len(article_links)} article links at {try_url}")
-                    index_url = try_url  # Update for further processing
-                    break
-                else:
-                    logger.warning(f"❌ No article links found at: {try_url}")
+            # Step 1 + 2: Article links of the index (like YouTube video links), from the link index
+            article_links = self._get_index_article_links(
+                try_url, pre_fetched_html=pre_fetched_html if try_url == index_url else None)
+            
+            if article_links:
+                logger.info(f"✅ Found {len(article_links)} article links at {try_url}")
+                index_url = try_url  # Update for further processing
+                break
+            else:
+                logger.warning(f"❌ No article links found at: {try_url}")
                     
         if not article_links:
             logger.warning(f"❌ No article links found on any tried paths")
@@ -1012,7 +1066,7 @@ class EnhancedCrawlerManager:
                     logger.info(f"🔍 INDEX DISCOVERY: Extracting author information for {person_name}")
                     try:
                         # Extract actual byline from the article content
-                        actual_byline = self._extract_byline_from_content(article_result['content'], article_url)
+                        actual_byline = self._extract_byline_from_content(article_result.get('document') or article_result['content'], article_url)
                         if actual_byline:
                             logger.info(f"📝 INDEX DISCOVERY: Found byline author: {actual_byline}")
                             # Check if expected author matches actual byline
@@ -1033,6 +1087,7 @@ class EnhancedCrawlerManager:
                 return {
                     'success': True,
                     'content': article_result['content'],
+                    'document': article_result.get('document'),
                     'title': article_title,
                     'url': article_url,
                     'tier_used': f"Index Discovery -> {article_result.get('tier_used', 'Unknown')}",
@@ -1054,60 +1109,78 @@ class EnhancedCrawlerManager:
         logger.warning(f"❌ All relevant articles failed to crawl")
         return None
 
-    def _scrape_index_page(self, index_url: str) -> Optional[str]:
-        """Scrape MULTIPLE PAGES of the index with PAGINATION SUPPORT"""
-        from bs4 import BeautifulSoup
-        from urllib.parse import urljoin, urlparse
-        
-        logger.info(f"🔍 PAGINATION: Starting multi-page scraping for {index_url}")
-        
-        all_content = ""
-        page_count = 0
-        # Reduce pagination for problematic sites to avoid timeouts
-        if "tightwadgarage.com" in index_url:
-            max_pages = 3  # Limit to 3 pages for Tightwad to avoid rate limiting
-        else:
-            max_pages = 5  # Default pagination limit
-        current_url = index_url
-        visited_urls = set()
-        
-        # ENHANCED DEBUG for Tightwad Garage
-        if "tightwadgarage.com" in index_url:
-            logger.info(f"🚨 DEBUG: Scraping Tightwad Garage index - will search up to {max_pages} pages")
-        
+    def _fetch_index_page(self, page_url: str) -> Optional[str]:
+        """Fetch one index page (ScrapFly with JS for domains that need it, Enhanced HTTP otherwise)"""
         # Check if this domain requires forced JS rendering
         force_js_domains = ['tightwadgarage.com', 'hagerty.com', 'motortrend.com']
-        should_force_js = any(domain in index_url.lower() for domain in force_js_domains)
+        if any(domain in page_url.lower() for domain in force_js_domains):
+            logger.info(f"🎯 Using ScrapFly with JS rendering for {page_url}")
+            try:
+                from src.utils.scrapfly_client import scrapfly_crawl_with_fallback
+                page_content, title, error = scrapfly_crawl_with_fallback(page_url)
+                if error:
+                    logger.warning(f"ScrapFly error: {error}")
+                    return None
+                return page_content
+            except Exception as e:
+                logger.error(f"ScrapFly exception: {e}")
+                return None
         
-        while current_url and page_count < max_pages and current_url not in visited_urls:
-            page_count += 1
-            visited_urls.add(current_url)
+        # Enhanced HTTP only (fast and free) - ScrapingBee DISABLED FOR TESTING
+        return self.enhanced_http.fetch_url(page_url)
+
+    def _get_index_article_links(self, index_url: str, pre_fetched_html: str = None) -> List[str]:
+        """
+        Article links of an outlet index, newest first, served from the persisted
+        article link index. A stale index is refreshed page by page (with PAGINATION
+        SUPPORT) only until a page is mostly links the index already knows.
+        """
+        from src.utils.article_link_index import get_article_link_index, index_key
+        
+        link_index = get_article_link_index()
+        key = index_key(index_url)
+        
+        # One refresh per index; other loans on this outlet wait and then read the index
+        with link_index.index_lock(key):
+            if link_index.is_fresh(key):
+                links = link_index.get_links(key)
+                logger.info(f"♻️ INDEX: Using {len(links)} indexed article links for {index_url}")
+                return links
+            
+            known = link_index.known_urls(key)
+            # Reduce pagination for problematic sites to avoid timeouts
+            if "tightwadgarage.com" in index_url:
+                max_pages = 3  # Limit to 3 pages for Tightwad to avoid rate limiting
+            else:
+                max_pages = 5  # Default pagination limit
             
-            logger.info(f"📄 PAGINATION: Scraping page {page_count}: {current_url}")
+            logger.info(f"🔍 PAGINATION: Refreshing article index for {index_url} "
+                        f"({len(known)} links known, up to {max_pages} pages)")
             
-            # CRITICAL FIX: Use ScrapFly with JS for domains that require it
-            if should_force_js:
-                logger.info(f"🎯 Using ScrapFly with JS rendering for {current_url}")
-                try:
-                    from src.utils.scrapfly_client import scrapfly_crawl_with_fallback
-                    page_content, title, error = scrapfly_crawl_with_fallback(current_url)
-                    if error:
-                        logger.warning(f"ScrapFly error: {error}")
-                        page_content = None
-                except Exception as e:
-                    logger.error(f"ScrapFly exception: {e}")
-                    page_content = None
-            else:
-                # Try Enhanced HTTP first (fast and free)
-                page_content = self.enhanced_http.fetch_url(current_url)
-                if not page_content or len(page_content) < 1000:
-                    # Try ScrapingBee if Enhanced HTTP fails - DISABLED FOR TESTING
-                    logger.info(f"Enhanced HTTP failed for page {page_count}, ScrapingBee DISABLED - skipping")
-                    # page_content = self.scraping_bee.scrape_url(current_url)
+            pages = []
+            current_url = index_url
+            visited_urls = set()
+            while current_url and len(pages) < max_pages and current_url not in visited_urls:
+                visited_urls.add(current_url)
+                page_number = len(pages) + 1
+                
+                if page_number == 1 and pre_fetched_html:
+                    logger.info(f"📄 PAGINATION: Using pre-fetched HTML for page 1 ({len(pre_fetched_html)} chars)")
+                    page_content = pre_fetched_html
+                else:
+                    logger.info(f"📄 PAGINATION: Scraping page {page_number}: {current_url}")
+                    page_content = self._fetch_index_page(current_url)
                 
-            if page_content and len(page_content) > 1000:
-                logger.info(f"✅ PAGINATION: Got page {page_count} content ({len(page_content)} chars)")
-                all_content += page_content + "\n<!-- PAGE_BREAK -->\n"
+                if not page_content or len(page_content) <= 1000:
+                    logger.warning(f"❌ PAGINATION: Failed to get content for page {page_number}")
+                    break
+                
+                page_links = self._extract_article_links_from_index(page_content, current_url)
+                pages.append(page_links)
+                
+                if link_index.should_stop(known, page_links):
+                    logger.info(f"🛑 PAGINATION: Page {page_number} is already indexed - stopping refresh")
+                    break
                 
                 # Look for "Next Page" link for pagination
                 next_url = self._find_next_page_url(page_content, current_url)
@@ -1115,18 +1188,21 @@ class EnhancedCrawlerManager:
                     logger.info(f"🔗 PAGINATION: Found next page URL: {next_url}")
                     current_url = next_url
                 else:
-                    logger.info(f"🛑 PAGINATION: No more pages found after page {page_count}")
+                    logger.info(f"🛑 PAGINATION: No more pages found after page {page_number}")
                     break
-            else:
-                logger.warning(f"❌ PAGINATION: Failed to get content for page {page_count}")
-                break
-                
-        if all_content:
-            logger.info(f"✅ PAGINATION: Successfully scraped {page_count} pages ({len(all_content)} total chars)")
-            return all_content
-        else:
-            logger.warning(f"❌ PAGINATION: Failed to scrape any pages")
-            return None
+            
+            if not pages:
+                # Keep serving what we have; don't mark the index fresh after a failed refresh
+                links = link_index.get_links(key)
+                if links:
+                    logger.warning(f"⚠️ INDEX: Refresh failed, using {len(links)} previously indexed links")
+                return links
+            
+            added = link_index.merge(key, pages)
+            links = link_index.get_links(key)
+            logger.info(f"✅ PAGINATION: Scraped {len(pages)} pages, {added} new article links "
+                        f"({len(links)} indexed for {index_url})")
+            return links
     
     def _find_next_page_url(self, html_content: str, current_url: str) -> Optional[str]:
         """Find the 'Next Page' URL for pagination"""
@@ -1349,35 +1425,12 @@ class EnhancedCrawlerManager:
         logger.info(f"   Model: '{model}' (lower: '{model_lower}')")
         logger.info(f"   Links to search: {len(article_links)}")
         
-        # Smart model parsing for compound models like "GR Corolla Premium"
-        model_parts = model_lower.split()
-        
-        # Handle Toyota GR models specially (GR is a sub-brand, not the base model)
-        if len(model_parts) >= 2 and model_parts[0] == "gr":
-            base_model = f"{model_parts[0]} {model_parts[1]}"  # "gr corolla" from "gr corolla premium"
-            variant = " ".join(model_parts[2:]) if len(model_parts) > 2 else ""  # "premium"
-        else:
-            # Standard parsing for regular models like "Camry Hybrid"
-            base_model = model_parts[0] if model_parts else model_lower  # "camry" from "camry hybrid"
-            variant = model_parts[1] if len(model_parts) > 1 else ""      # "hybrid" from "camry hybrid"
-        
-        # Use the enhanced model variations generator that handles trim levels
-        from src.utils.model_variations import generate_model_variations
-        model_variations = generate_model_variations(make, model)
-        
-        # Add year variants to the generated variations
-        current_year = 2025
-        year_variations = []
-        for year in [current_year, current_year-1, current_year-2]:  # 2025, 2024, 2023
-            for variation in model_variations[:5]:  # Add years to the first few variations
-                year_variations.extend([
-                    f"{year} {variation}",       # "2025 crown signia"
-                    f"{variation} {year}",       # "crown signia 2025"
-                ])
-        
-        # Combine all variations and remove duplicates
-        model_variations.extend(year_variations)
-        model_variations = list(set([v.lower() for v in model_variations if v.strip()]))
+        # Variations (trim-aware, plus 2025/2024/2023 year forms), base model and variant
+        # are compiled once per make/model into trie-shaped regexes and cached
+        from src.utils.vehicle_matcher import get_vehicle_matcher
+        matcher = get_vehicle_matcher(make, model)
+        base_model, variant = matcher.base_model, matcher.variant
+        model_variations = matcher.variations
         
         logger.info(f"🔍 FLEXIBLE SEARCH: Looking for articles about '{make}' '{model}'")
         logger.info(f"🔍 Base model: '{base_model}', Variant: '{variant}'")
@@ -1408,25 +1461,25 @@ class EnhancedCrawlerManager:
                     logger.info(f"   extracted title: '{title}'")
                     logger.info(f"   title_lower: '{title_lower}'")
                 
+                # One compiled pass per text for make, full model, base model and variant
+                url_scan = matcher.scan(url_lower)
+                title_scan = matcher.scan(title_lower)
+                
                 # TIER 1: Check for exact make + model match (perfect)
-                has_make_url = make_lower in url_lower
-                has_make_title = make_lower in title_lower
-                has_make = has_make_url or has_make_title
+                has_make_url = url_scan.make
+                has_make_title = title_scan.make
                 
-                has_full_model_url = any(variation in url_lower for variation in model_variations)
-                has_full_model_title = any(variation in title_lower for variation in model_variations)
-                has_full_model = has_full_model_url or has_full_model_title
-                matching_variation = next((var for var in model_variations if var in url_lower or var in title_lower), None)
+                has_full_model_url = url_scan.model is not None
+                has_full_model_title = title_scan.model is not None
+                matching_variation = url_scan.model or title_scan.model
                 
                 # TIER 2: Check for base model only (broader search)
-                has_base_model_url = base_model in url_lower
-                has_base_model_title = base_model in title_lower
-                has_base_model = has_base_model_url or has_base_model_title
+                has_base_model_url = url_scan.base_model
+                has_base_model_title = title_scan.base_model
                 
                 # TIER 3: Check for variant only (like "hybrid")
-                has_variant_url = variant and variant in url_lower
-                has_variant_title = variant and variant in title_lower
-                has_variant = has_variant_url or has_variant_title
+                has_variant_url = url_scan.variant
+                has_variant_title = title_scan.variant
                 
                 # ENHANCED DEBUG for Tightwad URL
                 if "tightwadgarage.com" in article_url and ("cx-70" in article_url or "cx70" in article_url):
@@ -1459,34 +1512,8 @@ class EnhancedCrawlerManager:
                     if variant:
                         logger.info(f"  Variant '{variant}' found: URL={has_variant_url}, Title={has_variant_title}")
                 
-                score = 0
-                match_type = ""
+                score, match_type = matcher.tier(url_scan, title_scan)
                 
-                if has_make and has_full_model:
-                    # PERFECT MATCH: Make + Full Model
-                    score = 1000
-                    match_type = f"PERFECT: {make} + {matching_variation}"
-                elif has_full_model:
-                    # EXCELLENT: Full Model without make
-                    score = 800
-                    match_type = f"EXCELLENT: {matching_variation} (no make)"
-                elif has_make and has_base_model and has_variant:
-                    # VERY GOOD: Make + Base Model + Variant (e.g., Toyota + Camry + Hybrid)
-                    score = 700
-                    match_type = f"VERY GOOD: {make} + {base_model} + {variant}"
-                elif has_base_model and has_variant:
-                    # GOOD: Base Model + Variant (no make) (e.g., Camry + Hybrid)
-                    score = 600
-                    match_type = f"GOOD: {base_model} + {variant} (no make)"
-                elif has_make and has_base_model:
-                    # DECENT: Make + Base Model only (e.g., Toyota + Camry)
-                    score = 500
-                    match_type = f"DECENT: {make} + {base_model}"
-                elif has_base_model:
-                    # FAIR: Base Model only (e.g., Camry only)
-                    score = 300
-                    match_type = f"FAIR: {base_model} only"
-                    
                 if score > 0:
                     relevant_articles.append((score, article_url, title))
                     logger.info(f"✅ {match_type}: {title} - {article_url}")
@@ -1539,9 +1566,13 @@ class EnhancedCrawlerManager:
         Modifies the result dictionary to include attribution_strength and actual_byline.
         """
         if result.get('success') and result.get('content'):
+            # Every successful result carries the parsed page - byline, date and
+            # content extraction downstream all read this one document
+            if result.get('document') is None:
+                result['document'] = ParsedDocument(result['content'], result.get('url', ''))
             try:
                 # Extract actual byline from the content
-                actual_byline = self._extract_byline_from_content(result['content'], result.get('url', ''))
+                actual_byline = self._extract_byline_from_content(result['document'], result.get('url', ''))
                 
                 if actual_byline:
                     logger.info(f"📝 Found byline author: {actual_byline}")
@@ -1568,13 +1599,14 @@ class EnhancedCrawlerManager:
         
         return result
     
-    def _extract_byline_from_content(self, html_content: str, url: str) -> Optional[str]:
-        """Extract author byline from article HTML content"""
-        from bs4 import BeautifulSoup
+    def _extract_byline_from_content(self, html_content: Union[str, ParsedDocument], url: str) -> Optional[str]:
+        """Extract author byline from article HTML content (or the ParsedDocument of the fetch)"""
+        from src.utils.parsed_document import as_document
         import re
         
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            # Read-only tree of this fetch (already parsed when crawl_url passes the document)
+            soup = as_document(html_content, url).soup
             
             # Common byline selectors used across automotive sites
             byline_selectors = [
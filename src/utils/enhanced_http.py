@@ -12,6 +12,7 @@ from typing import Optional, Dict, Any
 from urllib.parse import urlparse
 
 from src.utils.logger import setup_logger
+from src.utils.http_pool import get_http_session, ACCEPT_ENCODING
 
 logger = setup_logger(__name__)
 
@@ -19,7 +20,8 @@ class EnhancedHTTPClient:
     """HTTP client with enhanced headers to bypass bot detection"""
     
     def __init__(self):
-        self.session = requests.Session()
+        # Shared keep-alive pool - headers are sent per request, never set on the session
+        self.session = get_http_session()
         self.max_retries = 2
         self.retry_delay = 1  # seconds
         
@@ -28,7 +30,7 @@ class EnhancedHTTPClient:
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
+            'Accept-Encoding': ACCEPT_ENCODING,
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
             'Cache-Control': 'max-age=0',
@@ -37,9 +39,6 @@ class EnhancedHTTPClient:
             'Sec-Fetch-Site': 'none',
             'Sec-Fetch-User': '?1'
         }
-        
-        # Update session headers
-        self.session.headers.update(self.default_headers)
     
     def fetch_url(self, url: str, timeout: int = 10) -> Optional[str]:
         """
@@ -61,7 +60,7 @@ class EnhancedHTTPClient:
                 logger.info(f"Enhanced HTTP attempt {attempt + 1}/{self.max_retries} for {url}")
                 
                 start_time = time.time()
-                response = self.session.get(url, timeout=timeout)
+                response = self.session.get(url, headers=self.default_headers, timeout=timeout)
                 fetch_time = time.time() - start_time
                 
                 # Check response status
@@ -131,12 +130,8 @@ class EnhancedHTTPClient:
         return has_make and has_model
     
     def close(self):
-        """Clean up session"""
-        try:
-            self.session.close()
-            logger.debug("Enhanced HTTP session closed")
-        except Exception as e:
-            logger.warning(f"Error closing Enhanced HTTP session: {e}")
+        """Nothing to clean up - the pooled session is shared for the life of the process"""
+        logger.debug("Enhanced HTTP client released (shared pool stays open)")
 
 # Convenience function for easy importing
 def fetch_with_enhanced_http(url: str, timeout: int = 10) -> Optional[str]:
@@ -150,8 +145,4 @@ def fetch_with_enhanced_http(url: str, timeout: int = 10) -> Optional[str]:
     Returns:
         HTML content or None
     """
-    client = EnhancedHTTPClient()
-    try:
-        return client.fetch_url(url, timeout)
-    finally:
-        client.close() 
\ No newline at end of file
+    return EnhancedHTTPClient().fetch_url(url, timeout) 
\ No newline at end of file
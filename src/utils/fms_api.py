@@ -8,6 +8,7 @@ import logging
 from typing import List, Dict, Any, Optional
 import requests
 from datetime import datetime
+from src.utils.http_pool import get_http_session
 
 # Set up more visible logging for FMS API
 logger = logging.getLogger(__name__)
@@ -106,7 +107,7 @@ class FMSAPIClient:
             logger.info(f"Sample clip data: {json.dumps(clips[0] if clips else {}, indent=2)}")
             logger.debug(f"Full payload: {json.dumps(payload, indent=2, default=str)}")
             
-            response = requests.post(
+            response = get_http_session().post(
                 self.api_url,
                 headers=self.headers,
                 json=payload,
@@ -268,7 +269,7 @@ class FMSAPIClient:
             print(f"🔄 FMS_TOKEN_ROTATION: Requesting new token from {rotate_url}")
             logger.info(f"Rotating FMS token using endpoint: {rotate_url}")
             
-            response = requests.post(
+            response = get_http_session().post(
                 rotate_url,
                 headers=self.headers,
                 timeout=30
@@ -379,7 +380,7 @@ class FMSAPIClient:
             
             # Try a simple GET request to the endpoint
             # If GET is not supported, we'll get a 405 which still proves connectivity
-            response = requests.get(
+            response = get_http_session().get(
                 self.api_url,
                 headers=self.headers,
                 timeout=10
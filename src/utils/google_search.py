@@ -6,6 +6,7 @@ from urllib.parse import urlparse
 import time
 
 from src.utils.logger import setup_logger
+from src.utils.http_pool import get_http_session
 
 logger = setup_logger(__name__)
 
@@ -147,7 +148,7 @@ class BingSearchClient:
         }
         
         try:
-            response = requests.get(self.base_url, headers=headers, params=params, timeout=10)
+            response = get_http_session().get(self.base_url, headers=headers, params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -493,7 +494,7 @@ class GoogleSearchClient:
         }
         
         try:
-            response = requests.get(self.base_url, params=params, timeout=10)
+            response = get_http_session().get(self.base_url, params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -1019,7 +1020,7 @@ class GoogleSearchClient:
         """Synchronous version of byline extraction"""
         try:
             from src.utils.enhanced_http import fetch_with_enhanced_http
-            from bs4 import BeautifulSoup
+            from src.utils.parsed_document import ParsedDocument
             import re
             
             # Quick fetch of article content
@@ -1027,8 +1028,8 @@ class GoogleSearchClient:
             if not content:
                 return None
             
-            # Parse HTML and extract byline
-            soup = BeautifulSoup(content, 'html.parser')
+            # Parse HTML and extract byline (read-only, lxml-backed)
+            soup = ParsedDocument(content, url).soup
             
             # Common byline selectors
             byline_selectors = [
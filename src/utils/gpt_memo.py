@@ -0,0 +1,302 @@
+"""
+Persistent memo store for GPT analysis results.
+
+Results are keyed by (prompt version, OpenAI model name, make, model, normalized
+content hash), so retried WOs, historical reprocessing and enhanced-prompt
+re-runs of unchanged clips are answered from SQLite without an API call.
+Changing a prompt template changes its version and naturally misses the memo.
+
+data/gpt_memo.db is local to the container (the Render worker has no persistent
+disk). When Supabase credentials are set, the gpt_memo table (see
+migrations/create_gpt_memo_table.sql) is a shared tier behind it: local misses
+are read from it and backfilled, and every result is written to both.
+GPT_MEMO_SUPABASE=false/true overrides the default.
+"""
+
+import os
+import json
+import sqlite3
+import hashlib
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+from src.utils.logger import setup_logger
+from src.utils.cache_manager import content_hash
+
+logger = setup_logger(__name__)
+
+GPT_MEMO_ENABLED = os.environ.get('GPT_MEMO_ENABLED', 'true').lower() == 'true'
+# Unset: on when Supabase credentials are set (read when the store is built)
+GPT_MEMO_SUPABASE = os.environ.get('GPT_MEMO_SUPABASE')
+
+def prompt_version(name: str, template: Optional[str] = None) -> str:
+    """
+    Version tag for a prompt. When the template text is available its hash is
+    appended, so editing the template invalidates old memo entries automatically.
+    """
+    if not template:
+        return name
+    return f"{name}:{hashlib.sha256(template.encode('utf-8')).hexdigest()[:12]}"
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """Rough token count (~4 characters per token) for when the API gives no usage"""
+    return len(text) // 4 if text else 0
+
+def response_tokens(response, prompt: str) -> int:
+    """Total tokens billed for a ChatCompletion response, estimated from the prompt if missing"""
+    try:
+        usage = response.get('usage') if hasattr(response, 'get') else getattr(response, 'usage', None)
+        # dict-like on the 0.27 client, an object on the v1 client
+        total = usage.get('total_tokens') if hasattr(usage, 'get') else getattr(usage, 'total_tokens', None)
+        if total:
+            return int(total)
+    except Exception:
+        pass
+    return estimate_tokens(prompt)
+
+class SupabaseMemoBackend:
+    """Shared memo tier on the Supabase gpt_memo table"""
+
+    def __init__(self):
+        from src.utils.database import get_database
+        self.client = get_database().supabase
+
+    def get(self, key: tuple) -> Optional[tuple]:
+        result = (self.client.table('gpt_memo').select('result, tokens')
+                  .eq('prompt_version', key[0]).eq('model_name', key[1]).eq('make', key[2])
+                  .eq('model', key[3]).eq('content_hash', key[4]).limit(1).execute())
+        if not result.data:
+            return None
+        return result.data[0]['result'], result.data[0].get('tokens') or 0
+
+    def put(self, key: tuple, result: Dict[str, Any], tokens: int):
+        self.client.table('gpt_memo').upsert({
+            'prompt_version': key[0], 'model_name': key[1], 'make': key[2], 'model': key[3],
+            'content_hash': key[4], 'result': json.loads(json.dumps(result, default=str)), 'tokens': tokens,
+        }, on_conflict='prompt_version,model_name,make,model,content_hash').execute()
+
+def _shared_tier_enabled() -> bool:
+    if GPT_MEMO_SUPABASE is not None:
+        return GPT_MEMO_SUPABASE.lower() == 'true'
+    return bool(os.environ.get('SUPABASE_URL') and os.environ.get('SUPABASE_ANON_KEY'))
+
+class GPTMemoStore:
+    """
+    SQLite-backed (WAL mode, one connection per thread) memo of GPT results with
+    hit-rate and token-savings counters, optionally in front of a shared tier.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, shared: Any = None):
+        if db_path is None:
+            project_root = Path(__file__).parent.parent.parent
+            data_dir = os.path.join(project_root, 'data')
+            os.makedirs(data_dir, exist_ok=True)
+            db_path = os.path.join(data_dir, 'gpt_memo.db')
+
+        self.db_path = db_path
+        self.enabled = GPT_MEMO_ENABLED
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'tokens_saved': 0, 'shared_hits': 0}
+
+        # Only the default (process-wide) store gets the shared tier automatically
+        if shared is None and db_path is None and self.enabled and _shared_tier_enabled():
+            try:
+                shared = SupabaseMemoBackend()
+            except Exception as e:
+                logger.warning(f"⚠️ Shared GPT memo tier unavailable: {e}")
+        self.shared = shared
+
+        self._init_database()
+        logger.info(f"GPT memo store initialized with database: {self.db_path} "
+                    f"({'enabled' if self.enabled else 'DISABLED'}"
+                    f"{', shared tier: supabase' if self.shared is not None else ''})")
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """One pooled connection per thread, opened in WAL mode"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _init_database(self):
+        try:
+            conn = self._get_connection()
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS gpt_memo (
+                    prompt_version TEXT NOT NULL,
+                    model_name TEXT NOT NULL,
+                    make TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    result TEXT NOT NULL,
+                    tokens INTEGER DEFAULT 0,
+                    hits INTEGER DEFAULT 0,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (prompt_version, model_name, make, model, content_hash) ON CONFLICT REPLACE
+                )
+            ''')
+            conn.commit()
+        except Exception as e:
+            logger.error(f"Error initializing GPT memo database: {e}")
+            self.enabled = False
+
+    @staticmethod
+    def _key(version: str, model_name: str, make: str, model: str, content: str) -> Optional[tuple]:
+        return GPTMemoStore._hashed_key(version, model_name, make, model, content_hash(content))
+
+    @staticmethod
+    def _hashed_key(version: str, model_name: str, make: str, model: str, digest: Optional[str]) -> Optional[tuple]:
+        if not digest:
+            return None
+        return (version, model_name, (make or '').lower(), (model or '').lower(), digest)
+
+    def _count(self, name: str, amount: int = 1):
+        with self._stats_lock:
+            self.stats[name] += amount
+
+    def _record_lookup(self, event: str):
+        self._count(event)
+        lookups = getattr(self._local, 'lookups', None)
+        if lookups is not None:
+            lookups[event] += 1
+
+    @contextmanager
+    def track_lookups(self):
+        """
+        Count this thread's memo hits and misses inside the block. Yields a
+        {'hits', 'misses'} dict, so callers can tell whether their own call was
+        answered from the memo (self.stats is shared by every thread).
+        """
+        previous = getattr(self._local, 'lookups', None)
+        lookups = self._local.lookups = {'hits': 0, 'misses': 0}
+        try:
+            yield lookups
+        finally:
+            self._local.lookups = previous
+
+    def get(self, version: str, model_name: str, make: str, model: str, content: str) -> Optional[Dict[str, Any]]:
+        """Return the memoized result for this prompt/content, or None"""
+        if not self.enabled:
+            return None
+        key = self._key(version, model_name, make, model, content)
+        if key is None:
+            return None
+        try:
+            conn = self._get_connection()
+            row = conn.execute('''
+                SELECT result, tokens FROM gpt_memo
+                WHERE prompt_version = ? AND model_name = ? AND make = ? AND model = ? AND content_hash = ?
+            ''', key).fetchone()
+            if row is None:
+                shared = self._shared_get(key)
+                if shared is None:
+                    self._record_lookup('misses')
+                    return None
+                result, tokens = shared
+                # Backfill the local tier so the next lookup stays local
+                self._local_put(key, result, tokens)
+                self._record_lookup('hits')
+                self._count('shared_hits')
+                self._count('tokens_saved', tokens)
+                logger.info(f"♻️ GPT memo hit ({version}, {model_name}, shared) for {make} {model} - saved ~{tokens} tokens")
+                return result
+            conn.execute('''
+                UPDATE gpt_memo SET hits = hits + 1
+                WHERE prompt_version = ? AND model_name = ? AND make = ? AND model = ? AND content_hash = ?
+            ''', key)
+            conn.commit()
+            self._record_lookup('hits')
+            self._count('tokens_saved', row[1] or 0)
+            logger.info(f"♻️ GPT memo hit ({version}, {model_name}) for {make} {model} - saved ~{row[1] or 0} tokens")
+            return json.loads(row[0])
+        except Exception as e:
+            logger.error(f"Error reading GPT memo: {e}")
+            return None
+
+    def put(self, version: str, model_name: str, make: str, model: str, content: str,
+            result: Dict[str, Any], tokens: int = 0):
+        """Memoize a successful result; callers must not pass error placeholders"""
+        self.put_hashed(version, model_name, make, model, content_hash(content), result, tokens)
+
+    def put_hashed(self, version: str, model_name: str, make: str, model: str, digest: Optional[str],
+                   result: Dict[str, Any], tokens: int = 0):
+        """put() for callers that kept only the content_hash() of the content (the Batch API manifest)"""
+        if not self.enabled or not result:
+            return
+        key = self._hashed_key(version, model_name, make, model, digest)
+        if key is None:
+            return
+        if self._local_put(key, result, tokens):
+            self._count('stores')
+        if self.shared is not None:
+            try:
+                self.shared.put(key, result, int(tokens or 0))
+            except Exception as e:
+                logger.warning(f"Error writing shared GPT memo: {e}")
+
+    def _local_put(self, key: tuple, result: Dict[str, Any], tokens: int) -> bool:
+        try:
+            conn = self._get_connection()
+            conn.execute('''
+                INSERT INTO gpt_memo (prompt_version, model_name, make, model, content_hash, result, tokens)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', key + (json.dumps(result, default=str), int(tokens or 0)))
+            conn.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Error writing GPT memo: {e}")
+            return False
+
+    def _shared_get(self, key: tuple) -> Optional[tuple]:
+        if self.shared is None:
+            return None
+        try:
+            return self.shared.get(key)
+        except Exception as e:
+            logger.warning(f"Error reading shared GPT memo: {e}")
+            return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters for this process plus the number of stored entries"""
+        with self._stats_lock:
+            stats = dict(self.stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else 0.0
+        try:
+            stats['entries'] = self._get_connection().execute('SELECT COUNT(*) FROM gpt_memo').fetchone()[0]
+        except Exception:
+            stats['entries'] = None
+        return stats
+
+    def log_stats(self):
+        stats = self.get_stats()
+        logger.info(f"📊 GPT memo: {stats['hits']} hits ({stats['shared_hits']} from the shared tier) / "
+                    f"{stats['misses']} misses (hit rate {stats['hit_rate']:.0%}), ~{stats['tokens_saved']} tokens saved")
+
+    def clear(self):
+        try:
+            conn = self._get_connection()
+            conn.execute('DELETE FROM gpt_memo')
+            conn.commit()
+            logger.info("GPT memo cleared")
+        except Exception as e:
+            logger.error(f"Error clearing GPT memo: {e}")
+
+# Global memo store instance
+_gpt_memo = None
+_gpt_memo_lock = threading.Lock()
+
+def get_gpt_memo() -> GPTMemoStore:
+    """Get the global GPT memo store instance"""
+    global _gpt_memo
+    if _gpt_memo is None:
+        with _gpt_memo_lock:
+            if _gpt_memo is None:
+                _gpt_memo = GPTMemoStore()
+    return _gpt_memo
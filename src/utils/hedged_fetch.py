@@ -0,0 +1,199 @@
+"""
+Hedged "first good result wins" execution for interchangeable slow sources.
+
+Each source is started after its own hedge delay (0 = immediately) unless a
+result has already been accepted; the first result that passes the accept
+check wins and everything else is abandoned - queued sources are cancelled,
+sources already running finish in the background and are ignored. Per-source
+launches, wins, failures and latencies are recorded so the delays can be
+tuned from real numbers (get_stats() / log_stats()).
+
+Latency is measured from when a source actually starts on the pool. Abandoned
+sources keep their worker thread until they return, so launches that find
+every worker busy are counted as 'saturated' together with the time they
+waited for a thread - if that grows, raise HEDGE_WORKERS.
+"""
+
+import os
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Optional, List, Tuple, Any, Dict
+
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+HEDGE_WORKERS = int(os.environ.get('HEDGE_WORKERS', '8'))
+LATENCY_SAMPLES = 200
+
+class HedgedSource:
+    """A named source: fn() returns a result or None; delay is seconds after the hedge starts"""
+
+    __slots__ = ('name', 'fn', 'delay')
+
+    def __init__(self, name: str, fn: Callable[[], Any], delay: float = 0.0):
+        self.name = name
+        self.fn = fn
+        self.delay = delay
+
+def _percentile(samples, fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+class HedgeStats:
+    """Thread-safe per-source counters and latency samples"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sources: Dict[str, Dict[str, Any]] = {}
+
+    def _source(self, name: str) -> Dict[str, Any]:
+        stats = self._sources.get(name)
+        if stats is None:
+            stats = self._sources[name] = {
+                'launched': 0, 'wins': 0, 'rejected': 0, 'errors': 0, 'abandoned': 0, 'saturated': 0,
+                'latencies': deque(maxlen=LATENCY_SAMPLES), 'win_latencies': deque(maxlen=LATENCY_SAMPLES),
+                'queue_waits': deque(maxlen=LATENCY_SAMPLES),
+            }
+        return stats
+
+    def record(self, name: str, event: str, latency: Optional[float] = None):
+        with self._lock:
+            stats = self._source(name)
+            stats[event] += 1
+            if latency is not None:
+                stats['latencies'].append(latency)
+                if event == 'wins':
+                    stats['win_latencies'].append(latency)
+
+    def record_queue_wait(self, name: str, seconds: float):
+        with self._lock:
+            self._source(name)['queue_waits'].append(seconds)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            sources = {name: (dict(stats), list(stats['latencies']), list(stats['win_latencies']),
+                              list(stats['queue_waits']))
+                       for name, stats in self._sources.items()}
+        result = {}
+        for name, (stats, latencies, win_latencies, queue_waits) in sources.items():
+            result[name] = {
+                'launched': stats['launched'],
+                'wins': stats['wins'],
+                'rejected': stats['rejected'],
+                'errors': stats['errors'],
+                'abandoned': stats['abandoned'],
+                'saturated': stats['saturated'],
+                'win_rate': round(stats['wins'] / stats['launched'], 3) if stats['launched'] else 0.0,
+                'p50_s': round(_percentile(latencies, 0.5), 2),
+                'p95_s': round(_percentile(latencies, 0.95), 2),
+                'win_p50_s': round(_percentile(win_latencies, 0.5), 2),
+                'queue_p95_s': round(_percentile(queue_waits, 0.95), 2),
+            }
+        return result
+
+class HedgedRunner:
+    """Runs hedged source sets on a shared thread pool and keeps their stats"""
+
+    def __init__(self, name: str, max_workers: int = HEDGE_WORKERS):
+        self.name = name
+        self.stats = HedgeStats()
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"hedge-{name}")
+        self._outstanding = 0  # submitted sources not yet finished, abandoned ones included
+        self._outstanding_lock = threading.Lock()
+
+    def _run_source(self, source: HedgedSource, submitted: float) -> Tuple[Any, float, Optional[Exception]]:
+        """Returns (result, seconds since the source started, error)"""
+        started = time.perf_counter()
+        self.stats.record_queue_wait(source.name, started - submitted)
+        try:
+            return source.fn(), time.perf_counter() - started, None
+        except Exception as e:
+            return None, time.perf_counter() - started, e
+
+    def _finished(self, future):
+        with self._outstanding_lock:
+            self._outstanding -= 1
+
+    def _launch(self, source: HedgedSource):
+        self.stats.record(source.name, 'launched')
+        with self._outstanding_lock:
+            saturated = self._outstanding >= self.max_workers
+            self._outstanding += 1
+        if saturated:
+            self.stats.record(source.name, 'saturated')
+            logger.warning(f"⚠️ Hedged {self.name}: all {self.max_workers} workers busy - "
+                           f"{source.name} queues behind abandoned sources")
+        future = self._executor.submit(self._run_source, source, time.perf_counter())
+        future.add_done_callback(self._finished)
+        return future
+
+    def run(self, sources: List[HedgedSource], accept: Callable[[str, Any], bool],
+            timeout: Optional[float] = None) -> Tuple[Optional[str], Any]:
+        """
+        Return (source name, result) for the first accepted result, or (None, None)
+        if every source failed or the timeout expired.
+        """
+        start = time.perf_counter()
+        pending_sources = sorted(sources, key=lambda source: source.delay)
+        running = {}
+
+        try:
+            while pending_sources or running:
+                elapsed = time.perf_counter() - start
+                while pending_sources and pending_sources[0].delay <= elapsed:
+                    source = pending_sources.pop(0)
+                    running[self._launch(source)] = source
+
+                if timeout is not None and elapsed >= timeout:
+                    logger.warning(f"⚠️ Hedged {self.name}: no acceptable result within {timeout:.0f}s")
+                    return None, None
+
+                # Wake up for the next completion, the next hedge launch or the deadline
+                wake_at = [pending_sources[0].delay] if pending_sources else []
+                if timeout is not None:
+                    wake_at.append(timeout)
+                wait_for = max(0.0, min(wake_at) - elapsed) if wake_at else None
+                if not running:
+                    time.sleep(wait_for or 0)
+                    continue
+
+                done, _ = wait(list(running), timeout=wait_for, return_when=FIRST_COMPLETED)
+                for future in done:
+                    source = running.pop(future)
+                    result, latency, error = future.result()
+                    if error is not None:
+                        self.stats.record(source.name, 'errors', latency)
+                        logger.debug(f"Hedged {self.name}: {source.name} failed: {error}")
+                        continue
+                    if accept(source.name, result):
+                        self.stats.record(source.name, 'wins', latency)
+                        logger.info(f"🏁 Hedged {self.name}: {source.name} won after "
+                                    f"{time.perf_counter() - start:.1f}s")
+                        return source.name, result
+                    self.stats.record(source.name, 'rejected', latency)
+            return None, None
+        finally:
+            # Queued sources are cancelled; ones already running finish unobserved
+            for future, source in running.items():
+                future.cancel()
+                self.stats.record(source.name, 'abandoned')
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        return self.stats.snapshot()
+
+    def log_stats(self):
+        sources = self.get_stats()
+        if not sources:
+            return
+        logger.info(f"📊 Hedged {self.name} sources:")
+        for name, stats in sorted(sources.items(), key=lambda item: item[1]['wins'], reverse=True):
+            logger.info(f"📊   {name}: {stats['wins']}/{stats['launched']} wins ({stats['win_rate']:.0%}), "
+                        f"{stats['errors']} errors, {stats['abandoned']} abandoned, "
+                        f"p50 {stats['p50_s']}s p95 {stats['p95_s']}s, winning p50 {stats['win_p50_s']}s, "
+                        f"{stats['saturated']} saturated launches (queue p95 {stats['queue_p95_s']}s)")
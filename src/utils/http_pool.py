@@ -0,0 +1,203 @@
+"""
+Process-wide pooled HTTP session shared by every crawler tier and API client.
+
+All sync callers use one requests.Session backed by a keep-alive urllib3 pool,
+so repeated hits on the same outlet/API reuse TCP+TLS connections instead of
+paying a fresh handshake per request. Per-host connections are capped at
+HTTP_POOL_PER_HOST (callers wait for a free connection) and gzip/deflate (plus
+brotli when a decoder is installed) are negotiated automatically.
+
+Resolved addresses can be cached for HTTP_DNS_CACHE_SECONDS (opt-in, default
+off). The cache patches socket.getaddrinfo, so it applies to every client in the
+process (Supabase, OpenAI, httpx, yt-dlp), not just this session; it keeps at
+most HTTP_DNS_CACHE_SIZE lookups.
+
+Per-host request counts, errors and latency are recorded for every request and
+can be read with get_http_metrics() / log_http_metrics(). The async Tier 1
+client in ingest_database records into the same metrics via record_request().
+"""
+
+import os
+import time
+import socket
+import threading
+from collections import deque, OrderedDict
+from typing import Optional, Dict, Any
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+HTTP_POOL_HOSTS = int(os.environ.get('HTTP_POOL_HOSTS', '64'))
+HTTP_POOL_PER_HOST = int(os.environ.get('HTTP_POOL_PER_HOST', '8'))
+# 0 = no DNS cache (the default); see install_dns_cache
+HTTP_DNS_CACHE_SECONDS = float(os.environ.get('HTTP_DNS_CACHE_SECONDS', '0'))
+HTTP_DNS_CACHE_SIZE = int(os.environ.get('HTTP_DNS_CACHE_SIZE', '256'))
+LATENCY_SAMPLES_PER_HOST = 200
+
+def _brotli_available() -> bool:
+    # urllib3 and httpx both decode br with either package
+    for module in ('brotli', 'brotlicffi'):
+        try:
+            __import__(module)
+            return True
+        except ImportError:
+            continue
+    return False
+
+ACCEPT_ENCODING = 'gzip, deflate, br' if _brotli_available() else 'gzip, deflate'
+
+# ---------------------------------------------------------------------------
+# DNS cache
+# ---------------------------------------------------------------------------
+
+_dns_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_dns_lock = threading.Lock()
+_original_getaddrinfo = socket.getaddrinfo
+
+def _cached_getaddrinfo(*args, **kwargs):
+    key = args + tuple(sorted(kwargs.items()))
+    now = time.monotonic()
+    with _dns_lock:
+        entry = _dns_cache.get(key)
+        if entry and entry[0] > now:
+            _dns_cache.move_to_end(key)
+            return entry[1]
+    result = _original_getaddrinfo(*args, **kwargs)
+    with _dns_lock:
+        _dns_cache[key] = (now + HTTP_DNS_CACHE_SECONDS, result)
+        _dns_cache.move_to_end(key)
+        while len(_dns_cache) > HTTP_DNS_CACHE_SIZE:
+            _dns_cache.popitem(last=False)
+    return result
+
+def install_dns_cache() -> bool:
+    """
+    Cache successful lookups process-wide for HTTP_DNS_CACHE_SECONDS, least
+    recently used first out beyond HTTP_DNS_CACHE_SIZE entries; failures are never
+    cached. Does nothing unless HTTP_DNS_CACHE_SECONDS is set. Returns whether the
+    cache is active.
+    """
+    if HTTP_DNS_CACHE_SECONDS <= 0:
+        return False
+    if socket.getaddrinfo is _original_getaddrinfo:
+        socket.getaddrinfo = _cached_getaddrinfo
+        logger.info(f"DNS cache enabled process-wide ({HTTP_DNS_CACHE_SECONDS:.0f}s TTL, "
+                    f"{HTTP_DNS_CACHE_SIZE} entries)")
+    return True
+
+# ---------------------------------------------------------------------------
+# Per-host metrics
+# ---------------------------------------------------------------------------
+
+class HostMetrics:
+    """Thread-safe per-host request counters and recent latency samples"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, host: str, elapsed: float, status: Optional[int] = None, error: bool = False):
+        with self._lock:
+            stats = self._hosts.get(host)
+            if stats is None:
+                stats = self._hosts[host] = {
+                    'requests': 0, 'errors': 0, 'total_seconds': 0.0,
+                    'latencies': deque(maxlen=LATENCY_SAMPLES_PER_HOST), 'statuses': {}
+                }
+            stats['requests'] += 1
+            stats['total_seconds'] += elapsed
+            stats['latencies'].append(elapsed)
+            if error:
+                stats['errors'] += 1
+            if status is not None:
+                stats['statuses'][status] = stats['statuses'].get(status, 0) + 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            hosts = {host: (dict(stats), sorted(stats['latencies'])) for host, stats in self._hosts.items()}
+        result = {}
+        for host, (stats, latencies) in hosts.items():
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else 0.0
+            result[host] = {
+                'requests': stats['requests'],
+                'errors': stats['errors'],
+                'avg_ms': round(stats['total_seconds'] / stats['requests'] * 1000, 1) if stats['requests'] else 0.0,
+                'p95_ms': round(p95 * 1000, 1),
+                'statuses': dict(stats['statuses']),
+            }
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._hosts.clear()
+
+_metrics = HostMetrics()
+
+def _host_for(url: str) -> str:
+    try:
+        return urlparse(url).netloc.lower() or 'unknown'
+    except Exception:
+        return 'unknown'
+
+def record_request(url: str, elapsed: float, status: Optional[int] = None, error: bool = False):
+    """Record one request made outside the shared session (e.g. the async Tier 1 client)"""
+    _metrics.record(_host_for(url), elapsed, status, error)
+
+def get_http_metrics() -> Dict[str, Dict[str, Any]]:
+    """Per-host requests, errors, avg/p95 latency and status counts"""
+    return _metrics.snapshot()
+
+def log_http_metrics(top: int = 10):
+    hosts = sorted(get_http_metrics().items(), key=lambda item: item[1]['requests'], reverse=True)
+    if not hosts:
+        return
+    logger.info(f"📊 HTTP pool: {sum(stats['requests'] for _, stats in hosts)} requests to {len(hosts)} hosts")
+    for host, stats in hosts[:top]:
+        logger.info(f"📊   {host}: {stats['requests']} req, {stats['errors']} errors, "
+                    f"avg {stats['avg_ms']}ms, p95 {stats['p95_ms']}ms")
+
+# ---------------------------------------------------------------------------
+# Shared session
+# ---------------------------------------------------------------------------
+
+class PooledSession(requests.Session):
+    """requests.Session that times every request into the per-host metrics"""
+
+    def request(self, method, url, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = super().request(method, url, *args, **kwargs)
+        except Exception:
+            _metrics.record(_host_for(url), time.perf_counter() - start, error=True)
+            raise
+        _metrics.record(_host_for(url), time.perf_counter() - start, response.status_code,
+                        error=response.status_code >= 500)
+        return response
+
+_session: Optional[PooledSession] = None
+_session_lock = threading.Lock()
+
+def get_http_session() -> PooledSession:
+    """
+    Get the process-wide pooled session. Drop-in for requests.get/post:
+    pass headers/params/timeout per call - never mutate the shared session.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = PooledSession()
+                adapter = HTTPAdapter(pool_connections=HTTP_POOL_HOSTS, pool_maxsize=HTTP_POOL_PER_HOST,
+                                      pool_block=True)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+                _session = session
+                logger.info(f"Shared HTTP pool created ({HTTP_POOL_HOSTS} hosts x {HTTP_POOL_PER_HOST} connections, "
+                            f"Accept-Encoding: {ACCEPT_ENCODING})")
+    return _session
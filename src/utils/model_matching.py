@@ -4,8 +4,11 @@ Handles thousands of models without hardcoding.
 """
 
 import re
+from functools import lru_cache
 from typing import List, Tuple, Set
 
+from src.utils.vehicle_matcher import compile_terms, TermMatcher
+
 def generate_model_variations(model: str) -> Set[str]:
     """
     Generate common variations of a model name.
@@ -127,6 +130,11 @@ def extract_model_components(model: str) -> Tuple[str, List[str]]:
     
     return base_model, trim_parts
 
+@lru_cache(maxsize=512)
+def _variation_matcher(model: str) -> TermMatcher:
+    """generate_model_variations(model) compiled into one matcher (cached per model)"""
+    return compile_terms(tuple(sorted(generate_model_variations(model))))
+
 def fuzzy_model_match(search_text: str, model: str, threshold: float = 0.6) -> bool:
     """
     Intelligent model matching that works for any vehicle model.
@@ -141,21 +149,16 @@ def fuzzy_model_match(search_text: str, model: str, threshold: float = 0.6) -> b
     """
     search_text = search_text.lower()
     
-    # Generate variations
-    variations = generate_model_variations(model)
-    
     # Direct match with any variation
-    for variation in variations:
-        if variation in search_text:
-            return True
+    if _variation_matcher(model).search(search_text):
+        return True
     
     # Component-based matching for complex models
     base_model, trim_parts = extract_model_components(model)
     
     # For models with specific trim levels, check base model first
     if base_model:
-        base_variations = generate_model_variations(base_model)
-        base_found = any(var in search_text for var in base_variations)
+        base_found = _variation_matcher(base_model).search(search_text)
         
         # If we found the base model and it has trim parts
         if base_found and trim_parts:
@@ -163,8 +166,7 @@ def fuzzy_model_match(search_text: str, model: str, threshold: float = 0.6) -> b
             trim_found = False
             for trim in trim_parts:
                 if len(trim) > 2:  # Skip very short parts
-                    trim_variations = generate_model_variations(trim)
-                    if any(var in search_text for var in trim_variations):
+                    if _variation_matcher(trim).search(search_text):
                         trim_found = True
                         break
             
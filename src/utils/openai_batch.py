@@ -0,0 +1,129 @@
+"""
+Minimal async client for the OpenAI Batch API (file upload, batch create/poll/cancel,
+output download).
+
+The pinned openai==0.27.0 SDK predates the Batch API, so this talks to the REST
+endpoints directly over httpx. OPENAI_BATCH_BASE_URL can point at a local stand-in
+(scripts/openai_batch_stub_server.py) to exercise the whole path without an API key.
+"""
+
+import os
+import json
+from typing import Optional, Dict, Any, Iterator, Tuple
+
+import httpx
+
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+OPENAI_BATCH_BASE_URL = os.environ.get('OPENAI_BATCH_BASE_URL', 'https://api.openai.com/v1').rstrip('/')
+OPENAI_BATCH_COMPLETION_WINDOW = os.environ.get('OPENAI_BATCH_COMPLETION_WINDOW', '24h')
+
+CHAT_COMPLETIONS_ENDPOINT = '/v1/chat/completions'
+TERMINAL_STATUSES = {'completed', 'failed', 'expired', 'cancelled'}
+
+def chat_request_line(custom_id: str, model_name: str, prompt: str, max_tokens: int = 2000,
+                      temperature: float = 0.3) -> str:
+    """One JSONL line of a chat completions batch"""
+    return json.dumps({
+        'custom_id': custom_id,
+        'method': 'POST',
+        'url': CHAT_COMPLETIONS_ENDPOINT,
+        'body': {
+            'model': model_name,
+            'messages': [{'role': 'user', 'content': prompt}],
+            'max_tokens': max_tokens,
+            'temperature': temperature,
+        },
+    })
+
+def parse_output_lines(text: str) -> Iterator[Tuple[str, Optional[Dict[str, Any]], Optional[str]]]:
+    """
+    (custom_id, chat completion body, error) per line of a batch output or error file.
+    The body is None when the request failed.
+    """
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            logger.warning(f"⚠️ Skipping unparseable batch output line: {line[:200]}")
+            continue
+        custom_id = entry.get('custom_id')
+        response = entry.get('response') or {}
+        if entry.get('error') or response.get('status_code', 200) != 200:
+            error = entry.get('error') or (response.get('body') or {}).get('error')
+            yield custom_id, None, json.dumps(error) if error else f"HTTP {response.get('status_code')}"
+        else:
+            yield custom_id, response.get('body'), None
+
+def is_transient_error(error: Exception) -> bool:
+    """Network errors, 429 and 5xx are worth retrying; other 4xx (bad key, unknown batch) are not"""
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(error, httpx.TransportError)
+
+def completion_text(body: Dict[str, Any]) -> str:
+    """Message content of a chat completion body"""
+    return body['choices'][0]['message']['content']
+
+class OpenAIBatchClient:
+    """Async wrapper around the Batch API endpoints; use as `async with OpenAIBatchClient() as client:`"""
+
+    def __init__(self, api_key: Optional[str] = None, base_url: str = OPENAI_BATCH_BASE_URL,
+                 timeout: float = 120.0):
+        self.api_key = api_key or os.environ.get('OPENAI_API_KEY', '')
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def __aenter__(self) -> 'OpenAIBatchClient':
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={'Authorization': f"Bearer {self.api_key}"},
+            timeout=self.timeout,
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._client.aclose()
+        self._client = None
+
+    async def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        response = await self._client.request(method, path, **kwargs)
+        response.raise_for_status()
+        return response
+
+    async def upload_file(self, path: str) -> str:
+        """Upload a JSONL request file (purpose=batch) and return its file ID"""
+        with open(path, 'rb') as f:
+            response = await self._request('POST', '/files', data={'purpose': 'batch'},
+                                           files={'file': (os.path.basename(path), f, 'application/jsonl')})
+        file_id = response.json()['id']
+        logger.info(f"✅ Uploaded batch input {path} as {file_id}")
+        return file_id
+
+    async def create_batch(self, input_file_id: str, metadata: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        response = await self._request('POST', '/batches', json={
+            'input_file_id': input_file_id,
+            'endpoint': CHAT_COMPLETIONS_ENDPOINT,
+            'completion_window': OPENAI_BATCH_COMPLETION_WINDOW,
+            'metadata': metadata or {},
+        })
+        batch = response.json()
+        logger.info(f"✅ Created batch {batch['id']} ({batch.get('status')})")
+        return batch
+
+    async def get_batch(self, batch_id: str) -> Dict[str, Any]:
+        return (await self._request('GET', f"/batches/{batch_id}")).json()
+
+    async def cancel_batch(self, batch_id: str) -> Dict[str, Any]:
+        batch = (await self._request('POST', f"/batches/{batch_id}/cancel")).json()
+        logger.info(f"Cancelling batch {batch_id} ({batch.get('status')})")
+        return batch
+
+    async def file_content(self, file_id: str) -> str:
+        return (await self._request('GET', f"/files/{file_id}/content")).text
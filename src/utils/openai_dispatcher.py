@@ -0,0 +1,623 @@
+"""
+Token-aware adaptive dispatcher for OpenAI chat calls.
+
+GPT calls used to go through a fixed 3-slot semaphore plus the generic
+request bucket in rate_limiter (which sleeps while holding the bucket lock,
+so every waiting thread queues behind the sleeper). Neither knew about
+tokens: a 12,000-char sentiment prompt with max_tokens=2000 and a 100-token
+relevance check were throttled the same way, although the API limits tokens
+per minute as well as requests per minute.
+
+The dispatcher replaces both:
+
+- two refilling budgets per model, requests/minute (OPENAI_RPM_LIMIT) and
+  tokens/minute (OPENAI_TPM_LIMIT), because OpenAI limits each model
+  separately; a call reserves its prompt estimate plus max_tokens against its
+  model's budgets and the difference to the billed usage is refunded afterwards;
+- an adaptive concurrency cap (starts at OPENAI_MAX_CONCURRENT_START, moves
+  between OPENAI_MIN_CONCURRENT and OPENAI_MAX_CONCURRENT): halved on a 429,
+  lowered after a streak of responses whose x-ratelimit-remaining-* headers
+  run low, raised again after a streak of calls with plenty of headroom.
+  x-ratelimit-limit-* headers recalibrate the model's budgets to
+  OPENAI_LIMIT_HEADROOM of the account's limits for it.
+  The v1 client passes headers of successful calls via with_raw_response
+  (see gpt_analysis_enhanced_v1). The pinned openai==0.27 client only exposes
+  them on errors; entry points call install_response_header_hook() at
+  startup, which wraps its APIRequestor._interpret_response_line (seeing the
+  headers of every sync, async and streamed response) on 0.27 only;
+- a priority queue: interactive (dashboard) calls are granted before batch
+  (ingest, background worker) calls, FIFO within a priority. Waiters block on
+  their own event, never while holding a lock another caller needs;
+- queue depth and wait time metrics (get_stats()/log_stats()).
+
+Sync callers use acquire(), async callers async_acquire(); both share one
+queue and the same per-model budgets. Priority comes from the acquire() argument,
+else the surrounding openai_priority() block, else the process default
+(set_default_priority(), OPENAI_DEFAULT_PRIORITY).
+"""
+
+import os
+import re
+import time
+import heapq
+import asyncio
+import threading
+import functools
+import itertools
+import contextvars
+from collections import deque
+from contextlib import contextmanager, asynccontextmanager
+from typing import Optional, Dict, Any, Mapping
+
+from src.utils.logger import setup_logger
+from src.utils.gpt_memo import estimate_tokens, response_tokens
+
+logger = setup_logger(__name__)
+
+# OpenAI Tier 1 gpt-4-turbo: 500 RPM / 30,000 TPM - start at 80% like the old request bucket
+OPENAI_RPM_LIMIT = int(os.environ.get('OPENAI_RPM_LIMIT', '400'))
+OPENAI_TPM_LIMIT = int(os.environ.get('OPENAI_TPM_LIMIT', '24000'))
+OPENAI_LIMIT_HEADROOM = float(os.environ.get('OPENAI_LIMIT_HEADROOM', '0.8'))
+OPENAI_MIN_CONCURRENT = int(os.environ.get('OPENAI_MIN_CONCURRENT', '1'))
+OPENAI_MAX_CONCURRENT = int(os.environ.get('OPENAI_MAX_CONCURRENT', '8'))
+OPENAI_MAX_CONCURRENT_START = int(os.environ.get('OPENAI_MAX_CONCURRENT_START', '3'))
+# Completion budget reserved when a call doesn't pass max_tokens
+OPENAI_DEFAULT_COMPLETION_TOKENS = int(os.environ.get('OPENAI_DEFAULT_COMPLETION_TOKENS', '1000'))
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 1
+_PRIORITY_NAMES = {PRIORITY_INTERACTIVE: 'interactive', PRIORITY_BATCH: 'batch'}
+
+OPENAI_DEFAULT_PRIORITY = (PRIORITY_BATCH if os.environ.get('OPENAI_DEFAULT_PRIORITY', 'interactive').lower() == 'batch'
+                           else PRIORITY_INTERACTIVE)
+
+# Remaining share of a budget below which concurrency is lowered / above which it may grow
+_LOW_HEADROOM = 0.1
+_HIGH_HEADROOM = 0.5
+# Successful calls with high headroom before concurrency is raised by one
+_INCREASE_AFTER = 10
+# Responses with low headroom before concurrency is lowered by one, and the least
+# time between two such decreases (responses of one burst report the same window)
+_DECREASE_AFTER = 3
+_DECREASE_INTERVAL = 5.0
+# Longest a waiter sleeps before re-checking the budgets
+_MAX_WAIT_SLICE = 1.0
+
+_priority: contextvars.ContextVar = contextvars.ContextVar('openai_priority', default=None)
+_default_priority = OPENAI_DEFAULT_PRIORITY
+
+def set_default_priority(priority: int):
+    """Priority for calls in this process that don't ask for one (the background worker runs batch)"""
+    global _default_priority
+    _default_priority = priority
+    logger.info(f"OpenAI dispatcher default priority: {_PRIORITY_NAMES[priority]}")
+
+@contextmanager
+def openai_priority(priority: int):
+    """Run the block's OpenAI calls (including asyncio tasks and to_thread calls it starts) at a priority"""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+def current_priority() -> int:
+    priority = _priority.get()
+    return _default_priority if priority is None else priority
+
+_MODEL_SNAPSHOT = re.compile(r'-(\d{4}-\d{2}-\d{2}|\d{4})$')
+
+def model_key(model: Optional[str]) -> str:
+    """
+    Budget key for a model name: dated snapshots ('gpt-4-turbo-2024-04-09', as
+    reported in the openai-model header) share their alias's limits.
+    '' for calls that don't name a model.
+    """
+    if not model:
+        return ''
+    return _MODEL_SNAPSHOT.sub('', str(model).strip().lower())
+
+def estimate_request_tokens(prompt: str, max_tokens: Optional[int] = None) -> int:
+    """Tokens a call counts against the TPM limit: the prompt plus the completion budget"""
+    return estimate_tokens(prompt) + (max_tokens if max_tokens is not None else OPENAI_DEFAULT_COMPLETION_TOKENS)
+
+_DURATION_PART = re.compile(r'(\d+(?:\.\d+)?)(ms|h|m|s)')
+_DURATION_UNITS = {'h': 3600.0, 'm': 60.0, 's': 1.0, 'ms': 0.001}
+
+def parse_reset(value: Optional[str]) -> Optional[float]:
+    """Seconds from an x-ratelimit-reset-* / retry-after value ('6m0s', '1.5s', '20ms', '2')"""
+    if not value:
+        return None
+    value = str(value).strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+def _header(headers: Mapping, name: str) -> Optional[str]:
+    try:
+        value = headers.get(name)
+        if value is None:
+            value = headers.get(name.title())
+        return value
+    except Exception:
+        return None
+
+def _header_int(headers: Mapping, name: str) -> Optional[int]:
+    value = _header(headers, name)
+    try:
+        return int(float(value)) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """429 from either OpenAI client generation"""
+    status = getattr(error, 'http_status', None) or getattr(error, 'status_code', None)
+    return status == 429 or type(error).__name__ == 'RateLimitError'
+
+def _error_headers(error: BaseException) -> Optional[Mapping]:
+    headers = getattr(error, 'headers', None)
+    if headers is None:
+        response = getattr(error, 'response', None)
+        headers = getattr(response, 'headers', None)
+    return headers
+
+class _Budget:
+    """Continuously refilling per-minute allowance (requests or tokens)"""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(max(1, per_minute))
+        self.level = self.capacity
+        self._last = time.monotonic()
+
+    def refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self._last) * self.capacity / 60.0)
+        self._last = now
+
+    def cost(self, amount: float) -> float:
+        # A single call larger than the whole budget still goes through once the budget is full
+        return min(float(amount), self.capacity)
+
+    def seconds_until(self, amount: float) -> float:
+        missing = self.cost(amount) - self.level
+        return max(0.0, missing * 60.0 / self.capacity)
+
+    def resize(self, per_minute: int):
+        per_minute = float(max(1, per_minute))
+        self.level = min(self.level * per_minute / self.capacity, per_minute)
+        self.capacity = per_minute
+
+class _ModelBudgets:
+    """Request and token budgets of one model, and when dispatch to it may resume after a 429"""
+
+    def __init__(self, rpm: int, tpm: int):
+        self.requests = _Budget(rpm)
+        self.tokens = _Budget(tpm)
+        self.paused_until = 0.0
+
+    def refill(self, now: float):
+        self.requests.refill(now)
+        self.tokens.refill(now)
+
+    def seconds_until(self, now: float, tokens: int) -> float:
+        if now < self.paused_until:
+            return self.paused_until - now
+        return max(self.requests.seconds_until(1), self.tokens.seconds_until(tokens))
+
+class _Ticket:
+    __slots__ = ('priority', 'tokens', 'model', 'enqueued', 'granted', 'cancelled', '_event', '_loop')
+
+    def __init__(self, priority: int, tokens: int, model: str = '',
+                 loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.priority = priority
+        self.tokens = tokens
+        self.model = model
+        self.enqueued = time.monotonic()
+        self.granted = False
+        self.cancelled = False
+        self._loop = loop
+        self._event = asyncio.Event() if loop is not None else threading.Event()
+
+    def wake(self):
+        if self._loop is None:
+            self._event.set()
+        else:
+            try:
+                self._loop.call_soon_threadsafe(self._event.set)
+            except RuntimeError:
+                # Loop already closed - its waiter is gone
+                pass
+
+class Lease:
+    """A granted call slot; record() reconciles the reserved tokens with the billed usage"""
+
+    __slots__ = ('dispatcher', 'tokens', 'priority', 'model', 'recorded')
+
+    def __init__(self, dispatcher: 'OpenAIDispatcher', tokens: int, priority: int, model: str = ''):
+        self.dispatcher = dispatcher
+        self.tokens = tokens
+        self.priority = priority
+        self.model = model
+        self.recorded = False
+
+    def record(self, response=None, prompt: str = '', headers: Optional[Mapping] = None):
+        """Refund reserved tokens the call didn't use and feed any rate-limit headers back"""
+        if self.recorded:
+            return
+        self.recorded = True
+        if headers is None:
+            headers = getattr(response, 'headers', None)
+        if headers is not None:
+            self.dispatcher.record_headers(headers, model=self.model)
+        used = response_tokens(response, prompt) if response is not None else 0
+        if used:
+            self.dispatcher._refund(self.tokens - used, self.model)
+
+class OpenAIDispatcher:
+    """Per-model RPM/TPM budgets, adaptive concurrency and a priority queue for OpenAI calls"""
+
+    def __init__(self, rpm: int = OPENAI_RPM_LIMIT, tpm: int = OPENAI_TPM_LIMIT,
+                 min_concurrent: int = OPENAI_MIN_CONCURRENT, max_concurrent: int = OPENAI_MAX_CONCURRENT,
+                 start_concurrent: int = OPENAI_MAX_CONCURRENT_START):
+        self._lock = threading.Lock()
+        self.rpm = rpm
+        self.tpm = tpm
+        self._budgets: Dict[str, _ModelBudgets] = {}
+        self.min_concurrent = max(1, min_concurrent)
+        self.max_concurrent = max(self.min_concurrent, max_concurrent)
+        self.concurrency = min(self.max_concurrent, max(self.min_concurrent, start_concurrent))
+        self.in_flight = 0
+        self._queue = []
+        self._seq = itertools.count()
+        self._waiting = 0
+        self._healthy_streak = 0
+        self._low_streak = 0
+        self._last_decrease = 0.0
+
+        self._waits = {PRIORITY_INTERACTIVE: deque(maxlen=1000), PRIORITY_BATCH: deque(maxlen=1000)}
+        self.stats = {'calls': 0, 'rate_limited': 0, 'header_updates': 0, 'max_queue_depth': 0,
+                      'tokens_reserved': 0, 'tokens_refunded': 0,
+                      'concurrency_increases': 0, 'concurrency_decreases': 0}
+
+        logger.info(f"OpenAI dispatcher initialized: {rpm} RPM, {tpm} TPM per model, "
+                    f"{self.concurrency} concurrent (adaptive {self.min_concurrent}-{self.max_concurrent})")
+
+    # --- queue -----------------------------------------------------------------
+
+    def _budgets_locked(self, model: str) -> _ModelBudgets:
+        budgets = self._budgets.get(model)
+        if budgets is None:
+            budgets = self._budgets[model] = _ModelBudgets(self.rpm, self.tpm)
+        return budgets
+
+    def _enqueue(self, tokens: int, priority: Optional[int], model: Optional[str], loop=None) -> _Ticket:
+        priority = current_priority() if priority is None else priority
+        ticket = _Ticket(priority, max(1, int(tokens)), model_key(model), loop)
+        with self._lock:
+            heapq.heappush(self._queue, (priority, next(self._seq), ticket))
+            self._waiting += 1
+            self.stats['max_queue_depth'] = max(self.stats['max_queue_depth'], self._waiting)
+            self._dispatch_locked()
+        return ticket
+
+    def _dispatch_locked(self) -> float:
+        """
+        Grant queued tickets in priority order while slots and their model's budget allow.
+        A ticket waiting on its model's budget holds back later tickets for that model
+        only. Returns how long until a blocked ticket's budget allows it (0 if none is).
+        """
+        now = time.monotonic()
+        for budgets in self._budgets.values():
+            budgets.refill(now)
+        wait = 0.0
+        blocked = set()
+        granted = False
+        for entry in sorted(self._queue):
+            ticket = entry[2]
+            if ticket.cancelled:
+                self._queue.remove(entry)
+                granted = True
+                continue
+            if self.in_flight >= self.concurrency:
+                break
+            if ticket.model in blocked:
+                continue
+            budgets = self._budgets_locked(ticket.model)
+            ticket_wait = budgets.seconds_until(now, ticket.tokens)
+            if ticket_wait > 0:
+                blocked.add(ticket.model)
+                wait = min(wait, ticket_wait) if wait else ticket_wait
+                continue
+            self._queue.remove(entry)
+            granted = True
+            budgets.requests.level -= budgets.requests.cost(1)
+            budgets.tokens.level -= budgets.tokens.cost(ticket.tokens)
+            self.in_flight += 1
+            self._waiting -= 1
+            self.stats['calls'] += 1
+            self.stats['tokens_reserved'] += ticket.tokens
+            self._waits[ticket.priority].append(now - ticket.enqueued)
+            ticket.granted = True
+            ticket.wake()
+        if granted:
+            heapq.heapify(self._queue)
+        return wait
+
+    def _dispatch(self) -> float:
+        with self._lock:
+            return self._dispatch_locked()
+
+    def _cancel(self, ticket: _Ticket):
+        with self._lock:
+            if ticket.granted:
+                return
+            ticket.cancelled = True
+            self._waiting -= 1
+
+    def _release(self, error: Optional[BaseException] = None, model: str = ''):
+        if error is not None and is_rate_limit_error(error):
+            self._on_rate_limited(_error_headers(error), model)
+        with self._lock:
+            self.in_flight -= 1
+            self._dispatch_locked()
+
+    def _refund(self, tokens: int, model: str = ''):
+        with self._lock:
+            budget = self._budgets_locked(model).tokens
+            budget.level = min(budget.capacity, budget.level + tokens)
+            self.stats['tokens_refunded'] += tokens
+            self._dispatch_locked()
+
+    # --- acquire ---------------------------------------------------------------
+
+    @contextmanager
+    def acquire(self, tokens: int = OPENAI_DEFAULT_COMPLETION_TOKENS, priority: Optional[int] = None,
+                model: Optional[str] = None):
+        """
+        Context manager for synchronous code: blocks until the call fits the
+        budgets of `model` and a slot is free, yields a Lease. A RateLimitError
+        raised in the block halves concurrency and pauses dispatch to that model
+        until the reset.
+        """
+        ticket = self._enqueue(tokens, priority, model)
+        try:
+            while not ticket.granted:
+                ticket._event.wait(min(self._dispatch() or _MAX_WAIT_SLICE, _MAX_WAIT_SLICE))
+        except BaseException:
+            self._cancel(ticket)
+            if ticket.granted:
+                self._release()
+            raise
+        lease = Lease(self, ticket.tokens, ticket.priority, ticket.model)
+        try:
+            yield lease
+        except BaseException as e:
+            self._release(e, ticket.model)
+            raise
+        self._release()
+
+    @asynccontextmanager
+    async def async_acquire(self, tokens: int = OPENAI_DEFAULT_COMPLETION_TOKENS, priority: Optional[int] = None,
+                            model: Optional[str] = None):
+        """Async acquire(): waits on an asyncio.Event, so the event loop is never blocked"""
+        ticket = self._enqueue(tokens, priority, model, loop=asyncio.get_running_loop())
+        try:
+            while not ticket.granted:
+                try:
+                    await asyncio.wait_for(ticket._event.wait(),
+                                           min(self._dispatch() or _MAX_WAIT_SLICE, _MAX_WAIT_SLICE))
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:
+            self._cancel(ticket)
+            if ticket.granted:
+                self._release()
+            raise
+        lease = Lease(self, ticket.tokens, ticket.priority, ticket.model)
+        try:
+            yield lease
+        except BaseException as e:
+            self._release(e, ticket.model)
+            raise
+        self._release()
+
+    # --- adaptation ------------------------------------------------------------
+
+    def record_headers(self, headers: Mapping, model: Optional[str] = None):
+        """
+        Adapt the budgets of the model that answered (`model`, else the
+        openai-model header) and concurrency to x-ratelimit-* response headers
+        """
+        limit_requests = _header_int(headers, 'x-ratelimit-limit-requests')
+        limit_tokens = _header_int(headers, 'x-ratelimit-limit-tokens')
+        remaining_requests = _header_int(headers, 'x-ratelimit-remaining-requests')
+        remaining_tokens = _header_int(headers, 'x-ratelimit-remaining-tokens')
+        if remaining_requests is None and remaining_tokens is None:
+            return
+        key = model_key(model or _header(headers, 'openai-model'))
+        label = key or 'default'
+
+        with self._lock:
+            self.stats['header_updates'] += 1
+            budgets = self._budgets_locked(key)
+            if limit_requests:
+                target = int(limit_requests * OPENAI_LIMIT_HEADROOM)
+                if target != int(budgets.requests.capacity):
+                    budgets.requests.resize(target)
+                    logger.info(f"OpenAI dispatcher: {label} request budget recalibrated to {target} RPM")
+            if limit_tokens:
+                target = int(limit_tokens * OPENAI_LIMIT_HEADROOM)
+                if target != int(budgets.tokens.capacity):
+                    budgets.tokens.resize(target)
+                    logger.info(f"OpenAI dispatcher: {label} token budget recalibrated to {target} TPM")
+
+            # The server's count includes other processes using the same key - never spend more than that
+            now = time.monotonic()
+            budgets.refill(now)
+            if remaining_requests is not None:
+                budgets.requests.level = min(budgets.requests.level, remaining_requests)
+            if remaining_tokens is not None:
+                budgets.tokens.level = min(budgets.tokens.level, remaining_tokens)
+
+            shares = []
+            if remaining_requests is not None and limit_requests:
+                shares.append(remaining_requests / limit_requests)
+            if remaining_tokens is not None and limit_tokens:
+                shares.append(remaining_tokens / limit_tokens)
+            headroom = min(shares) if shares else None
+
+            if headroom is not None and headroom < _LOW_HEADROOM:
+                self._healthy_streak = 0
+                self._low_streak += 1
+                if (self._low_streak >= _DECREASE_AFTER and now - self._last_decrease >= _DECREASE_INTERVAL
+                        and self.concurrency > self.min_concurrent):
+                    self._low_streak = 0
+                    self._last_decrease = now
+                    self._set_concurrency_locked(self.concurrency - 1,
+                                                 f"{headroom:.0%} of the {label} rate limit left")
+            elif headroom is not None and headroom > _HIGH_HEADROOM:
+                self._low_streak = 0
+                self._healthy_streak += 1
+                if self._healthy_streak >= _INCREASE_AFTER and self.concurrency < self.max_concurrent:
+                    self._healthy_streak = 0
+                    self._set_concurrency_locked(self.concurrency + 1,
+                                                 f"{headroom:.0%} of the {label} rate limit left")
+            self._dispatch_locked()
+
+    def _on_rate_limited(self, headers: Optional[Mapping], model: str = ''):
+        pause = None
+        if headers is not None:
+            pause = (parse_reset(_header(headers, 'retry-after'))
+                     or max(filter(None, [parse_reset(_header(headers, 'x-ratelimit-reset-requests')),
+                                          parse_reset(_header(headers, 'x-ratelimit-reset-tokens'))]), default=None))
+        pause = min(pause or 5.0, 60.0)
+        with self._lock:
+            self.stats['rate_limited'] += 1
+            self._healthy_streak = 0
+            self._low_streak = 0
+            now = time.monotonic()
+            self._last_decrease = now
+            budgets = self._budgets_locked(model)
+            budgets.paused_until = max(budgets.paused_until, now + pause)
+            self._set_concurrency_locked(self.concurrency // 2, "429 rate limited")
+        logger.warning(f"⚠️ OpenAI rate limited ({model or 'default'}) - pausing dispatch to it for {pause:.1f}s, "
+                       f"concurrency now {self.concurrency}")
+        if headers is not None:
+            self.record_headers(headers, model=model)
+
+    def _set_concurrency_locked(self, value: int, reason: str):
+        value = min(self.max_concurrent, max(self.min_concurrent, value))
+        if value == self.concurrency:
+            return
+        self.stats['concurrency_increases' if value > self.concurrency else 'concurrency_decreases'] += 1
+        logger.info(f"OpenAI dispatcher concurrency {self.concurrency} -> {value} ({reason})")
+        self.concurrency = value
+
+    # --- metrics ---------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters plus current queue depth, in-flight calls, budgets and wait times per priority"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats.update({
+                'queue_depth': self._waiting,
+                'in_flight': self.in_flight,
+                'concurrency': self.concurrency,
+                'budgets': {(key or 'default'): {'rpm': int(budgets.requests.capacity),
+                                                 'tpm': int(budgets.tokens.capacity)}
+                            for key, budgets in self._budgets.items()},
+            })
+            waits = {priority: sorted(samples) for priority, samples in self._waits.items()}
+        for priority, samples in waits.items():
+            name = _PRIORITY_NAMES[priority]
+            stats[f'{name}_calls'] = len(samples)
+            stats[f'{name}_wait_avg'] = round(sum(samples) / len(samples), 3) if samples else 0.0
+            stats[f'{name}_wait_p95'] = round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3) if samples else 0.0
+        return stats
+
+    def log_stats(self):
+        stats = self.get_stats()
+        if not stats['calls']:
+            return
+        budgets = ', '.join(f"{name} {budget['tpm']} TPM / {budget['rpm']} RPM"
+                            for name, budget in sorted(stats['budgets'].items()))
+        logger.info(f"📊 OpenAI dispatcher: {stats['calls']} calls, queue depth {stats['queue_depth']} "
+                    f"(max {stats['max_queue_depth']}), concurrency {stats['concurrency']}, "
+                    f"{stats['rate_limited']} rate limited, "
+                    f"{stats['tokens_reserved'] - stats['tokens_refunded']} tokens used; budgets: {budgets}")
+        for name in ('interactive', 'batch'):
+            if stats[f'{name}_calls']:
+                logger.info(f"📊 OpenAI dispatcher {name}: wait avg {stats[f'{name}_wait_avg']:.2f}s, "
+                            f"p95 {stats[f'{name}_wait_p95']:.2f}s over the last {stats[f'{name}_calls']} calls")
+
+# Global dispatcher instance
+_openai_dispatcher = None
+_openai_dispatcher_lock = threading.Lock()
+
+def get_openai_dispatcher() -> OpenAIDispatcher:
+    """Get the global OpenAI dispatcher instance"""
+    global _openai_dispatcher
+    if _openai_dispatcher is None:
+        with _openai_dispatcher_lock:
+            if _openai_dispatcher is None:
+                _openai_dispatcher = OpenAIDispatcher()
+    return _openai_dispatcher
+
+_header_hook_installed = False
+_header_hook_lock = threading.Lock()
+# Headers last recorded on this thread - a streamed response passes the same object once per chunk
+_last_headers = threading.local()
+
+def _record_response_headers(rcode, rheaders):
+    if rheaders is None or not isinstance(rcode, int) or not 200 <= rcode < 300:
+        return  # errors reach the dispatcher through _on_rate_limited
+    if getattr(_last_headers, 'value', None) is rheaders:
+        return
+    _last_headers.value = rheaders
+    try:
+        get_openai_dispatcher().record_headers(rheaders)
+    except Exception as e:
+        logger.debug(f"Could not record OpenAI rate-limit headers: {e}")
+
+# Client versions whose private APIRequestor._interpret_response_line signature the hook was written against
+_HOOKED_OPENAI_VERSIONS = ('0.27.',)
+
+def install_response_header_hook() -> bool:
+    """
+    Feed x-ratelimit-* headers of successful openai==0.27 calls to the dispatcher.
+    Patches a private client method process-wide, so entry points (ingest, the
+    background worker) call it once at startup. Idempotent; False (and nothing
+    patched) for any other client version.
+    """
+    global _header_hook_installed
+    with _header_hook_lock:
+        if _header_hook_installed:
+            return True
+        try:
+            import openai
+            from openai import api_requestor
+        except ImportError:
+            return False
+        version = getattr(openai, '__version__', None) or getattr(getattr(openai, 'version', None), 'VERSION', '')
+        if not str(version).startswith(_HOOKED_OPENAI_VERSIONS):
+            logger.warning(f"OpenAI dispatcher: not hooking response headers of openai {version or 'unknown'} "
+                           f"(written for {', '.join(v + 'x' for v in _HOOKED_OPENAI_VERSIONS)})")
+            return False
+        requestor = getattr(api_requestor, 'APIRequestor', None)
+        original = getattr(requestor, '_interpret_response_line', None)
+        if original is None:
+            return False
+
+        @functools.wraps(original)
+        def _interpret_response_line(self, rbody, rcode, rheaders, *args, **kwargs):
+            _record_response_headers(rcode, rheaders)
+            return original(self, rbody, rcode, rheaders, *args, **kwargs)
+
+        requestor._interpret_response_line = _interpret_response_line
+        _header_hook_installed = True
+        logger.info("✅ OpenAI dispatcher reading x-ratelimit-* headers from openai 0.27 responses")
+        return True
@@ -1,66 +1,40 @@
 """
 OpenAI API Semaphore for controlling concurrent requests
 Prevents hitting burst limits when multiple processes are running
-"""
 
-import threading
-import asyncio
-from contextlib import contextmanager
-from src.utils.logger import setup_logger
+Kept for existing imports: concurrency, RPM/TPM budgets and priorities now
+live in the OpenAI dispatcher (src/utils/openai_dispatcher.py), and both
+context managers here just take a dispatcher slot with the default token
+reservation.
+"""
 
-logger = setup_logger(__name__)
+from contextlib import contextmanager, asynccontextmanager
+from src.utils.openai_dispatcher import get_openai_dispatcher
 
 class OpenAISemaphore:
     """
-    Singleton semaphore to limit concurrent OpenAI API calls across the application
+    Compatibility shim over the shared OpenAI dispatcher
     """
-    _instance = None
-    _lock = threading.Lock()
-    
-    def __new__(cls):
-        if cls._instance is None:
-            with cls._lock:
-                if cls._instance is None:
-                    cls._instance = super().__new__(cls)
-                    cls._instance._initialized = False
-        return cls._instance
     
-    def __init__(self):
-        if self._initialized:
-            return
-            
-        # Limit concurrent OpenAI calls
-        # With 5 workers, limit to 3 concurrent API calls to avoid burst issues
-        self.max_concurrent = 3
-        self.semaphore = threading.Semaphore(self.max_concurrent)
-        self.async_semaphore = asyncio.Semaphore(self.max_concurrent)
-        self._initialized = True
-        
-        logger.info(f"OpenAI Semaphore initialized with max {self.max_concurrent} concurrent requests")
+    @property
+    def max_concurrent(self) -> int:
+        return get_openai_dispatcher().concurrency
     
     @contextmanager
     def acquire(self):
         """
         Context manager for synchronous code
         """
-        logger.debug("Waiting for OpenAI semaphore...")
-        self.semaphore.acquire()
-        logger.debug("OpenAI semaphore acquired")
-        try:
-            yield
-        finally:
-            self.semaphore.release()
-            logger.debug("OpenAI semaphore released")
+        with get_openai_dispatcher().acquire() as lease:
+            yield lease
     
+    @asynccontextmanager
     async def async_acquire(self):
         """
         Context manager for async code
         """
-        logger.debug("Waiting for async OpenAI semaphore...")
-        async with self.async_semaphore:
-            logger.debug("Async OpenAI semaphore acquired")
-            yield
-            logger.debug("Async OpenAI semaphore released")
+        async with get_openai_dispatcher().async_acquire() as lease:
+            yield lease
 
 # Global singleton instance
-openai_semaphore = OpenAISemaphore()
\ No newline at end of file
+openai_semaphore = OpenAISemaphore()
@@ -0,0 +1,107 @@
+"""
+Parse-once HTML documents shared by the content, date and byline extractors.
+
+A fetched page used to be parsed up to five times (mostly with the pure-Python
+html.parser): content extraction, alternative extraction, date extraction and
+two byline extractors. crawl_url builds one ParsedDocument per fetch and hands
+it to the extractors explicitly (it travels on the crawl result as
+result['document']). Read-only extractors share one lxml-backed tree; the
+extractors that strip nodes share a second tree with scripts, styles, iframes
+and svgs already removed, taking out whatever else they drop for the duration
+of their extraction only (see stripped_tree()). Extracted article text is
+memoized per (url, expected topic) on the document, so the crawler's quality
+check and the ingest step share one extraction.
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Optional, Dict, Iterable, Iterator, List, Tuple, Union
+
+from bs4 import BeautifulSoup
+
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+HTML_PARSER = 'lxml'
+
+# Never part of article text - removed once from the stripped tree
+STRIPPED_TAGS = ['script', 'style', 'noscript', 'iframe', 'svg']
+
+class StrippedTree:
+    """The document's stripped tree plus the nodes one extractor has taken out of it"""
+
+    def __init__(self, soup: BeautifulSoup):
+        self.soup = soup
+        self._detached: List[Tuple] = []
+
+    def detach(self, elements: Iterable):
+        """Take elements out of the tree until the extractor is done (instead of decompose())"""
+        for element in elements:
+            parent = element.parent
+            if parent is None:
+                continue
+            index = parent.index(element)
+            self._detached.append((parent, index, element.extract()))
+
+    def restore(self):
+        """Put detached nodes back where they were, newest first"""
+        while self._detached:
+            parent, index, element = self._detached.pop()
+            parent.insert(index, element)
+
+class ParsedDocument:
+    """One fetched HTML page, parsed lazily and at most once for read-only use"""
+
+    def __init__(self, html: str, url: str = ""):
+        self.html = html or ""
+        self.url = url
+        self._soup: Optional[BeautifulSoup] = None
+        self._stripped: Optional[BeautifulSoup] = None
+        self._lock = threading.Lock()
+        self._stripped_lock = threading.RLock()
+        self._extracted: Dict[tuple, str] = {}
+
+    @property
+    def soup(self) -> BeautifulSoup:
+        """
+        Shared tree - callers must not modify it (no decompose()/extract()).
+        Use stripped_tree() when the extractor strips nodes.
+        """
+        if self._soup is None:
+            with self._lock:
+                if self._soup is None:
+                    self._soup = BeautifulSoup(self.html, HTML_PARSER)
+        return self._soup
+
+    @contextmanager
+    def stripped_tree(self) -> Iterator[StrippedTree]:
+        """
+        Tree shared by the node-stripping extractors, parsed once with STRIPPED_TAGS
+        removed. Remove further nodes with detach(); they are restored on exit so the
+        next extractor sees the same tree. Held under a reentrant lock per document.
+        """
+        with self._stripped_lock:
+            if self._stripped is None:
+                self._stripped = BeautifulSoup(self.html, HTML_PARSER)
+                for element in self._stripped(STRIPPED_TAGS):
+                    element.decompose()
+            tree = StrippedTree(self._stripped)
+            try:
+                yield tree
+            finally:
+                tree.restore()
+
+    def get_extracted(self, url: str, expected_topic: str) -> Optional[str]:
+        return self._extracted.get((url, expected_topic))
+
+    def set_extracted(self, url: str, expected_topic: str, text: str):
+        self._extracted[(url, expected_topic)] = text
+
+def as_document(html_or_document: Union[str, ParsedDocument, None], url: str = "") -> Optional[ParsedDocument]:
+    """Accept either raw HTML or a ParsedDocument; None for empty input"""
+    if isinstance(html_or_document, ParsedDocument):
+        return html_or_document if html_or_document.html else None
+    if not html_or_document:
+        return None
+    return ParsedDocument(html_or_document, url)
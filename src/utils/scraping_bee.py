@@ -7,6 +7,7 @@ from urllib.parse import urlparse
 import json
 
 from src.utils.logger import setup_logger
+from src.utils.http_pool import get_http_session
 
 logger = setup_logger(__name__)
 
@@ -109,7 +110,7 @@ class ScrapingBeeClient:
             try:
                 logger.info(f"ScrapingBee attempt {attempt + 1}/{self.max_retries} for {url} (timeout: {timeout}s)")
                 
-                response = requests.get(
+                response = get_http_session().get(
                     self.base_url,
                     params=params,
                     timeout=timeout  # Increased timeout for YouTube
@@ -185,7 +186,7 @@ class ScrapingBeeClient:
                 'render_js': 'false'
             }
             
-            response = requests.get(self.base_url, params=params, timeout=10)
+            response = get_http_session().get(self.base_url, params=params, timeout=10)
             
             status_info = {
                 'status_code': response.status_code,
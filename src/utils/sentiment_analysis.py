@@ -9,6 +9,7 @@ import asyncio
 
 from src.utils.logger import setup_logger
 from src.analysis.gpt_analysis import analyze_clip
+from src.analysis.gpt_analysis_enhanced import ingest_combined_analysis
 try:
     # Try to import the v1 API version first (for OpenAI 1.x)
     from src.analysis.gpt_analysis_enhanced_v1 import analyze_clip_enhanced
@@ -48,6 +49,14 @@ class SentimentAnalyzer:
             Dictionary with sentiment analysis results
         """
         try:
+            # Ingest's combined analysis mode may already have analyzed this clip
+            if self.use_enhanced:
+                result = ingest_combined_analysis(clip_data)
+                if result is not None:
+                    result['sentiment_completed'] = True
+                    result['sentiment_analysis_date'] = datetime.now().isoformat()
+                    return result
+            
             content = clip_data.get('extracted_content', '')
             
             # Check if this is a YouTube video with insufficient content
@@ -0,0 +1,170 @@
+"""
+Run-scoped single-flight coalescing for duplicate outlet fetches.
+
+Many loans in a report share an outlet URL (the same reviewer's site index or
+channel across several vehicles), and every (loan, URL) pair used to be
+crawled on its own, so the same page was fetched once per loan - often all at
+the same time. A SingleFlightGroup keys fetches by normalized URL: the first
+caller runs the fetch, concurrent callers for the same key wait on that one
+in-flight fetch, and later callers reuse the result until the run ends.
+
+Only the raw page fetch is shared - make/model scoring stays per loan. Errors
+are handed to everyone waiting but never cached, and neither are empty
+results, so the next loan still gets its own attempt.
+
+The async ingest engine opens one group per run with begin_run() and passes
+it down to the per-URL crawls; without a group callers fetch as before.
+"""
+
+import os
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Optional, Dict, Any, Awaitable
+from urllib.parse import urlparse, urlunparse
+
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+SINGLE_FLIGHT_ENABLED = os.environ.get('SINGLE_FLIGHT_ENABLED', 'true').lower() == 'true'
+SINGLE_FLIGHT_MAX_RESULTS = int(os.environ.get('SINGLE_FLIGHT_MAX_RESULTS', '256'))
+
+def normalize_url(url: str) -> str:
+    """Coalescing key: lowercase scheme/host without www., no fragment or trailing slash"""
+    parsed = urlparse(url.strip() if '://' in url else f"https://{url.strip()}")
+    netloc = parsed.netloc.lower()
+    if netloc.startswith('www.'):
+        netloc = netloc[4:]
+    path = parsed.path.rstrip('/') or '/'
+    return urlunparse((parsed.scheme.lower() or 'https', netloc, path, '', parsed.query, ''))
+
+def _default_cacheable(result: Any) -> bool:
+    return result is not None and result != ''
+
+class SingleFlightGroup:
+    """
+    Thread-safe single-flight map. In-flight fetches are
+    concurrent.futures.Futures, so overlapping runs on different event loops
+    can share one group.
+    """
+
+    def __init__(self, name: str = 'run', max_results: int = SINGLE_FLIGHT_MAX_RESULTS):
+        self.name = name
+        self.max_results = max_results
+        self._lock = threading.Lock()
+        self._inflight: Dict[tuple, Future] = {}
+        self._results: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, kind: str, event: str):
+        stats = self._stats.get(kind)
+        if stats is None:
+            stats = self._stats[kind] = {'fetches': 0, 'joined': 0, 'reused': 0, 'errors': 0}
+        stats[event] += 1
+
+    def _claim(self, key: tuple) -> tuple:
+        """
+        Returns ('hit', result), ('join', future) or ('lead', future) for a key.
+        Must be called without holding the lock.
+        """
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                self._count(key[0], 'reused')
+                return 'hit', self._results[key]
+            future = self._inflight.get(key)
+            if future is not None:
+                self._count(key[0], 'joined')
+                return 'join', future
+            future = self._inflight[key] = Future()
+            self._count(key[0], 'fetches')
+            return 'lead', future
+
+    def _settle(self, key: tuple, future: Future, result: Any = None, error: Optional[BaseException] = None,
+                cacheable: Callable[[Any], bool] = _default_cacheable):
+        with self._lock:
+            self._inflight.pop(key, None)
+            if error is not None:
+                self._count(key[0], 'errors')
+            elif cacheable(result):
+                self._results[key] = result
+                while len(self._results) > self.max_results:
+                    self._results.popitem(last=False)
+        if isinstance(error, asyncio.CancelledError):
+            # The leader's task was cancelled; waiters just lose this fetch, they aren't cancelled
+            error = RuntimeError(f"in-flight fetch of {key[1]} was cancelled")
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    async def do_async(self, kind: str, url: str, coro_fn: Callable[[], Awaitable[Any]],
+                       cacheable: Callable[[Any], bool] = _default_cacheable) -> Any:
+        """
+        Await coro_fn() once per (kind, normalized URL) for the run; concurrent
+        loans await the one in-flight fetch instead of starting their own.
+        """
+        key = (kind, normalize_url(url))
+        state, value = self._claim(key)
+        if state == 'hit':
+            return value
+        if state == 'join':
+            logger.debug(f"Single-flight {kind}: waiting on in-flight fetch of {url}")
+            # shield: a cancelled waiter must not cancel the fetch other loans are waiting on
+            return await asyncio.shield(asyncio.wrap_future(value))
+        try:
+            result = await coro_fn()
+        except BaseException as e:
+            self._settle(key, value, error=e)
+            raise
+        self._settle(key, value, result, cacheable=cacheable)
+        return result
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-kind fetches/joined/reused/errors plus 'deduplicated' (joined + reused)"""
+        with self._lock:
+            stats = {kind: dict(counts) for kind, counts in self._stats.items()}
+        for counts in stats.values():
+            counts['deduplicated'] = counts['joined'] + counts['reused']
+        return stats
+
+    def log_stats(self):
+        stats = self.get_stats()
+        if not stats:
+            return
+        for kind, counts in sorted(stats.items()):
+            total = counts['fetches'] + counts['deduplicated']
+            logger.info(f"📊 Single-flight {kind}: {counts['deduplicated']}/{total} fetches deduplicated "
+                        f"({counts['joined']} joined in flight, {counts['reused']} reused), "
+                        f"{counts['fetches']} fetched, {counts['errors']} errors")
+
+# Group of the ingest run currently in progress
+_run_group: Optional[SingleFlightGroup] = None
+_run_users = 0
+_run_lock = threading.Lock()
+
+def begin_run(name: str = 'run') -> Optional[SingleFlightGroup]:
+    """
+    Open the run's single-flight group (runs overlapping in one process share
+    it). Returns None when SINGLE_FLIGHT_ENABLED is off. Pair with end_run().
+    """
+    global _run_group, _run_users
+    if not SINGLE_FLIGHT_ENABLED:
+        return None
+    with _run_lock:
+        if _run_group is None:
+            _run_group = SingleFlightGroup(name)
+        _run_users += 1
+        return _run_group
+
+def end_run(group: Optional[SingleFlightGroup]):
+    """Release a begin_run() group; its results are dropped when the last run ends"""
+    global _run_group, _run_users
+    if group is None:
+        return
+    with _run_lock:
+        _run_users = max(0, _run_users - 1)
+        if _run_users == 0:
+            _run_group = None
@@ -11,9 +11,8 @@ import re
 import time
 import tempfile
 from pathlib import Path
-from typing import Optional, Dict, Any, List
-from datetime import datetime, timedelta
-import hashlib
+from typing import Optional, Dict, Any, List, Iterator
+from concurrent.futures import TimeoutError as FutureTimeoutError
 import httpx
 import webvtt
 import random
@@ -26,9 +25,20 @@ from src.utils.logger import setup_logger
 from src.utils.rate_limiter import should_wait, register_backoff, clear_backoff
 from src.utils.cooldown import should_wait as cooldown_should_wait, backoff as cooldown_backoff, clear_backoff as cooldown_clear
 from src.utils.proxy_pool import get_session_pool
+from src.utils.transcript_store import (
+    get_transcript_store, TranscriptStore, SQLiteTranscriptBackend, SOURCE_CAPTIONS, SOURCE_WHISPER
+)
+from src.utils.whisper_pool import get_whisper_pool, WhisperQueueFull, WHISPER_MAX_DURATION
+from src.utils.chunked_transcription import (
+    iter_transcribe_chunked, ffmpeg_available, chunked_timeout, WHISPER_CHUNKED_ENABLED, WHISPER_CHUNKED_MAX_DURATION
+)
 
 logger = setup_logger(__name__)
 
+# Caption errors that won't change on a retry; anything else (429s, proxy errors,
+# time budget) is transient and must not be negative-cached for every worker
+PERMANENT_CAPTION_ERRORS = ('no captions available', 'empty caption segments')
+
 # Language preferences - prefer English variants
 LANG_PREF = ["en", "en-US", "en-GB"]
 AUTO_OK = True
@@ -496,57 +506,38 @@ def segments_to_text(segments: List[dict], max_chars: int = None) -> str:
     return text
 
 class TranscriptCache:
-    """Simple file-based cache for transcripts with TTL management"""
+    """
+    Fetcher-facing view of the shared transcript store (captions + local
+    Whisper results). Kept for the old get/set interface: get() returns the
+    cached result dict, or an error-only dict (no segments) while a recent
+    failure is still within the failure TTL.
+    """
     
     def __init__(self, cache_dir: str = None):
-        self.cache_dir = Path(cache_dir or tempfile.gettempdir()) / "transcript_cache"
-        self.cache_dir.mkdir(exist_ok=True)
-        self.positive_ttl = 7 * 24 * 3600  # 7 days for successful transcripts
-        self.negative_ttl = 2 * 3600       # 2 hours for failures
-    
-    def _get_cache_path(self, video_id: str) -> Path:
-        """Get cache file path for video_id"""
-        hash_key = hashlib.md5(video_id.encode()).hexdigest()
-        return self.cache_dir / f"{hash_key}.json"
+        if cache_dir:
+            # Explicit directory: private SQLite store (tests/tools)
+            self.store = TranscriptStore([SQLiteTranscriptBackend(str(Path(cache_dir) / "transcripts.db"))])
+        else:
+            self.store = get_transcript_store()
     
     def get(self, video_id: str) -> Optional[dict]:
-        """Get cached transcript result"""
-        try:
-            cache_file = self._get_cache_path(video_id)
-            if not cache_file.exists():
-                return None
-            
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # Check TTL
-            cached_time = datetime.fromisoformat(data['cached_at'])
-            ttl = self.positive_ttl if data.get('success') else self.negative_ttl
-            
-            if datetime.now() - cached_time > timedelta(seconds=ttl):
-                cache_file.unlink()  # Remove expired cache
-                return None
-            
-            return data.get('result')
-        except Exception:
-            return None
+        """Get cached transcript result (any source) or a recent captions failure"""
+        entry = self.store.get(video_id)
+        if entry:
+            return entry
+        error = self.store.recent_failure(video_id, SOURCE_CAPTIONS)
+        if error:
+            return {'source': SOURCE_CAPTIONS, 'segments': [], 'error': error}
+        return None
     
     def set(self, video_id: str, result: dict = None, error: str = None):
         """Cache transcript result or error"""
-        try:
-            cache_file = self._get_cache_path(video_id)
-            cache_data = {
-                'video_id': video_id,
-                'cached_at': datetime.now().isoformat(),
-                'success': error is None,
-                'result': result,
-                'error': error
-            }
-            
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, indent=2)
-        except Exception:
-            pass  # Cache errors are non-fatal
+        if error is not None:
+            self.store.put_failure(video_id, SOURCE_CAPTIONS, error)
+            return
+        if result and result.get('segments'):
+            source = SOURCE_WHISPER if result.get('source') == 'whisper' else SOURCE_CAPTIONS
+            self.store.put(video_id, result['segments'], source, result.get('lang') or 'en')
 
 class FastTranscriptFetcher:
     """
@@ -576,15 +567,28 @@ class FastTranscriptFetcher:
         Returns:
             Transcript text or None if not available
         """
+        segments = []
+        for batch in self.iter_segments(video_id, timeout_s):
+            segments.extend(batch)
+        return segments_to_text(segments, max_chars) or None
+    
+    def iter_segments(self, video_id: str, timeout_s: int = 90) -> Iterator[List[dict]]:
+        """
+        Yield transcript segments in batches, in playback order, as they become
+        available. Captions arrive in one batch; Whisper transcription of long
+        videos yields one batch per chunk, so a caller can stop after the first
+        minutes (closing the generator abandons the remaining work).
+        Only fully consumed transcripts are cached.
+        """
         if not video_id:
-            return None
+            return
         
         # Check cache first
         cached = self.cache.get(video_id)
         if cached:
             if cached.get('segments'):
-                return segments_to_text(cached['segments'], max_chars)
-            return None
+                yield cached['segments']
+            return
         
         try:
             video_url = f"https://www.youtube.com/watch?v={video_id}"
@@ -593,42 +597,64 @@ class FastTranscriptFetcher:
             # Cache successful result
             self.cache.set(video_id, result)
             
-            # Return text
-            return segments_to_text(result['segments'], max_chars)
+            yield result['segments']
             
         except RuntimeError as e:
             error_msg = str(e)
             logger.warning(f"Transcript extraction failed for {video_id}: {error_msg}")
+            permanent = any(marker in error_msg.lower() for marker in PERMANENT_CAPTION_ERRORS)
             
-            # Try Faster-Whisper fallback for short videos if enabled
+            # Try Faster-Whisper fallback if enabled
             if self.enable_whisper_fallback and "no captions" in error_msg.lower():
-                whisper_text = self._try_whisper_fallback(video_id, timeout_s)
-                if whisper_text:
+                whisper_segments = []
+                complete = False
+                outcome = {}
+                for batch in self._iter_whisper_fallback(video_id, timeout_s, outcome):
+                    if batch is None:
+                        complete = True
+                        break
+                    whisper_segments.extend(batch)
+                    yield batch
+                if complete and whisper_segments:
                     # Cache whisper result
                     whisper_result = {
                         'source': 'whisper',
                         'lang': 'en',
-                        'segments': [{'start': 0, 'duration': 0, 'text': whisper_text}]
+                        'segments': whisper_segments
                     }
                     self.cache.set(video_id, whisper_result)
-                    return segments_to_text(whisper_result['segments'], max_chars)
+                    return
+                if whisper_segments:
+                    # Partial (timed out mid-way) - don't cache either way
+                    return
+                # Whisper skipped for capacity, timed out or hit a download error - worth retrying
+                permanent = permanent and outcome.get('permanent', False)
             
-            # Cache the failure
-            self.cache.set(video_id, error=error_msg)
-            return None
+            if permanent:
+                self.cache.set(video_id, error=error_msg)
+            else:
+                logger.info(f"Not caching transient transcript failure for {video_id}")
     
-    def _try_whisper_fallback(self, video_id: str, timeout_s: int) -> Optional[str]:
+    def _iter_whisper_fallback(self, video_id: str, timeout_s: int,
+                               outcome: Optional[dict] = None) -> Iterator[Optional[List[dict]]]:
         """
         Fallback to Faster-Whisper for videos without captions.
-        Only for short videos to maintain <30s SLA.
+        Yields segment batches as they are transcribed, then a final None once
+        the whole video is done (nothing after a failure or timeout).
+        Short videos run on the shared model pool; videos longer than
+        WHISPER_MAX_DURATION are split on silence and transcribed in parallel
+        chunks (up to WHISPER_CHUNKED_MAX_DURATION).
+        Sets outcome['permanent'] when Whisper can't transcribe this video at all
+        (too long, transcription failed) - not when it was skipped for capacity,
+        timed out or failed to download.
         """
+        outcome = {} if outcome is None else outcome
+        transcribing = False
         try:
-            # Check if faster-whisper is available
-            try:
-                from faster_whisper import WhisperModel
-            except ImportError:
+            pool = get_whisper_pool()
+            if not pool.is_available():
                 logger.debug("faster-whisper not available for fallback")
-                return None
+                return
             
             # Get video duration first
             video_url = f"https://www.youtube.com/watch?v={video_id}"
@@ -644,12 +670,23 @@ class FastTranscriptFetcher:
                 info = ydl.extract_info(video_url, download=False)
                 duration = info.get('duration', 0)
             
-            # Only use Whisper for videos under 6 minutes
-            if duration > 360:
-                logger.debug(f"Video too long for Whisper fallback: {duration}s")
-                return None
+            # Long videos go through the chunked process pool instead of one resident model
+            chunked = duration > WHISPER_MAX_DURATION
+            if chunked:
+                if not (WHISPER_CHUNKED_ENABLED and ffmpeg_available()) or duration > WHISPER_CHUNKED_MAX_DURATION:
+                    logger.debug(f"Video too long for Whisper fallback: {duration}s (cap {WHISPER_MAX_DURATION}s)")
+                    outcome['permanent'] = duration > WHISPER_CHUNKED_MAX_DURATION
+                    return
+                if not pool.has_chunked_capacity():
+                    logger.info(f"⚠️ Chunked transcription busy - skipping fallback for {video_id}")
+                    return
+                timeout_s = max(timeout_s, chunked_timeout(duration))
+            elif not pool.has_capacity():
+                # Don't download audio we have no queue slot for
+                logger.info(f"⚠️ Whisper queue full - skipping fallback for {video_id}")
+                return
             
-            logger.info(f"🎙️ Trying Faster-Whisper fallback for {video_id} ({duration}s)")
+            logger.info(f"🎙️ Trying Faster-Whisper fallback for {video_id} ({duration}s{', chunked' if chunked else ''})")
             start_time = time.time()
             
             # Download audio using yt-dlp
@@ -670,31 +707,52 @@ class FastTranscriptFetcher:
                 # Find the downloaded audio file
                 audio_files = list(Path(temp_dir).glob(f"{video_id}.*"))
                 if not audio_files:
-                    return None
+                    return
                 
                 actual_audio_file = audio_files[0]
                 
-                # Transcribe with Faster-Whisper
-                model = WhisperModel("base.en", device="cpu", compute_type="int8")
-                segments, _ = model.transcribe(
-                    str(actual_audio_file),
-                    beam_size=1,
-                    vad_filter=True
-                )
-                
-                transcript_text = ' '.join(segment.text.strip() for segment in segments)
+                # Transcribe on the resident model; the timeout covers queue wait too
+                remaining = timeout_s - (time.time() - start_time)
+                if remaining <= 0:
+                    logger.warning("Whisper fallback exceeded timeout during download")
+                    return
+                chars = 0
+                transcribing = True
+                if chunked:
+                    try:
+                        for segments in iter_transcribe_chunked(str(actual_audio_file), duration, timeout=remaining):
+                            chars += sum(len(segment['text']) for segment in segments)
+                            yield segments
+                    except (TimeoutError, WhisperQueueFull) as e:
+                        logger.warning(f"⚠️ Whisper fallback: {e}")
+                        return
+                else:
+                    try:
+                        job = pool.submit(str(actual_audio_file))
+                    except WhisperQueueFull as e:
+                        logger.warning(f"⚠️ {e} - skipping local transcription")
+                        return
+                    try:
+                        segments = job.future.result(timeout=remaining)
+                    except FutureTimeoutError:
+                        job.cancelled.set()
+                        logger.warning(f"⚠️ Whisper transcription timed out after {remaining:.0f}s")
+                        return
+                    if not segments:
+                        outcome['permanent'] = True
+                        return
+                    chars = sum(len(segment['text']) for segment in segments)
+                    yield segments
                 
                 elapsed = time.time() - start_time
-                if elapsed > timeout_s:
-                    logger.warning(f"Whisper fallback exceeded timeout: {elapsed:.1f}s")
-                    return None
-                
-                logger.info(f"✅ Whisper fallback successful: {len(transcript_text)} chars in {elapsed:.1f}s")
-                return transcript_text
+                logger.info(f"✅ Whisper fallback successful: {chars} chars in {elapsed:.1f}s")
+                yield None
         
         except Exception as e:
+            # Download/info errors are usually proxy or rate-limit trouble; a failed transcription is not
+            outcome['permanent'] = transcribing
             logger.debug(f"Whisper fallback failed for {video_id}: {e}")
-            return None
+            return
 
 # Global instance for easy importing
 _fetcher = None
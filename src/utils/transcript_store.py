@@ -0,0 +1,330 @@
+"""
+Shared, persistent transcript store used by every transcript source.
+
+Transcripts used to be cached three different ways (md5-named JSON files in
+the temp dir, a .whisper_cache directory, nothing at all for Apify), none of
+which survived a container restart or was shared between workers. The store
+keeps one row per (video, source) with:
+
+- segments as zlib-compressed JSON in the {'start', 'duration', 'text'} format
+- a source tag: captions, apify or whisper
+- separate TTLs for transcripts (TRANSCRIPT_TTL_HOURS) and failures
+  (TRANSCRIPT_FAILURE_TTL_HOURS), so a source that just failed is not retried
+  for every loan that mentions the same video
+
+Backends are pluggable via TRANSCRIPT_STORE_BACKENDS (comma-separated, read in
+order, written to all): 'sqlite' (data/transcripts.db) and 'supabase' (the
+transcripts table, see migrations/create_transcripts_table.sql). The default is
+sqlite,supabase - a local tier in front of the shared one - when Supabase
+credentials are set, else sqlite alone. The SQLite file is local to the
+container (the Render worker has no persistent disk), so only the Supabase
+tier survives redeploys and is shared by the dashboard and the worker.
+"""
+
+import os
+import json
+import time
+import zlib
+import base64
+import sqlite3
+import threading
+from pathlib import Path
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, List
+
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Unset: sqlite,supabase when Supabase credentials are set, else sqlite (see default_backends)
+TRANSCRIPT_STORE_BACKENDS = os.environ.get('TRANSCRIPT_STORE_BACKENDS')
+TRANSCRIPT_TTL_HOURS = float(os.environ.get('TRANSCRIPT_TTL_HOURS', str(7 * 24)))
+TRANSCRIPT_FAILURE_TTL_HOURS = float(os.environ.get('TRANSCRIPT_FAILURE_TTL_HOURS', '2'))
+
+SOURCE_CAPTIONS = 'captions'
+SOURCE_APIFY = 'apify'
+SOURCE_WHISPER = 'whisper'
+
+def compress_segments(segments: List[dict]) -> bytes:
+    return zlib.compress(json.dumps(segments, separators=(',', ':')).encode('utf-8'), 6)
+
+def decompress_segments(payload: bytes) -> List[dict]:
+    return json.loads(zlib.decompress(payload).decode('utf-8'))
+
+class SQLiteTranscriptBackend:
+    """Local SQLite backend (WAL mode, one connection per thread)"""
+
+    name = 'sqlite'
+
+    def __init__(self, db_path: Optional[str] = None):
+        if db_path is None:
+            project_root = Path(__file__).parent.parent.parent
+            data_dir = os.path.join(project_root, 'data')
+            os.makedirs(data_dir, exist_ok=True)
+            db_path = os.path.join(data_dir, 'transcripts.db')
+        self.db_path = db_path
+        self._local = threading.local()
+        conn = self._get_connection()
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS transcripts (
+                video_id TEXT NOT NULL,
+                source TEXT NOT NULL,
+                success INTEGER NOT NULL,
+                segments BLOB,
+                lang TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                PRIMARY KEY (video_id, source) ON CONFLICT REPLACE
+            )
+        ''')
+        conn.commit()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, video_id: str, source: Optional[str], success: bool, now: float) -> Optional[Dict[str, Any]]:
+        query = ('SELECT source, segments, lang, error, created_at FROM transcripts '
+                 'WHERE video_id = ? AND success = ? AND expires_at > ?')
+        params = [video_id, int(success), now]
+        if source:
+            query += ' AND source = ?'
+            params.append(source)
+        row = self._get_connection().execute(query + ' ORDER BY created_at DESC LIMIT 1', params).fetchone()
+        if row is None:
+            return None
+        return {'source': row[0], 'segments': row[1], 'lang': row[2], 'error': row[3], 'created_at': row[4]}
+
+    def put(self, video_id: str, record: Dict[str, Any]):
+        conn = self._get_connection()
+        conn.execute('''
+            INSERT INTO transcripts (video_id, source, success, segments, lang, error, created_at, expires_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (video_id, record['source'], int(record['success']), record['segments'], record['lang'],
+              record['error'], record['created_at'], record['expires_at']))
+        conn.commit()
+
+    def purge_expired(self, now: float) -> int:
+        conn = self._get_connection()
+        deleted = conn.execute('DELETE FROM transcripts WHERE expires_at <= ?', (now,)).rowcount
+        conn.commit()
+        return deleted
+
+class SupabaseTranscriptBackend:
+    """Shared backend on the Supabase transcripts table (segments stored base64-encoded)"""
+
+    name = 'supabase'
+
+    def __init__(self):
+        from src.utils.database import get_database
+        self.client = get_database().supabase
+
+    @staticmethod
+    def _iso(timestamp: float) -> str:
+        return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
+
+    def get(self, video_id: str, source: Optional[str], success: bool, now: float) -> Optional[Dict[str, Any]]:
+        query = (self.client.table('transcripts')
+                 .select('source, segments, lang, error, created_at')
+                 .eq('video_id', video_id)
+                 .eq('success', success)
+                 .gt('expires_at', self._iso(now)))
+        if source:
+            query = query.eq('source', source)
+        result = query.order('created_at', desc=True).limit(1).execute()
+        if not result.data:
+            return None
+        row = result.data[0]
+        return {
+            'source': row['source'],
+            'segments': base64.b64decode(row['segments']) if row.get('segments') else None,
+            'lang': row.get('lang'),
+            'error': row.get('error'),
+            'created_at': row.get('created_at'),
+        }
+
+    def put(self, video_id: str, record: Dict[str, Any]):
+        self.client.table('transcripts').upsert({
+            'video_id': video_id,
+            'source': record['source'],
+            'success': record['success'],
+            'segments': base64.b64encode(record['segments']).decode('ascii') if record['segments'] else None,
+            'lang': record['lang'],
+            'error': record['error'],
+            'created_at': self._iso(record['created_at']),
+            'expires_at': self._iso(record['expires_at']),
+        }, on_conflict='video_id,source').execute()
+
+    def purge_expired(self, now: float) -> int:
+        result = self.client.table('transcripts').delete().lte('expires_at', self._iso(now)).execute()
+        return len(result.data or [])
+
+_BACKENDS = {
+    'sqlite': SQLiteTranscriptBackend,
+    'supabase': SupabaseTranscriptBackend,
+}
+
+def default_backends() -> str:
+    """Backend list used when TRANSCRIPT_STORE_BACKENDS is unset (read when the store is built)"""
+    if os.environ.get('SUPABASE_URL') and os.environ.get('SUPABASE_ANON_KEY'):
+        return 'sqlite,supabase'
+    return 'sqlite'
+
+class TranscriptStore:
+    """
+    Read-through transcript store over one or more backends. Reads stop at the
+    first backend with a live entry (and backfill the faster ones before it);
+    writes go to every backend. Backend errors are logged and never raised.
+    """
+
+    def __init__(self, backends: Optional[List[Any]] = None):
+        if backends is None:
+            backends = []
+            names = TRANSCRIPT_STORE_BACKENDS or default_backends()
+            for name in (n.strip().lower() for n in names.split(',') if n.strip()):
+                try:
+                    backends.append(_BACKENDS[name]())
+                except KeyError:
+                    logger.warning(f"⚠️ Unknown transcript store backend '{name}' - ignoring")
+                except Exception as e:
+                    logger.warning(f"⚠️ Transcript store backend '{name}' unavailable: {e}")
+        self.backends = backends
+        self.ttl_seconds = TRANSCRIPT_TTL_HOURS * 3600
+        self.failure_ttl_seconds = TRANSCRIPT_FAILURE_TTL_HOURS * 3600
+        self._stats_lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'failure_hits': 0, 'stores': 0}
+        logger.info(f"Transcript store initialized with backends: "
+                    f"{', '.join(b.name for b in self.backends) or 'none'} "
+                    f"(TTL {TRANSCRIPT_TTL_HOURS}h / failures {TRANSCRIPT_FAILURE_TTL_HOURS}h)")
+
+    def _count(self, name: str):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def _lookup(self, video_id: str, source: Optional[str], success: bool) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        for i, backend in enumerate(self.backends):
+            try:
+                row = backend.get(video_id, source, success, now)
+            except Exception as e:
+                logger.warning(f"Transcript store read failed ({backend.name}): {e}")
+                continue
+            if row is None:
+                continue
+            # Backfill faster tiers so the next lookup stays local
+            if i and success:
+                ttl = self.ttl_seconds
+                record = dict(row, success=True, created_at=now, expires_at=now + ttl)
+                for earlier in self.backends[:i]:
+                    try:
+                        earlier.put(video_id, record)
+                    except Exception as e:
+                        logger.debug(f"Transcript store backfill failed ({earlier.name}): {e}")
+            return row
+        return None
+
+    def get(self, video_id: str, source: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Latest live transcript for the video (optionally from one source) as
+        {'source', 'lang', 'segments'}, or None.
+        """
+        if not video_id:
+            return None
+        row = self._lookup(video_id, source, True)
+        if row is None or not row.get('segments'):
+            self._count('misses')
+            return None
+        try:
+            segments = decompress_segments(row['segments'])
+        except Exception as e:
+            logger.warning(f"Corrupt transcript entry for {video_id}: {e}")
+            self._count('misses')
+            return None
+        self._count('hits')
+        logger.info(f"♻️ Transcript store hit for {video_id} (source: {row['source']})")
+        return {'source': row['source'], 'lang': row.get('lang') or 'en', 'segments': segments}
+
+    def get_text(self, video_id: str, source: Optional[str] = None) -> Optional[str]:
+        """Stored transcript as plain text (same normalization as the fetcher)"""
+        entry = self.get(video_id, source)
+        if not entry:
+            return None
+        from src.utils.transcript_fetcher import segments_to_text
+        return segments_to_text(entry['segments']) or None
+
+    def recent_failure(self, video_id: str, source: str) -> Optional[str]:
+        """Error message if this source failed for the video within the failure TTL"""
+        if not video_id:
+            return None
+        row = self._lookup(video_id, source, False)
+        if row is None:
+            return None
+        self._count('failure_hits')
+        logger.info(f"♻️ Skipping {source} for {video_id} - failed recently: {row.get('error')}")
+        return row.get('error') or 'failed'
+
+    def _write(self, video_id: str, record: Dict[str, Any]):
+        for backend in self.backends:
+            try:
+                backend.put(video_id, record)
+            except Exception as e:
+                logger.warning(f"Transcript store write failed ({backend.name}): {e}")
+
+    def put(self, video_id: str, segments: List[dict], source: str, lang: str = 'en'):
+        """Store a transcript; segments use the {'start', 'duration', 'text'} format"""
+        if not video_id or not segments:
+            return
+        now = time.time()
+        self._write(video_id, {
+            'source': source, 'success': True, 'segments': compress_segments(segments),
+            'lang': lang, 'error': None, 'created_at': now, 'expires_at': now + self.ttl_seconds,
+        })
+        self._count('stores')
+
+    def put_text(self, video_id: str, text: str, source: str, lang: str = 'en'):
+        """Store a transcript that only exists as flat text (Apify, whisper-1)"""
+        if text:
+            self.put(video_id, [{'start': 0, 'duration': 0, 'text': text}], source, lang)
+
+    def put_failure(self, video_id: str, source: str, error: str):
+        """Remember that a source has nothing for this video, for the failure TTL"""
+        if not video_id:
+            return
+        now = time.time()
+        self._write(video_id, {
+            'source': source, 'success': False, 'segments': None, 'lang': None,
+            'error': (error or 'failed')[:500], 'created_at': now, 'expires_at': now + self.failure_ttl_seconds,
+        })
+
+    def purge_expired(self) -> int:
+        now = time.time()
+        deleted = 0
+        for backend in self.backends:
+            try:
+                deleted += backend.purge_expired(now)
+            except Exception as e:
+                logger.warning(f"Transcript store purge failed ({backend.name}): {e}")
+        return deleted
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return dict(self.stats)
+
+# Global store instance
+_transcript_store = None
+_transcript_store_lock = threading.Lock()
+
+def get_transcript_store() -> TranscriptStore:
+    """Get the global transcript store instance"""
+    global _transcript_store
+    if _transcript_store is None:
+        with _transcript_store_lock:
+            if _transcript_store is None:
+                _transcript_store = TranscriptStore()
+    return _transcript_store
@@ -0,0 +1,185 @@
+"""
+Precompiled vehicle matching for article link, title and transcript scans.
+
+Relevance scans used to rebuild the make/model variation list for every call
+and then test every link with `any(variation in text ...)` over the whole list
+(twice - URL and title - plus a `next(...)` scan for the matched variation).
+Here each term list is compiled once into a single regex shaped like a trie
+(shared prefixes such as "mazda cx-70" / "mazda cx70" / "mazdacx70" are
+factored out), so a scan is one C-level pass over the text that behaves like
+an Aho-Corasick automaton: `search` answers "does any term occur?" exactly
+like the substring loop did, and the longest match is reported as the matched
+variation.
+
+get_vehicle_matcher(make, model) caches one VehicleMatcher per make/model
+with the same variations and tiers _find_relevant_articles used.
+"""
+
+import re
+from functools import lru_cache
+from typing import Iterable, Optional, Tuple, NamedTuple
+
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Year prefixes/suffixes added to the leading variations (as in Index Page Discovery)
+REFERENCE_YEAR = 2025
+YEAR_VARIATIONS = 5
+
+# Relevance tiers of an article link, best first
+TIER_PERFECT = 1000    # make + full model
+TIER_EXCELLENT = 800   # full model without make
+TIER_VERY_GOOD = 700   # make + base model + variant
+TIER_GOOD = 600        # base model + variant
+TIER_DECENT = 500      # make + base model
+TIER_FAIR = 300        # base model only
+
+def _trie_pattern(terms: Iterable[str]) -> str:
+    """Regex source for a literal term set, with common prefixes factored out"""
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node) -> str:
+        terminal = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        if len(branches) == 1 and not terminal:
+            return branches[0]
+        group = '(?:' + '|'.join(branches) + ')'
+        # Greedy optional group: at a given position the longest term wins
+        return group + '?' if terminal else group
+
+    return build(trie)
+
+class TermMatcher:
+    """A fixed set of lowercase literal terms compiled into one trie-shaped regex"""
+
+    __slots__ = ('terms', '_regex', '_overlapping', '_matches_all')
+
+    def __init__(self, terms: Iterable[str]):
+        terms = set(terms)
+        # '' occurs in every text, exactly like `'' in text`
+        self._matches_all = '' in terms
+        self.terms = tuple(sorted(term for term in terms if term))
+        pattern = _trie_pattern(self.terms)
+        self._regex = re.compile(pattern) if self.terms else None
+        # Zero-width lookahead: one match (the longest term) per start position, overlaps included
+        self._overlapping = re.compile(f'(?=({pattern}))') if self.terms else None
+
+    def search(self, text: str) -> bool:
+        """True if any term occurs in text (same result as any(term in text ...))"""
+        if self._matches_all:
+            return True
+        return self._regex is not None and self._regex.search(text) is not None
+
+    def longest(self, text: str) -> Optional[str]:
+        """Longest term found in text, or None"""
+        if self._overlapping is None:
+            return None
+        best = None
+        for match in self._overlapping.finditer(text):
+            if best is None or len(match.group(1)) > len(best):
+                best = match.group(1)
+        return best
+
+    def count(self, text: str) -> int:
+        """Non-overlapping occurrences of any term (longest match at each position)"""
+        if self._regex is None:
+            return 0
+        return sum(1 for _ in self._regex.finditer(text))
+
+@lru_cache(maxsize=1024)
+def compile_terms(terms: Tuple[str, ...]) -> TermMatcher:
+    """Cached TermMatcher for a term tuple (pass a sorted tuple for stable cache hits)"""
+    return TermMatcher(terms)
+
+class TextScan(NamedTuple):
+    """What one text (a URL or a title) mentions"""
+    make: bool
+    model: Optional[str]  # longest full-model variation found
+    base_model: bool
+    variant: bool
+
+def split_base_and_variant(model_lower: str) -> Tuple[str, str]:
+    """
+    "camry hybrid" -> ("camry", "hybrid"); Toyota GR models keep the sub-brand:
+    "gr corolla premium" -> ("gr corolla", "premium")
+    """
+    model_parts = model_lower.split()
+    if len(model_parts) >= 2 and model_parts[0] == "gr":
+        return f"{model_parts[0]} {model_parts[1]}", " ".join(model_parts[2:]) if len(model_parts) > 2 else ""
+    return (model_parts[0] if model_parts else model_lower), (model_parts[1] if len(model_parts) > 1 else "")
+
+class VehicleMatcher:
+    """Compiled make/model/base/variant matchers plus the article-link relevance tiers"""
+
+    def __init__(self, make: str, model: str, reference_year: int = REFERENCE_YEAR):
+        from src.utils.model_variations import generate_model_variations
+
+        self.make_name = make
+        self.make = make.lower()
+        self.model = model.lower()
+        self.base_model, self.variant = split_base_and_variant(self.model)
+
+        variations = generate_model_variations(make, model)
+        year_variations = []
+        for year in (reference_year, reference_year - 1, reference_year - 2):
+            for variation in variations[:YEAR_VARIATIONS]:
+                year_variations.extend([f"{year} {variation}", f"{variation} {year}"])
+        self.variations = sorted({v.lower() for v in variations + year_variations if v.strip()})
+
+        self._make = compile_terms((self.make,))
+        self._model = compile_terms(tuple(self.variations))
+        self._base = compile_terms((self.base_model,))
+        # An empty variant never counts (unlike an empty make/base model)
+        self._variant = compile_terms((self.variant,) if self.variant else ())
+
+    def scan(self, text: str) -> TextScan:
+        """Scan already-lowercased text"""
+        return TextScan(
+            make=self._make.search(text),
+            model=self._model.longest(text),
+            base_model=self._base.search(text),
+            variant=self._variant.search(text),
+        )
+
+    def has_model(self, text: str) -> bool:
+        return self._model.search(text)
+
+    def mentions(self, text: str) -> float:
+        """Weighted vehicle mentions in already-lowercased text: full model 1.0, base model 0.5, make 0.25"""
+        return self._model.count(text) + 0.5 * self._base.count(text) + 0.25 * self._make.count(text)
+
+    def tier(self, *scans: TextScan) -> Tuple[int, str]:
+        """(score, label) for the combined scans of a link (URL, title); (0, '') if irrelevant"""
+        has_make = any(scan.make for scan in scans)
+        matched = next((scan.model for scan in scans if scan.model), None)
+        has_base = any(scan.base_model for scan in scans)
+        has_variant = any(scan.variant for scan in scans)
+
+        if has_make and matched:
+            return TIER_PERFECT, f"PERFECT: {self.make_name} + {matched}"
+        if matched:
+            return TIER_EXCELLENT, f"EXCELLENT: {matched} (no make)"
+        if has_make and has_base and has_variant:
+            return TIER_VERY_GOOD, f"VERY GOOD: {self.make_name} + {self.base_model} + {self.variant}"
+        if has_base and has_variant:
+            return TIER_GOOD, f"GOOD: {self.base_model} + {self.variant} (no make)"
+        if has_make and has_base:
+            return TIER_DECENT, f"DECENT: {self.make_name} + {self.base_model}"
+        if has_base:
+            return TIER_FAIR, f"FAIR: {self.base_model} only"
+        return 0, ""
+
+@lru_cache(maxsize=256)
+def get_vehicle_matcher(make: str, model: str) -> VehicleMatcher:
+    """Cached VehicleMatcher - variations are generated and compiled once per make/model"""
+    matcher = VehicleMatcher(make, model)
+    logger.debug(f"Compiled vehicle matcher for {make} {model} ({len(matcher.variations)} variations)")
+    return matcher
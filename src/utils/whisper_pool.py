@@ -0,0 +1,271 @@
+"""
+Process-wide faster-whisper model pool with a bounded transcription queue.
+
+The Whisper fallback used to build a WhisperModel for every video, paying the
+model load on each call and letting every ingest thread run its own CPU-bound
+decode at the same time. The pool loads the model once (lazily, on the first
+job) and runs jobs on WHISPER_POOL_WORKERS dedicated threads; callers that find
+WHISPER_QUEUE_SIZE jobs already waiting are turned away immediately instead of
+piling up behind them.
+
+Queue wait, decode time and audio seconds are recorded per job so the duration
+cap (WHISPER_MAX_DURATION) can be raised against real numbers - see
+get_stats() / log_stats().
+"""
+
+import os
+import time
+import queue
+import threading
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Optional, List, Dict, Any
+
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+WHISPER_MODEL_SIZE = os.environ.get('WHISPER_MODEL_SIZE', 'base.en')
+WHISPER_COMPUTE_TYPE = os.environ.get('WHISPER_COMPUTE_TYPE', 'int8')
+WHISPER_CPU_THREADS = int(os.environ.get('WHISPER_CPU_THREADS', '0'))  # 0 = CTranslate2 default
+WHISPER_POOL_WORKERS = int(os.environ.get('WHISPER_POOL_WORKERS', '1'))
+WHISPER_QUEUE_SIZE = int(os.environ.get('WHISPER_QUEUE_SIZE', '4'))
+WHISPER_MAX_DURATION = int(os.environ.get('WHISPER_MAX_DURATION', '360'))
+# Long videos transcribed at once on the chunk process pool (each fans out to every process)
+WHISPER_CHUNKED_MAX_JOBS = int(os.environ.get('WHISPER_CHUNKED_MAX_JOBS', '1'))
+TIMING_SAMPLES = 200
+
+class WhisperQueueFull(Exception):
+    """Raised when the transcription queue is at capacity"""
+    pass
+
+class _Job:
+    __slots__ = ('audio_path', 'options', 'future', 'cancelled', 'enqueued_at')
+
+    def __init__(self, audio_path: str, options: Dict[str, Any]):
+        self.audio_path = audio_path
+        self.options = options
+        self.future: Future = Future()
+        self.cancelled = threading.Event()
+        self.enqueued_at = time.perf_counter()
+
+def _percentile(samples, fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+class WhisperModelPool:
+    """
+    One resident faster-whisper model shared by a fixed set of worker threads.
+    CTranslate2 runs num_workers=WHISPER_POOL_WORKERS replicas, so each worker
+    thread decodes in parallel without loading its own copy.
+    """
+
+    def __init__(self, model_size: str = WHISPER_MODEL_SIZE, workers: int = WHISPER_POOL_WORKERS,
+                 queue_size: int = WHISPER_QUEUE_SIZE, cpu_threads: int = WHISPER_CPU_THREADS,
+                 compute_type: str = WHISPER_COMPUTE_TYPE, chunked_jobs: int = WHISPER_CHUNKED_MAX_JOBS):
+        self.model_size = model_size
+        self.workers = max(1, workers)
+        self.cpu_threads = cpu_threads
+        self.compute_type = compute_type
+        self._queue: "queue.Queue[_Job]" = queue.Queue(maxsize=max(1, queue_size))
+        self.max_chunked_jobs = max(1, chunked_jobs)
+        self._chunked_jobs = 0
+        self._chunked_lock = threading.Lock()
+        self._model = None
+        self._model_lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._queue_waits = deque(maxlen=TIMING_SAMPLES)
+        self._decode_times = deque(maxlen=TIMING_SAMPLES)
+        self.stats = {
+            'submitted': 0, 'completed': 0, 'failed': 0, 'rejected': 0, 'cancelled': 0, 'chunked_rejected': 0,
+            'audio_seconds': 0.0, 'decode_seconds': 0.0, 'model_load_seconds': 0.0,
+        }
+
+    @staticmethod
+    def is_available() -> bool:
+        """True when faster-whisper is installed"""
+        try:
+            import faster_whisper  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def has_capacity(self) -> bool:
+        """Cheap pre-check so callers can skip the audio download when the queue is full"""
+        return not self._queue.full()
+
+    def has_chunked_capacity(self) -> bool:
+        """has_capacity() for long videos: also needs a free chunked-job slot"""
+        return self.has_capacity() and self._chunked_jobs < self.max_chunked_jobs
+
+    @contextmanager
+    def chunked_slot(self):
+        """
+        Hold one of WHISPER_CHUNKED_MAX_JOBS slots for a chunked transcription.
+        Raises WhisperQueueFull instead of waiting when all are taken, so several
+        ingest threads can't queue full-length videos behind each other.
+        """
+        with self._chunked_lock:
+            if self._chunked_jobs >= self.max_chunked_jobs or self._queue.full():
+                self._count('chunked_rejected')
+                raise WhisperQueueFull(f"Chunked transcription busy ({self._chunked_jobs} running)")
+            self._chunked_jobs += 1
+        try:
+            yield
+        finally:
+            with self._chunked_lock:
+                self._chunked_jobs -= 1
+
+    def _count(self, name: str, amount=1):
+        with self._stats_lock:
+            self.stats[name] += amount
+
+    def _get_model(self):
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    from faster_whisper import WhisperModel
+                    start = time.perf_counter()
+                    self._model = WhisperModel(self.model_size, device="cpu", compute_type=self.compute_type,
+                                               cpu_threads=self.cpu_threads, num_workers=self.workers)
+                    elapsed = time.perf_counter() - start
+                    self._count('model_load_seconds', elapsed)
+                    logger.info(f"✅ Loaded faster-whisper '{self.model_size}' ({self.compute_type}, "
+                                f"{self.workers} workers) in {elapsed:.1f}s")
+        return self._model
+
+    def _ensure_workers(self):
+        if self._threads:
+            return
+        with self._start_lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._worker_loop, name=f"whisper-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _worker_loop(self):
+        while True:
+            job = self._queue.get()
+            try:
+                self._run_job(job)
+            finally:
+                self._queue.task_done()
+
+    def _run_job(self, job: _Job):
+        wait = time.perf_counter() - job.enqueued_at
+        with self._stats_lock:
+            self._queue_waits.append(wait)
+        if job.cancelled.is_set() or not job.future.set_running_or_notify_cancel():
+            self._count('cancelled')
+            return
+
+        try:
+            model = self._get_model()
+            start = time.perf_counter()
+            # transcribe() is lazy - decoding happens while the segments are consumed
+            segments_iter, info = model.transcribe(job.audio_path, **job.options)
+            segments = []
+            for segment in segments_iter:
+                if job.cancelled.is_set():
+                    break
+                segments.append({
+                    'start': segment.start,
+                    'duration': segment.end - segment.start,
+                    'text': segment.text,
+                })
+            decode = time.perf_counter() - start
+            with self._stats_lock:
+                self._decode_times.append(decode)
+                self.stats['decode_seconds'] += decode
+                self.stats['audio_seconds'] += getattr(info, 'duration', 0.0) or 0.0
+                self.stats['cancelled' if job.cancelled.is_set() else 'completed'] += 1
+            job.future.set_result(segments)
+        except Exception as e:
+            self._count('failed')
+            job.future.set_exception(e)
+
+    def submit(self, audio_path: str, **options) -> _Job:
+        """
+        Queue an audio file for transcription. Raises WhisperQueueFull instead
+        of blocking when WHISPER_QUEUE_SIZE jobs are already waiting.
+        """
+        self._ensure_workers()
+        options.setdefault('beam_size', 1)
+        options.setdefault('vad_filter', True)
+        job = _Job(audio_path, options)
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            self._count('rejected')
+            raise WhisperQueueFull(f"Whisper queue full ({self._queue.maxsize} waiting)")
+        self._count('submitted')
+        return job
+
+    def transcribe(self, audio_path: str, timeout: Optional[float] = None, **options) -> Optional[List[dict]]:
+        """
+        Transcribe an audio file through the pool. Returns segments in the
+        {'start', 'duration', 'text'} format used by segments_to_text, or None
+        if the queue is full, the job fails or the timeout (queue wait included)
+        expires - in which case the job is cancelled so it frees its worker.
+        """
+        try:
+            job = self.submit(audio_path, **options)
+        except WhisperQueueFull as e:
+            logger.warning(f"⚠️ {e} - skipping local transcription")
+            return None
+
+        try:
+            return job.future.result(timeout=timeout)
+        except FutureTimeoutError:
+            job.cancelled.set()
+            logger.warning(f"⚠️ Whisper transcription timed out after {timeout:.0f}s")
+            return None
+        except Exception as e:
+            logger.warning(f"❌ Whisper transcription failed: {e}")
+            return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Job counters plus queue-wait and decode-time averages/p95 in seconds"""
+        with self._stats_lock:
+            stats = dict(self.stats)
+            waits = list(self._queue_waits)
+            decodes = list(self._decode_times)
+        stats['queued'] = self._queue.qsize()
+        stats['queue_wait_avg'] = round(sum(waits) / len(waits), 2) if waits else 0.0
+        stats['queue_wait_p95'] = round(_percentile(waits, 0.95), 2)
+        stats['decode_avg'] = round(sum(decodes) / len(decodes), 2) if decodes else 0.0
+        stats['decode_p95'] = round(_percentile(decodes, 0.95), 2)
+        # Decode seconds per audio second; < 1.0 means faster than real time
+        stats['realtime_factor'] = (round(stats['decode_seconds'] / stats['audio_seconds'], 3)
+                                    if stats['audio_seconds'] else None)
+        return stats
+
+    def log_stats(self):
+        stats = self.get_stats()
+        if not stats['submitted'] and not stats['rejected']:
+            return
+        logger.info(f"📊 Whisper pool: {stats['completed']} done, {stats['failed']} failed, "
+                    f"{stats['rejected']} rejected, {stats['cancelled']} cancelled | "
+                    f"queue wait avg {stats['queue_wait_avg']}s p95 {stats['queue_wait_p95']}s | "
+                    f"decode avg {stats['decode_avg']}s p95 {stats['decode_p95']}s | "
+                    f"RTF {stats['realtime_factor']}")
+
+# Global pool instance
+_whisper_pool = None
+_whisper_pool_lock = threading.Lock()
+
+def get_whisper_pool() -> WhisperModelPool:
+    """Get the global faster-whisper pool (the model itself loads on the first job)"""
+    global _whisper_pool
+    if _whisper_pool is None:
+        with _whisper_pool_lock:
+            if _whisper_pool is None:
+                _whisper_pool = WhisperModelPool()
+    return _whisper_pool
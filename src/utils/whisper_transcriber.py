@@ -8,14 +8,13 @@ import tempfile
 import subprocess
 from typing import Optional, Dict, Any
 import hashlib
-import json
-from datetime import datetime, timedelta
 
 from openai import OpenAI
 import yt_dlp
 
 from src.utils.logger import setup_logger
 from src.utils.rate_limiter import rate_limiter
+from src.utils.transcript_store import get_transcript_store, SOURCE_WHISPER
 
 logger = setup_logger(__name__)
 
@@ -30,7 +29,7 @@ class WhisperTranscriber:
         Initialize the Whisper transcriber
         
         Args:
-            cache_dir: Directory to store transcription cache
+            cache_dir: Unused - kept for backwards compatibility
         """
         self.api_key = os.environ.get('OPENAI_API_KEY')
         if not self.api_key:
@@ -39,9 +38,8 @@ class WhisperTranscriber:
         else:
             self.client = OpenAI(api_key=self.api_key)
         
-        # Create cache directory
-        self.cache_dir = cache_dir
-        os.makedirs(cache_dir, exist_ok=True)
+        # Transcripts are cached in the shared transcript store (cache_dir is no longer used)
+        self.store = get_transcript_store()
         
         # Choose a persistent tmp directory to avoid ephemeral /tmp cleanup
         self.tmp_dir = os.environ.get('TMPDIR', '/app/data/tmp')
@@ -72,13 +70,9 @@ class WhisperTranscriber:
             'extract_flat': False,
         }
     
-    def _get_cache_path(self, video_id: str) -> str:
-        """Get cache file path for a video ID"""
-        return os.path.join(self.cache_dir, f"{video_id}_transcript.json")
-    
     def _load_from_cache(self, video_id: str) -> Optional[str]:
         """
-        Load transcript from cache if available and not expired
+        Load transcript from the shared transcript store (any source)
         
         Args:
             video_id: YouTube video ID
@@ -86,43 +80,15 @@ class WhisperTranscriber:
         Returns:
             Cached transcript or None
         """
-        cache_path = self._get_cache_path(video_id)
-        
-        if os.path.exists(cache_path):
-            try:
-                with open(cache_path, 'r') as f:
-                    cache_data = json.load(f)
-                
-                # Check if cache is still valid (30 days)
-                cached_date = datetime.fromisoformat(cache_data['timestamp'])
-                if datetime.now() - cached_date < timedelta(days=30):
-                    logger.info(f"Found valid cached transcript for {video_id}")
-                    return cache_data['transcript']
-                else:
-                    logger.info(f"Cache expired for {video_id}")
-                    
-            except Exception as e:
-                logger.warning(f"Error loading cache for {video_id}: {e}")
-        
-        return None
+        transcript = self.store.get_text(video_id)
+        if transcript:
+            logger.info(f"Found valid cached transcript for {video_id}")
+        return transcript
     
     def _save_to_cache(self, video_id: str, transcript: str):
-        """Save transcript to cache"""
-        cache_path = self._get_cache_path(video_id)
-        
-        try:
-            cache_data = {
-                'video_id': video_id,
-                'transcript': transcript,
-                'timestamp': datetime.now().isoformat()
-            }
-            
-            with open(cache_path, 'w') as f:
-                json.dump(cache_data, f)
-                
-            logger.info(f"Saved transcript to cache for {video_id}")
-        except Exception as e:
-            logger.warning(f"Error saving cache for {video_id}: {e}")
+        """Save transcript to the shared transcript store"""
+        self.store.put_text(video_id, transcript, SOURCE_WHISPER)
+        logger.info(f"Saved transcript to cache for {video_id}")
     
     def download_audio(self, video_url: str, video_id: str) -> Optional[str]:
         """
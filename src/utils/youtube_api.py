@@ -1,12 +1,13 @@
 import os
-import requests
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
 import re
 
 from src.utils.logger import setup_logger
+from src.utils.http_pool import get_http_session
 from src.utils.rate_limiter import rate_limiter
 from src.utils.model_variations import generate_model_variations
+from src.utils.channel_video_index import get_channel_index
 
 logger = setup_logger(__name__)
 
@@ -50,7 +51,7 @@ class YouTubeAPIClient:
                 'maxResults': 1
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = get_http_session().get(url, params=params, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -68,7 +69,8 @@ class YouTubeAPIClient:
             
         return None
     
-    def get_all_channel_videos(self, channel_id: str, max_videos: int = 200) -> List[Dict[str, Any]]:
+    def get_all_channel_videos(self, channel_id: str, max_videos: int = 200,
+                               stop_at_video_id: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
         """
         Get ALL videos from a YouTube channel using official API.
         No pagination limits - can retrieve hundreds of videos.
@@ -76,13 +78,17 @@ class YouTubeAPIClient:
         Args:
             channel_id: YouTube channel ID
             max_videos: Maximum number of videos to retrieve (default 200)
+            stop_at_video_id: Stop paging once this (already known) video is
+                reached - used for incremental refreshes
             
         Returns:
-            List of video dictionaries with title, video_id, published_date, etc.
+            List of video dictionaries with title, video_id, published_date, etc.,
+            or None if the API failed (a partial newest-first listing would leave
+            a gap in the channel index)
         """
         if not self.api_key:
             logger.error("YouTube API key not available")
-            return []
+            return None
             
         try:
             videos = []
@@ -106,16 +112,20 @@ class YouTubeAPIClient:
                 if next_page_token:
                     params['pageToken'] = next_page_token
                 
-                response = requests.get(url, params=params, timeout=15)
+                response = get_http_session().get(url, params=params, timeout=15)
                 
                 if response.status_code != 200:
                     logger.error(f"YouTube API error {response.status_code}: {response.text}")
-                    break
+                    return None
                 
                 data = response.json()
                 
                 # Process videos from this page
+                reached_known = False
                 for item in data.get('items', []):
+                    if stop_at_video_id and item['id']['videoId'] == stop_at_video_id:
+                        reached_known = True
+                        break
                     video_info = {
                         'video_id': item['id']['videoId'],
                         'title': item['snippet']['title'],
@@ -127,6 +137,9 @@ class YouTubeAPIClient:
                     }
                     videos.append(video_info)
                 
+                if reached_known:
+                    break  # Everything older is already indexed
+                
                 # Check if there are more pages
                 next_page_token = data.get('nextPageToken')
                 if not next_page_token:
@@ -139,7 +152,33 @@ class YouTubeAPIClient:
             
         except Exception as e:
             logger.error(f"Error getting channel videos via YouTube API: {e}")
-            return []
+            return None
+    
+    def get_channel_videos_indexed(self, channel_id: str, max_videos: int = 200) -> Optional[List[Dict[str, Any]]]:
+        """
+        Channel uploads through the shared channel video index: served from
+        the index while fresh, otherwise only uploads newer than the newest
+        indexed video are paged in and merged. Loans that hit the same
+        channel concurrently share one refresh. Returns None if the refresh
+        failed; the channel is then left stale so the next loan retries.
+        """
+        index = get_channel_index()
+        source = 'youtube_api'
+        
+        with index.channel_lock(channel_id, source):
+            if index.is_fresh(channel_id, source):
+                videos = index.get_videos(channel_id, source, max_videos)
+                logger.info(f"♻️ Channel index hit for {channel_id}: {len(videos)} videos")
+                return videos
+            
+            newest = index.newest_video_id(channel_id, source)
+            new_videos = self.get_all_channel_videos(channel_id, max_videos=max_videos, stop_at_video_id=newest)
+            if new_videos is None:
+                return None
+            if new_videos or newest:
+                added = index.merge(channel_id, source, new_videos)
+                logger.info(f"📺 Channel index for {channel_id} refreshed: {added} new videos")
+            return index.get_videos(channel_id, source, max_videos)
     
     def search_channel_for_videos(self, channel_url: str, make: str, model: str, start_date: Optional[datetime] = None, days_forward: int = 90) -> Optional[List[Dict[str, Any]]]:
         """
@@ -165,7 +204,12 @@ class YouTubeAPIClient:
             handle_match = re.search(r'youtube\.com\/@([a-zA-Z0-9_-]+)', channel_url)
             if handle_match:
                 handle = handle_match.group(1)
-                channel_id = self.get_channel_id_from_handle(handle)
+                # Handle lookups cost a search call each - cache them in the channel index
+                channel_id = get_channel_index().get_alias(f"@{handle}")
+                if not channel_id:
+                    channel_id = self.get_channel_id_from_handle(handle)
+                    if channel_id:
+                        get_channel_index().set_alias(f"@{handle}", channel_id)
             
             # Handle direct channel ID format
             elif '/channel/' in channel_url:
@@ -180,7 +224,7 @@ class YouTubeAPIClient:
             logger.info(f"🔍 Searching YouTube channel {channel_id} for {make} {model} videos...")
             
             # Get ALL videos from channel (no 25-video limit!)
-            all_videos = self.get_all_channel_videos(channel_id, max_videos=200)
+            all_videos = self.get_channel_videos_indexed(channel_id, max_videos=200)
             
             if not all_videos:
                 logger.warning(f"No videos found in channel {channel_id}")
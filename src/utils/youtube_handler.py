@@ -1,5 +1,7 @@
 import re
 import os
+import time
+import threading
 import requests
 import xml.etree.ElementTree as ET
 from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled, NoTranscriptFound
@@ -11,6 +13,8 @@ from bs4 import BeautifulSoup
 
 # Import local modules
 from src.utils.logger import setup_logger
+from src.utils.http_pool import get_http_session
+from src.utils.transcript_store import get_transcript_store, SOURCE_CAPTIONS, SOURCE_APIFY
 # Rate limiting now handled by smart_rate_limiter in transcript_fetcher
 from src.utils.config import YOUTUBE_SCRAPFLY_CONFIG
 from src.utils.youtube_relative_date_parser import extract_youtube_date_from_html, parse_youtube_relative_date, extract_video_upload_date
@@ -210,7 +214,7 @@ def resolve_handle_to_channel_id(handle):
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         
-        response = requests.get(url, headers=headers, timeout=10)
+        response = get_http_session().get(url, headers=headers, timeout=10)
         
         if response.status_code == 200:
             html_content = response.text
@@ -289,7 +293,7 @@ def resolve_username_to_channel_id(username):
         for url in url_formats:
             logger.debug(f"Trying to resolve channel ID from: {url}")
             try:
-                response = requests.get(url, headers=headers, timeout=10, allow_redirects=True)
+                response = get_http_session().get(url, headers=headers, timeout=10, allow_redirects=True)
                 
                 if response.status_code == 200:
                     html_content = response.text
@@ -360,7 +364,7 @@ def get_latest_videos(channel_id, max_videos=25):
         
         # Use YouTube's RSS feed
         rss_url = f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
-        response = requests.get(rss_url)
+        response = get_http_session().get(rss_url)
         
         if response.status_code != 200:
             logger.error(f"Error fetching RSS feed: Status code {response.status_code}")
@@ -405,7 +409,7 @@ def get_latest_videos(channel_id, max_videos=25):
                 # Rate limiting now handled by smart_rate_limiter
                 
                 # Get the video page to extract real upload date
-                response = requests.get(video_url, headers={
+                response = get_http_session().get(video_url, headers={
                     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
                 })
                 
@@ -435,6 +439,54 @@ def get_latest_videos(channel_id, max_videos=25):
         logger.error(f"Error fetching latest videos for channel {channel_id}: {e}")
         return []
 
+def _fetch_legacy_transcript_data(video_id):
+    """
+    Fetch caption parts ({'text', 'start', 'duration'}) with youtube-transcript-api.
+    Raises when no transcript is available.
+    """
+    # Use proxied API if available, otherwise use regular API
+    if proxied_transcript_api:
+        logger.info(f"🔄 Using IPRoyal proxy for legacy transcript extraction of video {video_id}")
+        api = proxied_transcript_api
+    else:
+        logger.info(f"📝 Using direct connection for legacy transcript extraction (no proxy)")
+        api = YouTubeTranscriptApi
+    
+    # Try to get transcript with better fallback handling
+    transcript_data = None
+    try:
+        # First try manual transcripts in English
+        transcript_data = api.get_transcript(video_id, languages=['en', 'en-US', 'en-GB'])
+        logger.info(f"Got manual English transcript for {video_id}")
+    except:
+        try:
+            # Try to get auto-generated English transcript
+            transcript_list = api.list_transcripts(video_id)
+            
+            # Try to find any English transcript (including auto-generated)
+            for transcript in transcript_list:
+                if transcript.language_code.startswith('en'):
+                    transcript_data = transcript.fetch()
+                    logger.info(f"Got {transcript.language} transcript for {video_id} (auto-generated: {transcript.is_generated})")
+                    break
+            
+            # If no English found, take the first available
+            if not transcript_data:
+                transcript_data = transcript_list.find_transcript(['en']).fetch()
+                logger.info(f"Got first available transcript for {video_id}")
+        except Exception as e:
+            logger.warning(f"Failed to get any transcript: {e}")
+            raise Exception(f"No transcript found for video {video_id}: {e}")
+    
+    return transcript_data
+
+def _legacy_parts_to_segments(transcript_data):
+    """youtube-transcript-api parts (dicts or snippet objects) as {'text', 'start', 'duration'} segments"""
+    return [{'text': part['text'], 'start': part.get('start', 0), 'duration': part.get('duration', 0)}
+            if isinstance(part, dict) else
+            {'text': part.text, 'start': part.start, 'duration': part.duration}
+            for part in transcript_data]
+
 def get_transcript(video_id, video_url=None, use_whisper_fallback=True):
     """
     Get the transcript for a YouTube video.
@@ -469,6 +521,7 @@ def get_transcript(video_id, video_url=None, use_whisper_fallback=True):
                 
                 # Hardened None handling for force path too
                 if apify_text and isinstance(apify_text, str) and len(apify_text.strip()) > 50:
+                    get_transcript_store().put_text(video_id, apify_text, SOURCE_APIFY)
                     return apify_text
                 else:
                     logger.warning(f"❌ Force-Apify returned insufficient content for {video_id}")
@@ -478,6 +531,15 @@ def get_transcript(video_id, video_url=None, use_whisper_fallback=True):
         logger.warning(f"Force-Apify test path failed for {video_id}: {_e}")
         # Continue to normal flow instead of crashing
 
+    # Shared transcript store: captions, Apify and Whisper results from any worker
+    store = get_transcript_store()
+    stored_text = store.get_text(video_id)
+    if stored_text:
+        return stored_text
+    
+    if TRANSCRIPT_HEDGED:
+        return get_transcript_hedged(video_id, video_url)
+    
     # Try the new yt-dlp-based transcript fetcher first
     try:
         from src.utils.transcript_fetcher import get_transcript_fetcher
@@ -501,42 +563,11 @@ def get_transcript(video_id, video_url=None, use_whisper_fallback=True):
     try:
         # Rate limiting now handled by smart_rate_limiter in transcript_fetcher
         
-        # Use proxied API if available, otherwise use regular API
-        if proxied_transcript_api:
-            logger.info(f"🔄 Using IPRoyal proxy for legacy transcript extraction of video {video_id}")
-            api = proxied_transcript_api
-        else:
-            logger.info(f"📝 Using direct connection for legacy transcript extraction (no proxy)")
-            api = YouTubeTranscriptApi
-        
-        # Try to get transcript with better fallback handling
-        transcript_data = None
-        try:
-            # First try manual transcripts in English
-            transcript_data = api.get_transcript(video_id, languages=['en', 'en-US', 'en-GB'])
-            logger.info(f"Got manual English transcript for {video_id}")
-        except:
-            try:
-                # Try to get auto-generated English transcript
-                transcript_list = api.list_transcripts(video_id)
-                
-                # Try to find any English transcript (including auto-generated)
-                for transcript in transcript_list:
-                    if transcript.language_code.startswith('en'):
-                        transcript_data = transcript.fetch()
-                        logger.info(f"Got {transcript.language} transcript for {video_id} (auto-generated: {transcript.is_generated})")
-                        break
-                
-                # If no English found, take the first available
-                if not transcript_data:
-                    transcript_data = transcript_list.find_transcript(['en']).fetch()
-                    logger.info(f"Got first available transcript for {video_id}")
-            except Exception as e:
-                logger.warning(f"Failed to get any transcript: {e}")
-                raise Exception(f"No transcript found for video {video_id}: {e}")
+        transcript_data = _fetch_legacy_transcript_data(video_id)
         
         # Combine all text parts
         full_text = ' '.join([part['text'] for part in transcript_data])
+        store.put(video_id, _legacy_parts_to_segments(transcript_data), SOURCE_CAPTIONS)
         
         logger.info(f"✅ Got legacy YouTube transcript for {video_id}: {len(full_text)} characters")
         return full_text
@@ -559,13 +590,16 @@ def get_transcript(video_id, video_url=None, use_whisper_fallback=True):
             from src.config.env import is_apify_enabled
             from src.utils.apify_transcripts import get_transcript_from_apify
             
-            if is_apify_enabled() and video_url:
+            if is_apify_enabled() and video_url and store.recent_failure(video_id, SOURCE_APIFY):
+                logger.debug(f"Apify failed recently for {video_id} - not retrying yet")
+            elif is_apify_enabled() and video_url:
                 logger.info(f"🤝 Calling Apify transcript actor for {video_id}")
                 apify_text = get_transcript_from_apify(video_url, timeout_s=120)
                 
                 # Hardened None handling - never crash on None result
                 if apify_text and isinstance(apify_text, str) and len(apify_text.strip()) > 50:
                     logger.info(f"✅ Apify fallback successful: {len(apify_text)} chars")
+                    store.put_text(video_id, apify_text, SOURCE_APIFY)
                     
                     # Clean summary log for Apify success
                     cookiefile = os.getenv("YTDLP_COOKIES")
@@ -577,6 +611,7 @@ def get_transcript(video_id, video_url=None, use_whisper_fallback=True):
                     return apify_text
                 else:
                     logger.warning(f"❌ Apify returned insufficient content for {video_id}")
+                    store.put_failure(video_id, SOURCE_APIFY, "insufficient content")
                     # Continue to final error instead of crashing
             else:
                 logger.debug(f"Apify disabled or no video URL for {video_id}")
@@ -588,24 +623,294 @@ def get_transcript(video_id, video_url=None, use_whisper_fallback=True):
         logger.error(f"❌ All transcript extraction methods failed for video {video_id}")
         
         # Final safety net: create minimal content from video metadata to prevent pipeline death
-        try:
-            if video_url:
-                metadata = get_video_metadata_fallback(video_id, known_title=None)
-                if metadata and metadata.get('content_text'):
-                    logger.info(f"🛡️ Using metadata fallback for {video_id}: {len(metadata['content_text'])} chars")
-                    
-                    # Clean summary log for minimal fallback
-                    cookiefile = os.getenv("YTDLP_COOKIES")
-                    has_cookies = bool(cookiefile and os.path.exists(cookiefile))
-                    logger.info(f"🎯 CLIP SUMMARY: client=failed cookies={has_cookies} caption_proxy=failed "
-                               f"cap_status=failed retry_after=unknown waited_ms=unknown segments=0 elapsed_ms=unknown "
-                               f"fallback=minimal")
-                    
-                    return metadata['content_text']
-        except Exception as meta_err:
-            logger.debug(f"Metadata fallback also failed for {video_id}: {meta_err}")
-        
+        return _metadata_fallback_text(video_id, video_url)
+
+def _metadata_fallback_text(video_id, video_url):
+    """Title + description as minimal content when no transcript source worked"""
+    try:
+        if video_url:
+            metadata = get_video_metadata_fallback(video_id, known_title=None)
+            if metadata and metadata.get('content_text'):
+                logger.info(f"🛡️ Using metadata fallback for {video_id}: {len(metadata['content_text'])} chars")
+                
+                # Clean summary log for minimal fallback
+                cookiefile = os.getenv("YTDLP_COOKIES")
+                has_cookies = bool(cookiefile and os.path.exists(cookiefile))
+                logger.info(f"🎯 CLIP SUMMARY: client=failed cookies={has_cookies} caption_proxy=failed "
+                           f"cap_status=failed retry_after=unknown waited_ms=unknown segments=0 elapsed_ms=unknown "
+                           f"fallback=minimal")
+                
+                return metadata['content_text']
+    except Exception as meta_err:
+        logger.debug(f"Metadata fallback also failed for {video_id}: {meta_err}")
+    
+    return None
+
+# Hedged transcript mode: race the sources instead of trying them one by one
+TRANSCRIPT_HEDGED = os.getenv('TRANSCRIPT_HEDGED', 'false').lower() == 'true'
+# Seconds after the start before each source is launched (negative = never)
+TRANSCRIPT_HEDGE_DELAYS = {
+    'ytdlp': float(os.getenv('TRANSCRIPT_HEDGE_DELAY_YTDLP', '0')),
+    'legacy': float(os.getenv('TRANSCRIPT_HEDGE_DELAY_LEGACY', '0')),
+    'apify': float(os.getenv('TRANSCRIPT_HEDGE_DELAY_APIFY', '15')),
+    'whisper': float(os.getenv('TRANSCRIPT_HEDGE_DELAY_WHISPER', '-1')),
+}
+TRANSCRIPT_HEDGE_TIMEOUT = float(os.getenv('TRANSCRIPT_HEDGE_TIMEOUT', '150'))
+# Same minimum lengths the sequential path accepts from each source
+TRANSCRIPT_MIN_CHARS = {'ytdlp': 100, 'legacy': 1, 'apify': 50, 'whisper': 1}
+
+_transcript_hedge = None
+_transcript_hedge_lock = threading.Lock()
+
+def get_transcript_hedge():
+    """Shared hedged runner (and per-source stats) for transcript fetches"""
+    global _transcript_hedge
+    if _transcript_hedge is None:
+        with _transcript_hedge_lock:
+            if _transcript_hedge is None:
+                from src.utils.hedged_fetch import HedgedRunner
+                _transcript_hedge = HedgedRunner('transcripts')
+    return _transcript_hedge
+
+def _hedge_ytdlp(video_id):
+    from src.utils.transcript_fetcher import get_transcript_fetcher
+    return get_transcript_fetcher().get_transcript(video_id, timeout_s=25)
+
+def _hedge_legacy(video_id):
+    segments = _legacy_parts_to_segments(_fetch_legacy_transcript_data(video_id))
+    get_transcript_store().put(video_id, segments, SOURCE_CAPTIONS)
+    return ' '.join(segment['text'] for segment in segments)
+
+def _hedge_apify(video_id, video_url):
+    from src.config.env import is_apify_enabled
+    from src.utils.apify_transcripts import get_transcript_from_apify
+
+    store = get_transcript_store()
+    if not is_apify_enabled() or store.recent_failure(video_id, SOURCE_APIFY):
+        return None
+    apify_text = get_transcript_from_apify(video_url, timeout_s=120)
+    if apify_text and isinstance(apify_text, str) and len(apify_text.strip()) > 50:
+        store.put_text(video_id, apify_text, SOURCE_APIFY)
+        return apify_text
+    store.put_failure(video_id, SOURCE_APIFY, "insufficient content")
+    return None
+
+def _hedge_whisper(video_id, video_url):
+    from src.utils.whisper_transcriber import transcribe_youtube_video
+    return transcribe_youtube_video(video_url, video_id)
+
+def get_transcript_hedged(video_id, video_url=None):
+    """
+    Hedged variant of get_transcript: the cheap sources (yt-dlp fetcher and
+    youtube-transcript-api) start together, Apify/Whisper join after their
+    TRANSCRIPT_HEDGE_DELAY_* delays, and the first result long enough for its
+    source wins. Falls back to video metadata like the sequential path.
+    
+    Returns:
+        str: Transcript text or None if not available
+    """
+    if not video_id:
+        return None
+    if not video_url:
+        video_url = f"https://www.youtube.com/watch?v={video_id}"
+
+    stored_text = get_transcript_store().get_text(video_id)
+    if stored_text:
+        return stored_text
+
+    text = _hedged_transcript_text(video_id, video_url)
+    if text:
+        return text
+    return _metadata_fallback_text(video_id, video_url)
+
+def _hedged_transcript_text(video_id, video_url):
+    """Race the transcript sources; the winning text, or None when every source failed"""
+    from src.utils.hedged_fetch import HedgedSource
+    candidates = {
+        'ytdlp': lambda: _hedge_ytdlp(video_id),
+        'legacy': lambda: _hedge_legacy(video_id),
+        'apify': lambda: _hedge_apify(video_id, video_url),
+        'whisper': lambda: _hedge_whisper(video_id, video_url),
+    }
+    sources = [HedgedSource(name, fn, TRANSCRIPT_HEDGE_DELAYS[name])
+               for name, fn in candidates.items() if TRANSCRIPT_HEDGE_DELAYS[name] >= 0]
+
+    def accept(name, text):
+        return isinstance(text, str) and len(text.strip()) >= TRANSCRIPT_MIN_CHARS[name]
+
+    winner, text = get_transcript_hedge().run(sources, accept, timeout=TRANSCRIPT_HEDGE_TIMEOUT)
+    if winner:
+        logger.info(f"✅ Hedged transcript for {video_id} from {winner}: {len(text)} characters")
+        return text
+
+    logger.error(f"❌ All hedged transcript sources failed for video {video_id}")
+    return None
+
+# Early-exit relevance gate for streamed transcripts
+TRANSCRIPT_GATE_SECONDS = int(os.getenv('TRANSCRIPT_GATE_SECONDS', '180'))
+# Spoken English runs ~15 characters/second; used when segments carry no timing (e.g. Apify text)
+TRANSCRIPT_CHARS_PER_SECOND = 15
+
+class TranscriptRelevanceGate:
+    """
+    Decide from the opening minutes of a transcript whether a video is about
+    the loaned vehicle. Feed segments as they arrive: the gate accepts as soon
+    as a model variation is mentioned and rejects once window_seconds of
+    speech have gone by without one.
+    """
+    ACCEPT = 'accept'
+    REJECT = 'reject'
+    PENDING = 'pending'
+
+    def __init__(self, make: str, model: str, window_seconds: int = TRANSCRIPT_GATE_SECONDS):
+        from src.utils.model_matching import generate_model_variations
+        from src.utils.vehicle_matcher import compile_terms
+        self.make = make or ''
+        self.model = model or ''
+        self.window_seconds = window_seconds
+        self.variations = sorted(generate_model_variations(self.model)) if self.model else []
+        self._terms = compile_terms(tuple(self.variations))
+        self.decision = self.PENDING if self.variations else self.ACCEPT
+        self.matched_variation = None
+        self.seconds_seen = 0.0
+        self._text_parts = []
+        self._chars = 0
+
+    def feed(self, segments: List[Dict[str, Any]]) -> str:
+        if self.decision != self.PENDING or not segments:
+            return self.decision
+
+        for segment in segments:
+            text = (segment.get('text') or '').strip()
+            if text:
+                self._text_parts.append(text.lower())
+                self._chars += len(text) + 1
+            end = (segment.get('start') or 0) + (segment.get('duration') or 0)
+            self.seconds_seen = max(self.seconds_seen, end)
+        self.seconds_seen = max(self.seconds_seen, self._chars / TRANSCRIPT_CHARS_PER_SECOND)
+
+        text = ' '.join(self._text_parts)
+        # One compiled pass for verbatim mentions before the per-variation word matching
+        matched = self._terms.longest(text)
+        if matched:
+            self.matched_variation = matched
+            self.decision = self.ACCEPT
+            return self.decision
+        for variation in self.variations:
+            if flexible_model_match(text, variation):
+                self.matched_variation = variation
+                self.decision = self.ACCEPT
+                return self.decision
+
+        if self.seconds_seen >= self.window_seconds:
+            self.decision = self.REJECT
+        return self.decision
+
+def iter_transcript_segments(video_id, video_url=None):
+    """
+    Streaming counterpart of get_transcript: yields segment batches
+    ({'text', 'start', 'duration'}) from the first source that has any -
+    yt-dlp captions/Whisper (chunk by chunk for long videos), then the legacy
+    youtube-transcript-api, then Apify. Closing the generator stops the
+    source mid-way, e.g. before a long Whisper transcription finishes.
+    
+    With TRANSCRIPT_HEDGED the sources race instead (get_transcript_hedged)
+    and the winning transcript is yielded as one batch.
+    """
+    if not video_id:
+        return
+    if not video_url:
+        video_url = f"https://www.youtube.com/watch?v={video_id}"
+    
+    if TRANSCRIPT_HEDGED:
+        yield from _iter_hedged_segments(video_id, video_url)
+        return
+
+    try:
+        from src.utils.transcript_fetcher import get_transcript_fetcher
+        produced = False
+        for batch in get_transcript_fetcher().iter_segments(video_id, timeout_s=25):
+            produced = True
+            yield batch
+        if produced:
+            return
+    except Exception as e:
+        logger.warning(f"❌ Streaming transcript fetcher failed for {video_id}: {e}")
+
+    store = get_transcript_store()
+    try:
+        transcript_data = _fetch_legacy_transcript_data(video_id)
+        if transcript_data:
+            segments = _legacy_parts_to_segments(transcript_data)
+            store.put(video_id, segments, SOURCE_CAPTIONS)
+            yield segments
+            return
+    except Exception as e:
+        logger.warning(f"No YouTube transcript available via legacy method for video {video_id}: {e}")
+
+    try:
+        from src.config.env import is_apify_enabled
+        from src.utils.apify_transcripts import get_transcript_from_apify
+
+        if is_apify_enabled() and not store.recent_failure(video_id, SOURCE_APIFY):
+            apify_text = get_transcript_from_apify(video_url, timeout_s=120)
+            if apify_text and isinstance(apify_text, str) and len(apify_text.strip()) > 50:
+                store.put_text(video_id, apify_text, SOURCE_APIFY)
+                yield [{'text': apify_text, 'start': 0, 'duration': 0}]
+            else:
+                store.put_failure(video_id, SOURCE_APIFY, "insufficient content")
+    except Exception as e:
+        logger.warning(f"Apify fallback failed for {video_id}: {e}")
+
+def _iter_hedged_segments(video_id, video_url):
+    """
+    Hedged transcript as one segment batch. Sources that store their segments
+    (captions, Whisper) keep their timing; plain text (Apify) becomes one segment.
+    No metadata fallback - callers of the streaming path handle a missing transcript.
+    """
+    store = get_transcript_store()
+    entry = store.get(video_id)
+    if entry is None:
+        text = _hedged_transcript_text(video_id, video_url)
+        if not text:
+            return
+        entry = store.get(video_id) or {'segments': [{'text': text, 'start': 0, 'duration': 0}]}
+    yield entry['segments']
+
+def get_relevant_transcript(video_id, make, model, video_url=None, window_seconds=TRANSCRIPT_GATE_SECONDS):
+    """
+    Get the transcript only if the video talks about the loaned make/model.
+    The relevance gate looks at the first window_seconds of speech and aborts
+    the fetch (skipping the rest of the download/transcription) when the
+    model is never mentioned.
+    
+    Returns:
+        str: Transcript text, or None if unavailable or irrelevant
+    """
+    from src.utils.transcript_fetcher import segments_to_text
+
+    gate = TranscriptRelevanceGate(make, model, window_seconds)
+    segments = []
+    stream = iter_transcript_segments(video_id, video_url)
+    try:
+        for batch in stream:
+            segments.extend(batch)
+            if gate.feed(batch) == gate.REJECT:
+                logger.warning(f"⚠️ Transcript gate: no mention of {make} {model} in the first "
+                               f"{gate.seconds_seen:.0f}s of {video_id} - aborting transcript")
+                return None
+    finally:
+        stream.close()
+
+    if not segments:
+        return None
+    if gate.decision == gate.PENDING:
+        # Whole transcript was shorter than the window and never mentioned the model
+        logger.warning(f"⚠️ Transcript gate: {video_id} never mentions {make} {model}")
         return None
+    if gate.matched_variation:
+        logger.info(f"✅ Transcript gate: '{gate.matched_variation}' mentioned within {gate.seconds_seen:.0f}s of {video_id}")
+    return segments_to_text(segments) or None
 
 def get_video_metadata_fallback(video_id, known_title=None):
     """
@@ -629,7 +934,7 @@ def get_video_metadata_fallback(video_id, known_title=None):
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         
-        response = requests.get(url, headers=headers, timeout=10)
+        response = get_http_session().get(url, headers=headers, timeout=10)
         
         if response.status_code != 200:
             logger.error(f"Error fetching video page: Status code {response.status_code}")
@@ -918,11 +1223,269 @@ def _create_fallback_metadata_with_title(video_id, title, url):
         'url': url
     }
 
+# ScrapFly health, shared by every channel scrape instead of a per-call httpbin probe
+SCRAPFLY_HEALTH_TTL = int(os.getenv('SCRAPFLY_HEALTH_TTL', '300'))
+_scrapfly_health = {'ok': True, 'checked_at': 0.0, 'error': None}
+_scrapfly_health_lock = threading.Lock()
+
+def _scrapfly_recently_failed() -> bool:
+    with _scrapfly_health_lock:
+        return (not _scrapfly_health['ok']
+                and time.time() - _scrapfly_health['checked_at'] < SCRAPFLY_HEALTH_TTL)
+
+def _record_scrapfly_health(ok: bool, error: Optional[str] = None):
+    with _scrapfly_health_lock:
+        _scrapfly_health.update(ok=ok, checked_at=time.time(), error=error)
+
+def _scrape_channel_page(channel_url: str, scroll_actions: int) -> Optional[List[Dict[str, Any]]]:
+    """
+    Render a channel's /videos page with ScrapFly and parse the listing.
+    scroll_actions=0 renders only the first page (~30 newest videos).
+    
+    Returns:
+        Newest-first list of video dictionaries, or None if the render failed
+    """
+    from src.utils.scrapfly_client import ScrapFlyWebCrawler
+    
+    crawler = ScrapFlyWebCrawler()
+    if not crawler.client:
+        _record_scrapfly_health(False, "no API key")
+        return None
+    
+    # Ensure we're using the /videos page to get all videos
+    if '/videos' not in channel_url:
+        if channel_url.endswith('/'):
+            channel_url = channel_url + 'videos'
+        else:
+            channel_url = channel_url + '/videos'
+    
+    # Create JavaScript scenario to scroll and load more videos
+    # This scrolls multiple times to trigger lazy loading
+    scroll_wait_ms = YOUTUBE_SCRAPFLY_CONFIG.get('scroll_wait_ms', 2000)
+    js_scenario = []
+    for _ in range(scroll_actions):
+        js_scenario.extend([
+            {"scroll": {"direction": "down"}},
+            {"wait": scroll_wait_ms}
+        ])
+    
+    logger.info(f"🎬 Scraping YouTube channel with ScrapFly: {channel_url} ({scroll_actions} scrolls)")
+    
+    # Get raw HTML from YouTube channel page with scrolling
+    # YouTube requires ASP (Anti-Scraping Protection) and JS rendering
+    html_content, title, error = crawler.crawl(
+        url=channel_url,
+        render_js=True,  # Essential for YouTube
+        use_stealth=True,  # ASP - Essential for YouTube
+        country='US',
+        js_scenario=js_scenario or None,  # Scroll to load more videos
+        rendering_wait=3000  # Wait 3s after initial render
+    )
+    
+    if error:
+        # Transport/API failure - other channels would hit it too
+        logger.warning(f"❌ ScrapFly error for {channel_url}: {error}")
+        _record_scrapfly_health(False, error)
+        return None
+    
+    if not html_content or len(html_content) < 1000:
+        # This channel's page only (bad URL, no videos, blocked page) - ScrapFly itself is fine
+        logger.warning(f"❌ ScrapFly returned insufficient content for {channel_url} "
+                       f"({len(html_content) if html_content else 0} chars)")
+        return None
+    
+    _record_scrapfly_health(True)
+    logger.info(f"✅ ScrapFly successfully scraped YouTube channel! ({len(html_content)} chars)")
+    
+    # Use BeautifulSoup to parse HTML properly (like ScrapingBee guide suggests)
+    logger.info("🔍 Parsing YouTube HTML with BeautifulSoup...")
+    soup = BeautifulSoup(html_content, 'html.parser')
+    
+    # Method 1: Find video-title elements (ScrapingBee guide approach)
+    title_elements = soup.find_all(id="video-title")
+    link_elements = soup.find_all(id="video-title-link")
+    
+    logger.info(f"📋 Found {len(title_elements)} title elements and {len(link_elements)} link elements")
+    
+    videos_found = []
+    
+    # 🚀 REMOVED 20-VIDEO LIMIT: Process ALL videos found on the page
+    for i, (title_elem, link_elem) in enumerate(zip(title_elements, link_elements)):
+        try:
+            # Extract title text
+            title = title_elem.get_text(strip=True) if title_elem else ""
+            
+            # Extract href (video URL)
+            href = link_elem.get('href') if link_elem else ""
+            
+            # Try to find the date for this specific video
+            published_date = None
+            date_text = None
+            
+            # Look for metadata in the parent container and broader areas
+            parent = title_elem.parent if title_elem else None
+            if parent:
+                # Method 1: Look for ANY text containing relative dates in a much broader scope
+                # Search up to 3 levels of parents for date strings
+                search_elements = [parent]
+                if parent.parent:
+                    search_elements.append(parent.parent)
+                    if parent.parent.parent:
+                        search_elements.append(parent.parent.parent)
+                
+                for search_elem in search_elements:
+                    if published_date:
+                        break
+                    
+                    # Look for ALL text that contains relative dates
+                    all_text = search_elem.get_text()
+                    date_matches = re.findall(r'(\d+\s*(?:second|minute|hour|day|week|month|year)s?\s*ago)', all_text, re.I)
+                    
+                    if date_matches:
+                        # Try each date match
+                        for date_match in date_matches:
+                            date_text = date_match.strip()
+                            published_date = parse_youtube_relative_date(date_text)
+                            if published_date:
+                                logger.info(f"   📅 Found date in broader text for video {i+1}: '{date_text}' -> {published_date.strftime('%Y-%m-%d')}")
+                                break
+                    
+                    # Also check aria-labels in this element and children
+                    if not published_date:
+                        for elem_with_aria in search_elem.find_all(attrs={'aria-label': True}):
+                            aria_label = elem_with_aria.get('aria-label', '')
+                            date_match = re.search(r'(\d+\s*(?:second|minute|hour|day|week|month|year)s?\s*ago)', aria_label, re.I)
+                            if date_match:
+                                date_text = date_match.group(1)
+                                published_date = parse_youtube_relative_date(date_text)
+                                if published_date:
+                                    logger.info(f"   📅 Found date in aria-label for video {i+1}: '{date_text}' -> {published_date.strftime('%Y-%m-%d')}")
+                                    break
+            
+            # Method 2: As last resort, search for dates in the raw HTML around this video
+            if not published_date and title:
+                try:
+                    # Find this video's title in the raw HTML and extract surrounding context
+                    title_escaped = re.escape(title[:50])  # Use first 50 chars to find it
+                    html_str = str(soup)
+                    title_pos = html_str.find(title[:50])
+                    if title_pos > 0:
+                        # Get 2000 characters around the title
+                        start = max(0, title_pos - 1000)
+                        end = min(len(html_str), title_pos + 1000)
+                        video_context = html_str[start:end]
+                        
+                        # Look for date patterns in this context
+                        date_matches = re.findall(r'(\d+\s*(?:second|minute|hour|day|week|month|year)s?\s*ago)', video_context, re.I)
+                        if date_matches:
+                            # Use the first valid date found
+                            for date_match in date_matches:
+                                date_text = date_match.strip()
+                                published_date = parse_youtube_relative_date(date_text)
+                                if published_date:
+                                    logger.info(f"   📅 Found date in HTML context for video {i+1}: '{date_text}' -> {published_date.strftime('%Y-%m-%d')}")
+                                    break
+                except Exception as e:
+                    logger.debug(f"   Could not search HTML context: {e}")
+            
+            logger.info(f"🔍 Video {i+1}: Title='{title}', Href='{href}', Date='{date_text or 'Not found'}'")
+            
+            if title and href and '/watch?v=' in href:
+                # Extract video ID
+                video_id_match = re.search(r'v=([a-zA-Z0-9_-]{11})', href)
+                if video_id_match:
+                    video_id = video_id_match.group(1)
+                    
+                    # Skip if title is too short
+                    if len(title) < 10:
+                        logger.warning(f"   ❌ Title too short: '{title}' ({len(title)} chars)")
+                        continue
+                    
+                    video_info = {
+                        'video_id': video_id,
+                        'title': title,
+                        'url': f"https://www.youtube.com/watch?v={video_id}",
+                        'method': 'scrapfly'
+                    }
+                    
+                    # Add the published date if we found it
+                    if published_date:
+                        video_info['published'] = published_date.isoformat()
+                        video_info['date_source'] = 'relative_date_parser'
+                        video_info['date_text'] = date_text
+                    
+                    videos_found.append(video_info)
+                    logger.info(f"   ✅ Added video: {title}")
+        
+        except Exception as e:
+            logger.warning(f"   ❌ Error processing video {i+1}: {e}")
+            continue
+    
+    logger.info(f"🎬 ScrapFly method: Found {len(videos_found)} valid videos (after scrolling)")
+    
+    # Log if we found more than 30 videos (proving scrolling worked)
+    if len(videos_found) > 30:
+        logger.info(f"✨ Scrolling worked! Found {len(videos_found) - 30} additional videos beyond initial 30")
+    
+    return videos_found
+
+def get_channel_videos_scrapfly(channel_url: str, max_videos: int = None) -> Optional[List[Dict[str, Any]]]:
+    """
+    Channel listing from the shared channel video index, refreshed with
+    ScrapFly when stale. A refresh first renders only the newest page and
+    merges videos newer than the last indexed one; the full scrolling render
+    runs only for unindexed channels or when the new uploads overflow the
+    first page. Concurrent loans for the same channel share one refresh.
+    
+    Returns:
+        Newest-first list of video dictionaries, or None if nothing is available
+    """
+    from src.utils.channel_video_index import get_channel_index, channel_key
+    
+    if max_videos is None:
+        max_videos = YOUTUBE_SCRAPFLY_CONFIG.get('max_videos', 100)
+    
+    index = get_channel_index()
+    key = channel_key(channel_url)
+    source = 'scrapfly'
+    
+    with index.channel_lock(key, source):
+        if index.is_fresh(key, source):
+            videos = index.get_videos(key, source, max_videos)
+            logger.info(f"♻️ Channel index hit for {key}: {len(videos)} videos")
+            return videos or None
+        
+        if _scrapfly_recently_failed():
+            logger.warning(f"⚠️ ScrapFly failed within the last {SCRAPFLY_HEALTH_TTL}s - not scraping {key}")
+            return None
+        
+        newest = index.newest_video_id(key, source)
+        full_scrolls = YOUTUBE_SCRAPFLY_CONFIG.get('scroll_actions', 5)
+        
+        videos = None
+        if newest:
+            # Incremental refresh: the first page is enough unless it has no overlap
+            videos = _scrape_channel_page(channel_url, 0)
+            if videos is None and not _scrapfly_recently_failed():
+                # A short first page isn't an outage - the full render may still work
+                logger.info(f"📺 First page of {key} unusable - doing a full scrape")
+                videos = _scrape_channel_page(channel_url, full_scrolls)
+            elif videos is not None and newest not in {video['video_id'] for video in videos}:
+                logger.info(f"📺 More than one page of new uploads on {key} - doing a full scrape")
+                videos = _scrape_channel_page(channel_url, full_scrolls)
+        else:
+            videos = _scrape_channel_page(channel_url, full_scrolls)
+        
+        if videos is None:
+            return None
+        added = index.merge(key, source, videos)
+        logger.info(f"📺 Channel index for {key} refreshed: {added} new videos")
+        return index.get_videos(key, source, max_videos) or None
+
 def scrape_channel_videos_with_scrapfly(channel_url: str, make: str, model: str, start_date: Optional[datetime] = None, days_forward: int = 90, max_videos: int = None) -> Optional[List[Dict[str, Any]]]:
     """
-    Scrape YouTube channel page using ScrapFly to get raw HTML and parse manually.
-    Now with enhanced scrolling to load more videos (up to max_videos).
-    Falls back to YouTube API if ScrapFly fails.
+    Find a loan's videos on a YouTube channel using the ScrapFly-backed
+    channel video index. Falls back to YouTube API if ScrapFly fails.
     
     Args:
         channel_url: YouTube channel URL (e.g., https://www.youtube.com/@TheCarCareNutReviews/videos)
@@ -938,286 +1501,80 @@ def scrape_channel_videos_with_scrapfly(channel_url: str, make: str, model: str,
         max_videos = YOUTUBE_SCRAPFLY_CONFIG.get('max_videos', 100)
     
     try:
-        from src.utils.scrapfly_client import ScrapFlyWebCrawler
+        videos_found = get_channel_videos_scrapfly(channel_url, max_videos)
+        if not videos_found:
+            logger.warning("ScrapFly extracted no videos - falling back to YouTube API")
+            return _fallback_to_youtube_api(channel_url, make, model, start_date, days_forward, max_videos)
         
-        # Initialize ScrapFly client
-        crawler = ScrapFlyWebCrawler()
+        logger.info(f"✅ ScrapFly listing has {len(videos_found)} videos")
         
-        # Quick API test with a simple page first
-        logger.info("🧪 Testing ScrapFly API connectivity...")
-        test_content, _, test_error = crawler.crawl(
-            url="https://httpbin.org/html",  # This returns actual HTML content
-            render_js=False,
-            use_stealth=False
-        )
+        # Filter for relevant videos
+        relevant_videos = []
+        make_lower = make.lower()
+        model_lower = model.lower()
         
-        if not test_content:
-            logger.warning(f"⚠️ ScrapFly API test failed: {test_error} - falling back to YouTube API")
-            return _fallback_to_youtube_api(channel_url, make, model, start_date, days_forward, max_videos)
-        else:
-            logger.info("✅ ScrapFly API test successful - proceeding with YouTube scraping")
+        # Create model variations using the improved function
+        from src.utils.model_variations import generate_model_variations
+        model_variations = generate_model_variations(make, model)
         
-        # Ensure we're using the /videos page to get all videos
-        if '/videos' not in channel_url:
-            if channel_url.endswith('/'):
-                channel_url = channel_url + 'videos'
-            else:
-                channel_url = channel_url + '/videos'
+        logger.info(f"Filtering {len(videos_found)} videos for make='{make}' and model variations: {model_variations}")
         
-        logger.info(f"🎬 Scraping YouTube channel with ScrapFly: {channel_url}")
+        # 🚀 SHOW MORE DEBUG INFO: Display more videos if we got them
+        videos_to_show = min(70, len(videos_found))  # Show up to 70 videos (to catch video #52)
+        logger.info(f"🔍 DEBUG: Showing {videos_to_show} of {len(videos_found)} video titles extracted by ScrapFly:")
+        for i, video in enumerate(videos_found[:videos_to_show]):
+            logger.info(f"  {i+1}. '{video['title']}'")
         
-        # Use ScrapFly to get the raw HTML with scrolling
-        try:
-            # Create JavaScript scenario to scroll and load more videos
-            # This scrolls multiple times to trigger lazy loading
-            scroll_actions = YOUTUBE_SCRAPFLY_CONFIG.get('scroll_actions', 5)
-            scroll_wait_ms = YOUTUBE_SCRAPFLY_CONFIG.get('scroll_wait_ms', 2000)
-            
-            js_scenario = []
-            for _ in range(scroll_actions):
-                js_scenario.extend([
-                    {"scroll": {"direction": "down"}},
-                    {"wait": scroll_wait_ms}
-                ])
+        for video in videos_found:
+            title_lower = video['title'].lower()
             
-            logger.info(f"🎬 Scraping YouTube channel with ScrapFly (enhanced scrolling for {max_videos} videos)...")
+            # DEBUG: Show what we're checking
+            logger.info(f"🔍 Checking video: '{video['title']}'")
+            logger.info(f"   Title (lowercase): '{title_lower}'")
+            logger.info(f"   Looking for make: '{make_lower}' in title")
             
-            # Get raw HTML from YouTube channel page with scrolling
-            # YouTube requires ASP (Anti-Scraping Protection) and JS rendering
-            html_content, title, error = crawler.crawl(
-                url=channel_url,
-                render_js=True,  # Essential for YouTube
-                use_stealth=True,  # ASP - Essential for YouTube
-                country='US',
-                js_scenario=js_scenario,  # Scroll to load more videos
-                rendering_wait=3000  # Wait 3s after initial render
-            )
-            
-            if not html_content or len(html_content) < 1000:
-                logger.warning(f"❌ ScrapFly returned insufficient content ({len(html_content) if html_content else 0} chars) - falling back to YouTube API")
-                if error:
-                    logger.warning(f"ScrapFly error: {error}")
-                return _fallback_to_youtube_api(channel_url, make, model, start_date, days_forward, max_videos)
-                
-            logger.info(f"✅ ScrapFly successfully scraped YouTube channel! ({len(html_content)} chars)")
-            
-            # Parse HTML manually to find video titles and links
-            import re
-            
-            # Use BeautifulSoup to parse HTML properly (like ScrapingBee guide suggests)
-            logger.info("🔍 Parsing YouTube HTML with BeautifulSoup...")
-            try:
-                soup = BeautifulSoup(html_content, 'html.parser')
-                
-                # Method 1: Find video-title elements (ScrapingBee guide approach)
-                title_elements = soup.find_all(id="video-title")
-                link_elements = soup.find_all(id="video-title-link")
-                
-                logger.info(f"📋 Found {len(title_elements)} title elements and {len(link_elements)} link elements")
-                
-                videos_found = []
-                
-                # 🚀 REMOVED 20-VIDEO LIMIT: Process ALL videos found on the page
-                for i, (title_elem, link_elem) in enumerate(zip(title_elements, link_elements)):
-                    try:
-                        # Extract title text
-                        title = title_elem.get_text(strip=True) if title_elem else ""
-                        
-                        # Extract href (video URL)
-                        href = link_elem.get('href') if link_elem else ""
-                        
-                        # Try to find the date for this specific video
-                        published_date = None
-                        date_text = None
-                        
-                        # Look for metadata in the parent container and broader areas
-                        parent = title_elem.parent if title_elem else None
-                        if parent:
-                            # Method 1: Look for ANY text containing relative dates in a much broader scope
-                            # Search up to 3 levels of parents for date strings
-                            search_elements = [parent]
-                            if parent.parent:
-                                search_elements.append(parent.parent)
-                                if parent.parent.parent:
-                                    search_elements.append(parent.parent.parent)
-                            
-                            for search_elem in search_elements:
-                                if published_date:
-                                    break
-                                    
-                                # Look for ALL text that contains relative dates
-                                all_text = search_elem.get_text()
-                                date_matches = re.findall(r'(\d+\s*(?:second|minute|hour|day|week|month|year)s?\s*ago)', all_text, re.I)
-                                
-                                if date_matches:
-                                    # Try each date match
-                                    for date_match in date_matches:
-                                        date_text = date_match.strip()
-                                        published_date = parse_youtube_relative_date(date_text)
-                                        if published_date:
-                                            logger.info(f"   📅 Found date in broader text for video {i+1}: '{date_text}' -> {published_date.strftime('%Y-%m-%d')}")
-                                            break
-                                
-                                # Also check aria-labels in this element and children
-                                if not published_date:
-                                    for elem_with_aria in search_elem.find_all(attrs={'aria-label': True}):
-                                        aria_label = elem_with_aria.get('aria-label', '')
-                                        date_match = re.search(r'(\d+\s*(?:second|minute|hour|day|week|month|year)s?\s*ago)', aria_label, re.I)
-                                        if date_match:
-                                            date_text = date_match.group(1)
-                                            published_date = parse_youtube_relative_date(date_text)
-                                            if published_date:
-                                                logger.info(f"   📅 Found date in aria-label for video {i+1}: '{date_text}' -> {published_date.strftime('%Y-%m-%d')}")
-                                                break
-                        
-                        # Method 2: As last resort, search for dates in the raw HTML around this video
-                        if not published_date and title:
+            # Check if title contains make and any model variation
+            if make_lower in title_lower:
+                logger.info(f"   ✅ Found make '{make_lower}' in title!")
+                for model_var in model_variations:
+                    logger.info(f"   🔍 Checking for model variation: '{model_var}'")
+                    if flexible_model_match(title_lower, model_var):
+                        # Check date filtering before adding video
+                        video_date = None
+                        if video.get('published'):
                             try:
-                                # Find this video's title in the raw HTML and extract surrounding context
-                                title_escaped = re.escape(title[:50])  # Use first 50 chars to find it
-                                html_str = str(soup)
-                                title_pos = html_str.find(title[:50])
-                                if title_pos > 0:
-                                    # Get 2000 characters around the title
-                                    start = max(0, title_pos - 1000)
-                                    end = min(len(html_str), title_pos + 1000)
-                                    video_context = html_str[start:end]
-                                    
-                                    # Look for date patterns in this context
-                                    date_matches = re.findall(r'(\d+\s*(?:second|minute|hour|day|week|month|year)s?\s*ago)', video_context, re.I)
-                                    if date_matches:
-                                        # Use the first valid date found
-                                        for date_match in date_matches:
-                                            date_text = date_match.strip()
-                                            published_date = parse_youtube_relative_date(date_text)
-                                            if published_date:
-                                                logger.info(f"   📅 Found date in HTML context for video {i+1}: '{date_text}' -> {published_date.strftime('%Y-%m-%d')}")
-                                                break
-                            except Exception as e:
-                                logger.debug(f"   Could not search HTML context: {e}")
+                                video_date = datetime.fromisoformat(video['published'].replace('Z', '+00:00')).replace(tzinfo=None)
+                            except:
+                                video_date = None
                         
-                        logger.info(f"🔍 Video {i+1}: Title='{title}', Href='{href}', Date='{date_text or 'Not found'}'")
-                        
-                        if title and href and '/watch?v=' in href:
-                            # Extract video ID
-                            video_id_match = re.search(r'v=([a-zA-Z0-9_-]{11})', href)
-                            if video_id_match:
-                                video_id = video_id_match.group(1)
-                                
-                                # Skip if title is too short
-                                if len(title) < 10:
-                                    logger.warning(f"   ❌ Title too short: '{title}' ({len(title)} chars)")
-                                    continue
-                                
-                                video_info = {
-                                    'video_id': video_id,
-                                    'title': title,
-                                    'url': f"https://www.youtube.com/watch?v={video_id}",
-                                    'method': 'scrapfly'
-                                }
-                                
-                                # Add the published date if we found it
-                                if published_date:
-                                    video_info['published'] = published_date.isoformat()
-                                    video_info['date_source'] = 'relative_date_parser'
-                                    video_info['date_text'] = date_text
-                                
-                                videos_found.append(video_info)
-                                logger.info(f"   ✅ Added video: {title}")
-                                
-                    except Exception as e:
-                        logger.warning(f"   ❌ Error processing video {i+1}: {e}")
-                        continue
-                
-                logger.info(f"🎬 ScrapFly method: Found {len(videos_found)} valid videos (after scrolling)")
-                
-                # Log if we found more than 30 videos (proving scrolling worked)
-                if len(videos_found) > 30:
-                    logger.info(f"✨ Scrolling worked! Found {len(videos_found) - 30} additional videos beyond initial 30")
-                
-                # If ScrapFly found videos, use them
-                if videos_found:
-                    logger.info("✅ ScrapFly extraction successful!")
-                    
-                    # Filter for relevant videos
-                    relevant_videos = []
-                    make_lower = make.lower()
-                    model_lower = model.lower()
-                    
-                    # Create model variations using the improved function
-                    from src.utils.model_variations import generate_model_variations
-                    model_variations = generate_model_variations(make, model)
-                    
-                    logger.info(f"Filtering {len(videos_found)} videos for make='{make}' and model variations: {model_variations}")
-                    
-                    # 🚀 SHOW MORE DEBUG INFO: Display more videos if we got them
-                    videos_to_show = min(70, len(videos_found))  # Show up to 70 videos (to catch video #52)
-                    logger.info(f"🔍 DEBUG: Showing {videos_to_show} of {len(videos_found)} video titles extracted by ScrapFly:")
-                    for i, video in enumerate(videos_found[:videos_to_show]):
-                        logger.info(f"  {i+1}. '{video['title']}'")
-                    
-                    for video in videos_found:
-                        title_lower = video['title'].lower()
-                        
-                        # DEBUG: Show what we're checking
-                        logger.info(f"🔍 Checking video: '{video['title']}'")
-                        logger.info(f"   Title (lowercase): '{title_lower}'")
-                        logger.info(f"   Looking for make: '{make_lower}' in title")
-                        
-                        # Check if title contains make and any model variation
-                        if make_lower in title_lower:
-                            logger.info(f"   ✅ Found make '{make_lower}' in title!")
-                            for model_var in model_variations:
-                                logger.info(f"   🔍 Checking for model variation: '{model_var}'")
-                                if flexible_model_match(title_lower, model_var):
-                                    # Check date filtering before adding video
-                                    video_date = None
-                                    if video.get('published'):
-                                        try:
-                                            video_date = datetime.fromisoformat(video['published'].replace('Z', '+00:00')).replace(tzinfo=None)
-                                        except:
-                                            video_date = None
-                                    
-                                    # Import and use enhanced date filter
-                                    from src.utils.enhanced_date_filter import is_content_acceptable
-                                    if is_content_acceptable(video_date, start_date, "youtube", video.get('url')):
-                                        logger.info(f"🎯 ScrapFly found relevant video: {video['title']}")
-                                        relevant_videos.append(video)
-                                    else:
-                                        if video_date:
-                                            logger.info(f"📅 Skipping video '{video['title']}' - published {video_date.strftime('%Y-%m-%d')} outside acceptable date range")
-                                        else:
-                                            logger.info(f"📅 Skipping video '{video['title']}' - no date available and failed enhanced date filter")
-                                    break
-                                else:
-                                    logger.info(f"   ❌ Model variation '{model_var}' not found")
+                        # Import and use enhanced date filter
+                        from src.utils.enhanced_date_filter import is_content_acceptable
+                        if is_content_acceptable(video_date, start_date, "youtube", video.get('url')):
+                            logger.info(f"🎯 ScrapFly found relevant video: {video['title']}")
+                            relevant_videos.append(video)
                         else:
-                            logger.info(f"   ❌ Make '{make_lower}' not found in title")
-                    
-                    logger.info(f"🎬 ScrapFly found {len(relevant_videos)} relevant videos for {make} {model}")
-                    
-                    # If we didn't find dates individually, log but don't attempt bulk extraction
-                    # Bulk extraction is unreliable as it assigns dates in order without matching to specific videos
-                    if relevant_videos and not any(video.get('published') for video in relevant_videos):
-                        logger.info("📅 No individual video dates found - dates will be extracted when processing individual videos")
-                        # Don't attempt bulk extraction as it leads to incorrect date assignments
-                    
-                    if relevant_videos:
-                        return relevant_videos[:10]  # Return top 10 most relevant
+                            if video_date:
+                                logger.info(f"📅 Skipping video '{video['title']}' - published {video_date.strftime('%Y-%m-%d')} outside acceptable date range")
+                            else:
+                                logger.info(f"📅 Skipping video '{video['title']}' - no date available and failed enhanced date filter")
+                        break
                     else:
-                        logger.warning("ScrapFly found videos but none were relevant - falling back to YouTube API")
-                        return _fallback_to_youtube_api(channel_url, make, model, start_date, days_forward, max_videos)
-                        
-                else:
-                    logger.warning("ScrapFly extracted no videos - falling back to YouTube API")
-                    return _fallback_to_youtube_api(channel_url, make, model, start_date, days_forward, max_videos)
-                    
-            except Exception as e:
-                logger.error(f"BeautifulSoup parsing failed: {e} - falling back to YouTube API")
-                return _fallback_to_youtube_api(channel_url, make, model, start_date, days_forward, max_videos)
-                
-        except Exception as e:
-            logger.error(f"Error processing ScrapFly YouTube response: {e} - falling back to YouTube API")
+                        logger.info(f"   ❌ Model variation '{model_var}' not found")
+            else:
+                logger.info(f"   ❌ Make '{make_lower}' not found in title")
+        
+        logger.info(f"🎬 ScrapFly found {len(relevant_videos)} relevant videos for {make} {model}")
+        
+        # If we didn't find dates individually, log but don't attempt bulk extraction
+        # Bulk extraction is unreliable as it assigns dates in order without matching to specific videos
+        if relevant_videos and not any(video.get('published') for video in relevant_videos):
+            logger.info("📅 No individual video dates found - dates will be extracted when processing individual videos")
+            # Don't attempt bulk extraction as it leads to incorrect date assignments
+        
+        if relevant_videos:
+            return relevant_videos[:10]  # Return top 10 most relevant
+        else:
+            logger.warning("ScrapFly found videos but none were relevant - falling back to YouTube API")
             return _fallback_to_youtube_api(channel_url, make, model, start_date, days_forward, max_videos)
         
     except Exception as e:
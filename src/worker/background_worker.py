@@ -21,13 +21,25 @@ sys.path.append(str(project_root))
 
 from src.utils.logger import setup_logger
 from src.utils.database import get_database
-from src.ingest.ingest_database import run_ingest_database_with_filters, load_loans_data_from_url
+from src.utils.cancellation import JobCancellationPoller
+from src.ingest.ingest_database import run_ingest_database_with_filters
 from src.utils.sentiment_analysis import run_sentiment_analysis
+from src.analysis.sentiment_batch import submit_sentiment_batch_job, collect_sentiment_batches, queued_clip_ids
+from src.utils.openai_dispatcher import (
+    get_openai_dispatcher, set_default_priority, install_response_header_hook, PRIORITY_BATCH
+)
+from src.utils.http_pool import install_dns_cache
 from src.utils.fms_api import FMSAPIClient
 
 # Setup logging
 logger = setup_logger(__name__)
 
+# Sentiment jobs with at least this many clips go through the OpenAI Batch API
+# (0 = only when the job sets batch_mode)
+SENTIMENT_BATCH_MIN_CLIPS = int(os.environ.get('SENTIMENT_BATCH_MIN_CLIPS', '0'))
+# How often the run loop checks submitted batches for results (seconds)
+SENTIMENT_BATCH_CHECK_SECONDS = int(os.environ.get('SENTIMENT_BATCH_CHECK_SECONDS', '300'))
+
 class BackgroundWorker:
     """Background worker that processes jobs from the queue"""
     
@@ -38,7 +50,9 @@ class BackgroundWorker:
         self.running = False
         self.current_job_id = None
         self.heartbeat_interval = 5  # seconds - reduced for faster cancellation response
+        self.cancel_poller: Optional[JobCancellationPoller] = None  # Polls job_status for the current job
         self.last_heartbeat = time.time()
+        self.last_batch_check = 0.0
         
         # Register signal handlers for graceful shutdown
         signal.signal(signal.SIGTERM, self.handle_shutdown)
@@ -142,6 +156,10 @@ class BackgroundWorker:
         if not self.current_job_id:
             return False
         
+        # While a job runs its poller keeps the token fresh - no DB round trip needed
+        if self.cancel_poller and self.cancel_poller.job_id == self.current_job_id:
+            return self.cancel_poller.token.is_cancelled()
+        
         try:
             result = self.db.supabase.table('processing_runs').select('job_status').eq(
                 'id', self.current_job_id
@@ -296,6 +314,22 @@ class BackgroundWorker:
             except:
                 pass
     
+    def _iter_job_loans(self, url: str, filters: Dict[str, Any], limit: int):
+        """Filtered loans streamed from the report, with trim extracted only for loans that passed"""
+        from src.ingest.loan_report import iter_loan_report
+        from src.utils.trim_extractor import extract_trim_from_model
+        
+        for loan in iter_loan_report(url, filters=filters, limit=limit):
+            if loan.get('model_full') and not loan.get('trim'):
+                make = loan.get('make', '')
+                full_model = loan.get('model_full', '')
+                base_model, trim = extract_trim_from_model(full_model, make)
+                loan['model'] = base_model  # Update to base model
+                loan['trim'] = trim  # Add extracted trim
+                if trim:
+                    logger.info(f"Extracted trim '{trim}' from '{full_model}' for WO# {loan.get('work_order')}")
+            yield loan
+    
     def process_csv_upload_job(self, job: Dict[str, Any]):
         """Process a CSV upload job"""
         self.log_job_message('INFO', 'Starting CSV upload processing')
@@ -319,147 +353,23 @@ class BackgroundWorker:
             if not url:
                 raise ValueError("No URL provided in job parameters")
             
-            # Load loans data
-            self.log_job_message('INFO', f'Loading loans from URL: {url}')
-            loans = load_loans_data_from_url(url, limit=limit)
-            
-            if not loans:
-                raise ValueError("No loans found to process")
-            
-            self.log_job_message('INFO', f'Loaded {len(loans)} loans')
-            
-            # Apply filters if provided
-            filtered_loans = loans
-            if filters:
-                # Apply office filter
-                office_filter = filters.get('office')
-                if office_filter and office_filter not in ['All', 'All Offices']:
-                    filtered_loans = [l for l in filtered_loans if l.get('office') == office_filter]
-                
-                # Apply make filter
-                make_filter = filters.get('make')
-                if make_filter and make_filter not in ['All', 'All Makes']:
-                    filtered_loans = [l for l in filtered_loans if l.get('make') == make_filter]
-                
-                # Apply model filter
-                model_filter = filters.get('model')
-                if model_filter and model_filter not in ['All', 'All Models']:
-                    filtered_loans = [l for l in filtered_loans if l.get('model') == model_filter]
-
-                # Apply reporter filter (maps to contact name 'to')
-                reporter_filter = filters.get('reporter')
-                if reporter_filter and reporter_filter not in ['All', 'All Reporters']:
-                    filtered_loans = [l for l in filtered_loans if str(l.get('to', '')).strip() == str(reporter_filter).strip()]
-
-                # Apply WO # filter (comma-separated list)
-                wo_numbers_raw = filters.get('wo_numbers')
-                if wo_numbers_raw:
-                    try:
-                        wo_numbers = [str(x).strip() for x in str(wo_numbers_raw).split(',') if str(x).strip()]
-                        if wo_numbers:
-                            filtered_loans = [l for l in filtered_loans if str(l.get('work_order', '')).strip() in wo_numbers]
-                    except Exception:
-                        pass
-
-                # Apply Activity ID filter (comma-separated list)
-                activity_ids_raw = filters.get('activity_ids')
-                if activity_ids_raw:
-                    try:
-                        activity_ids = [str(x).strip() for x in str(activity_ids_raw).split(',') if str(x).strip()]
-                        if activity_ids:
-                            filtered_loans = [l for l in filtered_loans if str(l.get('activity_id', '')).strip() in activity_ids]
-                    except Exception:
-                        pass
-
-                # Apply positional skip filter
-                skip_records = filters.get('skip_records')
-                if isinstance(skip_records, int) and skip_records > 0 and skip_records < len(filtered_loans):
-                    filtered_loans = filtered_loans[skip_records:]
-
-                # Apply date range filter on Start Date if provided
-                date_from = filters.get('date_from')
-                date_to = filters.get('date_to')
-                if date_from or date_to:
-                    from datetime import datetime
-                    def in_range(loan):
-                        sd = loan.get('start_date')
-                        # Parse strings to datetime when necessary
-                        if isinstance(sd, str) and sd:
-                            try:
-                                sd = datetime.fromisoformat(sd)
-                            except Exception:
-                                return True  # if unparseable, don't exclude
-                        if date_from:
-                            try:
-                                df = datetime.fromisoformat(str(date_from))
-                                if sd and sd < df:
-                                    return False
-                            except Exception:
-                                pass
-                        if date_to:
-                            try:
-                                dt = datetime.fromisoformat(str(date_to))
-                                if sd and sd > dt:
-                                    return False
-                            except Exception:
-                                pass
-                        return True
-                    filtered_loans = [l for l in filtered_loans if in_range(l)]
-                
-                self.log_job_message('INFO', f'Filtered to {len(filtered_loans)} loans')
-            
-            # Apply overall limit AFTER filtering
-            if isinstance(limit, int) and limit > 0:
-                filtered_loans = filtered_loans[:limit]
-                self.log_job_message('INFO', f'Applied limit: processing {len(filtered_loans)} loans')
-            
-            # NOW extract trim only for the filtered loans (much more efficient!)
-            from src.utils.trim_extractor import extract_trim_from_model
-            for loan in filtered_loans:
-                if loan.get('model_full') and not loan.get('trim'):
-                    make = loan.get('make', '')
-                    full_model = loan.get('model_full', '')
-                    base_model, trim = extract_trim_from_model(full_model, make)
-                    loan['model'] = base_model  # Update to base model
-                    loan['trim'] = trim  # Add extracted trim
-                    if trim:
-                        logger.info(f"Extracted trim '{trim}' from '{full_model}' for WO# {loan.get('work_order')}")
-            
-            # Update job with correct total for progress tracking
-            self.db.supabase.table('processing_runs').update({
-                'progress_total': len(filtered_loans),  # Set the actual filtered count
-                'total_records': len(filtered_loans)
-            }).eq('id', self.current_job_id).execute()
-            
-            # Start a background thread to check for cancellation every second
-            import threading
-            import os
-            import signal
-            self.job_cancelled = False
-            
-            def check_cancellation_thread():
-                while not self.job_cancelled and self.current_job_id:
-                    if self.check_if_cancelled():
-                        self.job_cancelled = True
-                        logger.info(f"Cancellation detected for job {self.current_job_id} - flagged for stop")
-                        break
-                    time.sleep(30)  # Check every 30 seconds - plenty for cancellation detection
-            
-            cancel_thread = threading.Thread(target=check_cancellation_thread, daemon=True)
-            cancel_thread.start()
+            # Stream loans from the report: filters and the overall limit are applied while
+            # parsing, so crawling starts before the download finishes
+            self.log_job_message('INFO', f'Streaming loans from URL: {url}')
+            loans = self._iter_job_loans(url, filters, limit)
             
             # Create progress callback that checks for cancellation
             def progress_callback(current, total):
                 # Check if job was cancelled
-                if self.job_cancelled or self.check_if_cancelled():
+                if self.check_if_cancelled():
                     raise Exception("Job cancelled by user")
                 
-                # Use the filtered count for progress
-                self.update_job_progress(current, len(filtered_loans))
+                # total grows while the report is still being read
+                self.update_job_progress(current, total)
                 self.send_heartbeat()  # Send heartbeat on progress updates
             
             # Process the loans
-            self.log_job_message('INFO', f'Starting loan processing for {len(filtered_loans)} filtered records')
+            self.log_job_message('INFO', 'Starting loan processing for filtered records')
             
             # We need to process without creating a new run since we already have one
             from src.ingest.ingest_database import process_loans_database_concurrent, load_person_outlets_mapping
@@ -471,7 +381,8 @@ class BackgroundWorker:
             # Process loans and get stats with cancellation support
             try:
                 stats = asyncio.run(process_loans_database_concurrent(
-                    filtered_loans, self.db, self.current_job_id, outlets_mapping, progress_callback
+                    loans, self.db, self.current_job_id, outlets_mapping, progress_callback,
+                    cancel_token=self.cancel_poller.token if self.cancel_poller else None
                 ))
             except Exception as e:
                 if "cancelled by user" in str(e).lower():
@@ -481,14 +392,20 @@ class BackgroundWorker:
                     # Real error, re-raise
                     raise
             
+            if not stats.get('total'):
+                self.log_job_message('WARNING', 'No loans in the report matched the job filters')
+            else:
+                self.log_job_message('INFO', f"Processed {stats['total']} filtered loans")
+            
             # Update job with final statistics - use actual skipped count
             self.db.supabase.table('processing_runs').update({
-                'total_records': stats.get('processed', len(filtered_loans)),  # Use actual processed count
+                'progress_total': stats['total'],
+                'total_records': stats.get('processed', stats['total']),  # Use actual processed count
                 'successful_finds': stats.get('successful', 0),
                 'failed_attempts': stats.get('failed', 0),
                 'skipped_count': stats.get('skipped', 0),  # Store actual skipped count
                 'error_count': stats.get('errors', 0),  # Store error count separately
-                'progress_current': stats.get('processed', len(filtered_loans))
+                'progress_current': stats.get('processed', stats['total'])
             }).eq('id', self.current_job_id).execute()
             
             self.log_job_message('INFO', f'CSV upload processing completed: {stats}')
@@ -513,13 +430,6 @@ class BackgroundWorker:
             params = job.get('job_params', {})
             run_id = params.get('run_id')
             
-            if run_id:
-                # Process specific run
-                self.log_job_message('INFO', f'Processing sentiment for run {run_id}')
-            else:
-                # Process all pending
-                self.log_job_message('INFO', 'Processing all pending sentiment analysis')
-            
             # Create progress callback that checks for cancellation
             def progress_callback(current, total):
                 if self.check_if_cancelled():
@@ -527,13 +437,58 @@ class BackgroundWorker:
                 self.update_job_progress(current, total)
                 self.send_heartbeat()
             
-            # Run sentiment analysis
-            stats = run_sentiment_analysis(
-                run_id=run_id,
-                progress_callback=progress_callback
-            )
+            # Check on an earlier Batch API submission (local manifest ID, sentiment_...)
+            sentiment_batch_id = params.get('sentiment_batch_id')
+            if sentiment_batch_id:
+                self.log_job_message('INFO', f'Checking sentiment batch {sentiment_batch_id}')
+                collected = collect_sentiment_batches([sentiment_batch_id])
+                if collected:
+                    self.log_job_message('INFO', f'Sentiment analysis completed: {collected[0]}')
+                else:
+                    self.log_job_message('INFO', f'Sentiment batch {sentiment_batch_id} is not finished; '
+                                                 'results are saved when it completes')
+                self.complete_job(success=True)
+                return
+            
+            if run_id:
+                # Process specific run
+                self.log_job_message('INFO', f'Processing sentiment for run {run_id}')
+            else:
+                # Process all pending
+                self.log_job_message('INFO', 'Processing all pending sentiment analysis')
+            clips = self.db.get_clips_needing_sentiment([run_id] if run_id else None)
+            
+            # Clips in a batch that hasn't been saved yet still look unanalyzed - don't pay for them twice
+            queued = queued_clip_ids()
+            if queued:
+                waiting = [clip for clip in clips if str(clip['id']) in queued]
+                if waiting:
+                    self.log_job_message('INFO', f'Skipping {len(waiting)} clips already queued in a pending sentiment batch')
+                    clips = [clip for clip in clips if str(clip['id']) not in queued]
+            
+            use_batch = params.get('batch_mode', False) or (
+                SENTIMENT_BATCH_MIN_CLIPS > 0 and len(clips) >= SENTIMENT_BATCH_MIN_CLIPS)
+            if use_batch:
+                # Overnight backfills: submit one Batch API job and release the worker; the run
+                # loop saves the results once the batch finishes (collect_pending_batches)
+                self.log_job_message('INFO', f'Submitting {len(clips)} clips through the OpenAI Batch API')
+                stats = submit_sentiment_batch_job(clips, self.check_if_cancelled)
+                if stats.get('pending'):
+                    self.log_job_message('INFO', f"Submitted sentiment batch {stats['local_id']}; "
+                                                 'results are saved when it completes')
+            else:
+                # Run sentiment analysis (its callback reports a 0-1 fraction)
+                stats = run_sentiment_analysis(
+                    clips,
+                    progress_callback=lambda progress, message: progress_callback(int(progress * len(clips)), len(clips))
+                )
+                for clip, result in zip(clips, stats.get('results', [])):
+                    if result.get('sentiment_completed'):
+                        self.db.update_clip_sentiment(clip['id'], result)
+                stats.pop('results', None)
             
             self.log_job_message('INFO', f'Sentiment analysis completed: {stats}')
+            get_openai_dispatcher().log_stats()
             self.complete_job(success=True)
             
         except Exception as e:
@@ -593,9 +548,15 @@ class BackgroundWorker:
         
         logger.info(f"Processing job type: {job_type}")
         
+        # One cancellation poller per job; all checks below read its token
+        self.cancel_poller = JobCancellationPoller(self.db, self.current_job_id)
+        self.cancel_poller.start()
+        
         # Check if job was already cancelled before starting
         if self.check_if_cancelled():
             logger.info(f"Job {self.current_job_id} was cancelled before processing started")
+            self.cancel_poller.stop()
+            self.cancel_poller = None
             self.current_job_id = None
             return
         
@@ -619,6 +580,10 @@ class BackgroundWorker:
             logger.error(error_msg, exc_info=True)
             self.log_job_message('ERROR', error_msg, {'traceback': traceback.format_exc()})
             self.complete_job(success=False, error_message=error_msg)
+        finally:
+            if self.cancel_poller:
+                self.cancel_poller.stop()
+                self.cancel_poller = None
     
     def cleanup_stale_jobs(self):
         """Clean up stale jobs that have no heartbeat"""
@@ -629,6 +594,17 @@ class BackgroundWorker:
         except Exception as e:
             logger.error(f"Failed to cleanup stale jobs: {e}")
     
+    def collect_pending_batches(self):
+        """Save the results of submitted sentiment batches that have finished (every SENTIMENT_BATCH_CHECK_SECONDS)"""
+        if time.time() - self.last_batch_check < SENTIMENT_BATCH_CHECK_SECONDS:
+            return
+        self.last_batch_check = time.time()
+        try:
+            for stats in collect_sentiment_batches():
+                logger.info(f"Saved sentiment batch {stats['local_id']}: {stats}")
+        except Exception as e:
+            logger.error(f"Failed to collect sentiment batches: {e}")
+    
     def run(self):
         """Main worker loop"""
         logger.info(f"Worker {self.worker_id} starting...")
@@ -649,6 +625,9 @@ class BackgroundWorker:
                 if time.time() % 300 < 1:  # Every 5 minutes
                     self.cleanup_stale_jobs()
                 
+                # Pick up finished Batch API submissions
+                self.collect_pending_batches()
+                
                 # Try to claim a job
                 job = self.claim_job()
                 
@@ -691,6 +670,14 @@ def main():
     # Get worker ID from environment or generate one
     worker_id = os.environ.get('WORKER_ID')
     
+    # Everything the worker sends to OpenAI is queued job work - dashboard calls go first
+    set_default_priority(PRIORITY_BATCH)
+    # Feed rate-limit headers of successful calls to the dispatcher (openai 0.27 only)
+    install_response_header_hook()
+    
+    # Process-wide DNS cache, only when HTTP_DNS_CACHE_SECONDS is set
+    install_dns_cache()
+    
     # Create and run worker
     worker = BackgroundWorker(worker_id=worker_id)
     
@@ -0,0 +1,108 @@
+"""
+VehicleMatcher must give the same answers as the substring loops it replaced
+in _find_relevant_articles (`any(variation in text ...)` per URL and title).
+"""
+
+import pytest
+
+from src.utils.model_variations import generate_model_variations
+from src.utils.vehicle_matcher import TermMatcher, VehicleMatcher, split_base_and_variant
+
+VEHICLES = [
+    ('Mazda', 'CX-5'),
+    ('Mazda', 'CX-70'),
+    ('Toyota', 'GR Corolla Premium'),
+    ('Ford', 'F-150 Raptor'),
+    ('Honda', 'Accord Hybrid Touring'),
+]
+
+TEXTS = [
+    'https://www.example.com/reviews/2025-mazda-cx-5-turbo-review',
+    '2025 mazda cx-50 first drive',
+    'mazda cx 70 vs mazda cx-90 comparison',
+    'https://www.example.com/news/mazdacx70-recall',
+    '2024 gr corolla premium long-term test',
+    'toyota gr-corolla track day',
+    'corolla hybrid news',
+    'ford f-150 raptor r 2025',
+    'the f 150 lightning reviewed',
+    'honda accord hybrid touring 2023 vs accord hybrid sport',
+    'https://www.example.com/honda/accord-review',
+    'best suvs of the year',
+    '',
+]
+
+def legacy_variations(make, model):
+    """The variation list _find_relevant_articles built before the matcher"""
+    model_variations = generate_model_variations(make, model)
+    year_variations = []
+    for year in [2025, 2024, 2023]:
+        for variation in model_variations[:5]:
+            year_variations.extend([f"{year} {variation}", f"{variation} {year}"])
+    model_variations.extend(year_variations)
+    return list(set([v.lower() for v in model_variations if v.strip()]))
+
+def legacy_score(make, model, url_lower, title_lower):
+    """The pre-matcher scoring loop for one link"""
+    make_lower = make.lower()
+    base_model, variant = split_base_and_variant(model.lower())
+    model_variations = legacy_variations(make, model)
+    has_make = make_lower in url_lower or make_lower in title_lower
+    has_full_model = (any(v in url_lower for v in model_variations)
+                      or any(v in title_lower for v in model_variations))
+    has_base_model = base_model in url_lower or base_model in title_lower
+    has_variant = bool(variant) and (variant in url_lower or variant in title_lower)
+    if has_make and has_full_model:
+        return 1000
+    if has_full_model:
+        return 800
+    if has_make and has_base_model and has_variant:
+        return 700
+    if has_base_model and has_variant:
+        return 600
+    if has_make and has_base_model:
+        return 500
+    if has_base_model:
+        return 300
+    return 0
+
+@pytest.mark.parametrize('make,model', VEHICLES)
+def test_variations_match_legacy_list(make, model):
+    assert VehicleMatcher(make, model).variations == sorted(legacy_variations(make, model))
+
+@pytest.mark.parametrize('make,model', VEHICLES)
+def test_search_matches_substring_loop(make, model):
+    matcher = VehicleMatcher(make, model)
+    variations = legacy_variations(make, model)
+    for text in TEXTS:
+        assert matcher.has_model(text) == any(v in text for v in variations), text
+
+@pytest.mark.parametrize('make,model', VEHICLES)
+def test_tier_matches_legacy_score(make, model):
+    matcher = VehicleMatcher(make, model)
+    for url in TEXTS:
+        for title in TEXTS:
+            score, _ = matcher.tier(matcher.scan(url), matcher.scan(title))
+            assert score == legacy_score(make, model, url, title), (url, title)
+
+@pytest.mark.parametrize('make,model', VEHICLES)
+def test_longest_is_longest_occurring_variation(make, model):
+    matcher = VehicleMatcher(make, model)
+    for text in TEXTS:
+        found = [v for v in matcher.variations if v in text]
+        longest = matcher.scan(text).model
+        if not found:
+            assert longest is None, text
+        else:
+            assert longest in text and len(longest) == max(len(v) for v in found), text
+
+def test_longest_sees_overlapping_terms():
+    # "cx-5" matches first; a non-overlapping scan would resume after it and miss "x-50 turbo"
+    matcher = TermMatcher(['cx-5', 'x-50 turbo'])
+    assert matcher.longest('mazda cx-50 turbo') == 'x-50 turbo'
+    assert matcher.count('mazda cx-50 turbo') == 1
+
+def test_empty_terms():
+    assert TermMatcher(['']).search('anything')
+    assert not TermMatcher([]).search('anything')
+    assert TermMatcher([]).longest('anything') is None